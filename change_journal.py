@@ -0,0 +1,271 @@
+"""
+Append-only journal for schedule change tracking.
+Persists ChangeTracker records and undo/redo operations as JSON lines so that
+the undo/redo stacks and the audit trail survive a restart.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+from exceptions import SchedulerError
+
+
+class ChangeJournal:
+    """
+    Write-ahead journal of schedule changes
+
+    Every line is one compact JSON record:
+        {"op": "record", "c": {...change...}}   a new change (audit_only marks
+                                                 changes no longer on the stack)
+        {"op": "undo", "id": ...}               a change was rolled back
+        {"op": "redo", "id": ...}               a change was reapplied
+        {"op": "clear"}                         the undo/redo history was cleared
+        {"op": "state", "stack": [...], "position": n}
+                                                 stack written by compaction
+
+    Lines are written and flushed on every append; fsync is batched by count
+    and time.
+    """
+
+    def __init__(self, path: str, fsync_batch_size: int = 64, fsync_interval: float = 0.5,
+                 compact_every: int = 1000):
+        """
+        Open (or create) a journal
+
+        Args:
+            path: Journal file
+            fsync_batch_size: Appends between two fsync calls
+            fsync_interval: Maximum seconds between two fsync calls
+            compact_every: Undo/redo/clear operations after which compaction is due
+        """
+        self.path = path
+        self.fsync_batch_size = max(1, fsync_batch_size)
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._ops_since_compaction = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        try:
+            self._file = open(path, 'a', encoding='utf-8')
+        except OSError as e:
+            raise SchedulerError(f"Cannot open change journal {path}: {str(e)}")
+
+        logging.info(f"ChangeJournal opened at {path}")
+
+    @staticmethod
+    def _compact_change(change_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop empty and default fields from a serialized change"""
+        compact = {}
+        for key, value in change_dict.items():
+            if value in (None, '', {}, []):
+                continue
+            if (key == 'can_rollback' and value is True) or (key == 'rollback_applied' and value is False):
+                continue
+            compact[key] = value
+        return compact
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append one line and fsync when the batch is full or old enough"""
+        self._file.write(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+        self._file.flush()
+        self._unsynced += 1
+        if (self._unsynced >= self.fsync_batch_size or
+                time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def append_record(self, change_dict: Dict[str, Any]) -> None:
+        """
+        Journal a new change
+
+        Args:
+            change_dict: ScheduleChange.to_dict() of the change
+        """
+        self._append({'op': 'record', 'c': self._compact_change(change_dict)})
+
+    def append_undo(self, change_id: str) -> None:
+        """Journal the rollback of a change"""
+        self._append({'op': 'undo', 'id': change_id})
+        self._ops_since_compaction += 1
+
+    def append_redo(self, change_id: str) -> None:
+        """Journal the reapplication of a change"""
+        self._append({'op': 'redo', 'id': change_id})
+        self._ops_since_compaction += 1
+
+    def append_clear(self) -> None:
+        """Journal clearing of the undo/redo history"""
+        self._append({'op': 'clear'})
+        self._ops_since_compaction += 1
+
+    def sync(self) -> None:
+        """Force journaled lines to stable storage"""
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal"""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def iter_lines(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the journal records from disk
+
+        Yields:
+            dict: One journal record per line (a torn last line is skipped)
+        """
+        if not self._file.closed:
+            self._file.flush()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        logging.warning(f"Skipping corrupt line in change journal {self.path}")
+        except FileNotFoundError:
+            return
+
+    def iter_changes(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every journaled change in chronological order (the audit trail)
+
+        Yields:
+            dict: Serialized change with rollback_applied reflecting its last known state
+        """
+        applied: Dict[str, bool] = {}
+        for record in self.iter_lines():
+            if record['op'] == 'undo':
+                applied[record['id']] = True
+            elif record['op'] == 'redo':
+                applied[record['id']] = False
+
+        for record in self.iter_lines():
+            if record['op'] == 'record':
+                change = dict(record['c'])
+                change.pop('audit_only', None)
+                change['rollback_applied'] = applied.get(change['change_id'], change.get('rollback_applied', False))
+                yield change
+
+    def replay(self, max_history: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Rebuild the undo/redo stack from the journal
+
+        Args:
+            max_history: Stack size limit of the ChangeTracker
+
+        Returns:
+            tuple: (serialized changes on the stack, current position)
+        """
+        changes: List[Optional[Dict[str, Any]]] = []
+        position = -1
+        slots: Dict[str, int] = {}
+
+        for record in self.iter_lines():
+            op = record.get('op')
+            if op == 'state':
+                changes = [None] * len(record['stack'])
+                slots = {change_id: i for i, change_id in enumerate(record['stack'])}
+                position = record['position']
+            elif op == 'record':
+                change = record['c']
+                if change.get('audit_only'):
+                    continue
+                if change['change_id'] in slots:
+                    changes[slots.pop(change['change_id'])] = change
+                    continue
+                del changes[position + 1:]
+                changes.append(change)
+                position = len(changes) - 1
+                if len(changes) > max_history:
+                    del changes[0]
+                    position -= 1
+            elif op in ('undo', 'redo'):
+                for i in range(len(changes) - 1, -1, -1):
+                    if changes[i] is not None and changes[i]['change_id'] == record['id']:
+                        changes[i] = dict(changes[i], rollback_applied=(op == 'undo'))
+                        position = i - 1 if op == 'undo' else i
+                        break
+            elif op == 'clear':
+                changes, position, slots = [], -1, {}
+
+        # Drop slots whose record was lost (e.g. torn write before compaction finished)
+        stack = [c for c in changes if c is not None]
+        position = min(position, len(stack) - 1)
+        self._ops_since_compaction = 0
+        return stack, position
+
+    def needs_compaction(self) -> bool:
+        """Whether enough undo/redo/clear operations accumulated to compact"""
+        return self._ops_since_compaction >= self.compact_every
+
+    def compact(self, stack: List[Dict[str, Any]], position: int) -> bool:
+        """
+        Rewrite the journal without undo/redo/clear operations
+
+        Every change is kept for the audit trail. Changes no longer on the
+        stack are marked audit_only, and the current stack is written as a
+        state header.
+
+        Args:
+            stack: Serialized changes currently on the undo/redo stack
+            position: Current position in the stack
+
+        Returns:
+            bool: True if the journal was compacted
+        """
+        stack_ids = {c['change_id'] for c in stack}
+        current = {c['change_id']: c for c in stack}
+        directory = os.path.dirname(os.path.abspath(self.path))
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.journal_', dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as out:
+                    out.write(json.dumps({'op': 'state', 'stack': [c['change_id'] for c in stack],
+                                          'position': position}, separators=(',', ':')) + '\n')
+                    for change in self.iter_changes():
+                        change_id = change['change_id']
+                        if change_id in stack_ids:
+                            change = current[change_id]
+                        else:
+                            change['audit_only'] = True
+                        out.write(json.dumps({'op': 'record', 'c': self._compact_change(change)},
+                                             separators=(',', ':'), default=str) + '\n')
+                    out.flush()
+                    os.fsync(out.fileno())
+
+                self._file.close()
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            finally:
+                if self._file.closed:
+                    self._file = open(self.path, 'a', encoding='utf-8')
+
+            self._ops_since_compaction = 0
+            self._unsynced = 0
+            logging.info(f"Change journal compacted ({len(stack)} changes on stack)")
+            return True
+
+        except Exception as e:
+            logging.error(f"Error compacting change journal {self.path}: {str(e)}", exc_info=True)
+            return False
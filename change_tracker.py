@@ -9,9 +9,11 @@ import logging
 from dataclasses import dataclass, field
 from enum import Enum
 import json
-from copy import deepcopy
+from threading import RLock
 
-from event_bus import get_event_bus, EventType
+from event_bus import get_event_bus, EventType, DeliveryMode, ScheduleEvent, make_bulk_event, unpack_bulk_event
+from change_journal import ChangeJournal
+from version_table import VersionTable
 
 
 class ChangeType(Enum):
@@ -41,6 +43,9 @@ class ScheduleChange:
     # Metadata
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    # Cell diffs [shift date (ISO), post index, old worker, new worker] in applied order
+    cells: List[List[Any]] = field(default_factory=list)
+    
     # Rollback information
     can_rollback: bool = True
     rollback_applied: bool = False
@@ -56,6 +61,7 @@ class ScheduleChange:
             'before_state': self.before_state,
             'after_state': self.after_state,
             'metadata': self.metadata,
+            'cells': self.cells,
             'can_rollback': self.can_rollback,
             'rollback_applied': self.rollback_applied
         }
@@ -72,29 +78,67 @@ class ScheduleChange:
             before_state=data.get('before_state', {}),
             after_state=data.get('after_state', {}),
             metadata=data.get('metadata', {}),
+            cells=data.get('cells', []),
             can_rollback=data.get('can_rollback', True),
             rollback_applied=data.get('rollback_applied', False)
         )
 
 
+def diff_schedules(before: Dict[datetime, List[Optional[str]]],
+                   after: Dict[datetime, List[Optional[str]]]) -> List[List[Any]]:
+    """
+    Compute the cell diffs that turn one schedule into another
+    
+    Args:
+        before: Schedule before the change
+        after: Schedule after the change
+        
+    Returns:
+        List of [shift date (ISO), post index, old worker, new worker]
+    """
+    cells = []
+    for shift_date in sorted(set(before) | set(after)):
+        old_row = before.get(shift_date, [])
+        new_row = after.get(shift_date, [])
+        for post_index in range(max(len(old_row), len(new_row))):
+            old = old_row[post_index] if post_index < len(old_row) else None
+            new = new_row[post_index] if post_index < len(new_row) else None
+            if old != new:
+                cells.append([shift_date.isoformat(), post_index, old, new])
+    return cells
+
+
 class ChangeTracker:
     """Tracks schedule changes and provides undo/redo functionality"""
     
-    def __init__(self, scheduler, max_history: int = 100):
+    def __init__(self, scheduler, max_history: int = 100, journal_path: Optional[str] = None,
+                 versions: Optional[VersionTable] = None):
         """
         Initialize the change tracker
         
         Args:
             scheduler: The main Scheduler instance
             max_history: Maximum number of changes to keep in history
+            journal_path: Change journal file (defaults to config['change_journal_path'])
+            versions: Version table to bump when undo/redo rewrites cells
         """
         self.scheduler = scheduler
         self.event_bus = get_event_bus()
         self.max_history = max_history
+        self.versions = versions
         
         # Change tracking
         self._changes: List[ScheduleChange] = []
         self._current_position = -1  # Position in undo/redo stack
+        self._history_lock = RLock()
+        
+        # Durable journal: the stack is rebuilt from it on startup
+        config = getattr(scheduler, 'config', None) or {}
+        journal_path = journal_path or config.get('change_journal_path')
+        self.journal: Optional[ChangeJournal] = None
+        if journal_path:
+            self.journal = ChangeJournal(journal_path)
+            self._restore_from_journal()
         
         # Setup event listeners
         self._setup_event_listeners()
@@ -103,11 +147,11 @@ class ChangeTracker:
     
     def _setup_event_listeners(self):
         """Set up event listeners to track changes"""
-        self.event_bus.subscribe(EventType.SHIFT_ASSIGNED, self._on_shift_assigned)
-        self.event_bus.subscribe(EventType.SHIFT_UNASSIGNED, self._on_shift_unassigned)
-        self.event_bus.subscribe(EventType.SHIFT_SWAPPED, self._on_shift_swapped)
-        self.event_bus.subscribe(EventType.BULK_UPDATE, self._on_bulk_update)
-        self.event_bus.subscribe(EventType.SCHEDULE_GENERATED, self._on_schedule_generated)
+        self.event_bus.subscribe(EventType.SHIFT_ASSIGNED, self._on_shift_assigned, delivery=DeliveryMode.SYNC)
+        self.event_bus.subscribe(EventType.SHIFT_UNASSIGNED, self._on_shift_unassigned, delivery=DeliveryMode.SYNC)
+        self.event_bus.subscribe(EventType.SHIFT_SWAPPED, self._on_shift_swapped, delivery=DeliveryMode.SYNC)
+        self.event_bus.subscribe(EventType.BULK_UPDATE, self._on_bulk_update, delivery=DeliveryMode.SYNC)
+        self.event_bus.subscribe(EventType.SCHEDULE_GENERATED, self._on_schedule_generated, delivery=DeliveryMode.SYNC)
     
     def record_change(self, change: ScheduleChange) -> None:
         """
@@ -116,21 +160,57 @@ class ChangeTracker:
         Args:
             change: The change to record
         """
-        # Remove any changes after current position (for redo)
-        if self._current_position < len(self._changes) - 1:
-            self._changes = self._changes[:self._current_position + 1]
-        
-        # Add the new change
-        self._changes.append(change)
-        self._current_position = len(self._changes) - 1
-        
-        # Maintain maximum history
-        if len(self._changes) > self.max_history:
-            self._changes.pop(0)
-            self._current_position -= 1
+        # Edits on different dates record their changes concurrently
+        with self._history_lock:
+            # Remove any changes after current position (for redo)
+            if self._current_position < len(self._changes) - 1:
+                del self._changes[self._current_position + 1:]
+            
+            # Add the new change
+            self._changes.append(change)
+            self._current_position = len(self._changes) - 1
+            
+            # Maintain maximum history
+            if len(self._changes) > self.max_history:
+                del self._changes[0]
+                self._current_position -= 1
+            
+            if self.journal:
+                self.journal.append_record(change.to_dict())
         
         logging.debug(f"Recorded change: {change.change_id}")
     
+    def _restore_from_journal(self) -> None:
+        """Rebuild the undo/redo stack from the change journal"""
+        try:
+            stack, position = self.journal.replay(self.max_history)
+            self._changes = [ScheduleChange.from_dict(c) for c in stack]
+            self._current_position = position
+            logging.info(f"Restored {len(self._changes)} changes from journal {self.journal.path}")
+        except Exception as e:
+            logging.error(f"Error replaying change journal {self.journal.path}: {str(e)}", exc_info=True)
+            self._changes = []
+            self._current_position = -1
+    
+    def _journal_operation(self, operation: str, change_id: Optional[str] = None) -> None:
+        """Journal an undo/redo/clear operation and compact when due"""
+        if not self.journal:
+            return
+        if operation == 'undo':
+            self.journal.append_undo(change_id)
+        elif operation == 'redo':
+            self.journal.append_redo(change_id)
+        else:
+            self.journal.append_clear()
+        
+        if self.journal.needs_compaction():
+            self.journal.compact([c.to_dict() for c in self._changes], self._current_position)
+    
+    def close(self) -> None:
+        """Flush and close the change journal"""
+        if self.journal:
+            self.journal.close()
+    
     def undo(self, user_id: Optional[str] = None) -> Optional[ScheduleChange]:
         """
         Undo the last change
@@ -152,25 +232,12 @@ class ChangeTracker:
         
         try:
             # Apply the rollback
-            success = self._apply_rollback(change)
+            success = self._apply_rollback(change, user_id)
             
             if success:
                 change.rollback_applied = True
                 self._current_position -= 1
-                
-                # Record the undo operation
-                undo_change = ScheduleChange(
-                    change_id=f"undo_{change.change_id}_{datetime.now().timestamp()}",
-                    change_type=change.change_type,
-                    user_id=user_id,
-                    description=f"Undo: {change.description}",
-                    before_state=change.after_state,
-                    after_state=change.before_state,
-                    metadata={'is_undo': True, 'original_change_id': change.change_id},
-                    can_rollback=False  # Prevent undo of undo
-                )
-                
-                # Don't record undo in normal history to avoid infinite loops
+                self._journal_operation('undo', change.change_id)
                 logging.info(f"Undid change: {change.change_id}")
                 return change
             else:
@@ -199,23 +266,11 @@ class ChangeTracker:
         
         try:
             # Reapply the change
-            success = self._reapply_change(change)
+            success = self._reapply_change(change, user_id)
             
             if success:
                 change.rollback_applied = False
-                
-                # Record the redo operation
-                redo_change = ScheduleChange(
-                    change_id=f"redo_{change.change_id}_{datetime.now().timestamp()}",
-                    change_type=change.change_type,
-                    user_id=user_id,
-                    description=f"Redo: {change.description}",
-                    before_state=change.before_state,
-                    after_state=change.after_state,
-                    metadata={'is_redo': True, 'original_change_id': change.change_id},
-                    can_rollback=False  # Prevent undo of redo
-                )
-                
+                self._journal_operation('redo', change.change_id)
                 logging.info(f"Redid change: {change.change_id}")
                 return change
             else:
@@ -287,8 +342,41 @@ class ChangeTracker:
         """Clear all change history"""
         self._changes.clear()
         self._current_position = -1
+        self._journal_operation('clear')
         logging.info("Change history cleared")
     
+    def iter_audit_trail(self,
+                         user_id: Optional[str] = None,
+                         change_type: Optional[ChangeType] = None,
+                         since: Optional[datetime] = None):
+        """
+        Stream the audit trail in chronological order
+        
+        With a journal every change ever journaled is streamed from disk;
+        otherwise the in-memory history is used.
+        
+        Args:
+            user_id: Filter by user ID
+            change_type: Filter by change type
+            since: Only changes at or after this timestamp
+            
+        Yields:
+            ScheduleChange matching the criteria
+        """
+        if self.journal:
+            source = (ScheduleChange.from_dict(c) for c in self.journal.iter_changes())
+        else:
+            source = iter(list(self._changes))
+        
+        for change in source:
+            if user_id and change.user_id != user_id:
+                continue
+            if change_type and change.change_type != change_type:
+                continue
+            if since and change.timestamp < since:
+                continue
+            yield change
+    
     def export_audit_trail(self, filepath: str) -> bool:
         """
         Export audit trail to file
@@ -300,14 +388,16 @@ class ChangeTracker:
             True if export successful
         """
         try:
-            audit_data = {
-                'export_timestamp': datetime.now().isoformat(),
-                'total_changes': len(self._changes),
-                'changes': [change.to_dict() for change in self._changes]
-            }
-            
+            # Changes are streamed one at a time so large journals are never
+            # held in memory; total_changes is written after the list.
+            total_changes = 0
             with open(filepath, 'w') as f:
-                json.dump(audit_data, f, indent=2)
+                f.write('{\n  "export_timestamp": %s,\n  "changes": [' % json.dumps(datetime.now().isoformat()))
+                for change in self.iter_audit_trail():
+                    f.write(',' if total_changes else '')
+                    f.write('\n    ' + json.dumps(change.to_dict(), default=str))
+                    total_changes += 1
+                f.write('\n  ],\n  "total_changes": %d\n}\n' % total_changes)
             
             logging.info(f"Audit trail exported to {filepath}")
             return True
@@ -316,198 +406,117 @@ class ChangeTracker:
             logging.error(f"Error exporting audit trail: {e}")
             return False
     
-    def _apply_rollback(self, change: ScheduleChange) -> bool:
+    def _apply_rollback(self, change: ScheduleChange, user_id: Optional[str] = None) -> bool:
         """Apply rollback for a specific change"""
         try:
-            if change.change_type == ChangeType.ASSIGNMENT:
-                return self._rollback_assignment(change)
-            elif change.change_type == ChangeType.UNASSIGNMENT:
-                return self._rollback_unassignment(change)
-            elif change.change_type == ChangeType.SWAP:
-                return self._rollback_swap(change)
-            elif change.change_type == ChangeType.BULK_UPDATE:
-                return self._rollback_bulk_update(change)
-            else:
-                logging.warning(f"Rollback not implemented for change type: {change.change_type}")
-                return False
-                
+            return self._apply_cells(self._get_cells(change), undo=True, user_id=user_id,
+                                     change_id=change.change_id)
         except Exception as e:
             logging.error(f"Error applying rollback for {change.change_id}: {e}")
             return False
     
-    def _reapply_change(self, change: ScheduleChange) -> bool:
+    def _reapply_change(self, change: ScheduleChange, user_id: Optional[str] = None) -> bool:
         """Reapply a previously undone change"""
         try:
-            if change.change_type == ChangeType.ASSIGNMENT:
-                return self._reapply_assignment(change)
-            elif change.change_type == ChangeType.UNASSIGNMENT:
-                return self._reapply_unassignment(change)
-            elif change.change_type == ChangeType.SWAP:
-                return self._reapply_swap(change)
-            elif change.change_type == ChangeType.BULK_UPDATE:
-                return self._reapply_bulk_update(change)
-            else:
-                logging.warning(f"Reapply not implemented for change type: {change.change_type}")
-                return False
-                
+            return self._apply_cells(self._get_cells(change), undo=False, user_id=user_id,
+                                     change_id=change.change_id)
         except Exception as e:
             logging.error(f"Error reapplying change {change.change_id}: {e}")
             return False
     
-    def _rollback_assignment(self, change: ScheduleChange) -> bool:
-        """Rollback a worker assignment"""
-        before_state = change.before_state
-        shift_date = datetime.fromisoformat(before_state['shift_date'])
-        post_index = before_state['post_index']
-        previous_worker = before_state.get('previous_worker')
-        worker_id = change.after_state['worker_id']
-        
-        # Remove current assignment
-        if shift_date in self.scheduler.schedule:
-            self.scheduler.schedule[shift_date][post_index] = previous_worker
-            
-            # Update tracking data
-            self.scheduler._update_tracking_data(worker_id, shift_date, post_index, removing=True)
-            if previous_worker:
-                self.scheduler._update_tracking_data(previous_worker, shift_date, post_index, removing=False)
-        
-        return True
-    
-    def _rollback_unassignment(self, change: ScheduleChange) -> bool:
-        """Rollback a worker unassignment"""
-        before_state = change.before_state
-        shift_date = datetime.fromisoformat(before_state['shift_date'])
-        post_index = before_state['post_index']
-        worker_id = before_state['worker_id']
-        
-        # Restore assignment
-        if shift_date not in self.scheduler.schedule:
-            self.scheduler.schedule[shift_date] = [None] * self.scheduler.num_shifts
-        
-        self.scheduler.schedule[shift_date][post_index] = worker_id
-        
-        # Update tracking data
-        self.scheduler._update_tracking_data(worker_id, shift_date, post_index, removing=False)
-        
-        return True
-    
-    def _rollback_swap(self, change: ScheduleChange) -> bool:
-        """Rollback a worker swap"""
-        before_state = change.before_state
-        shift1 = before_state['shift1']
-        shift2 = before_state['shift2']
-        
-        shift_date1 = datetime.fromisoformat(shift1['date'])
-        shift_date2 = datetime.fromisoformat(shift2['date'])
-        
-        # Restore original assignments
-        if shift_date1 not in self.scheduler.schedule:
-            self.scheduler.schedule[shift_date1] = [None] * self.scheduler.num_shifts
-        if shift_date2 not in self.scheduler.schedule:
-            self.scheduler.schedule[shift_date2] = [None] * self.scheduler.num_shifts
-        
-        self.scheduler.schedule[shift_date1][shift1['post']] = shift1['worker']
-        self.scheduler.schedule[shift_date2][shift2['post']] = shift2['worker']
-        
-        # Update tracking data
-        after_state = change.after_state
-        
-        # Remove current assignments and restore original ones
-        if shift1['worker']:
-            self.scheduler._update_tracking_data(shift1['worker'], shift_date2, shift2['post'], removing=True)
-            self.scheduler._update_tracking_data(shift1['worker'], shift_date1, shift1['post'], removing=False)
-        
-        if shift2['worker'] and shift2['worker'] != shift1['worker']:
-            self.scheduler._update_tracking_data(shift2['worker'], shift_date1, shift1['post'], removing=True)
-            self.scheduler._update_tracking_data(shift2['worker'], shift_date2, shift2['post'], removing=False)
-        
-        return True
-    
-    def _rollback_bulk_update(self, change: ScheduleChange) -> bool:
-        """Rollback a bulk update"""
-        # For bulk updates, we would need to rollback each individual operation
-        # This is complex and depends on the specific implementation
-        logging.warning("Bulk update rollback not fully implemented")
-        return False
-    
-    def _reapply_assignment(self, change: ScheduleChange) -> bool:
-        """Reapply a worker assignment"""
-        after_state = change.after_state
-        shift_date = datetime.fromisoformat(after_state['shift_date'])
-        post_index = after_state['post_index']
-        worker_id = after_state['worker_id']
-        
-        # Apply assignment
-        if shift_date not in self.scheduler.schedule:
-            self.scheduler.schedule[shift_date] = [None] * self.scheduler.num_shifts
-        
-        previous_worker = self.scheduler.schedule[shift_date][post_index]
-        self.scheduler.schedule[shift_date][post_index] = worker_id
-        
-        # Update tracking data
-        if previous_worker:
-            self.scheduler._update_tracking_data(previous_worker, shift_date, post_index, removing=True)
-        self.scheduler._update_tracking_data(worker_id, shift_date, post_index, removing=False)
+    @staticmethod
+    def _get_cells(change: ScheduleChange) -> List[List[Any]]:
+        """Get the cell diffs of a change, deriving them for changes recorded without cells"""
+        if change.cells:
+            return change.cells
+        before, after = change.before_state, change.after_state
+        if change.change_type == ChangeType.ASSIGNMENT:
+            return [[after['shift_date'], after['post_index'], before.get('previous_worker'), after['worker_id']]]
+        if change.change_type == ChangeType.UNASSIGNMENT:
+            return [[before['shift_date'], before['post_index'], before['worker_id'], None]]
+        if change.change_type == ChangeType.SWAP:
+            return [[before[key]['date'], before[key]['post'], before[key]['worker'], after[key]['worker']]
+                    for key in ('shift1', 'shift2')]
+        raise ValueError(f"No cell diffs recorded for {change.change_type.value} change {change.change_id}")
+    
+    def _apply_cells(self, cells: List[List[Any]], undo: bool, user_id: Optional[str] = None,
+                     change_id: Optional[str] = None) -> bool:
+        """
+        Apply cell diffs forwards (redo) or backwards (undo)
         
-        return True
-    
-    def _reapply_unassignment(self, change: ScheduleChange) -> bool:
-        """Reapply a worker unassignment"""
-        after_state = change.after_state
-        shift_date = datetime.fromisoformat(after_state['shift_date'])
-        post_index = after_state['post_index']
-        worker_id = change.before_state['worker_id']
+        The schedule is checked first: if a cell no longer holds the value the
+        change left there, nothing is applied. Tracking data is updated per
+        changed cell, so the cost is O(changed cells). The applied cells are
+        published as one BULK_UPDATE so that event-maintained state follows.
         
-        # Remove assignment
-        if shift_date in self.scheduler.schedule:
-            self.scheduler.schedule[shift_date][post_index] = None
+        Args:
+            cells: Cell diffs [shift date (ISO), post index, old worker, new worker]
+            undo: Restore old values (True) or new values (False)
+            user_id: User the published event is attributed to
+            change_id: ID of the change being undone or redone
             
-            # Update tracking data
-            self.scheduler._update_tracking_data(worker_id, shift_date, post_index, removing=True)
-        
+        Returns:
+            bool: True if the diffs were applied
+        """
+        steps = []
+        expected: Dict[tuple, Optional[str]] = {}
+        for shift_date, post_index, old, new in (reversed(cells) if undo else cells):
+            current_value, target = (new, old) if undo else (old, new)
+            date = datetime.fromisoformat(shift_date)
+            key = (date, post_index)
+            if key in expected:
+                actual = expected[key]
+            else:
+                row = self.scheduler.schedule.get(date)
+                actual = row[post_index] if row is not None and post_index < len(row) else None
+            if actual != current_value:
+                logging.warning(f"Cannot apply change: {shift_date} post {post_index} holds {actual}, "
+                                f"expected {current_value}")
+                return False
+            expected[key] = target
+            steps.append((date, post_index, current_value, target))
+        
+        for date, post_index, current_value, target in steps:
+            if date not in self.scheduler.schedule:
+                self.scheduler.schedule[date] = [None] * self.scheduler.num_shifts
+            self.scheduler.schedule[date][post_index] = target
+            if current_value:
+                self.scheduler._update_tracking_data(current_value, date, post_index, removing=True)
+            if target:
+                self.scheduler._update_tracking_data(target, date, post_index, removing=False)
+        if self.versions is not None:
+            self.versions.bump([(date, post_index) for date, post_index, _, _ in steps],
+                               [w for _, _, current_value, target in steps for w in (current_value, target)])
+        self._publish_cells(steps, 'undo' if undo else 'redo', user_id, change_id)
         return True
     
-    def _reapply_swap(self, change: ScheduleChange) -> bool:
-        """Reapply a worker swap"""
-        after_state = change.after_state
-        shift1 = after_state['shift1']
-        shift2 = after_state['shift2']
-        
-        shift_date1 = datetime.fromisoformat(shift1['date'])
-        shift_date2 = datetime.fromisoformat(shift2['date'])
-        
-        # Apply swap
-        if shift_date1 not in self.scheduler.schedule:
-            self.scheduler.schedule[shift_date1] = [None] * self.scheduler.num_shifts
-        if shift_date2 not in self.scheduler.schedule:
-            self.scheduler.schedule[shift_date2] = [None] * self.scheduler.num_shifts
-        
-        # Get original workers
-        before_state = change.before_state
-        original_worker1 = before_state['shift1']['worker']
-        original_worker2 = before_state['shift2']['worker']
-        
-        # Apply the swap
-        self.scheduler.schedule[shift_date1][shift1['post']] = original_worker2
-        self.scheduler.schedule[shift_date2][shift2['post']] = original_worker1
-        
-        # Update tracking data
-        if original_worker1:
-            self.scheduler._update_tracking_data(original_worker1, shift_date1, shift1['post'], removing=True)
-            self.scheduler._update_tracking_data(original_worker1, shift_date2, shift2['post'], removing=False)
-        
-        if original_worker2 and original_worker2 != original_worker1:
-            self.scheduler._update_tracking_data(original_worker2, shift_date2, shift2['post'], removing=True)
-            self.scheduler._update_tracking_data(original_worker2, shift_date1, shift1['post'], removing=False)
+    def _publish_cells(self, steps: List[tuple], operation: str, user_id: Optional[str],
+                       change_id: Optional[str]) -> None:
+        """
+        Publish cells rewritten by undo/redo as shift events in a BULK_UPDATE envelope
         
-        return True
-    
-    def _reapply_bulk_update(self, change: ScheduleChange) -> bool:
-        """Reapply a bulk update"""
-        logging.warning("Bulk update reapply not fully implemented")
-        return False
-    
-    def _on_shift_assigned(self, event):
+        Every event is flagged with the operation ('undo' or 'redo') so the
+        tracker does not record it as a new change.
+        """
+        events = []
+        for date, post_index, current_value, target in steps:
+            if target is None:
+                events.append(ScheduleEvent(EventType.SHIFT_UNASSIGNED, user_id=user_id, data={
+                    'worker_id': current_value, 'shift_date': date.isoformat(),
+                    'post_index': post_index, operation: True}))
+            else:
+                events.append(ScheduleEvent(EventType.SHIFT_ASSIGNED, user_id=user_id, data={
+                    'worker_id': target, 'shift_date': date.isoformat(), 'post_index': post_index,
+                    'previous_worker': current_value, operation: True}))
+        if events:
+            self.event_bus.publish(make_bulk_event(events, user_id, change_id=change_id, **{operation: True}))
+    
+    @staticmethod
+    def _is_undo_redo(event) -> bool:
+        """Whether an event was published by undo/redo rather than by an edit"""
+        return bool(event.data.get('undo') or event.data.get('redo'))
+    
+    def _on_shift_assigned(self, event, record: bool = True) -> ScheduleChange:
         """Handle shift assignment events"""
         change = ScheduleChange(
             change_id=f"assign_{event.event_id}",
@@ -523,11 +532,15 @@ class ChangeTracker:
                 'shift_date': event.data['shift_date'],
                 'post_index': event.data['post_index'],
                 'worker_id': event.data['worker_id']
-            }
+            },
+            cells=[[event.data['shift_date'], event.data['post_index'],
+                    event.data.get('previous_worker'), event.data['worker_id']]]
         )
-        self.record_change(change)
+        if record and not self._is_undo_redo(event):
+            self.record_change(change)
+        return change
     
-    def _on_shift_unassigned(self, event):
+    def _on_shift_unassigned(self, event, record: bool = True) -> ScheduleChange:
         """Handle shift unassignment events"""
         change = ScheduleChange(
             change_id=f"unassign_{event.event_id}",
@@ -543,11 +556,14 @@ class ChangeTracker:
                 'shift_date': event.data['shift_date'],
                 'post_index': event.data['post_index'],
                 'worker_id': None
-            }
+            },
+            cells=[[event.data['shift_date'], event.data['post_index'], event.data['worker_id'], None]]
         )
-        self.record_change(change)
+        if record and not self._is_undo_redo(event):
+            self.record_change(change)
+        return change
     
-    def _on_shift_swapped(self, event):
+    def _on_shift_swapped(self, event, record: bool = True) -> ScheduleChange:
         """Handle shift swap events"""
         change = ScheduleChange(
             change_id=f"swap_{event.event_id}",
@@ -577,30 +593,61 @@ class ChangeTracker:
                     'post': event.data['post_index2'],
                     'worker': event.data.get('worker1')
                 }
-            }
+            },
+            cells=[
+                [event.data['shift_date1'], event.data['post_index1'], event.data.get('worker1'), event.data.get('worker2')],
+                [event.data['shift_date2'], event.data['post_index2'], event.data.get('worker2'), event.data.get('worker1')]
+            ]
         )
-        self.record_change(change)
+        if record and not self._is_undo_redo(event):
+            self.record_change(change)
+        return change
     
     def _on_bulk_update(self, event):
         """Handle bulk update events"""
+        # A batched envelope becomes one change holding the cell diffs of all
+        # its inner changes, so the whole bulk edit is undone in one step.
+        builders = {
+            EventType.SHIFT_ASSIGNED: self._on_shift_assigned,
+            EventType.SHIFT_UNASSIGNED: self._on_shift_unassigned,
+            EventType.SHIFT_SWAPPED: self._on_shift_swapped,
+        }
+        cells = []
+        for inner_event in unpack_bulk_event(event):
+            builder = builders.get(inner_event.event_type)
+            # Undo/redo events may be batched with edits; only the edits are new changes
+            if builder and not self._is_undo_redo(inner_event):
+                cells.extend(builder(inner_event, record=False).cells)
+        
+        if not cells and 'total_operations' not in event.data:
+            return
+        
+        metadata = {k: v for k, v in event.data.items() if k != 'events'}
+        if 'total_operations' in event.data:
+            description = f"Bulk update: {event.data['successful_operations']}/{event.data['total_operations']} operations"
+        else:
+            description = f"Bulk update: {event.data.get('event_count', 0)} changes"
         change = ScheduleChange(
             change_id=f"bulk_{event.event_id}",
             change_type=ChangeType.BULK_UPDATE,
             user_id=event.user_id,
-            description=f"Bulk update: {event.data['successful_operations']}/{event.data['total_operations']} operations",
-            metadata=event.data,
-            can_rollback=False  # Bulk updates are complex to rollback
+            description=description,
+            metadata=metadata,
+            cells=cells,
+            can_rollback=bool(cells)
         )
         self.record_change(change)
     
     def _on_schedule_generated(self, event):
         """Handle schedule generation events"""
+        cells = event.data.get('changes', [])
         change = ScheduleChange(
             change_id=f"generate_{event.event_id}",
             change_type=ChangeType.SCHEDULE_GENERATION,
             user_id=event.user_id,
             description="Generated new schedule",
-            metadata=event.data,
-            can_rollback=False  # Schedule generation creates new state
+            metadata={k: v for k, v in event.data.items() if k != 'changes'},
+            cells=cells,
+            can_rollback=bool(cells)
         )
-        self.record_change(change)
\ No newline at end of file
+        self.record_change(change)
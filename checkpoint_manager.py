@@ -0,0 +1,180 @@
+"""
+Checkpoint Manager Module
+
+Periodically persists the best-so-far state of a schedule generation run
+so that a long optimization can be resumed after a crash or forced exit.
+"""
+
+import logging
+import os
+import pickle
+import random
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from exceptions import SchedulerError
+
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+class CheckpointManager:
+    """
+    Writes and reads atomic optimization checkpoints.
+
+    A checkpoint holds the best schedule found so far, the locked mandatory
+    assignments, the state of the global ``random`` generator and the position
+    (phase, loop, operation) the optimizer had reached.
+    """
+
+    def __init__(self, scheduler, checkpoint_path: str, interval_seconds: float = 5.0):
+        """
+        Initialize the checkpoint manager
+
+        Args:
+            scheduler: The main Scheduler instance
+            checkpoint_path: File the checkpoint is written to
+            interval_seconds: Minimum number of seconds between two writes
+        """
+        self.scheduler = scheduler
+        self.checkpoint_path = checkpoint_path
+        self.interval_seconds = max(0.0, float(interval_seconds))
+        self._last_write = 0.0
+        self.checkpoints_written = 0
+
+        logging.info(f"CheckpointManager initialized ({checkpoint_path}, every {self.interval_seconds:.1f}s)")
+
+    def maybe_checkpoint(self, phase: str, loop_index: int, operation_index: int = 0,
+                         max_loops: Optional[int] = None) -> bool:
+        """
+        Write a checkpoint if the configured interval has elapsed
+
+        Args:
+            phase: Name of the optimization phase currently running
+            loop_index: Index of the improvement loop being executed
+            operation_index: Index of the next operation inside the loop
+            max_loops: Loop budget of the run, restored on resume
+
+        Returns:
+            bool: True if a checkpoint was written
+        """
+        if time.monotonic() - self._last_write < self.interval_seconds:
+            return False
+        return self.write_checkpoint(phase, loop_index, operation_index, max_loops)
+
+    def write_checkpoint(self, phase: str, loop_index: int, operation_index: int = 0,
+                         max_loops: Optional[int] = None) -> bool:
+        """
+        Atomically write a checkpoint of the best-so-far state
+
+        Args:
+            phase: Name of the optimization phase currently running
+            loop_index: Index of the improvement loop being executed
+            operation_index: Index of the next operation inside the loop
+            max_loops: Loop budget of the run, restored on resume
+
+        Returns:
+            bool: True if the checkpoint was written
+        """
+        builder = getattr(self.scheduler, 'schedule_builder', None)
+        if builder is None:
+            return False
+
+        try:
+            # best_schedule_data is already a private copy owned by the builder,
+            # so it can be pickled directly without another deep copy.
+            best_data = builder.best_schedule_data
+            if not best_data or not best_data.get('schedule'):
+                best_data = {'schedule': self.scheduler.schedule, 'score': float('-inf')}
+
+            payload = {
+                'version': CHECKPOINT_FORMAT_VERSION,
+                'created_at': datetime.now(),
+                'fingerprint': self.get_fingerprint(self.scheduler),
+                'phase': phase,
+                'loop_index': loop_index,
+                'operation_index': operation_index,
+                'max_loops': max_loops,
+                'best_schedule_data': best_data,
+                'locked_mandatory': set(builder._locked_mandatory),
+                'rng_state': random.getstate(),
+            }
+
+            directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.checkpoint_', dir=directory)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.checkpoint_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            self._last_write = time.monotonic()
+            self.checkpoints_written += 1
+            logging.debug(f"Checkpoint written: phase={phase}, loop={loop_index}, op={operation_index}, "
+                          f"score={best_data.get('score', float('-inf')):.2f}")
+            return True
+
+        except Exception as e:
+            logging.error(f"Error writing checkpoint to {self.checkpoint_path}: {str(e)}", exc_info=True)
+            return False
+
+    def clear(self) -> None:
+        """Remove the checkpoint file once a run has completed"""
+        try:
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+                logging.info(f"Removed checkpoint {self.checkpoint_path}")
+        except OSError as e:
+            logging.warning(f"Could not remove checkpoint {self.checkpoint_path}: {str(e)}")
+
+    @staticmethod
+    def get_fingerprint(scheduler) -> Dict[str, Any]:
+        """
+        Build a fingerprint identifying the problem a checkpoint belongs to
+
+        Args:
+            scheduler: The main Scheduler instance
+
+        Returns:
+            dict: Period, shift count and worker ids of the scheduler
+        """
+        return {
+            'start_date': scheduler.start_date,
+            'end_date': scheduler.end_date,
+            'num_shifts': scheduler.num_shifts,
+            'worker_ids': sorted(str(w['id']) for w in scheduler.workers_data),
+        }
+
+    @staticmethod
+    def load(checkpoint_path: str) -> Dict[str, Any]:
+        """
+        Load a checkpoint from disk
+
+        Args:
+            checkpoint_path: Path of the checkpoint file
+
+        Returns:
+            dict: The checkpoint payload
+
+        Raises:
+            SchedulerError: If the file is missing or not a valid checkpoint
+        """
+        try:
+            with open(checkpoint_path, 'rb') as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            raise SchedulerError(f"Checkpoint not found: {checkpoint_path}")
+        except Exception as e:
+            raise SchedulerError(f"Failed to read checkpoint {checkpoint_path}: {str(e)}")
+
+        if not isinstance(payload, dict) or payload.get('version') != CHECKPOINT_FORMAT_VERSION:
+            raise SchedulerError(f"Unsupported checkpoint format in {checkpoint_path}")
+        return payload
@@ -7,10 +7,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set, Any
 import logging
 from dataclasses import dataclass, field
-from threading import Lock
+from threading import RLock
 import uuid
 
 from event_bus import get_event_bus, EventType
+from lock_manager import LockManager, ResourcePath, resource_path, path_resource_id, range_paths
 
 
 @dataclass
@@ -63,8 +64,7 @@ class CollaborationManager:
         self.session_to_user: Dict[str, str] = {}
         
         # Resource locking
-        self.resource_locks: Dict[str, ResourceLock] = {}
-        self._lock_mutex = Lock()
+        self._lock_mutex = RLock()
         
         # Conflict tracking
         self.pending_conflicts: Dict[str, Dict[str, Any]] = {}
@@ -72,6 +72,7 @@ class CollaborationManager:
         
         # Configuration
         self.lock_timeout = timedelta(minutes=5)  # Default lock timeout
+        self.lock_manager = LockManager(self.lock_timeout)
         self.session_timeout = timedelta(hours=8)  # Default session timeout
         
         # Setup event listeners
@@ -86,6 +87,7 @@ class CollaborationManager:
         self.event_bus.subscribe(EventType.SHIFT_ASSIGNED, self._on_schedule_change)
         self.event_bus.subscribe(EventType.SHIFT_UNASSIGNED, self._on_schedule_change)
         self.event_bus.subscribe(EventType.SHIFT_SWAPPED, self._on_schedule_change)
+        self.event_bus.subscribe(EventType.BULK_UPDATE, self._on_schedule_change)
     
     def start_user_session(self, user_id: str) -> str:
         """
@@ -161,6 +163,11 @@ class CollaborationManager:
         """
         Acquire a lock on a schedule resource
         
+        Resources are hierarchical ('schedule', 'month_YYYY-MM', 'date_<date>',
+        'shift_<date>_<post>'): a lock conflicts with other users' locks on
+        the resource itself, on the resources containing it and on the
+        resources it contains.
+        
         Args:
             user_id: ID of the user requesting the lock
             resource_id: ID of the resource to lock
@@ -169,6 +176,41 @@ class CollaborationManager:
         Returns:
             True if lock was acquired
         """
+        return self._acquire_locks(user_id, [resource_path(resource_id)], lock_type)
+    
+    def acquire_range_lock(self, user_id: str, start_date: datetime, end_date: datetime,
+                           lock_type: str = 'write') -> bool:
+        """
+        Lock every date in a range in one operation (e.g. before a bulk edit)
+        
+        Whole months are locked at month level and the remaining days at date
+        level; either all of them are acquired or none.
+        
+        Args:
+            user_id: ID of the user requesting the lock
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            lock_type: Type of lock ('read', 'write', 'exclusive')
+            
+        Returns:
+            True if the range was locked
+        """
+        return self._acquire_locks(user_id, range_paths(start_date, end_date), lock_type)
+    
+    def release_range_lock(self, user_id: str, start_date: datetime, end_date: datetime) -> bool:
+        """
+        Release a range lock taken with acquire_range_lock
+        
+        Returns:
+            True if any lock was released
+        """
+        with self._lock_mutex:
+            released = [self._release_resource_lock(path_resource_id(path), user_id)
+                        for path in range_paths(start_date, end_date)]
+            return any(released)
+    
+    def _acquire_locks(self, user_id: str, paths: List[ResourcePath], lock_type: str) -> bool:
+        """Acquire locks on several resources atomically"""
         with self._lock_mutex:
             # Check if user has an active session
             if user_id not in self.active_sessions:
@@ -176,48 +218,42 @@ class CollaborationManager:
                 return False
             
             session = self.active_sessions[user_id]
+            now = datetime.now()
+            self._expire_locks(now)
             
-            # Check if resource is already locked
-            if resource_id in self.resource_locks:
-                existing_lock = self.resource_locks[resource_id]
-                
-                # Check if lock has expired
-                if (existing_lock.expires_at and 
-                    datetime.now() > existing_lock.expires_at):
-                    self._release_resource_lock(resource_id)
-                else:
-                    # Check if same user
-                    if existing_lock.user_id == user_id:
-                        # User already has the lock
-                        return True
-                    
-                    # Check lock compatibility
-                    if not self._are_locks_compatible(existing_lock.lock_type, lock_type):
-                        logging.info(f"Lock conflict: {resource_id} locked by {existing_lock.user_id}")
-                        return False
-            
-            # Acquire the lock
-            lock = ResourceLock(
-                resource_id=resource_id,
-                user_id=user_id,
-                session_id=session.session_id,
-                locked_at=datetime.now(),
-                lock_type=lock_type,
-                expires_at=datetime.now() + self.lock_timeout
-            )
+            held = [self.lock_manager.get_lock(path, user_id) for path in paths]
+            if all(lock is not None and (lock.lock_type == lock_type or lock.lock_type != 'read')
+                   for lock in held):
+                # User already has the locks
+                return True
             
-            self.resource_locks[resource_id] = lock
-            session.locked_resources.add(resource_id)
+            def make_lock(resource_id, expires_at):
+                return ResourceLock(
+                    resource_id=resource_id,
+                    user_id=user_id,
+                    session_id=session.session_id,
+                    locked_at=now,
+                    lock_type=lock_type,
+                    expires_at=expires_at
+                )
             
-            # Emit lock event
-            self.event_bus.emit(
-                EventType.SCHEDULE_LOCKED,
-                user_id=user_id,
-                resource_id=resource_id,
-                lock_type=lock_type
-            )
+            granted, blocking = self.lock_manager.acquire(user_id, paths, lock_type, make_lock, now)
+            if blocking:
+                logging.info(f"Lock conflict: {blocking[0].resource_id} locked by {blocking[0].user_id}")
+                return False
             
-            logging.debug(f"User {user_id} acquired {lock_type} lock on {resource_id}")
+            for lock in granted:
+                session.locked_resources.add(lock.resource_id)
+                
+                # Emit lock event
+                self.event_bus.emit(
+                    EventType.SCHEDULE_LOCKED,
+                    user_id=user_id,
+                    resource_id=lock.resource_id,
+                    lock_type=lock.lock_type
+                )
+                
+                logging.debug(f"User {user_id} acquired {lock.lock_type} lock on {lock.resource_id}")
             return True
     
     def release_resource_lock(self, user_id: str, resource_id: str) -> bool:
@@ -232,43 +268,49 @@ class CollaborationManager:
             True if lock was released
         """
         with self._lock_mutex:
-            if resource_id not in self.resource_locks:
+            path = resource_path(resource_id)
+            if self.lock_manager.get_lock(path) is None:
                 return False
             
-            lock = self.resource_locks[resource_id]
-            
             # Check if user owns the lock
-            if lock.user_id != user_id:
-                logging.warning(f"User {user_id} tried to release lock owned by {lock.user_id}")
+            if self.lock_manager.get_lock(path, user_id) is None:
+                owner = self.lock_manager.get_lock(path).user_id
+                logging.warning(f"User {user_id} tried to release lock owned by {owner}")
                 return False
             
-            return self._release_resource_lock(resource_id)
+            return self._release_resource_lock(resource_id, user_id)
     
-    def _release_resource_lock(self, resource_id: str) -> bool:
+    def _release_resource_lock(self, resource_id: str, user_id: str) -> bool:
         """Internal method to release a resource lock"""
-        if resource_id not in self.resource_locks:
+        lock = self.lock_manager.release(user_id, resource_path(resource_id))
+        if lock is None:
             return False
         
-        lock = self.resource_locks[resource_id]
-        
+        self._on_lock_released(lock)
+        return True
+    
+    def _on_lock_released(self, lock: ResourceLock):
+        """Update the owner's session and announce a released lock"""
         # Remove from user's locked resources
         if lock.user_id in self.active_sessions:
             session = self.active_sessions[lock.user_id]
-            session.locked_resources.discard(resource_id)
-        
-        # Remove the lock
-        del self.resource_locks[resource_id]
+            session.locked_resources.discard(lock.resource_id)
         
         # Emit unlock event
         self.event_bus.emit(
             EventType.SCHEDULE_UNLOCKED,
             user_id=lock.user_id,
-            resource_id=resource_id,
+            resource_id=lock.resource_id,
             lock_type=lock.lock_type
         )
         
-        logging.debug(f"Released lock on {resource_id}")
-        return True
+        logging.debug(f"Released lock on {lock.resource_id}")
+    
+    def _expire_locks(self, now: Optional[datetime] = None):
+        """Release the locks whose expiry time has passed"""
+        for lock in self.lock_manager.expire(now):
+            logging.info(f"Lock expired for resource {lock.resource_id}")
+            self._on_lock_released(lock)
     
     def _release_user_locks(self, user_id: str):
         """Release all locks held by a user"""
@@ -278,24 +320,15 @@ class CollaborationManager:
         session = self.active_sessions[user_id]
         locked_resources = session.locked_resources.copy()
         
-        for resource_id in locked_resources:
-            self._release_resource_lock(resource_id)
+        with self._lock_mutex:
+            for resource_id in locked_resources:
+                self._release_resource_lock(resource_id, user_id)
     
-    def _are_locks_compatible(self, existing_lock_type: str, requested_lock_type: str) -> bool:
-        """Check if two lock types are compatible"""
-        # Read locks are compatible with other read locks
-        if existing_lock_type == 'read' and requested_lock_type == 'read':
-            return True
-        
-        # Exclusive locks are never compatible
-        if existing_lock_type == 'exclusive' or requested_lock_type == 'exclusive':
-            return False
-        
-        # Write locks are not compatible with anything
-        if existing_lock_type == 'write' or requested_lock_type == 'write':
-            return False
-        
-        return False
+    @property
+    def resource_locks(self) -> Dict[str, ResourceLock]:
+        """Current explicit locks by resource ID (one holder per resource)"""
+        with self._lock_mutex:
+            return {lock.resource_id: lock for lock in self.lock_manager.iter_locks()}
     
     def get_resource_lock_info(self, resource_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -307,10 +340,11 @@ class CollaborationManager:
         Returns:
             Lock information or None if not locked
         """
-        if resource_id not in self.resource_locks:
+        with self._lock_mutex:
+            lock = self.lock_manager.get_lock(resource_path(resource_id))
+        if lock is None:
             return None
         
-        lock = self.resource_locks[resource_id]
         return {
             'resource_id': lock.resource_id,
             'user_id': lock.user_id,
@@ -324,6 +358,10 @@ class CollaborationManager:
         """
         Detect if an operation would conflict with other users' activities
         
+        A shift conflicts with other users' locks on the shift, its date,
+        month or the whole schedule. A 'bulk_update' with 'start_date' and
+        'end_date' conflicts with any lock inside or around that range.
+        
         Args:
             user_id: ID of user performing the operation
             operation_type: Type of operation
@@ -332,19 +370,23 @@ class CollaborationManager:
         Returns:
             Conflict information or None if no conflict
         """
-        resource_ids = self._get_operation_resource_ids(operation_type, operation_data)
-        
-        conflicts = []
-        for resource_id in resource_ids:
-            if resource_id in self.resource_locks:
-                lock = self.resource_locks[resource_id]
-                if lock.user_id != user_id:
-                    conflicts.append({
-                        'resource_id': resource_id,
-                        'locked_by': lock.user_id,
-                        'lock_type': lock.lock_type,
-                        'locked_at': lock.locked_at.isoformat()
-                    })
+        with self._lock_mutex:
+            self._expire_locks()
+            blocking = {}
+            if operation_type == 'bulk_update' and operation_data.get('start_date') and operation_data.get('end_date'):
+                for lock in self.lock_manager.conflicts_in_range(
+                        user_id, operation_data['start_date'], operation_data['end_date']):
+                    blocking[id(lock)] = lock
+            for resource_id in self._get_operation_resource_ids(operation_type, operation_data):
+                for lock in self.lock_manager.conflicts(user_id, resource_path(resource_id)):
+                    blocking[id(lock)] = lock
+        
+        conflicts = [{
+            'resource_id': lock.resource_id,
+            'locked_by': lock.user_id,
+            'lock_type': lock.lock_type,
+            'locked_at': lock.locked_at.isoformat()
+        } for lock in blocking.values()]
         
         if conflicts:
             return {
@@ -428,16 +470,9 @@ class CollaborationManager:
             logging.info(f"Session expired for user {user_id}")
             self.end_user_session(user_id)
         
-        # Clean up expired locks
+        # Clean up expired locks (popped from the expiry heap, no full scan)
         with self._lock_mutex:
-            expired_locks = []
-            for resource_id, lock in self.resource_locks.items():
-                if lock.expires_at and current_time > lock.expires_at:
-                    expired_locks.append(resource_id)
-            
-            for resource_id in expired_locks:
-                logging.info(f"Lock expired for resource {resource_id}")
-                self._release_resource_lock(resource_id)
+            self._expire_locks(current_time)
     
     def get_collaboration_stats(self) -> Dict[str, Any]:
         """Get collaboration statistics"""
@@ -451,10 +486,11 @@ class CollaborationManager:
         )
         
         # Lock stats
-        active_lock_count = len(self.resource_locks)
-        lock_types = {}
-        for lock in self.resource_locks.values():
-            lock_types[lock.lock_type] = lock_types.get(lock.lock_type, 0) + 1
+        with self._lock_mutex:
+            active_lock_count = len(self.lock_manager)
+            lock_types = {}
+            for lock in self.lock_manager.iter_locks():
+                lock_types[lock.lock_type] = lock_types.get(lock.lock_type, 0) + 1
         
         return {
             'active_sessions': active_session_count,
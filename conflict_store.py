@@ -0,0 +1,201 @@
+"""
+Date-indexed store of detected schedule conflicts.
+Keeps conflicts in per-day buckets with a reverse index by worker so that
+range queries (e.g. the visible month) cost in proportion to the conflicts
+they return, and recomputes only the dates and workers changed by events.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from contextlib import nullcontext
+from datetime import datetime
+from threading import RLock
+from typing import Dict, List, Optional, Set, Tuple, Any, Callable, Iterable, Hashable
+import logging
+
+
+class ConflictStore:
+    """
+    Conflicts bucketed by date, indexed by worker
+
+    Every conflict is produced by an owner: a date (conflicts within one
+    day, e.g. incompatible workers) or a worker (conflicts across the
+    worker's assignments, e.g. gaps). When an owner is marked changed its
+    conflicts are recomputed on the next query and replace the old ones.
+    """
+
+    def __init__(self, scheduler,
+                 detect_date: Callable[[datetime], List[Any]],
+                 detect_worker: Callable[[str], List[Any]],
+                 locks=None):
+        """
+        Initialize the store
+
+        Args:
+            scheduler: The main Scheduler instance
+            detect_date: Returns the conflicts within one date
+            detect_worker: Returns the conflicts across one worker's assignments
+            locks: ScheduleLocks holding edits off while conflicts are
+                recomputed from the live schedule (optional)
+        """
+        self.scheduler = scheduler
+        self.locks = locks
+        self._detect_date = detect_date
+        self._detect_worker = detect_worker
+
+        self._lock = RLock()
+        self._conflicts: Dict[Hashable, Any] = {}
+        self._by_date: Dict[datetime, Set[Hashable]] = {}
+        self._dates: List[datetime] = []  # Sorted dates with a non-empty bucket
+        self._by_worker: Dict[str, Set[Hashable]] = {}
+        self._owned: Dict[Tuple[str, Any], Set[Hashable]] = {}
+
+        self._built = False
+        self._dirty_dates: Set[datetime] = set()
+        self._dirty_workers: Set[str] = set()
+
+    @staticmethod
+    def _key(conflict) -> Hashable:
+        return (conflict.conflict_type, tuple(conflict.workers_involved), tuple(conflict.dates_involved))
+
+    def clear(self):
+        """Drop every conflict; the next query rebuilds the store"""
+        with self._lock:
+            self._conflicts.clear()
+            self._by_date.clear()
+            self._dates.clear()
+            self._by_worker.clear()
+            self._owned.clear()
+            self._dirty_dates.clear()
+            self._dirty_workers.clear()
+            self._built = False
+
+    def mark_changed(self, dates: Iterable[datetime], workers: Iterable[str]):
+        """
+        Mark dates and workers whose conflicts must be recomputed
+
+        Args:
+            dates: Dates whose assignments changed
+            workers: Workers whose assignments changed
+        """
+        with self._lock:
+            if self._built:
+                self._dirty_dates.update(dates)
+                self._dirty_workers.update(workers)
+
+    def _remove(self, key: Hashable):
+        conflict = self._conflicts.pop(key, None)
+        if conflict is None:
+            return
+        for shift_date in set(conflict.dates_involved):
+            bucket = self._by_date.get(shift_date)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._by_date[shift_date]
+                    del self._dates[bisect_left(self._dates, shift_date)]
+        for worker_id in conflict.workers_involved:
+            keys = self._by_worker.get(worker_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_worker[worker_id]
+
+    def _add(self, key: Hashable, conflict):
+        self._conflicts[key] = conflict
+        for shift_date in set(conflict.dates_involved):
+            bucket = self._by_date.get(shift_date)
+            if bucket is None:
+                bucket = self._by_date[shift_date] = set()
+                insort(self._dates, shift_date)
+            bucket.add(key)
+        for worker_id in conflict.workers_involved:
+            self._by_worker.setdefault(worker_id, set()).add(key)
+
+    def _replace(self, owner: Tuple[str, Any], conflicts: List[Any]):
+        """Replace the conflicts produced by an owner"""
+        for key in self._owned.pop(owner, ()):
+            self._remove(key)
+        keys = set()
+        for conflict in conflicts:
+            key = self._key(conflict)
+            if key in self._conflicts:
+                continue  # Already reported by another owner
+            self._add(key, conflict)
+            keys.add(key)
+        if keys:
+            self._owned[owner] = keys
+
+    def _reading(self):
+        """Locks to hold (before the store's own) while reading the live schedule"""
+        return self.locks.reading() if self.locks is not None else nullcontext()
+
+    def _refresh(self):
+        """
+        Recompute conflicts of changed dates and workers (everything on first use)
+
+        The caller holds _reading() and the store lock. Dates and workers stay
+        marked until their conflicts are recomputed, so a failed refresh is
+        retried by the next query.
+        """
+        if not self._built:
+            dates = set(self.scheduler.schedule)
+            workers = {w for w, assignments in self.scheduler.worker_assignments.items() if assignments}
+        elif self._dirty_dates or self._dirty_workers:
+            dates, workers = set(self._dirty_dates), set(self._dirty_workers)
+        else:
+            return
+
+        for shift_date in dates:
+            self._replace(('date', shift_date), self._detect_date(shift_date))
+        for worker_id in workers:
+            self._replace(('worker', worker_id), self._detect_worker(worker_id))
+        self._built = True
+        self._dirty_dates -= dates
+        self._dirty_workers -= workers
+        logging.debug(f"Conflict store refreshed {len(dates)} dates and {len(workers)} workers")
+
+    def query(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Any]:
+        """
+        Get conflicts involving any date in a range
+
+        Args:
+            start_date: First date (inclusive), None for unbounded
+            end_date: Last date (inclusive), None for unbounded
+
+        Returns:
+            Conflicts ordered by their first date in the range
+        """
+        with self._reading(), self._lock:
+            self._refresh()
+            lo = 0 if start_date is None else bisect_left(self._dates, start_date)
+            hi = len(self._dates) if end_date is None else bisect_right(self._dates, end_date)
+
+            seen: Set[Hashable] = set()
+            result = []
+            for shift_date in self._dates[lo:hi]:
+                for key in sorted(self._by_date[shift_date], key=str):
+                    if key not in seen:
+                        seen.add(key)
+                        result.append(self._conflicts[key])
+            return result
+
+    def for_worker(self, worker_id: str) -> List[Any]:
+        """
+        Get conflicts involving a worker
+
+        Args:
+            worker_id: ID of the worker
+
+        Returns:
+            The worker's conflicts ordered by date
+        """
+        with self._reading(), self._lock:
+            self._refresh()
+            keys = sorted(self._by_worker.get(worker_id, ()),
+                          key=lambda key: (min(key[2]) if key[2] else datetime.min, str(key)))
+            return [self._conflicts[key] for key in keys]
+
+    def __len__(self) -> int:
+        with self._reading(), self._lock:
+            self._refresh()
+            return len(self._conflicts)
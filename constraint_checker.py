@@ -142,8 +142,19 @@ class ConstraintChecker:
         logging.debug("ConstraintChecker caches cleared and rebuilt")
 
 
-    def _check_gap_constraint(self, worker_id, date): # Removed min_gap parameter
-        """Check minimum gap between assignments, Friday-Monday, and 7/14 day patterns."""
+    def _get_prior_assignments(self, worker_id) -> Set[datetime]:
+        """Get the worker's assignments in the tail of the previous period (warm start)"""
+        return getattr(self.scheduler, 'prior_assignments', {}).get(worker_id, set())
+
+    def _check_gap_constraint(self, worker_id, date, assignments=None): # Removed min_gap parameter
+        """
+        Check minimum gap between assignments, Friday-Monday, and 7/14 day patterns.
+
+        Args:
+            worker_id: Worker to check
+            date: Date being assigned
+            assignments: Worker's assignments to check against (default: live worker_assignments)
+        """
         worker = next((w for w in self.workers_data if w['id'] == worker_id), None)
         if not worker: return False # Should not happen
         work_percentage = worker.get('work_percentage', 100)
@@ -158,7 +169,10 @@ class ConstraintChecker:
         if work_percentage < 70: # Using a common threshold from ScheduleBuilder
             min_required_days_between = max(min_required_days_between, self.scheduler.gap_between_shifts + 2) # e.g. at least +1 more day
 
-        assignments = sorted(list(self.scheduler.worker_assignments.get(worker_id, []))) # Use scheduler's live assignments
+        if assignments is None:
+            assignments = self.scheduler.worker_assignments.get(worker_id, set())
+        assignments = sorted(set(assignments) |
+                             self._get_prior_assignments(worker_id)) # Live assignments plus prior period tail
 
         for prev_date in assignments:
             if prev_date == date: continue # Should not happen if checking before assignment
@@ -191,11 +205,13 @@ class ConstraintChecker:
         
         return True
     
-    def _would_exceed_weekend_limit(self, worker_id, date):
+    def _would_exceed_weekend_limit(self, worker_id, date, assignments=None):
         """
         Enhanced check if assigning this date would exceed weekend/holiday constraints:
         1. Max consecutive weekend/holiday constraint (adjusted for part-time)
         2. Proportional weekend count with +/- 1 tolerance based on work percentage and time worked
+
+        assignments overrides the worker's live worker_assignments (e.g. staged changes).
         """ 
         try:
             # Check if the date is a weekend or holiday
@@ -234,7 +250,9 @@ class ConstraintChecker:
                 adjusted_max_consecutive = base_max_consecutive
     
             # Get all weekend/holiday assignments including the prospective date
-            current_assignments = self.scheduler.worker_assignments.get(worker_id, set())
+            if assignments is None:
+                assignments = self.scheduler.worker_assignments.get(worker_id, set())
+            current_assignments = assignments
             weekend_dates = []
             for d in current_assignments:
                 if (d.weekday() >= 4 or 
@@ -248,12 +266,16 @@ class ConstraintChecker:
     
             weekend_dates.sort()
     
+            # Weekend runs continue across the boundary with the previous period
+            run_dates = sorted(weekend_dates + [d for d in self._get_prior_assignments(worker_id)
+                                                if self.is_weekend_day(d)])
+    
             # Check consecutive weekend/holiday constraint
-            if weekend_dates:
+            if run_dates:
                 consecutive_groups = []
                 current_group = []
         
-                for i, weekend_date in enumerate(weekend_dates):
+                for i, weekend_date in enumerate(run_dates):
                     if not current_group:
                         current_group = [weekend_date]
                     else:
@@ -332,26 +354,35 @@ class ConstraintChecker:
             logging.error(f"Error checking weekend limit for worker {worker_id}: {e}")
             return True  # Conservative: reject on error
             
+    def _is_worker_off(self, worker_id, date):
+        """
+        Check if a date falls in the worker's days off or outside their work periods
+        """
+        worker = next(w for w in self.workers_data if w['id'] == worker_id)
+
+        # Check days off
+        if worker.get('days_off'):
+            off_periods = self.date_utils.parse_date_ranges(worker['days_off'])
+            if any(start <= date <= end for start, end in off_periods):
+                logging.debug(f"Worker {worker_id} is off on {date}")
+                return True
+
+        # Check work periods
+        if worker.get('work_periods'):
+            work_periods = self.date_utils.parse_date_ranges(worker['work_periods'])
+            if not any(start <= date <= end for start, end in work_periods):
+                logging.debug(f"Worker {worker_id} is not in work period on {date}")
+                return True
+
+        return False
+
     def _is_worker_unavailable(self, worker_id, date):
         """
         Check if worker is unavailable on a specific date
         """
         try:
-            worker = next(w for w in self.workers_data if w['id'] == worker_id)
-        
-            # Check days off
-            if worker.get('days_off'):
-                off_periods = self.date_utils.parse_date_ranges(worker['days_off'])
-                if any(start <= date <= end for start, end in off_periods):
-                    logging.debug(f"Worker {worker_id} is off on {date}")
-                    return True
-
-            # Check work periods
-            if worker.get('work_periods'):
-                work_periods = self.date_utils.parse_date_ranges(worker['work_periods'])
-                if not any(start <= date <= end for start, end in work_periods):
-                    logging.debug(f"Worker {worker_id} is not in work period on {date}")
-                    return True
+            if self._is_worker_off(worker_id, date):
+                return True
 
             # Check if worker is already assigned for this date
             if date in self.worker_assignments.get(worker_id, []):
@@ -413,14 +444,17 @@ class ConstraintChecker:
             logging.error(f"Error in _can_assign_worker for worker {worker_id}: {str(e)}", exc_info=True)
             return False
               
-    def _check_constraints(self, worker_id, date, skip_constraints=False, try_part_time=False): # try_part_time seems unused
+    def _check_constraints(self, worker_id, date, skip_constraints=False, try_part_time=False, # try_part_time seems unused
+                           check_sync=True):
         """
         Unified constraint checking with data synchronization validation.
+        Callers holding only some of the schedule locks pass check_sync=False:
+        the synchronization check reads (and may repair) the whole schedule.
         Returns: (bool, str) - (passed, reason_if_failed)
         """
         try:
             # ENHANCED: Ensure data synchronization before constraint checking
-            if hasattr(self.scheduler, '_ensure_data_synchronization'):
+            if check_sync and hasattr(self.scheduler, '_ensure_data_synchronization'):
                 if not self.scheduler._ensure_data_synchronization():
                     logging.warning(f"Data synchronization issues detected before constraint check for worker {worker_id} on {date.strftime('%Y-%m-%d')}")
             
@@ -177,7 +177,7 @@ class DataManager:
         Returns:
             bool: True if the date is a holiday, False otherwise
         """
-        return self.scheduler.date_utils.is_holiday(date, self.scheduler.holidays)
+        return date in self.scheduler.holidays
 
     def _is_pre_holiday(self, date):
         """
@@ -189,7 +189,7 @@ class DataManager:
         Returns:
             bool: True if the next day is a holiday, False otherwise
         """
-        return self.scheduler.date_utils.is_pre_holiday(date, self.scheduler.holidays)
+        return date + timedelta(days=1) in self.scheduler.holidays
 
     def _is_authorized_incompatibility(self, date, worker1_id, worker2_id):
         """
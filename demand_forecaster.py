@@ -10,21 +10,58 @@ import warnings
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any, Union
 import json
-import numpy as np
 
-# ML Dependencies with graceful fallback
-try:
-    import pandas as pd
-    from sklearn.ensemble import RandomForestRegressor
-    from sklearn.metrics import mean_absolute_error, mean_squared_error
-    from sklearn.model_selection import train_test_split
-    import statsmodels.api as sm
-    from statsmodels.tsa.arima.model import ARIMA
-    from statsmodels.tsa.seasonal import seasonal_decompose
-    ML_AVAILABLE = True
-except ImportError as e:
-    ML_AVAILABLE = False
-    logging.warning(f"ML libraries not available: {e}. Falling back to basic forecasting.")
+# Heavy numeric/ML dependencies are imported on first use (see _load_ml_libraries)
+# so that importing this module, and constructing a Scheduler, stays cheap.
+np = None
+pd = None
+RandomForestRegressor = None
+mean_absolute_error = None
+mean_squared_error = None
+train_test_split = None
+sm = None
+ARIMA = None
+seasonal_decompose = None
+ML_AVAILABLE = None  # Unknown until the libraries are first needed
+
+
+def _load_ml_libraries() -> bool:
+    """
+    Import numpy and the optional ML libraries on first use.
+    
+    Returns:
+        bool: True if pandas, scikit-learn and statsmodels are available
+    """
+    global np, pd, RandomForestRegressor, mean_absolute_error, mean_squared_error
+    global train_test_split, sm, ARIMA, seasonal_decompose, ML_AVAILABLE
+    
+    if ML_AVAILABLE is not None:
+        return ML_AVAILABLE
+    
+    import numpy
+    np = numpy
+    
+    # ML Dependencies with graceful fallback
+    try:
+        import pandas
+        from sklearn.ensemble import RandomForestRegressor as _RandomForestRegressor
+        from sklearn.metrics import mean_absolute_error as _mae, mean_squared_error as _mse
+        from sklearn.model_selection import train_test_split as _train_test_split
+        import statsmodels.api as _sm
+        from statsmodels.tsa.arima.model import ARIMA as _ARIMA
+        from statsmodels.tsa.seasonal import seasonal_decompose as _seasonal_decompose
+        
+        pd = pandas
+        RandomForestRegressor = _RandomForestRegressor
+        mean_absolute_error, mean_squared_error = _mae, _mse
+        train_test_split = _train_test_split
+        sm, ARIMA, seasonal_decompose = _sm, _ARIMA, _seasonal_decompose
+        ML_AVAILABLE = True
+    except ImportError as e:
+        ML_AVAILABLE = False
+        logging.warning(f"ML libraries not available: {e}. Falling back to basic forecasting.")
+    
+    return ML_AVAILABLE
 
 from exceptions import SchedulerError
 
@@ -60,9 +97,6 @@ class DemandForecaster:
         }
         
         logging.info("DemandForecaster initialized")
-        
-        if not ML_AVAILABLE:
-            logging.warning("Running in fallback mode without ML libraries")
     
     def generate_forecasts(self, forecast_days: int = 30) -> Dict[str, Any]:
         """
@@ -75,6 +109,9 @@ class DemandForecaster:
             Dictionary containing forecasting results and predictions
         """
         try:
+            if not _load_ml_libraries():
+                logging.warning("Running in fallback mode without ML libraries")
+            
             if not self.historical_data_manager:
                 return self._generate_basic_forecasts(forecast_days)
             
@@ -208,7 +245,7 @@ class DemandForecaster:
             logging.error(f"Error in time series forecasting: {e}")
             return None
     
-    def _fit_arima_model(self, time_series: pd.Series, metric_name: str):
+    def _fit_arima_model(self, time_series: 'pd.Series', metric_name: str):
         """Fit ARIMA model to time series data"""
         try:
             # Handle missing values
@@ -555,7 +592,7 @@ class DemandForecaster:
             logging.error(f"Error in trend analysis: {e}")
             return {}
     
-    def _calculate_trend(self, values: np.ndarray) -> Dict[str, Any]:
+    def _calculate_trend(self, values: 'np.ndarray') -> Dict[str, Any]:
         """Calculate trend direction and strength"""
         if len(values) < 2:
             return {'direction': 'unknown', 'strength': 0, 'slope': 0}
@@ -767,7 +804,7 @@ class DemandForecaster:
             Dictionary with accuracy metrics
         """
         try:
-            if not ML_AVAILABLE:
+            if not _load_ml_libraries():
                 return {'error': 'ML libraries required for accuracy validation'}
             
             accuracy_metrics = {}
@@ -4,13 +4,19 @@ Provides centralized event handling for all schedule changes.
 """
 
 from datetime import datetime
-from typing import Dict, List, Callable, Any, Optional
+from typing import Dict, List, Callable, Any, Optional, Tuple
 from enum import Enum
 import logging
-from threading import Lock
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock, Condition, Timer, local
 from dataclasses import dataclass, field
 import json
 
+from latency_metrics import current_stage
+
 
 class EventType(Enum):
     """Define different types of schedule events"""
@@ -38,6 +44,7 @@ class ScheduleEvent:
     user_id: Optional[str] = None
     data: Dict[str, Any] = field(default_factory=dict)
     event_id: str = field(default_factory=lambda: str(datetime.now().timestamp()))
+    seq: Optional[int] = None  # Assigned by the EventBus on publish
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary for serialization"""
@@ -46,7 +53,8 @@ class ScheduleEvent:
             'timestamp': self.timestamp.isoformat(),
             'user_id': self.user_id,
             'data': self.data,
-            'event_id': self.event_id
+            'event_id': self.event_id,
+            'seq': self.seq
         }
     
     @classmethod
@@ -57,41 +65,333 @@ class ScheduleEvent:
             timestamp=datetime.fromisoformat(data['timestamp']),
             user_id=data.get('user_id'),
             data=data.get('data', {}),
-            event_id=data['event_id']
+            event_id=data['event_id'],
+            seq=data.get('seq')
         )
 
 
+# Event types collected into a BULK_UPDATE envelope inside EventBus.batch()
+BATCHED_EVENT_TYPES = frozenset({
+    EventType.SHIFT_ASSIGNED,
+    EventType.SHIFT_UNASSIGNED,
+    EventType.SHIFT_SWAPPED,
+    EventType.BULK_UPDATE,
+})
+
+
+def make_bulk_event(events: List[ScheduleEvent], user_id: Optional[str] = None, **data) -> ScheduleEvent:
+    """
+    Build a BULK_UPDATE envelope carrying several events
+    
+    Nested envelopes are flattened, so the envelope always lists the
+    individual changes in the order they happened.
+    
+    Args:
+        events: Events to wrap, in delivery order
+        user_id: User the envelope is attributed to
+        **data: Extra envelope data (e.g. bulk operation totals)
+        
+    Returns:
+        ScheduleEvent: The BULK_UPDATE envelope
+    """
+    inner = []
+    for event in events:
+        if event.event_type == EventType.BULK_UPDATE:
+            # Inner events of a published envelope are identified by its seq
+            inner.extend(e if e.get('seq') is not None else dict(e, seq=event.seq)
+                         for e in event.data.get('events', []))
+            data.update({k: v for k, v in event.data.items() if k not in ('events', 'event_count', 'coalesced')})
+        else:
+            inner.append(event.to_dict())
+    
+    data.update(events=inner, event_count=len(inner), coalesced=True)
+    return ScheduleEvent(event_type=EventType.BULK_UPDATE, user_id=user_id, data=data)
+
+
+def unpack_bulk_event(event: ScheduleEvent) -> List[ScheduleEvent]:
+    """
+    Get the individual events carried by a BULK_UPDATE envelope
+    
+    Args:
+        event: A BULK_UPDATE event
+        
+    Returns:
+        List of inner events (empty for a plain bulk summary event)
+    """
+    return [ScheduleEvent.from_dict(e) for e in event.data.get('events', [])]
+
+
+# A cell change: (date, post index, old worker, new worker)
+CellChange = Tuple[datetime, int, Optional[str], Optional[str]]
+
+
+def schedule_cell_changes(event: ScheduleEvent) -> List[CellChange]:
+    """
+    Get the cell changes carried by a schedule event
+    
+    Args:
+        event: A SHIFT_ASSIGNED, SHIFT_UNASSIGNED, SHIFT_SWAPPED or BULK_UPDATE event
+        
+    Returns:
+        (date, post index, old worker, new worker) per changed cell, in order
+        
+    Raises:
+        ValueError: If the event type carries no cell changes
+        KeyError: If the event data is incomplete
+    """
+    data = event.data
+    if event.event_type == EventType.SHIFT_ASSIGNED:
+        return [(datetime.fromisoformat(data['shift_date']), data['post_index'],
+                 data.get('previous_worker'), data['worker_id'])]
+    if event.event_type == EventType.SHIFT_UNASSIGNED:
+        return [(datetime.fromisoformat(data['shift_date']), data['post_index'], data['worker_id'], None)]
+    if event.event_type == EventType.SHIFT_SWAPPED:
+        worker1, worker2 = data.get('worker1'), data.get('worker2')
+        return [(datetime.fromisoformat(data['shift_date1']), data['post_index1'], worker1, worker2),
+                (datetime.fromisoformat(data['shift_date2']), data['post_index2'], worker2, worker1)]
+    if event.event_type == EventType.BULK_UPDATE:
+        # Coalesced envelopes may also carry events that change no cells
+        # (e.g. CONSTRAINT_VIOLATION); those are skipped
+        return [cell for inner_event in unpack_bulk_event(event)
+                if inner_event.event_type in BATCHED_EVENT_TYPES
+                for cell in schedule_cell_changes(inner_event)]
+    raise ValueError(f"no cell changes in {event.event_type.value}")
+
+
+class DeliveryMode(Enum):
+    """How an event is delivered to a subscriber"""
+    SYNC = "sync"    # Called on the publishing thread before publish() returns
+    ASYNC = "async"  # Queued and called from the dispatch worker pool
+
+
+class OverflowPolicy(Enum):
+    """What to do when an asynchronous subscriber's queue is full"""
+    BLOCK = "block"              # Publisher waits for room (up to block_timeout), then drops the event
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued event
+    DROP_NEWEST = "drop_newest"  # Discard the event being published
+
+
+class _Subscription:
+    """A callback registered for one event type, with its delivery queue and metrics"""
+
+    def __init__(self, event_type: EventType, callback: Callable[[ScheduleEvent], None],
+                 delivery: DeliveryMode, queue_size: int, overflow_policy: OverflowPolicy):
+        self.event_type = event_type
+        self.callback = callback
+        self.delivery = delivery
+        self.queue_size = max(1, queue_size)
+        self.overflow_policy = overflow_policy
+        self.queue = deque()
+        self.condition = Condition()
+        self.draining = False
+        self.active = True
+        self.coalescer: Optional['_Coalescer'] = None
+
+        # Metrics
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def name(self) -> str:
+        return getattr(self.callback, '__qualname__', repr(self.callback))
+
+    def record_delivery(self, latency: float) -> None:
+        self.delivered += 1
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'callback': self.name,
+            'event_type': self.event_type.value,
+            'delivery': self.delivery.value,
+            'queue_depth': len(self.queue),
+            'max_queue_depth': self.max_depth,
+            'queue_size': self.queue_size,
+            'overflow_policy': self.overflow_policy.value,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'avg_latency_ms': (self.total_latency / self.delivered * 1000) if self.delivered else 0.0,
+            'max_latency_ms': self.max_latency * 1000
+        }
+
+
+class _Coalescer:
+    """Collects the events for one callback and delivers them once per time window"""
+
+    def __init__(self, subscription: _Subscription, window: float):
+        self.subscription = subscription
+        self.window = window
+        self.events: List[ScheduleEvent] = []
+        self.timer: Optional[Timer] = None
+        self.lock = Lock()
+        self.references = 1
+
+
+class _EventBatch:
+    """Events collected by an EventBus.batch() context"""
+
+    def __init__(self, user_id: Optional[str], data: Dict[str, Any]):
+        self.user_id = user_id
+        self.data = data
+        self.events: List[ScheduleEvent] = []
+
+    def update(self, **data) -> None:
+        """Add data to the envelope published when the batch closes"""
+        self.data.update(data)
+
+
 class EventBus:
     """Centralized event bus for handling all schedule-related events"""
     
-    def __init__(self, max_history: int = 1000):
+    def __init__(self, max_history: int = 1000, async_dispatch: bool = False, max_workers: int = 4,
+                 queue_size: int = 1000, overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                 block_timeout: float = 1.0):
         """
         Initialize the event bus
         
         Args:
             max_history: Maximum number of events to keep in history
+            async_dispatch: Deliver to asynchronous subscribers from a worker pool
+            max_workers: Number of dispatch worker threads
+            queue_size: Default per-subscriber queue size
+            overflow_policy: Default policy when a subscriber queue is full
+            block_timeout: Seconds a publisher waits for room under OverflowPolicy.BLOCK
         """
-        self._listeners: Dict[EventType, List[Callable]] = {}
-        self._event_history: List[ScheduleEvent] = []
-        self._max_history = max_history
+        self._listeners: Dict[EventType, List[_Subscription]] = {}
+        # Event history is a fixed-capacity ring buffer addressed by sequence
+        # number: event seq N lives in slot N % capacity.
+        self._max_history = max(1, max_history)
+        self._event_history: List[Optional[ScheduleEvent]] = [None] * self._max_history
+        self._next_seq = 1
+        self._oldest_seq = 1
+        self._type_index: Dict[EventType, deque] = {}
+        self._type_counts: Dict[EventType, int] = {}
+        self._total_published = 0
         self._lock = Lock()
         
-        logging.info("EventBus initialized")
+        self._queue_size = queue_size
+        self._overflow_policy = overflow_policy
+        self._block_timeout = block_timeout
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._coalescers: Dict[Callable, _Coalescer] = {}
+        self._batch_state = local()
+        if async_dispatch:
+            self.enable_async_dispatch(max_workers)
+        
+        logging.info(f"EventBus initialized ({'async' if async_dispatch else 'sync'} dispatch)")
+    
+    @property
+    def async_dispatch(self) -> bool:
+        """Whether asynchronous subscribers are delivered from the worker pool"""
+        return self._executor is not None
     
-    def subscribe(self, event_type: EventType, callback: Callable[[ScheduleEvent], None]) -> None:
+    def enable_async_dispatch(self, max_workers: Optional[int] = None) -> None:
+        """
+        Start the dispatch worker pool
+        
+        Args:
+            max_workers: Number of dispatch worker threads (defaults to the constructor value)
+        """
+        with self._lock:
+            if self._executor is not None:
+                return
+            if max_workers:
+                self._max_workers = max_workers
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                thread_name_prefix='event-dispatch')
+        logging.info(f"EventBus async dispatch enabled with {self._max_workers} workers")
+    
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the dispatch worker pool, delivering queued events first if wait is True
+        
+        Args:
+            wait: Drain the subscriber queues before stopping
+            timeout: Maximum seconds to wait for the queues to drain
+        """
+        if wait:
+            self.flush(timeout)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+            logging.info("EventBus async dispatch stopped")
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every asynchronous subscriber queue has been delivered
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            bool: True if all queues are empty
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            subscriptions = [s for subs in self._listeners.values() for s in subs]
+            coalescers = list(self._coalescers.values())
+        
+        for coalescer in coalescers:
+            self._flush_coalescer(coalescer)
+        
+        for sub in subscriptions:
+            with sub.condition:
+                while sub.queue or sub.draining:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    sub.condition.wait(remaining)
+        return True
+    
+    def subscribe(self, event_type: EventType, callback: Callable[[ScheduleEvent], None],
+                  delivery: DeliveryMode = DeliveryMode.ASYNC, queue_size: Optional[int] = None,
+                  overflow_policy: Optional[OverflowPolicy] = None,
+                  coalesce_window: Optional[float] = None) -> None:
         """
         Subscribe to an event type
         
+        Asynchronous subscribers are delivered from the worker pool when async
+        dispatch is enabled and on the publishing thread otherwise. Events are
+        delivered to each subscriber in publish order.
+        
         Args:
             event_type: Type of event to listen for
             callback: Function to call when event occurs
+            delivery: DeliveryMode.SYNC for subscribers that must see the event
+                before publish() returns
+            queue_size: Maximum queued events for this subscriber
+            overflow_policy: Policy applied when the queue is full
+            coalesce_window: Seconds to collect events before delivering them
+                as one BULK_UPDATE envelope. Shared by every event type the
+                callback subscribes to with a window.
         """
+        subscription = _Subscription(
+            event_type, callback, delivery,
+            queue_size if queue_size is not None else self._queue_size,
+            overflow_policy or self._overflow_policy
+        )
         with self._lock:
+            if coalesce_window:
+                coalescer = self._coalescers.get(callback)
+                if coalescer is None:
+                    coalescer = self._coalescers[callback] = _Coalescer(subscription, coalesce_window)
+                else:
+                    coalescer.references += 1
+                subscription.coalescer = coalescer
             if event_type not in self._listeners:
                 self._listeners[event_type] = []
-            self._listeners[event_type].append(callback)
+            self._listeners[event_type].append(subscription)
             
-        logging.debug(f"Subscribed to {event_type.value}")
+        logging.debug(f"Subscribed to {event_type.value} ({delivery.value})")
     
     def unsubscribe(self, event_type: EventType, callback: Callable[[ScheduleEvent], None]) -> None:
         """
@@ -103,12 +403,26 @@ class EventBus:
         """
         with self._lock:
             if event_type in self._listeners:
-                try:
-                    self._listeners[event_type].remove(callback)
-                    if not self._listeners[event_type]:
-                        del self._listeners[event_type]
-                except ValueError:
-                    pass  # Callback wasn't in the list
+                subscriptions = self._listeners[event_type]
+                for sub in subscriptions:
+                    if sub.callback == callback:
+                        sub.active = False
+                        subscriptions.remove(sub)
+                        if sub.coalescer is not None:
+                            sub.coalescer.references -= 1
+                            if sub.coalescer.references == 0:
+                                if sub.coalescer.timer is not None:
+                                    sub.coalescer.timer.cancel()
+                                self._coalescers.pop(callback, None)
+                            elif sub.coalescer.subscription is sub:
+                                # Deliver through another event type of the same callback
+                                sub.coalescer.subscription = next(
+                                    other for others in self._listeners.values() for other in others
+                                    if other is not sub and other.coalescer is sub.coalescer
+                                )
+                        break
+                if not subscriptions:
+                    del self._listeners[event_type]
         
         logging.debug(f"Unsubscribed from {event_type.value}")
     
@@ -119,24 +433,183 @@ class EventBus:
         Args:
             event: Event to publish
         """
+        batches = getattr(self._batch_state, 'stack', None)
+        if batches and event.event_type in BATCHED_EVENT_TYPES:
+            batches[-1].events.append(event)
+            return
+        
         with self._lock:
             # Add to history
-            self._event_history.append(event)
-            if len(self._event_history) > self._max_history:
-                self._event_history.pop(0)
+            self._append_to_history(event)
             
             # Notify listeners
             listeners = self._listeners.get(event.event_type, []).copy()
+            executor = self._executor
         
         # Call listeners outside of lock to prevent deadlocks
-        for listener in listeners:
-            try:
-                listener(event)
-            except Exception as e:
-                logging.error(f"Error in event listener for {event.event_type.value}: {e}")
+        with current_stage('dispatch'):
+            for sub in listeners:
+                if sub.coalescer is not None:
+                    self._coalesce(sub.coalescer, event)
+                else:
+                    self._dispatch(sub, event, executor)
         
         logging.debug(f"Published event: {event.event_type.value}")
     
+    @contextmanager
+    def batch(self, user_id: Optional[str] = None, discard_on_error: bool = False, **data):
+        """
+        Collect the schedule change events published by this thread into one
+        BULK_UPDATE envelope, published when the outermost batch closes
+        
+        Subscribers that need to see batched changes subscribe to BULK_UPDATE
+        and use unpack_bulk_event() to read the individual events.
+        
+        Args:
+            user_id: User the envelope is attributed to
+            discard_on_error: Drop the collected events if the block raises
+            **data: Extra envelope data
+            
+        Yields:
+            The batch; call update(**data) on it to add envelope data
+        """
+        stack = getattr(self._batch_state, 'stack', None)
+        if stack is None:
+            stack = self._batch_state.stack = []
+        current = _EventBatch(user_id, data)
+        stack.append(current)
+        try:
+            yield current
+        except BaseException:
+            stack.pop()
+            if not discard_on_error:
+                self._close_batch(current, stack)
+            raise
+        stack.pop()
+        self._close_batch(current, stack)
+    
+    def _close_batch(self, current: _EventBatch, stack: List[_EventBatch]) -> None:
+        """Merge a closed batch into its parent or publish its envelope"""
+        if stack:
+            stack[-1].events.extend(current.events)
+            stack[-1].data.update(current.data)
+            return
+        if not current.events and not current.data:
+            return
+        if len(current.events) == 1 and not current.data:
+            self.publish(current.events[0])
+        else:
+            self.publish(make_bulk_event(current.events, current.user_id, **current.data))
+    
+    def _dispatch(self, sub: _Subscription, event: ScheduleEvent,
+                  executor: Optional[ThreadPoolExecutor]) -> None:
+        """Deliver an event inline or through the subscriber queue"""
+        if executor is None or sub.delivery == DeliveryMode.SYNC:
+            self._deliver(sub, event, time.perf_counter())
+        else:
+            self._enqueue(sub, event, executor)
+    
+    def _coalesce(self, coalescer: _Coalescer, event: ScheduleEvent) -> None:
+        """Hold an event until the subscriber's coalescing window closes"""
+        with coalescer.lock:
+            coalescer.events.append(event)
+            if coalescer.timer is None:
+                coalescer.timer = Timer(coalescer.window, self._flush_coalescer, args=(coalescer,))
+                coalescer.timer.daemon = True
+                coalescer.timer.start()
+    
+    def _flush_coalescer(self, coalescer: _Coalescer) -> None:
+        """Deliver the events collected in a coalescing window"""
+        with coalescer.lock:
+            events, coalescer.events = coalescer.events, []
+            if coalescer.timer is not None:
+                coalescer.timer.cancel()
+                coalescer.timer = None
+        if not events or not coalescer.subscription.active:
+            return
+        
+        event = events[0] if len(events) == 1 else make_bulk_event(events)
+        self._dispatch(coalescer.subscription, event, self._executor)
+    
+    def _append_to_history(self, event: ScheduleEvent) -> None:
+        """Store an event in the ring buffer and its type index (caller holds the lock)"""
+        seq = self._next_seq
+        self._next_seq += 1
+        event.seq = seq
+        
+        slot = seq % self._max_history
+        evicted = self._event_history[slot]
+        if evicted is not None and evicted.seq is not None and evicted.seq >= self._oldest_seq:
+            # The evicted event is the oldest one, so it heads its type index
+            self._type_index[evicted.event_type].popleft()
+            self._type_counts[evicted.event_type] -= 1
+            self._oldest_seq = evicted.seq + 1
+        self._event_history[slot] = event
+        
+        self._type_index.setdefault(event.event_type, deque()).append(seq)
+        self._type_counts[event.event_type] = self._type_counts.get(event.event_type, 0) + 1
+        self._total_published += 1
+    
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recently published event (0 if none)"""
+        return self._next_seq - 1
+    
+    def _deliver(self, sub: _Subscription, event: ScheduleEvent, enqueued_at: float) -> None:
+        """Invoke a subscriber callback and record its delivery latency"""
+        try:
+            sub.callback(event)
+        except Exception as e:
+            sub.errors += 1
+            logging.error(f"Error in event listener for {event.event_type.value}: {e}")
+        sub.record_delivery(time.perf_counter() - enqueued_at)
+    
+    def _enqueue(self, sub: _Subscription, event: ScheduleEvent, executor: ThreadPoolExecutor) -> None:
+        """Queue an event for an asynchronous subscriber, applying its overflow policy"""
+        with sub.condition:
+            if len(sub.queue) >= sub.queue_size:
+                if sub.overflow_policy == OverflowPolicy.DROP_OLDEST:
+                    sub.queue.popleft()
+                    sub.dropped += 1
+                elif sub.overflow_policy == OverflowPolicy.DROP_NEWEST:
+                    sub.dropped += 1
+                    return
+                elif not sub.condition.wait_for(lambda: len(sub.queue) < sub.queue_size,
+                                                self._block_timeout):
+                    sub.dropped += 1
+                    logging.warning(f"Dropped {event.event_type.value} for slow subscriber {sub.name}")
+                    return
+            
+            sub.queue.append((event, time.perf_counter()))
+            sub.max_depth = max(sub.max_depth, len(sub.queue))
+            if sub.draining:
+                return
+            sub.draining = True
+        
+        try:
+            executor.submit(self._drain, sub)
+        except RuntimeError:
+            # Pool shut down between publish and submit: deliver inline
+            self._drain(sub)
+    
+    def _drain(self, sub: _Subscription) -> None:
+        """
+        Deliver queued events to one subscriber in order.
+        
+        At most one drain runs per subscription, which keeps delivery ordered
+        per subscriber and therefore per event type.
+        """
+        while True:
+            with sub.condition:
+                if not sub.queue or not sub.active:
+                    sub.queue.clear()
+                    sub.draining = False
+                    sub.condition.notify_all()
+                    return
+                event, enqueued_at = sub.queue.popleft()
+                sub.condition.notify_all()
+            self._deliver(sub, event, enqueued_at)
+    
     def emit(self, event_type: EventType, user_id: Optional[str] = None, **data) -> None:
         """
         Emit an event with the given data
@@ -166,52 +639,105 @@ class EventBus:
             limit: Limit number of events returned
             
         Returns:
-            List of events matching the criteria
+            List of events matching the criteria, newest first
         """
+        events = []
         with self._lock:
-            events = self._event_history.copy()
-        
-        # Apply filters
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
-        
-        if since:
-            events = [e for e in events if e.timestamp >= since]
+            if event_type is not None:
+                seqs = reversed(self._type_index.get(event_type, ()))
+            else:
+                seqs = range(self._next_seq - 1, self._oldest_seq - 1, -1)
+            
+            # Walk newest to oldest so the limit can stop early. Timestamps are
+            # taken when an event is created, not published, so they are not
+            # in seq order and an older event does not end the walk.
+            for seq in seqs:
+                event = self._event_history[seq % self._max_history]
+                if since and event.timestamp < since:
+                    continue
+                events.append(event)
+                if limit and len(events) >= limit:
+                    break
         
-        # Sort by timestamp (newest first)
-        events.sort(key=lambda x: x.timestamp, reverse=True)
+        return events
+    
+    def get_events_since(self, seq: int, event_type: Optional[EventType] = None) -> List[ScheduleEvent]:
+        """
+        Get the events published after a sequence number, oldest first
         
-        if limit:
-            events = events[:limit]
+        Args:
+            seq: Sequence number of the last event already seen
+            event_type: Filter by event type
+            
+        Returns:
+            List of events with a sequence number greater than seq
+        """
+        with self._lock:
+            start = max(seq + 1, self._oldest_seq)
+            if event_type is None:
+                return [self._event_history[s % self._max_history] for s in range(start, self._next_seq)]
+            
+            index = self._type_index.get(event_type, ())
+            result = []
+            for s in reversed(index):
+                if s < start:
+                    break
+                result.append(self._event_history[s % self._max_history])
+            result.reverse()
+            return result
+    
+    def is_seq_available(self, seq: int) -> bool:
+        """
+        Check whether every event after a sequence number is still in the history
         
-        return events
+        Args:
+            seq: Sequence number of the last event already seen
+            
+        Returns:
+            bool: True if get_events_since(seq) returns a complete sequence
+        """
+        with self._lock:
+            return seq + 1 >= self._oldest_seq
     
     def clear_history(self) -> None:
-        """Clear all event history"""
+        """Clear all event history (sequence numbers keep increasing)"""
         with self._lock:
-            self._event_history.clear()
+            self._event_history = [None] * self._max_history
+            self._oldest_seq = self._next_seq
+            self._type_index.clear()
+            self._type_counts.clear()
         logging.info("Event history cleared")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the event bus"""
         with self._lock:
-            total_events = len(self._event_history)
-            event_counts = {}
-            
-            for event in self._event_history:
-                event_type = event.event_type.value
-                event_counts[event_type] = event_counts.get(event_type, 0) + 1
+            total_events = self._next_seq - self._oldest_seq
+            event_counts = {
+                event_type.value: count
+                for event_type, count in self._type_counts.items() if count
+            }
             
             listener_counts = {
                 event_type.value: len(listeners) 
                 for event_type, listeners in self._listeners.items()
             }
+            subscriptions = [s for subs in self._listeners.values() for s in subs]
         
+        subscriber_stats = [sub.get_stats() for sub in subscriptions]
         return {
             'total_events': total_events,
             'event_type_counts': event_counts,
             'listener_counts': listener_counts,
-            'max_history': self._max_history
+            'max_history': self._max_history,
+            'total_published': self._total_published,
+            'last_seq': self._next_seq - 1,
+            'dispatch': {
+                'async_dispatch': self.async_dispatch,
+                'max_workers': self._max_workers,
+                'total_queue_depth': sum(s['queue_depth'] for s in subscriber_stats),
+                'total_dropped': sum(s['dropped'] for s in subscriber_stats),
+                'subscribers': subscriber_stats
+            }
         }
 
 
@@ -230,4 +756,6 @@ def get_event_bus() -> EventBus:
 def reset_event_bus() -> None:
     """Reset the global event bus (useful for testing)"""
     global _global_event_bus
+    if _global_event_bus is not None:
+        _global_event_bus.shutdown(wait=False)
     _global_event_bus = None
\ No newline at end of file
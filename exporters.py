@@ -3,56 +3,51 @@ import csv
 from datetime import datetime
 import calendar
 
+from stats_engine import get_statistics_engine
+
 class StatsExporter:
-    def __init__(self, scheduler):
+    def __init__(self, scheduler, snapshot=None):
+        """
+        Args:
+            scheduler: The main Scheduler object
+            snapshot: ScheduleSnapshot to export (a fresh one per export by default)
+        """
         self.scheduler = scheduler
+        self.snapshot = snapshot
 
     def gather_worker_statistics(self):
-        """Gather comprehensive statistics for all workers"""
+        """Gather comprehensive statistics for all workers from one schedule snapshot"""
         stats = {}
+        snapshot = self.snapshot or self.scheduler.get_schedule_snapshot()
+        schedule_stats = get_statistics_engine().compute(snapshot, self.scheduler.holidays)
     
-        for worker in self.workers_data:
+        for worker in self.scheduler.workers_data:
             worker_id = worker['id']
-            assignments = self.worker_assignments[worker_id]
+            worker_stats = schedule_stats.worker(worker_id)
+            weekend_shifts = len(worker_stats.special_days)
+            gaps = worker_stats.gaps
         
-            # Basic stats
             stats[worker_id] = {
                 'worker_id': worker_id,
                 'work_percentage': worker.get('work_percentage', 100),
-                'total_shifts': len(assignments),
+                'total_shifts': worker_stats.days,
                 'target_shifts': worker.get('target_shifts', 0),
             
                 # Shifts by type
-                'weekend_shifts': len(self.worker_weekends[worker_id]),
-                'weekday_shifts': len(assignments) - len(self.worker_weekends[worker_id]),
+                'weekend_shifts': weekend_shifts,
+                'weekday_shifts': worker_stats.days - weekend_shifts,
             
                 # Monthly distribution
-                'monthly_distribution': {},
+                'monthly_distribution': dict(worker_stats.monthly),
             
                 # Shifts by weekday
-                'weekday_distribution': {i: 0 for i in range(7)},  # 0-6 for Monday-Sunday
+                'weekday_distribution': dict(worker_stats.weekdays),  # 0-6 for Monday-Sunday
             
                 # Gaps analysis
-                'average_gap': 0,
-                'min_gap': float('inf'),
-                'max_gap': 0
+                'average_gap': gaps['avg_gap'] if gaps['avg_gap'] is not None else 0,
+                'min_gap': gaps['min_gap'] if gaps['min_gap'] is not None else float('inf'),
+                'max_gap': gaps['max_gap'] if gaps['max_gap'] is not None else 0
             }
-        
-            # Calculate monthly distribution
-            for date in sorted(assignments):
-                month_key = f"{date.year}-{date.month:02d}"
-                stats[worker_id]['monthly_distribution'][month_key] = \
-                    stats[worker_id]['monthly_distribution'].get(month_key, 0) + 1
-                stats[worker_id]['weekday_distribution'][date.weekday()] += 1
-        
-            # Calculate gaps
-            if len(assignments) > 1:
-                sorted_dates = sorted(assignments)
-                gaps = [(sorted_dates[i+1] - sorted_dates[i]).days 
-                       for i in range(len(sorted_dates)-1)]
-                stats[worker_id]['average_gap'] = sum(gaps) / len(gaps)
-                stats[worker_id]['min_gap'] = min(gaps)
-                stats[worker_id]['max_gap'] = max(gaps)
             
         return stats
 
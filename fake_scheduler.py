@@ -0,0 +1,70 @@
+"""
+In-memory scheduler for the real-time component test suites.
+Provides the schedule, tracking and configuration attributes that the
+incremental updater, validators and event-maintained stores read from a
+Scheduler, without running schedule generation.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Union
+
+from constraint_checker import ConstraintChecker
+from utilities import DateTimeUtils
+
+
+def make_workers(count: int) -> List[Dict[str, Any]]:
+    """Full-time workers W001..W<count>"""
+    return [{'id': f'W{i:03d}', 'work_percentage': 100} for i in range(1, count + 1)]
+
+
+class FakeScheduler:
+    """Empty schedule of consecutive days with a real ConstraintChecker"""
+
+    def __init__(self, start: datetime, days: int, workers: List[Dict[str, Any]], num_shifts: int = 2,
+                 **attributes):
+        """
+        Initialize the fake scheduler
+
+        Args:
+            start: First date of the schedule
+            days: Number of dates
+            workers: Worker records (workers_data)
+            num_shifts: Posts per date
+            **attributes: Scheduler settings overriding the defaults
+                (gap_between_shifts, max_consecutive_weekends, ...)
+        """
+        self.start_date = start
+        self.end_date = start + timedelta(days=days - 1)
+        self.workers_data = workers
+        self.num_shifts = num_shifts
+        self.schedule = {start + timedelta(days=d): [None] * num_shifts for d in range(days)}
+
+        worker_ids = [w['id'] for w in workers]
+        self.worker_assignments = {w: set() for w in worker_ids}
+        self.worker_posts = {w: set() for w in worker_ids}
+        self.worker_weekdays = {w: {i: 0 for i in range(7)} for w in worker_ids}
+        self.worker_weekends = {w: [] for w in worker_ids}
+        self.constraint_skips = {w: {'gap': [], 'incompatibility': [], 'reduced_gap': []} for w in worker_ids}
+
+        self.holidays = []
+        self.date_utils = DateTimeUtils()
+        self.gap_between_shifts = 1
+        self.max_consecutive_weekends = 4
+        self.max_shifts_per_worker = 20
+        self.config = {}
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+        self.constraint_checker = ConstraintChecker(self)
+
+    def _update_tracking_data(self, worker_id: str, date: datetime, post: int, removing: bool = False):
+        """Keep worker_assignments in step with a cell edit"""
+        if removing:
+            self.worker_assignments[worker_id].discard(date)
+        else:
+            self.worker_assignments[worker_id].add(date)
+
+    def day(self, offset: int, iso: bool = False) -> Union[datetime, str]:
+        """Date offset days after the start (as an ISO string if iso)"""
+        date = self.start_date + timedelta(days=offset)
+        return date.isoformat() if iso else date
@@ -12,13 +12,12 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Set, Optional, Tuple, Any
 from pathlib import Path
 import os
+import tempfile
+import importlib.util
 
-try:
-    import pandas as pd
-    import numpy as np
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+# Only probe for pandas here; importing it is left to the forecasting code that needs it
+PANDAS_AVAILABLE = importlib.util.find_spec('pandas') is not None
+if not PANDAS_AVAILABLE:
     logging.warning("Pandas not available. Historical data will use basic storage.")
 
 from exceptions import SchedulerError
@@ -51,16 +50,26 @@ class HistoricalDataManager:
         # Load existing historical data if available
         self._load_historical_data()
     
-    def collect_current_schedule_data(self) -> Dict[str, Any]:
+    def collect_current_schedule_data(self, snapshot=None) -> Dict[str, Any]:
         """
         Collect data from the current schedule for historical analysis
         
+        Args:
+            snapshot: ScheduleSnapshot to collect from instead of the live
+                schedule (required when collecting off the editing thread)
+        
         Returns:
             Dictionary containing comprehensive schedule metrics
         """
         try:
             # Get current statistics using existing infrastructure
-            stats = self.scheduler.stats.gather_statistics()
+            if snapshot is not None:
+                from statistics import StatisticsCalculator
+                stats = StatisticsCalculator(self.scheduler, snapshot=snapshot).gather_statistics()
+                schedule, assignments = snapshot.schedule, snapshot.worker_assignments
+            else:
+                stats = self.scheduler.stats.gather_statistics()
+                schedule, assignments = self.scheduler.schedule, self.scheduler.data_manager.worker_assignments
             
             # Calculate additional metrics for forecasting
             current_data = {
@@ -70,11 +79,11 @@ class HistoricalDataManager:
                     'end_date': self.scheduler.end_date.isoformat(),
                     'total_days': (self.scheduler.end_date - self.scheduler.start_date).days + 1
                 },
-                'shift_metrics': self._calculate_shift_metrics(),
-                'worker_metrics': self._calculate_worker_metrics(stats),
-                'coverage_metrics': self._calculate_coverage_metrics(),
+                'shift_metrics': self._calculate_shift_metrics(schedule),
+                'worker_metrics': self._calculate_worker_metrics(stats, assignments),
+                'coverage_metrics': self._calculate_coverage_metrics(schedule),
                 'constraint_metrics': self._extract_constraint_metrics(stats),
-                'seasonal_indicators': self._extract_seasonal_indicators(),
+                'seasonal_indicators': self._extract_seasonal_indicators(schedule),
                 'efficiency_score': self._calculate_efficiency_score(stats)
             }
             
@@ -84,7 +93,7 @@ class HistoricalDataManager:
             logging.error(f"Error collecting current schedule data: {e}")
             raise SchedulerError(f"Failed to collect schedule data: {str(e)}")
     
-    def _calculate_shift_metrics(self) -> Dict[str, Any]:
+    def _calculate_shift_metrics(self, schedule) -> Dict[str, Any]:
         """Calculate daily shift fill rates and patterns"""
         shift_metrics = {
             'daily_fill_rates': {},
@@ -96,7 +105,7 @@ class HistoricalDataManager:
         total_slots = 0
         filled_slots = 0
         
-        for date, shifts in self.scheduler.schedule.items():
+        for date, shifts in schedule.items():
             date_str = date.strftime('%Y-%m-%d')
             total_day_slots = len(shifts)
             filled_day_slots = sum(1 for shift in shifts if shift is not None)
@@ -124,7 +133,7 @@ class HistoricalDataManager:
         
         return shift_metrics
     
-    def _calculate_worker_metrics(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_worker_metrics(self, stats: Dict[str, Any], assignments) -> Dict[str, Any]:
         """Calculate worker availability and performance patterns"""
         worker_metrics = {
             'availability_patterns': {},
@@ -139,8 +148,8 @@ class HistoricalDataManager:
             
             worker_metrics['availability_patterns'][worker_id] = {
                 'availability_rate': availability_rate,
-                'weekend_preference': self._calculate_weekend_preference(worker_id),
-                'shift_consistency': self._calculate_shift_consistency(worker_id),
+                'weekend_preference': self._calculate_weekend_preference(worker_id, assignments),
+                'shift_consistency': self._calculate_shift_consistency(worker_id, assignments),
                 'post_rotation_balance': self._calculate_post_rotation_score(worker_stats['post_distribution'])
             }
             
@@ -154,7 +163,7 @@ class HistoricalDataManager:
         
         return worker_metrics
     
-    def _calculate_coverage_metrics(self) -> Dict[str, Any]:
+    def _calculate_coverage_metrics(self, schedule) -> Dict[str, Any]:
         """Calculate overall schedule coverage and gap analysis"""
         coverage_metrics = {
             'overall_coverage': 0.0,
@@ -167,7 +176,7 @@ class HistoricalDataManager:
         filled_slots = 0
         post_coverage = {}
         
-        for date, shifts in self.scheduler.schedule.items():
+        for date, shifts in schedule.items():
             for post_idx, worker in enumerate(shifts):
                 post_num = post_idx + 1
                 if post_num not in post_coverage:
@@ -227,7 +236,7 @@ class HistoricalDataManager:
         
         return constraint_metrics
     
-    def _extract_seasonal_indicators(self) -> Dict[str, Any]:
+    def _extract_seasonal_indicators(self, schedule) -> Dict[str, Any]:
         """Extract seasonal and temporal patterns from the schedule"""
         seasonal_indicators = {
             'monthly_patterns': {},
@@ -242,7 +251,7 @@ class HistoricalDataManager:
         holiday_shifts = 0
         total_holiday_slots = 0
         
-        for date, shifts in self.scheduler.schedule.items():
+        for date, shifts in schedule.items():
             month_key = f"{date.year}-{date.month:02d}"
             filled_shifts = sum(1 for shift in shifts if shift is not None)
             
@@ -304,15 +313,15 @@ class HistoricalDataManager:
             logging.error(f"Error calculating efficiency score: {e}")
             return 0.0
     
-    def _calculate_weekend_preference(self, worker_id: str) -> float:
+    def _calculate_weekend_preference(self, worker_id: str, assignments) -> float:
         """Calculate worker's weekend shift preference/tendency"""
         weekend_count = len(self.scheduler.data_manager.worker_weekends.get(worker_id, []))
-        total_shifts = len(self.scheduler.data_manager.worker_assignments.get(worker_id, []))
+        total_shifts = len(assignments.get(worker_id, []))
         return weekend_count / total_shifts if total_shifts > 0 else 0
     
-    def _calculate_shift_consistency(self, worker_id: str) -> float:
+    def _calculate_shift_consistency(self, worker_id: str, assignments) -> float:
         """Calculate how consistently a worker is scheduled"""
-        assignments = sorted(list(self.scheduler.data_manager.worker_assignments.get(worker_id, [])))
+        assignments = sorted(assignments.get(worker_id, []))
         if len(assignments) < 2:
             return 0.0
         
@@ -365,8 +374,7 @@ class HistoricalDataManager:
             filename = f"schedule_data_{timestamp}.json"
             filepath = self.storage_path / filename
             
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            self._write_json(filepath, data)
             
             logging.info(f"Historical data stored: {filepath}")
             
@@ -407,12 +415,31 @@ class HistoricalDataManager:
                 history['records'] = history['records'][-100:]
             
             # Save updated history
-            with open(consolidated_file, 'w') as f:
-                json.dump(history, f, indent=2, default=str)
+            self._write_json(consolidated_file, history)
             
         except Exception as e:
             logging.error(f"Error updating consolidated history: {e}")
     
+    def _write_json(self, path: Path, data: Any) -> None:
+        """
+        Write a JSON file atomically
+
+        Collection runs on a daemon thread that can be stopped at interpreter
+        exit, so the file is written to a temporary sibling and renamed over
+        the target: readers see either the old file or the complete new one.
+        """
+        fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.stem}_', suffix='.tmp', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
     def _load_historical_data(self) -> None:
         """Load existing historical data from storage"""
         try:
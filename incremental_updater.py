@@ -7,10 +7,12 @@ from datetime import datetime, date
 from typing import Dict, List, Optional, Tuple, Any, Set
 import logging
 from dataclasses import dataclass
-from copy import deepcopy
+from contextlib import contextmanager
 
-from event_bus import get_event_bus, EventType, ScheduleEvent
+from event_bus import get_event_bus, EventType, ScheduleEvent, DeliveryMode
 from exceptions import SchedulerError
+from version_table import VersionTable, Versions
+from schedule_locks import ScheduleLocks
 
 
 @dataclass
@@ -21,6 +23,9 @@ class UpdateResult:
     conflicts: List[str] = None
     suggestions: List[str] = None
     rollback_data: Dict[str, Any] = None
+    item_errors: List[Dict[str, Any]] = None
+    versions: Versions = None
+    stale: Dict[str, Any] = None
     
     def __post_init__(self):
         if self.conflicts is None:
@@ -29,6 +34,328 @@ class UpdateResult:
             self.suggestions = []
         if self.rollback_data is None:
             self.rollback_data = {}
+        if self.item_errors is None:
+            self.item_errors = []
+        if self.versions is None:
+            self.versions = {}
+        if self.stale is None:
+            self.stale = {}
+
+
+class ScheduleTransaction:
+    """
+    A set of schedule edits staged in an overlay and committed atomically
+
+    Edits are read through the overlay, so later items see earlier ones.
+    Constraints are validated once against the final state on commit: each
+    affected date is checked for duplicates and incompatibilities, and each
+    affected worker for availability, gaps and weekend limits. Either every
+    cell is applied and listeners receive one BULK_UPDATE, or nothing is
+    applied and the result lists the failing items. Versions registered
+    with expect() are compared when the commit starts.
+    """
+    
+    def __init__(self, updater: 'IncrementalUpdater', user_id: Optional[str] = None):
+        """
+        Start an empty transaction
+        
+        Args:
+            updater: IncrementalUpdater owning the schedule
+            user_id: ID of user making the changes
+        """
+        self.updater = updater
+        self.scheduler = updater.scheduler
+        self.user_id = user_id
+        
+        # (date, post) -> staged worker, and the item that last wrote each cell
+        self._overlay: Dict[Tuple[datetime, int], Optional[str]] = {}
+        self._cell_items: Dict[Tuple[datetime, int], int] = {}
+        self._forced: Set[int] = set()
+        self._operations: List[str] = []
+        self._errors: List[Dict[str, Any]] = []
+        self._expected: Versions = {'cells': [], 'workers': {}}
+        self._closed = False
+    
+    def get(self, shift_date: datetime, post_index: int) -> Optional[str]:
+        """Worker on a shift as seen through the staged edits"""
+        key = (shift_date, post_index)
+        if key in self._overlay:
+            return self._overlay[key]
+        row = self.scheduler.schedule.get(shift_date)
+        return row[post_index] if row and post_index < len(row) else None
+    
+    def expect(self, versions: Optional[Versions]) -> None:
+        """
+        Require cells and workers to still have the versions read when committing
+        
+        Args:
+            versions: Versions as returned by IncrementalUpdater.read_versions
+        """
+        if versions:
+            self._expected['cells'].extend(versions.get('cells', ()))
+            self._expected['workers'].update(versions.get('workers', {}))
+    
+    def _add_item(self, operation: str, force: bool) -> int:
+        """Register a staged item and return its index"""
+        if self._closed:
+            raise SchedulerError("Transaction already committed")
+        index = len(self._operations)
+        self._operations.append(operation)
+        if force:
+            self._forced.add(index)
+        return index
+    
+    def _item_error(self, index: int, error: str) -> None:
+        self._errors.append({'index': index, 'operation': self._operations[index], 'error': error})
+    
+    def _stage(self, index: int, shift_date: datetime, post_index: int, worker_id: Optional[str]) -> None:
+        self._overlay[(shift_date, post_index)] = worker_id
+        self._cell_items[(shift_date, post_index)] = index
+    
+    def assign(self, worker_id: str, shift_date: datetime, post_index: int, force: bool = False) -> int:
+        """
+        Stage an assignment
+        
+        Args:
+            worker_id: ID of worker to assign
+            shift_date: Date of the shift
+            post_index: Post index (0-based)
+            force: Skip constraint validation for this item
+            
+        Returns:
+            Index of the staged item
+        """
+        index = self._add_item('assign', force)
+        if not self.updater._validate_assignment_inputs(worker_id, shift_date, post_index):
+            self._item_error(index, "Invalid assignment parameters")
+        else:
+            self._stage(index, shift_date, post_index, worker_id)
+        return index
+    
+    def unassign(self, shift_date: datetime, post_index: int) -> int:
+        """
+        Stage an unassignment
+        
+        Args:
+            shift_date: Date of the shift
+            post_index: Post index (0-based)
+            
+        Returns:
+            Index of the staged item
+        """
+        index = self._add_item('unassign', False)
+        if not self.updater._validate_unassignment_inputs(shift_date, post_index):
+            self._item_error(index, "Invalid unassignment parameters")
+        elif self.get(shift_date, post_index) is None:
+            self._item_error(index, "No worker assigned to this shift")
+        else:
+            self._stage(index, shift_date, post_index, None)
+        return index
+    
+    def swap(self, shift_date1: datetime, post_index1: int,
+             shift_date2: datetime, post_index2: int, force: bool = False) -> int:
+        """
+        Stage a swap of two shifts
+        
+        Args:
+            shift_date1: Date of first shift
+            post_index1: Post index of first shift
+            shift_date2: Date of second shift
+            post_index2: Post index of second shift
+            force: Skip constraint validation for this item
+            
+        Returns:
+            Index of the staged item
+        """
+        index = self._add_item('swap', force)
+        if not (self.updater._validate_unassignment_inputs(shift_date1, post_index1) and
+                self.updater._validate_unassignment_inputs(shift_date2, post_index2)):
+            self._item_error(index, "Invalid swap parameters")
+            return index
+        
+        worker1 = self.get(shift_date1, post_index1)
+        worker2 = self.get(shift_date2, post_index2)
+        if worker1 is None and worker2 is None:
+            self._item_error(index, "No workers to swap")
+        else:
+            self._stage(index, shift_date1, post_index1, worker2)
+            self._stage(index, shift_date2, post_index2, worker1)
+        return index
+    
+    def get_cells(self) -> List[Tuple[datetime, int, Optional[str], Optional[str]]]:
+        """
+        Net cell changes of the staged edits
+        
+        Returns:
+            List of (date, post, old worker, new worker) for cells that change
+        """
+        cells = []
+        for (shift_date, post_index), new in self._overlay.items():
+            row = self.scheduler.schedule.get(shift_date)
+            old = row[post_index] if row and post_index < len(row) else None
+            if old != new:
+                cells.append((shift_date, post_index, old, new))
+        return cells
+    
+    def validate(self) -> List[Dict[str, Any]]:
+        """
+        Validate the final staged state in a single pass
+        
+        Returns:
+            List of item errors ({'index', 'operation', 'error'}), empty if valid
+        """
+        errors = list(self._errors)
+        checker = self.scheduler.constraint_checker
+        cells = self.get_cells()
+        
+        # Dates gained and vacated per worker; added maps the checked (unforced) ones to their item
+        added: Dict[str, Dict[datetime, int]] = {}
+        gained: Dict[str, Set[datetime]] = {}
+        vacated: Dict[str, Set[datetime]] = {}
+        for shift_date, post_index, old, new in cells:
+            if old is not None:
+                vacated.setdefault(old, set()).add(shift_date)
+            if new is not None:
+                gained.setdefault(new, set()).add(shift_date)
+                index = self._cell_items[(shift_date, post_index)]
+                if index not in self._forced:
+                    added.setdefault(new, {})[shift_date] = index
+        
+        def fail(index: int, error: str):
+            errors.append({'index': index, 'operation': self._operations[index], 'error': error})
+        
+        # One pass per affected date: duplicates and incompatibilities in the final row
+        dates: Dict[datetime, Dict[str, int]] = {}
+        for worker_id, worker_dates in added.items():
+            for shift_date, index in worker_dates.items():
+                dates.setdefault(shift_date, {})[worker_id] = index
+        for shift_date, new_workers in dates.items():
+            row = [self.get(shift_date, p) for p in range(self.scheduler.num_shifts)]
+            for worker_id, index in new_workers.items():
+                if row.count(worker_id) > 1:
+                    fail(index, f"Worker {worker_id} assigned twice on {shift_date.strftime('%Y-%m-%d')}")
+                for other in set(row):
+                    if other is not None and checker._are_workers_incompatible(worker_id, other):
+                        fail(index, f"Worker {worker_id} is incompatible with {other} on {shift_date.strftime('%Y-%m-%d')}")
+        
+        # One pass per affected worker against their final assignments
+        for worker_id, worker_dates in added.items():
+            if checker._get_worker_data(worker_id) is None:
+                for index in sorted(set(worker_dates.values())):
+                    fail(index, f"Worker {worker_id} not found")
+                continue
+            
+            final = ((self.scheduler.worker_assignments.get(worker_id, set()) - vacated.get(worker_id, set())) |
+                     gained[worker_id])
+            for shift_date, index in sorted(worker_dates.items()):
+                if checker._is_worker_off(worker_id, shift_date):
+                    fail(index, f"Worker {worker_id} unavailable on {shift_date.strftime('%Y-%m-%d')}")
+                elif not checker._check_gap_constraint(worker_id, shift_date, assignments=final - {shift_date}):
+                    fail(index, f"Worker {worker_id} violates gap or pattern constraint on {shift_date.strftime('%Y-%m-%d')}")
+            
+            weekend_dates = [d for d in sorted(worker_dates) if checker.is_weekend_day(d)]
+            if weekend_dates and checker._would_exceed_weekend_limit(worker_id, weekend_dates[0], assignments=final):
+                for shift_date in weekend_dates:
+                    fail(worker_dates[shift_date], f"Worker {worker_id} would exceed weekend limit")
+        
+        errors.sort(key=lambda e: e['index'])
+        return errors
+    
+    def commit(self) -> UpdateResult:
+        """
+        Validate and apply the staged edits atomically
+        
+        Returns:
+            UpdateResult; on failure nothing is applied and item_errors lists the failing items
+        """
+        # Transactions may touch any cell, so they hold the schedule exclusively
+        with self.updater.locks.exclusive():
+            return self._commit()
+    
+    def _commit(self) -> UpdateResult:
+        if self._closed:
+            return UpdateResult(False, "Transaction already committed")
+        self._closed = True
+        total = len(self._operations)
+        
+        conflict = self.updater._version_conflict(self._expected)
+        if conflict is not None:
+            return conflict
+        
+        errors = self.validate()
+        if errors:
+            failed = len({e['index'] for e in errors})
+            logging.warning(f"Bulk update rolled back: {failed}/{total} operations failed validation")
+            return UpdateResult(
+                False,
+                f"Bulk update rolled back: {failed}/{total} operations failed",
+                conflicts=[f"Operation {e['index']} ({e['operation']}): {e['error']}" for e in errors],
+                item_errors=errors
+            )
+        
+        cells = self.get_cells()
+        schedule = self.scheduler.schedule
+        applied = []
+        try:
+            # Listeners receive the whole transaction as one BULK_UPDATE envelope
+            with self.updater.event_bus.batch(user_id=self.user_id, discard_on_error=True) as batch:
+                for shift_date, post_index, old, new in cells:
+                    if shift_date not in schedule:
+                        schedule[shift_date] = [None] * self.scheduler.num_shifts
+                    schedule[shift_date][post_index] = new
+                    applied.append((shift_date, post_index, old, new))
+                
+                # Removals first so a worker moved between posts of a day stays tracked
+                for shift_date, post_index, old, _ in cells:
+                    if old is not None:
+                        self.scheduler._update_tracking_data(old, shift_date, post_index, removing=True)
+                for shift_date, post_index, _, new in cells:
+                    if new is not None:
+                        self.scheduler._update_tracking_data(new, shift_date, post_index, removing=False)
+                
+                for shift_date, post_index, old, new in cells:
+                    if new is None:
+                        self.updater.event_bus.emit(
+                            EventType.SHIFT_UNASSIGNED,
+                            user_id=self.user_id,
+                            worker_id=old,
+                            shift_date=shift_date.isoformat(),
+                            post_index=post_index
+                        )
+                    else:
+                        self.updater.event_bus.emit(
+                            EventType.SHIFT_ASSIGNED,
+                            user_id=self.user_id,
+                            worker_id=new,
+                            shift_date=shift_date.isoformat(),
+                            post_index=post_index,
+                            previous_worker=old
+                        )
+                
+                batch.update(
+                    total_operations=total,
+                    successful_operations=total,
+                    failed_operations=0
+                )
+        except Exception as e:
+            logging.error(f"Error committing bulk update, restoring schedule: {e}", exc_info=True)
+            for shift_date, post_index, old, _ in reversed(applied):
+                schedule[shift_date][post_index] = old
+            if hasattr(self.scheduler, '_ensure_data_synchronization'):
+                self.scheduler._ensure_data_synchronization()
+            return UpdateResult(False, f"Bulk update failed: {str(e)}")
+        
+        versions = self.updater._bump_versions(
+            [(d, p) for d, p, _, _ in cells],
+            [w for _, _, old, new in cells for w in (old, new)]
+        )
+        logging.info(f"Bulk update committed: {total} operations, {len(cells)} cells changed")
+        return UpdateResult(
+            True,
+            f"Bulk update: {total}/{total} operations successful",
+            rollback_data={'cells': [[d.isoformat(), p, old, new] for d, p, old, new in cells]},
+            versions=versions
+        )
 
 
 class IncrementalUpdater:
@@ -47,14 +374,104 @@ class IncrementalUpdater:
         # Caches for performance
         self._validation_cache: Dict[str, Any] = {}
         
+        # Optimistic concurrency: edits compare versions and apply while holding
+        # the stripes of the dates and workers they touch
+        self.versions = VersionTable()
+        self.locks = ScheduleLocks()
+        self.event_bus.subscribe(EventType.SCHEDULE_GENERATED, self._on_schedule_generated,
+                                 delivery=DeliveryMode.SYNC)
+        
         logging.info("IncrementalUpdater initialized")
     
+    def read_versions(self, cells: List[Tuple[datetime, int]],
+                      workers: Optional[List[str]] = None) -> Versions:
+        """
+        Versions to submit with an edit based on what was read
+        
+        Args:
+            cells: (date, post index) of the cells read
+            workers: Workers whose assignments were read (default: the workers on the cells)
+            
+        Returns:
+            Versions dict
+        """
+        with self.locks.edit([shift_date for shift_date, _ in cells]):
+            if workers is None:
+                workers = []
+                for shift_date, post_index in cells:
+                    row = self.scheduler.schedule.get(shift_date)
+                    worker_id = row[post_index] if row and post_index < len(row) else None
+                    if worker_id is not None and worker_id not in workers:
+                        workers.append(worker_id)
+            return self.versions.read(cells, workers)
+    
+    def _cell(self, shift_date: datetime, post_index: int) -> Optional[str]:
+        row = self.scheduler.schedule.get(shift_date)
+        return row[post_index] if row and 0 <= post_index < len(row) else None
+    
+    @contextmanager
+    def _locked_edit(self, cells: List[Tuple[datetime, int]], workers: List[Optional[str]],
+                     expected_versions: Optional[Versions]):
+        """
+        Hold the locks a cell edit needs
+        
+        Takes the stripes of the edited and expected cells' dates, then of
+        the given workers, the workers currently on the cells and the
+        expected workers.
+        """
+        expected_versions = expected_versions or {}
+        dates = [shift_date for shift_date, _ in cells]
+        dates.extend(datetime.fromisoformat(d) if isinstance(d, str) else d
+                     for d, _, _ in expected_versions.get('cells', ()))
+        with self.locks.edit(dates) as scope:
+            scope.lock_workers(list(workers) + [self._cell(d, p) for d, p in cells] +
+                               list(expected_versions.get('workers', {})))
+            yield
+    
+    def _version_conflict(self, expected: Optional[Versions]) -> Optional[UpdateResult]:
+        """
+        Compare submitted versions with the current ones
+        
+        Returns:
+            None if nothing read has changed, otherwise a failed UpdateResult
+            whose stale field holds the current state of the changed cells
+            and workers to rebase on
+        """
+        stale_cells, stale_workers = self.versions.stale(expected)
+        if not stale_cells and not stale_workers:
+            return None
+        
+        current = self.versions.read(stale_cells, stale_workers)
+        schedule = self.scheduler.schedule
+        stale = {
+            'cells': [[d, p, (schedule.get(datetime.fromisoformat(d)) or [None] * (p + 1))[p], v]
+                      for d, p, v in current['cells']],
+            'workers': {w: {'version': v,
+                            'assignments': sorted(d.isoformat() for d in self.scheduler.worker_assignments.get(w, ()))}
+                        for w, v in current['workers'].items()}
+        }
+        conflicts = ([f"Shift {d} post {p} changed (now {worker or 'empty'})" for d, p, worker, _ in stale['cells']] +
+                     [f"Assignments of {w} changed" for w in stale['workers']])
+        logging.info(f"Version conflict: {len(stale_cells)} cells and {len(stale_workers)} workers changed")
+        return UpdateResult(False, "Version conflict: schedule changed since it was read",
+                            conflicts=conflicts, stale=stale)
+    
+    def _bump_versions(self, cells: List[Tuple[datetime, int]], workers: List[Optional[str]]) -> Versions:
+        """Record a change and return the new versions of what it touched"""
+        self.versions.bump(cells, workers)
+        return self.versions.read(cells, list(dict.fromkeys(w for w in workers if w is not None)))
+    
+    def _on_schedule_generated(self, event):
+        """A regenerated schedule invalidates every version read before it"""
+        self.versions.reset()
+    
     def assign_worker_to_shift(self, 
                               worker_id: str, 
                               shift_date: datetime, 
                               post_index: int,
                               user_id: Optional[str] = None,
-                              force: bool = False) -> UpdateResult:
+                              force: bool = False,
+                              expected_versions: Optional[Versions] = None) -> UpdateResult:
         """
         Assign a worker to a specific shift
         
@@ -64,54 +481,63 @@ class IncrementalUpdater:
             post_index: Post index (0-based)
             user_id: ID of user making the change
             force: Skip constraint validation if True
+            expected_versions: Versions read by the client; the assignment
+                fails with a rebase diff if any of them changed
             
         Returns:
             UpdateResult with success status and details
         """
         try:
-            # Validate inputs
-            if not self._validate_assignment_inputs(worker_id, shift_date, post_index):
-                return UpdateResult(False, "Invalid assignment parameters")
-            
-            # Create rollback data
-            rollback_data = self._create_assignment_rollback_data(shift_date, post_index)
-            
-            # Check constraints unless forced
-            if not force:
-                constraint_result = self._check_assignment_constraints(worker_id, shift_date, post_index)
-                if not constraint_result.success:
-                    return constraint_result
-            
-            # Store previous assignment
-            previous_worker = self.scheduler.schedule.get(shift_date, [None] * self.scheduler.num_shifts)[post_index]
-            
-            # Perform the assignment
-            if shift_date not in self.scheduler.schedule:
-                self.scheduler.schedule[shift_date] = [None] * self.scheduler.num_shifts
-            
-            self.scheduler.schedule[shift_date][post_index] = worker_id
-            
-            # Update tracking data
-            self._update_assignment_tracking(worker_id, shift_date, post_index, previous_worker)
-            
-            # Emit event
-            self.event_bus.emit(
-                EventType.SHIFT_ASSIGNED,
-                user_id=user_id,
-                worker_id=worker_id,
-                shift_date=shift_date.isoformat(),
-                post_index=post_index,
-                previous_worker=previous_worker
-            )
-            
-            logging.info(f"Worker {worker_id} assigned to {shift_date.strftime('%Y-%m-%d')} post {post_index}")
-            
-            return UpdateResult(
-                True, 
-                f"Successfully assigned {worker_id}",
-                rollback_data=rollback_data
-            )
-            
+            with self._locked_edit([(shift_date, post_index)], [worker_id], expected_versions):
+                conflict = self._version_conflict(expected_versions)
+                if conflict is not None:
+                    return conflict
+                
+                # Validate inputs
+                if not self._validate_assignment_inputs(worker_id, shift_date, post_index):
+                    return UpdateResult(False, "Invalid assignment parameters")
+                
+                # Create rollback data
+                rollback_data = self._create_assignment_rollback_data(shift_date, post_index)
+                
+                # Check constraints unless forced
+                if not force:
+                    constraint_result = self._check_assignment_constraints(worker_id, shift_date, post_index)
+                    if not constraint_result.success:
+                        return constraint_result
+                
+                # Store previous assignment
+                previous_worker = self.scheduler.schedule.get(shift_date, [None] * self.scheduler.num_shifts)[post_index]
+                
+                # Perform the assignment
+                if shift_date not in self.scheduler.schedule:
+                    self.scheduler.schedule[shift_date] = [None] * self.scheduler.num_shifts
+                
+                self.scheduler.schedule[shift_date][post_index] = worker_id
+                
+                # Update tracking data
+                self._update_assignment_tracking(worker_id, shift_date, post_index, previous_worker)
+                versions = self._bump_versions([(shift_date, post_index)], [worker_id, previous_worker])
+                
+                # Emit event
+                self.event_bus.emit(
+                    EventType.SHIFT_ASSIGNED,
+                    user_id=user_id,
+                    worker_id=worker_id,
+                    shift_date=shift_date.isoformat(),
+                    post_index=post_index,
+                    previous_worker=previous_worker
+                )
+                
+                logging.info(f"Worker {worker_id} assigned to {shift_date.strftime('%Y-%m-%d')} post {post_index}")
+                
+                return UpdateResult(
+                    True, 
+                    f"Successfully assigned {worker_id}",
+                    rollback_data=rollback_data,
+                    versions=versions
+                )
+                
         except Exception as e:
             logging.error(f"Error assigning worker: {e}")
             return UpdateResult(False, f"Assignment failed: {str(e)}")
@@ -119,7 +545,8 @@ class IncrementalUpdater:
     def unassign_worker_from_shift(self, 
                                   shift_date: datetime, 
                                   post_index: int,
-                                  user_id: Optional[str] = None) -> UpdateResult:
+                                  user_id: Optional[str] = None,
+                                  expected_versions: Optional[Versions] = None) -> UpdateResult:
         """
         Remove worker assignment from a specific shift
         
@@ -127,46 +554,54 @@ class IncrementalUpdater:
             shift_date: Date of the shift
             post_index: Post index (0-based)
             user_id: ID of user making the change
+            expected_versions: Versions read by the client (see assign_worker_to_shift)
             
         Returns:
             UpdateResult with success status and details
         """
         try:
-            # Validate inputs
-            if not self._validate_unassignment_inputs(shift_date, post_index):
-                return UpdateResult(False, "Invalid unassignment parameters")
-            
-            # Get current assignment
-            current_worker = self.scheduler.schedule.get(shift_date, [None] * self.scheduler.num_shifts)[post_index]
-            if current_worker is None:
-                return UpdateResult(False, "No worker assigned to this shift")
-            
-            # Create rollback data
-            rollback_data = self._create_unassignment_rollback_data(shift_date, post_index, current_worker)
-            
-            # Perform the unassignment
-            self.scheduler.schedule[shift_date][post_index] = None
-            
-            # Update tracking data
-            self._update_unassignment_tracking(current_worker, shift_date, post_index)
-            
-            # Emit event
-            self.event_bus.emit(
-                EventType.SHIFT_UNASSIGNED,
-                user_id=user_id,
-                worker_id=current_worker,
-                shift_date=shift_date.isoformat(),
-                post_index=post_index
-            )
-            
-            logging.info(f"Worker {current_worker} unassigned from {shift_date.strftime('%Y-%m-%d')} post {post_index}")
-            
-            return UpdateResult(
-                True, 
-                f"Successfully unassigned {current_worker}",
-                rollback_data=rollback_data
-            )
-            
+            with self._locked_edit([(shift_date, post_index)], [], expected_versions):
+                conflict = self._version_conflict(expected_versions)
+                if conflict is not None:
+                    return conflict
+                
+                # Validate inputs
+                if not self._validate_unassignment_inputs(shift_date, post_index):
+                    return UpdateResult(False, "Invalid unassignment parameters")
+                
+                # Get current assignment
+                current_worker = self.scheduler.schedule.get(shift_date, [None] * self.scheduler.num_shifts)[post_index]
+                if current_worker is None:
+                    return UpdateResult(False, "No worker assigned to this shift")
+                
+                # Create rollback data
+                rollback_data = self._create_unassignment_rollback_data(shift_date, post_index, current_worker)
+                
+                # Perform the unassignment
+                self.scheduler.schedule[shift_date][post_index] = None
+                
+                # Update tracking data
+                self._update_unassignment_tracking(current_worker, shift_date, post_index)
+                versions = self._bump_versions([(shift_date, post_index)], [current_worker])
+                
+                # Emit event
+                self.event_bus.emit(
+                    EventType.SHIFT_UNASSIGNED,
+                    user_id=user_id,
+                    worker_id=current_worker,
+                    shift_date=shift_date.isoformat(),
+                    post_index=post_index
+                )
+                
+                logging.info(f"Worker {current_worker} unassigned from {shift_date.strftime('%Y-%m-%d')} post {post_index}")
+                
+                return UpdateResult(
+                    True, 
+                    f"Successfully unassigned {current_worker}",
+                    rollback_data=rollback_data,
+                    versions=versions
+                )
+                
         except Exception as e:
             logging.error(f"Error unassigning worker: {e}")
             return UpdateResult(False, f"Unassignment failed: {str(e)}")
@@ -175,7 +610,8 @@ class IncrementalUpdater:
                     shift_date1: datetime, post_index1: int,
                     shift_date2: datetime, post_index2: int,
                     user_id: Optional[str] = None,
-                    force: bool = False) -> UpdateResult:
+                    force: bool = False,
+                    expected_versions: Optional[Versions] = None) -> UpdateResult:
         """
         Swap two worker assignments
         
@@ -186,139 +622,212 @@ class IncrementalUpdater:
             post_index2: Post index of second shift
             user_id: ID of user making the change
             force: Skip constraint validation if True
+            expected_versions: Versions read by the client (see assign_worker_to_shift)
             
         Returns:
             UpdateResult with success status and details
         """
         try:
-            # Get current assignments
-            worker1 = self.scheduler.schedule.get(shift_date1, [None] * self.scheduler.num_shifts)[post_index1]
-            worker2 = self.scheduler.schedule.get(shift_date2, [None] * self.scheduler.num_shifts)[post_index2]
-            
-            if worker1 is None and worker2 is None:
-                return UpdateResult(False, "No workers to swap")
-            
-            # Create rollback data
-            rollback_data = {
-                'shift1': {'date': shift_date1, 'post': post_index1, 'worker': worker1},
-                'shift2': {'date': shift_date2, 'post': post_index2, 'worker': worker2}
-            }
-            
-            # Check constraints unless forced
-            if not force:
-                constraint_result = self._check_swap_constraints(
-                    worker1, shift_date1, post_index1,
-                    worker2, shift_date2, post_index2
+            with self._locked_edit([(shift_date1, post_index1), (shift_date2, post_index2)], [],
+                                   expected_versions):
+                conflict = self._version_conflict(expected_versions)
+                if conflict is not None:
+                    return conflict
+                
+                # Get current assignments
+                worker1 = self.scheduler.schedule.get(shift_date1, [None] * self.scheduler.num_shifts)[post_index1]
+                worker2 = self.scheduler.schedule.get(shift_date2, [None] * self.scheduler.num_shifts)[post_index2]
+                
+                if worker1 is None and worker2 is None:
+                    return UpdateResult(False, "No workers to swap")
+                
+                # Create rollback data
+                rollback_data = {
+                    'shift1': {'date': shift_date1, 'post': post_index1, 'worker': worker1},
+                    'shift2': {'date': shift_date2, 'post': post_index2, 'worker': worker2}
+                }
+                
+                # Check constraints unless forced
+                if not force:
+                    constraint_result = self._check_swap_constraints(
+                        worker1, shift_date1, post_index1,
+                        worker2, shift_date2, post_index2
+                    )
+                    if not constraint_result.success:
+                        return constraint_result
+                
+                # Perform the swap
+                if shift_date1 not in self.scheduler.schedule:
+                    self.scheduler.schedule[shift_date1] = [None] * self.scheduler.num_shifts
+                if shift_date2 not in self.scheduler.schedule:
+                    self.scheduler.schedule[shift_date2] = [None] * self.scheduler.num_shifts
+                
+                self.scheduler.schedule[shift_date1][post_index1] = worker2
+                self.scheduler.schedule[shift_date2][post_index2] = worker1
+                
+                # Update tracking data for both workers
+                if worker1:
+                    self._update_unassignment_tracking(worker1, shift_date1, post_index1)
+                    if worker1 != worker2:  # Don't double-update if same worker
+                        self._update_assignment_tracking(worker1, shift_date2, post_index2, worker2)
+                
+                if worker2 and worker2 != worker1:
+                    self._update_unassignment_tracking(worker2, shift_date2, post_index2)
+                    self._update_assignment_tracking(worker2, shift_date1, post_index1, worker1)
+                versions = self._bump_versions([(shift_date1, post_index1), (shift_date2, post_index2)],
+                                               [worker1, worker2])
+                
+                # Emit event
+                self.event_bus.emit(
+                    EventType.SHIFT_SWAPPED,
+                    user_id=user_id,
+                    worker1=worker1,
+                    worker2=worker2,
+                    shift_date1=shift_date1.isoformat(),
+                    post_index1=post_index1,
+                    shift_date2=shift_date2.isoformat(),
+                    post_index2=post_index2
                 )
-                if not constraint_result.success:
-                    return constraint_result
-            
-            # Perform the swap
-            if shift_date1 not in self.scheduler.schedule:
-                self.scheduler.schedule[shift_date1] = [None] * self.scheduler.num_shifts
-            if shift_date2 not in self.scheduler.schedule:
-                self.scheduler.schedule[shift_date2] = [None] * self.scheduler.num_shifts
-            
-            self.scheduler.schedule[shift_date1][post_index1] = worker2
-            self.scheduler.schedule[shift_date2][post_index2] = worker1
-            
-            # Update tracking data for both workers
-            if worker1:
-                self._update_unassignment_tracking(worker1, shift_date1, post_index1)
-                if worker1 != worker2:  # Don't double-update if same worker
-                    self._update_assignment_tracking(worker1, shift_date2, post_index2, worker2)
-            
-            if worker2 and worker2 != worker1:
-                self._update_unassignment_tracking(worker2, shift_date2, post_index2)
-                self._update_assignment_tracking(worker2, shift_date1, post_index1, worker1)
-            
-            # Emit event
-            self.event_bus.emit(
-                EventType.SHIFT_SWAPPED,
-                user_id=user_id,
-                worker1=worker1,
-                worker2=worker2,
-                shift_date1=shift_date1.isoformat(),
-                post_index1=post_index1,
-                shift_date2=shift_date2.isoformat(),
-                post_index2=post_index2
-            )
-            
-            logging.info(f"Swapped workers: {worker1} <-> {worker2}")
-            
-            return UpdateResult(
-                True, 
-                f"Successfully swapped {worker1 or 'empty'} and {worker2 or 'empty'}",
-                rollback_data=rollback_data
-            )
-            
+                
+                logging.info(f"Swapped workers: {worker1} <-> {worker2}")
+                
+                return UpdateResult(
+                    True, 
+                    f"Successfully swapped {worker1 or 'empty'} and {worker2 or 'empty'}",
+                    rollback_data=rollback_data,
+                    versions=versions
+                )
+                
         except Exception as e:
             logging.error(f"Error swapping workers: {e}")
             return UpdateResult(False, f"Swap failed: {str(e)}")
     
-    def bulk_update(self, updates: List[Dict[str, Any]], user_id: Optional[str] = None) -> UpdateResult:
+    def begin_transaction(self, user_id: Optional[str] = None) -> ScheduleTransaction:
+        """
+        Start a transaction whose edits are validated together and applied atomically
+        
+        Args:
+            user_id: ID of user making the changes
+            
+        Returns:
+            Empty ScheduleTransaction
+        """
+        return ScheduleTransaction(self, user_id)
+    
+    def bulk_update(self, updates: List[Dict[str, Any]], user_id: Optional[str] = None,
+                    atomic: bool = True, expected_versions: Optional[Versions] = None) -> UpdateResult:
         """
         Perform multiple updates as a single operation
         
         Args:
             updates: List of update operations
             user_id: ID of user making the changes
+            atomic: Apply all updates or none (False applies each update on its own)
+            expected_versions: Versions read by the client; nothing is applied if any changed
             
         Returns:
             UpdateResult with overall success status
         """
+        if not atomic:
+            with self.locks.exclusive():
+                conflict = self._version_conflict(expected_versions)
+                if conflict is not None:
+                    return conflict
+                return self._bulk_update_partial(updates, user_id)
+        
+        try:
+            transaction = self.begin_transaction(user_id)
+            transaction.expect(expected_versions)
+            for i, update in enumerate(updates):
+                operation = update.get('operation')
+                try:
+                    if operation == 'assign':
+                        transaction.assign(
+                            update['worker_id'],
+                            datetime.fromisoformat(update['shift_date']),
+                            update['post_index'],
+                            force=update.get('force', False)
+                        )
+                    elif operation == 'unassign':
+                        transaction.unassign(
+                            datetime.fromisoformat(update['shift_date']),
+                            update['post_index']
+                        )
+                    elif operation == 'swap':
+                        transaction.swap(
+                            datetime.fromisoformat(update['shift_date1']),
+                            update['post_index1'],
+                            datetime.fromisoformat(update['shift_date2']),
+                            update['post_index2'],
+                            force=update.get('force', False)
+                        )
+                    else:
+                        transaction._add_item(str(operation), False)
+                        transaction._item_error(i, f"Unknown operation: {operation}")
+                except (KeyError, TypeError, ValueError) as e:
+                    if len(transaction._operations) == i:
+                        transaction._add_item(str(operation), False)
+                    transaction._item_error(i, f"Malformed update: {str(e)}")
+            
+            return transaction.commit()
+            
+        except Exception as e:
+            logging.error(f"Error in bulk update: {e}")
+            return UpdateResult(False, f"Bulk update failed: {str(e)}")
+    
+    def _bulk_update_partial(self, updates: List[Dict[str, Any]], user_id: Optional[str] = None) -> UpdateResult:
+        """Apply each update on its own, keeping the ones that succeed"""
         try:
             rollback_operations = []
             successful_updates = 0
             
-            for i, update in enumerate(updates):
-                operation = update.get('operation')
+            # Listeners receive the whole update as one BULK_UPDATE envelope
+            with self.event_bus.batch(user_id=user_id) as batch:
+                for i, update in enumerate(updates):
+                    operation = update.get('operation')
                 
-                if operation == 'assign':
-                    result = self.assign_worker_to_shift(
-                        update['worker_id'],
-                        datetime.fromisoformat(update['shift_date']),
-                        update['post_index'],
-                        user_id=user_id,
-                        force=update.get('force', False)
-                    )
-                elif operation == 'unassign':
-                    result = self.unassign_worker_from_shift(
-                        datetime.fromisoformat(update['shift_date']),
-                        update['post_index'],
-                        user_id=user_id
-                    )
-                elif operation == 'swap':
-                    result = self.swap_workers(
-                        datetime.fromisoformat(update['shift_date1']),
-                        update['post_index1'],
-                        datetime.fromisoformat(update['shift_date2']),
-                        update['post_index2'],
-                        user_id=user_id,
-                        force=update.get('force', False)
-                    )
-                else:
-                    logging.warning(f"Unknown operation in bulk update: {operation}")
-                    continue
-                
-                if result.success:
-                    successful_updates += 1
-                    rollback_operations.append({
-                        'operation': operation,
-                        'rollback_data': result.rollback_data,
-                        'index': i
-                    })
-                else:
-                    logging.warning(f"Bulk update operation {i} failed: {result.message}")
-            
-            # Emit bulk update event
-            self.event_bus.emit(
-                EventType.BULK_UPDATE,
-                user_id=user_id,
-                total_operations=len(updates),
-                successful_operations=successful_updates,
-                failed_operations=len(updates) - successful_updates
-            )
+                    if operation == 'assign':
+                        result = self.assign_worker_to_shift(
+                            update['worker_id'],
+                            datetime.fromisoformat(update['shift_date']),
+                            update['post_index'],
+                            user_id=user_id,
+                            force=update.get('force', False)
+                        )
+                    elif operation == 'unassign':
+                        result = self.unassign_worker_from_shift(
+                            datetime.fromisoformat(update['shift_date']),
+                            update['post_index'],
+                            user_id=user_id
+                        )
+                    elif operation == 'swap':
+                        result = self.swap_workers(
+                            datetime.fromisoformat(update['shift_date1']),
+                            update['post_index1'],
+                            datetime.fromisoformat(update['shift_date2']),
+                            update['post_index2'],
+                            user_id=user_id,
+                            force=update.get('force', False)
+                        )
+                    else:
+                        logging.warning(f"Unknown operation in bulk update: {operation}")
+                        continue
+                
+                    if result.success:
+                        successful_updates += 1
+                        rollback_operations.append({
+                            'operation': operation,
+                            'rollback_data': result.rollback_data,
+                            'index': i
+                        })
+                    else:
+                        logging.warning(f"Bulk update operation {i} failed: {result.message}")
+            
+                batch.update(
+                    total_operations=len(updates),
+                    successful_operations=successful_updates,
+                    failed_operations=len(updates) - successful_updates
+                )
             
             return UpdateResult(
                 successful_updates > 0,
@@ -352,8 +861,10 @@ class IncrementalUpdater:
         """Check if assignment violates constraints"""
         try:
             # Use the existing constraint checker
+            # Striped edits hold only their own dates and workers, so the
+            # schedule-wide synchronization check must not run here
             can_assign, reason = self.scheduler.constraint_checker._check_constraints(
-                worker_id, shift_date
+                worker_id, shift_date, check_sync=False
             )
             
             if not can_assign:
@@ -381,7 +892,7 @@ class IncrementalUpdater:
         if worker1:
             # For 7/14 day pattern and gap constraints, we need to keep the original assignments
             # but for incompatibility, we need to consider the swap
-            can_assign, reason = self.scheduler.constraint_checker._check_constraints(worker1, shift_date2)
+            can_assign, reason = self.scheduler.constraint_checker._check_constraints(worker1, shift_date2, check_sync=False)
             if not can_assign:
                 constraints_ok = False
                 conflicts.append(f"Worker {worker1} cannot take shift 2: {reason}")
@@ -399,7 +910,7 @@ class IncrementalUpdater:
         if worker2:
             # For 7/14 day pattern and gap constraints, we need to keep the original assignments
             # but for incompatibility, we need to consider the swap
-            can_assign, reason = self.scheduler.constraint_checker._check_constraints(worker2, shift_date1)
+            can_assign, reason = self.scheduler.constraint_checker._check_constraints(worker2, shift_date1, check_sync=False)
             if not can_assign:
                 constraints_ok = False
                 conflicts.append(f"Worker {worker2} cannot take shift 1: {reason}")
@@ -424,7 +935,7 @@ class IncrementalUpdater:
         
         for worker in self.scheduler.workers_data:
             worker_id = worker['id']
-            can_assign, _ = self.scheduler.constraint_checker._check_constraints(worker_id, shift_date)
+            can_assign, _ = self.scheduler.constraint_checker._check_constraints(worker_id, shift_date, check_sync=False)
             if can_assign:
                 suggestions.append(f"Worker {worker_id} is available")
                 if len(suggestions) >= 3:  # Limit suggestions
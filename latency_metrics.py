@@ -0,0 +1,310 @@
+"""
+Latency histograms for real-time operations.
+Each operation (assign, swap, undo, broadcast, ...) records its total
+duration and the time spent in each stage (validation, mutation, event
+dispatch) into fixed-bucket histograms, from which percentiles are read
+and exported as JSON or in the Prometheus text format.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock, local
+from typing import Dict, List, Optional, Tuple, Any, Iterator
+
+
+TOTAL_STAGE = 'total'
+
+# Bucket upper bounds in seconds: 10us to ~100s, four buckets per doubling,
+# so a percentile read from a bucket bound is within ~19% of the true value
+DEFAULT_BOUNDS: Tuple[float, ...] = tuple(1e-5 * 2 ** (i / 4) for i in range(94))
+
+REPORTED_PERCENTILES = (50, 95, 99)
+
+# Stage timers of the operations running on this thread
+_thread_state = local()
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, sum, min and max"""
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BOUNDS):
+        """
+        Initialize the histogram
+
+        Args:
+            bounds: Ascending bucket upper bounds in seconds; larger values
+                fall into an overflow bucket
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self._lock = Lock()
+
+    def record(self, seconds: float):
+        """Add one observation"""
+        index = bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds < self.min:
+                self.min = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """
+        Upper bound of the bucket holding the given percentile
+
+        Args:
+            percent: Percentile in 0-100
+
+        Returns:
+            Latency in seconds (clamped to the observed min/max), 0.0 if empty
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, -(-self.count * percent // 100))
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    break
+            bound = self.bounds[index] if index < len(self.bounds) else self.max
+            return min(max(bound, self.min), self.max)
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, total, average, min, max and the reported percentiles"""
+        with self._lock:
+            count, total, low, high = self.count, self.total, self.min, self.max
+        summary = {
+            'count': count,
+            'total_time': total,
+            'avg_time': total / count if count else 0.0,
+            'min_time': low if count else 0.0,
+            'max_time': high
+        }
+        for percent in REPORTED_PERCENTILES:
+            summary[f'p{percent}'] = self.percentile(percent)
+        return summary
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, observations at or below it) per bucket, ending with +Inf"""
+        with self._lock:
+            counts = list(self.counts)
+        result, seen = [], 0
+        for bound, count in zip(self.bounds + (float('inf'),), counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+
+class OperationTimer:
+    """Times one running operation and the stages inside it"""
+
+    def __init__(self, metrics: 'LatencyMetrics', operation: str):
+        self.metrics = metrics
+        self.operation = operation
+        self._started = time.perf_counter()
+        # [stage, start, time spent in nested stages]
+        self._stages: List[list] = []
+        self._stopped = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a stage of the operation
+
+        Nested stages are timed on their own and their time is excluded from
+        the enclosing stage, so stages add up to at most the total.
+        """
+        frame = [name, time.perf_counter(), 0.0]
+        self._stages.append(frame)
+        try:
+            yield
+        finally:
+            self._stages.pop()
+            elapsed = time.perf_counter() - frame[1]
+            if self._stages:
+                self._stages[-1][2] += elapsed
+            self.metrics.record(self.operation, elapsed - frame[2], stage=name)
+
+    def stop(self) -> float:
+        """
+        Record the operation's total duration (only the first call counts)
+
+        Returns:
+            Duration in seconds
+        """
+        elapsed = time.perf_counter() - self._started
+        if not self._stopped:
+            self._stopped = True
+            self.metrics.record(self.operation, elapsed)
+            stack = getattr(_thread_state, 'timers', None)
+            if stack and self in stack:
+                stack.remove(self)
+        return elapsed
+
+
+@contextmanager
+def current_stage(name: str) -> Iterator[None]:
+    """
+    Time a stage of the operation running on this thread, if any
+
+    Lets shared code (e.g. event dispatch) report its share of whichever
+    operation called it without knowing about that operation.
+    """
+    stack = getattr(_thread_state, 'timers', None)
+    if not stack:
+        yield
+        return
+    with stack[-1].stage(name):
+        yield
+
+
+class LatencyMetrics:
+    """Latency histograms per operation and stage"""
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BOUNDS):
+        """
+        Initialize the metrics
+
+        Args:
+            bounds: Bucket upper bounds in seconds for every histogram
+        """
+        self.bounds = bounds
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = Lock()
+
+    def histogram(self, operation: str, stage: str = TOTAL_STAGE) -> LatencyHistogram:
+        """Histogram of an operation stage, created on first use"""
+        key = (operation, stage)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram(self.bounds))
+        return histogram
+
+    def record(self, operation: str, seconds: float, stage: str = TOTAL_STAGE):
+        """
+        Record a duration
+
+        Args:
+            operation: Operation name
+            seconds: Duration in seconds
+            stage: Stage of the operation (TOTAL_STAGE for the whole operation)
+        """
+        self.histogram(operation, stage).record(seconds)
+
+    def start(self, operation: str) -> OperationTimer:
+        """
+        Start timing an operation on this thread
+
+        Stages timed with current_stage() on this thread are attributed to
+        it until stop() is called.
+        """
+        timer = OperationTimer(self, operation)
+        stack = getattr(_thread_state, 'timers', None)
+        if stack is None:
+            stack = _thread_state.timers = []
+        stack.append(timer)
+        return timer
+
+    @contextmanager
+    def time(self, operation: str) -> Iterator[OperationTimer]:
+        """Time an operation for the duration of a with block"""
+        timer = self.start(operation)
+        try:
+            yield timer
+        finally:
+            timer.stop()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Latency summary per operation
+
+        Returns:
+            {operation: {count, total_time, avg_time, min_time, max_time,
+            p50, p95, p99, 'stages': {stage: {...}}}}, in seconds
+        """
+        with self._lock:
+            items = sorted(self._histograms.items())
+        result: Dict[str, Any] = {}
+        for (operation, stage), histogram in items:
+            entry = result.setdefault(operation, {'stages': {}})
+            if stage == TOTAL_STAGE:
+                entry.update(histogram.summary())
+            else:
+                entry['stages'][stage] = histogram.summary()
+        return result
+
+    def to_json(self) -> str:
+        """Summary as a JSON document"""
+        return json.dumps(self.summary(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, name: str = 'scheduler_operation_latency_seconds') -> str:
+        """
+        All histograms in the Prometheus text exposition format
+
+        Args:
+            name: Metric family name
+
+        Returns:
+            Text with _bucket, _sum and _count series labelled by operation and stage
+        """
+        with self._lock:
+            items = sorted(self._histograms.items())
+        lines = [f'# HELP {name} Duration of real-time schedule operations by stage',
+                 f'# TYPE {name} histogram']
+        for (operation, stage), histogram in items:
+            labels = f'operation="{operation}",stage="{stage}"'
+            for bound, count in histogram.cumulative():
+                le = '+Inf' if bound == float('inf') else f'{bound:.6g}'
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.total:.9g}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str, fmt: str = 'json') -> str:
+        """
+        Write the metrics to a file, replacing it atomically
+
+        Args:
+            path: Output file
+            fmt: 'json' or 'prometheus'
+
+        Returns:
+            The path written
+        """
+        if fmt == 'json':
+            text = self.to_json()
+        elif fmt == 'prometheus':
+            text = self.to_prometheus()
+        else:
+            raise ValueError(f"Unknown latency export format: {fmt}")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.latency_')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        logging.info(f"Latency metrics exported to {path} ({fmt})")
+        return path
+
+    def reset(self):
+        """Drop every histogram"""
+        with self._lock:
+            self._histograms.clear()
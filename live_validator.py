@@ -6,10 +6,14 @@ Provides instant validation when schedule changes are made.
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any, Set
 import logging
+import threading
+from contextlib import nullcontext
 from dataclasses import dataclass
 from enum import Enum
 
-from event_bus import get_event_bus, EventType
+from event_bus import get_event_bus, EventType, DeliveryMode, unpack_bulk_event
+from suggestion_index import SuggestionIndex
+from conflict_store import ConflictStore
 
 
 class ValidationSeverity(Enum):
@@ -54,20 +58,47 @@ class ConflictInfo:
 class LiveValidator:
     """Real-time constraint validation engine"""
     
-    def __init__(self, scheduler):
+    def __init__(self, scheduler, locks=None):
         """
         Initialize the live validator
         
         Args:
             scheduler: The main Scheduler instance
+            locks: ScheduleLocks holding edits off while the maintained state
+                is brought up to date from the live schedule (optional)
         """
         self.scheduler = scheduler
+        self.locks = locks
         self.event_bus = get_event_bus()
         
         # Validation caches for performance
         self._constraint_cache: Dict[str, ValidationResult] = {}
         self._conflict_cache: Dict[str, List[ConflictInfo]] = {}
         
+        # Live violation state: violations of assigned cells and per-worker
+        # (weekend limit) violations, kept current by revalidating only the
+        # dates and workers marked dirty by schedule events.
+        self._state_lock = threading.RLock()
+        self._cell_violations: Dict[Tuple[datetime, int], ValidationResult] = {}
+        self._worker_violations: Dict[str, ValidationResult] = {}
+        self._dirty_dates: Set[datetime] = set()
+        self._dirty_workers: Set[str] = set()
+        self._state_built = False
+        
+        # Tracking is checked against the schedule once, then kept in sync by events
+        self._sync_verified = False
+        
+        # Eligible workers per date for suggestions
+        self.suggestion_index = SuggestionIndex(self)
+        
+        # Detected conflicts bucketed by date
+        self.conflict_store = ConflictStore(
+            scheduler,
+            detect_date=lambda shift_date: self._detect_incompatibility_conflicts(shift_date, shift_date),
+            detect_worker=self._detect_worker_gap_violations,
+            locks=locks
+        )
+        
         # Subscribe to relevant events
         self._setup_event_listeners()
         
@@ -75,9 +106,15 @@ class LiveValidator:
     
     def _setup_event_listeners(self):
         """Set up event listeners for automatic validation"""
+        # Cache invalidation must happen before publish() returns so that a
+        # following validation never reads stale results; the validation
+        # itself may run on the dispatch pool.
+        for event_type in (EventType.SHIFT_ASSIGNED, EventType.SHIFT_UNASSIGNED,
+                           EventType.SHIFT_SWAPPED, EventType.BULK_UPDATE, EventType.SCHEDULE_GENERATED):
+            self.event_bus.subscribe(event_type, self._on_schedule_changed, delivery=DeliveryMode.SYNC)
         self.event_bus.subscribe(EventType.SHIFT_ASSIGNED, self._on_shift_assigned)
-        self.event_bus.subscribe(EventType.SHIFT_UNASSIGNED, self._on_shift_unassigned)
         self.event_bus.subscribe(EventType.SHIFT_SWAPPED, self._on_shift_swapped)
+        self.event_bus.subscribe(EventType.BULK_UPDATE, self._on_bulk_update)
     
     def validate_assignment(self, worker_id: str, shift_date: datetime, post_index: int) -> ValidationResult:
         """
@@ -92,8 +129,10 @@ class LiveValidator:
             ValidationResult with validation details
         """
         try:
-            # ENHANCED: Ensure data synchronization before validation
-            if hasattr(self.scheduler, '_ensure_data_synchronization'):
+            # ENHANCED: Ensure data synchronization before validation. Schedule
+            # events keep tracking in sync afterwards, so the full check only
+            # runs again after invalidate() or a regenerated schedule.
+            if not self._sync_verified and hasattr(self.scheduler, '_ensure_data_synchronization'):
                 if not self.scheduler._ensure_data_synchronization():
                     return ValidationResult(
                         is_valid=False,
@@ -102,6 +141,7 @@ class LiveValidator:
                         constraint_type="data_synchronization",
                         suggestions=["Run schedule rebuild to fix synchronization issues"]
                     )
+                self._sync_verified = True
             
             # Check basic availability
             availability_result = self._check_worker_availability(worker_id, shift_date)
@@ -144,22 +184,30 @@ class LiveValidator:
                 constraint_type="system_error"
             )
     
-    def validate_schedule_integrity(self, check_partial: bool = False) -> List[ValidationResult]:
+    def validate_schedule_integrity(self, check_partial: bool = False,
+                                    quick_check: bool = False) -> List[ValidationResult]:
         """
         Validate the entire schedule for integrity including data synchronization
         
         Args:
             check_partial: If True, validate even partially filled schedules
+            quick_check: If True, return only the live constraint violations,
+                revalidating just the dates and workers changed since the last call
             
         Returns:
             List of validation results
         """
+        if quick_check:
+            return self.get_violations()
+        
         results = []
         
         try:
             # ENHANCED: First check data synchronization
             sync_result = self._check_data_synchronization()
             results.append(sync_result)
+            if not sync_result.is_valid:
+                self.invalidate()
             
             # Check for constraint violations
             constraint_violations = self._find_all_constraint_violations()
@@ -253,6 +301,10 @@ class LiveValidator:
         """
         Detect conflicts in the schedule
         
+        Incompatibility and gap conflicts come from the conflict store, so a
+        range query only touches the conflicts in that range. With a range,
+        workload imbalances are reported for the workers assigned in it.
+        
         Args:
             date_range: Optional date range to check (start, end)
             
@@ -269,20 +321,22 @@ class LiveValidator:
                 start_date = self.scheduler.start_date
                 end_date = self.scheduler.end_date
             
-            # Check for incompatible workers on same shifts
-            incompatibility_conflicts = self._detect_incompatibility_conflicts(start_date, end_date)
-            conflicts.extend(incompatibility_conflicts)
-            
-            # Check for gap violations
-            gap_conflicts = self._detect_gap_violations(start_date, end_date)
-            conflicts.extend(gap_conflicts)
+            # Incompatible workers on same shifts and gap violations
+            conflicts.extend(self.conflict_store.query(*(date_range or (None, None))))
             
             # Check for weekend limit violations
             weekend_conflicts = self._detect_weekend_violations(start_date, end_date)
             conflicts.extend(weekend_conflicts)
             
             # Check for workload imbalances
-            workload_conflicts = self._detect_workload_imbalances()
+            workers = None
+            if date_range:
+                workers = set()
+                current_date = start_date
+                while current_date <= end_date:
+                    workers.update(w for w in self.scheduler.schedule.get(current_date, []) if w is not None)
+                    current_date += timedelta(days=1)
+            workload_conflicts = self._detect_workload_imbalances(workers)
             conflicts.extend(workload_conflicts)
             
             return conflicts
@@ -291,56 +345,45 @@ class LiveValidator:
             logging.error(f"Error detecting conflicts: {e}")
             return []
     
-    def get_suggestions_for_date(self, shift_date: datetime, post_index: int) -> List[str]:
+    def get_suggestions_for_date(self, shift_date: datetime, post_index: int, limit: int = 5) -> List[str]:
         """
         Get worker suggestions for a specific date and post
         
         Args:
             shift_date: Date of the shift
             post_index: Post index
+            limit: Maximum number of suggestions
             
         Returns:
             List of suggested workers
         """
-        suggestions = []
-        
         try:
-            for worker in self.scheduler.workers_data:
-                worker_id = worker['id']
-                
-                # Skip if worker is already assigned on this date
-                if shift_date in self.scheduler.worker_assignments.get(worker_id, set()):
-                    continue
-                
-                # Validate the assignment
-                result = self.validate_assignment(worker_id, shift_date, post_index)
-                
-                if result.is_valid:
-                    # Calculate priority based on various factors
-                    priority = self._calculate_assignment_priority(worker_id, shift_date)
-                    suggestions.append({
-                        'worker_id': worker_id,
-                        'priority': priority,
-                        'reason': self._get_suggestion_reason(worker_id, shift_date)
-                    })
-                elif result.severity == ValidationSeverity.WARNING:
-                    # Include with lower priority if only warnings
-                    priority = self._calculate_assignment_priority(worker_id, shift_date) * 0.5
-                    suggestions.append({
-                        'worker_id': worker_id,
-                        'priority': priority,
-                        'reason': f"Available (with warnings): {result.message}"
-                    })
-            
-            # Sort by priority
-            suggestions.sort(key=lambda x: x['priority'], reverse=True)
-            
-            return [s['worker_id'] + ': ' + s['reason'] for s in suggestions[:5]]
+            return self.suggestion_index.top_k(shift_date, limit)
             
         except Exception as e:
             logging.error(f"Error generating suggestions: {e}")
             return []
     
+    def prefetch_suggestions(self, start_date: datetime, end_date: datetime,
+                             limit: int = 5) -> Dict[Tuple[datetime, int], List[str]]:
+        """
+        Get worker suggestions for every empty cell in a date range in one call
+        
+        Args:
+            start_date: First date of the range (e.g. the visible month)
+            end_date: Last date of the range
+            limit: Maximum number of suggestions per cell
+            
+        Returns:
+            Dict mapping (date, post index) of empty cells to suggested workers
+        """
+        try:
+            return self.suggestion_index.prefetch(start_date, end_date, limit)
+            
+        except Exception as e:
+            logging.error(f"Error prefetching suggestions: {e}")
+            return {}
+    
     def _check_worker_availability(self, worker_id: str, shift_date: datetime) -> ValidationResult:
         """Check if worker is available on the given date"""
         # Check if worker is already assigned
@@ -401,9 +444,12 @@ class LiveValidator:
             constraint_type="incompatibility"
         )
     
-    def _check_gap_constraints(self, worker_id: str, shift_date: datetime) -> ValidationResult:
+    def _check_gap_constraints(self, worker_id: str, shift_date: datetime,
+                               assignments: Optional[Set[datetime]] = None) -> ValidationResult:
         """Check minimum gap between shifts including 7/14 day pattern and Friday-Monday rules"""
-        worker_assignments = self.scheduler.worker_assignments.get(worker_id, set())
+        if assignments is None:
+            assignments = self.scheduler.worker_assignments.get(worker_id, set())
+        worker_assignments = assignments
         
         # Get worker data for part-time adjustments
         worker_data = next((w for w in self.scheduler.workers_data if w['id'] == worker_id), None)
@@ -532,16 +578,210 @@ class LiveValidator:
     
     def _find_all_constraint_violations(self) -> List[ValidationResult]:
         """Find all constraint violations in the current schedule"""
-        violations = []
+        return self.get_violations()
+    
+    def get_violations(self) -> List[ValidationResult]:
+        """
+        Get the constraint violations of the current schedule
         
-        for date, shifts in self.scheduler.schedule.items():
-            for post_index, worker_id in enumerate(shifts):
-                if worker_id is not None:
-                    result = self.validate_assignment(worker_id, date, post_index)
-                    if not result.is_valid:
-                        violations.append(result)
+        Only dates and workers changed since the last call are revalidated;
+        the first call validates the whole schedule.
+        
+        Returns:
+            List of violations of assigned cells and per-worker limits
+        """
+        with self._reading(), self._state_lock:
+            self._refresh_violations()
+            return list(self._cell_violations.values()) + list(self._worker_violations.values())
+    
+    def invalidate(self):
+        """Drop the live violation state (call after editing the schedule without events)"""
+        with self._state_lock:
+            self._state_built = False
+            self._sync_verified = False
+            self._dirty_dates.clear()
+            self._dirty_workers.clear()
+        self.suggestion_index.clear()
+        self.conflict_store.clear()
+    
+    @staticmethod
+    def _touched_by(event) -> Optional[Tuple[Set[datetime], Set[str]]]:
+        """
+        Dates and workers touched by a schedule event
+        
+        Returns:
+            (dates, workers), or None if the event may have changed anything
+        """
+        dates: Set[datetime] = set()
+        workers: Set[str] = set()
+        data = event.data
+        if event.event_type in (EventType.SHIFT_ASSIGNED, EventType.SHIFT_UNASSIGNED):
+            dates.add(datetime.fromisoformat(data['shift_date']))
+            workers.update(w for w in (data.get('worker_id'), data.get('previous_worker')) if w)
+        elif event.event_type == EventType.SHIFT_SWAPPED:
+            dates.add(datetime.fromisoformat(data['shift_date1']))
+            dates.add(datetime.fromisoformat(data['shift_date2']))
+            workers.update(w for w in (data.get('worker1'), data.get('worker2')) if w)
+        elif event.event_type == EventType.BULK_UPDATE:
+            for inner_event in unpack_bulk_event(event):
+                touched = LiveValidator._touched_by(inner_event)
+                if touched is None:
+                    return None
+                dates |= touched[0]
+                workers |= touched[1]
+        else:
+            return None
+        return dates, workers
+    
+    def _mark_dirty(self, event):
+        """Mark the dates and workers touched by a schedule event for revalidation"""
+        try:
+            touched = self._touched_by(event)
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(f"Schedule event {event.event_type.value} not understood ({e}), revalidating everything")
+            touched = None
+        
+        if touched is None:
+            self.invalidate()
+            return
+        
+        dates, workers = touched
+        with self._state_lock:
+            if self._state_built:
+                self._dirty_dates |= dates
+                self._dirty_workers |= workers
+        self.suggestion_index.mark_changed(dates, workers)
+        self.conflict_store.mark_changed(dates, workers)
+    
+    def _reading(self):
+        """Locks to hold (before _state_lock) while reading the live schedule"""
+        return self.locks.reading() if self.locks is not None else nullcontext()
+    
+    def _refresh_violations(self):
+        """
+        Revalidate dirty dates and workers (everything on the first call)
+        
+        The caller holds _reading() and _state_lock. Dates and workers stay
+        dirty until they are revalidated, so a failed refresh is retried.
+        """
+        schedule = self.scheduler.schedule
+        worker_assignments = self.scheduler.worker_assignments
+        
+        if not self._state_built:
+            self._cell_violations.clear()
+            self._worker_violations.clear()
+            dates = set(schedule)
+            workers = {w for w, assignments in worker_assignments.items() if assignments}
+        else:
+            if not self._dirty_dates and not self._dirty_workers:
+                return
+            dates, workers = set(self._dirty_dates), set(self._dirty_workers)
+        
+        # Cells on dirty dates, plus every cell of dirty workers (gaps span dates)
+        cells = {(d, p) for d in dates for p in range(len(schedule.get(d, [])))}
+        for worker_id in workers:
+            for d in worker_assignments.get(worker_id, ()):
+                for p, assigned in enumerate(schedule.get(d, [])):
+                    if assigned == worker_id:
+                        cells.add((d, p))
+        
+        for cell in cells:
+            self._cell_violations.pop(cell, None)
+            shift_date, post_index = cell
+            row = schedule.get(shift_date)
+            if not row or post_index >= len(row) or row[post_index] is None:
+                continue
+            result = self._validate_existing_assignment(row[post_index], shift_date, post_index)
+            if not result.is_valid:
+                self._cell_violations[cell] = result
         
-        return violations
+        for worker_id in workers:
+            self._worker_violations.pop(worker_id, None)
+            result = self._check_worker_limits(worker_id)
+            if not result.is_valid:
+                self._worker_violations[worker_id] = result
+        
+        self._state_built = True
+        self._dirty_dates -= dates
+        self._dirty_workers -= workers
+    
+    def _validate_existing_assignment(self, worker_id: str, shift_date: datetime, post_index: int) -> ValidationResult:
+        """Validate a worker already assigned to a cell against the rest of the schedule"""
+        try:
+            row = self.scheduler.schedule.get(shift_date, [])
+            date_str = shift_date.strftime('%Y-%m-%d')
+            if row.count(worker_id) > 1:
+                return ValidationResult(
+                    is_valid=False,
+                    severity=ValidationSeverity.ERROR,
+                    message=f"Worker {worker_id} is assigned more than once on {date_str}",
+                    constraint_type="double_assignment",
+                    affected_items=[worker_id]
+                )
+            
+            checker = getattr(self.scheduler, 'constraint_checker', None)
+            if checker:
+                if checker._get_worker_data(worker_id) and checker._is_worker_off(worker_id, shift_date):
+                    return ValidationResult(
+                        is_valid=False,
+                        severity=ValidationSeverity.ERROR,
+                        message=f"Worker {worker_id} is unavailable on {date_str}",
+                        constraint_type="unavailable",
+                        affected_items=[worker_id]
+                    )
+                for i, other in enumerate(row):
+                    if i != post_index and other is not None and checker._are_workers_incompatible(worker_id, other):
+                        return ValidationResult(
+                            is_valid=False,
+                            severity=ValidationSeverity.ERROR,
+                            message=f"Worker {worker_id} is incompatible with {other} on {date_str}",
+                            constraint_type="incompatibility",
+                            affected_items=[worker_id, other]
+                        )
+            
+            assignments = self.scheduler.worker_assignments.get(worker_id, set())
+            gap_result = self._check_gap_constraints(worker_id, shift_date, assignments=assignments - {shift_date})
+            if not gap_result.is_valid:
+                gap_result.affected_items = [worker_id, date_str] + gap_result.affected_items
+                return gap_result
+            
+            return ValidationResult(
+                is_valid=True,
+                severity=ValidationSeverity.INFO,
+                message="Assignment is valid",
+                constraint_type="all"
+            )
+            
+        except Exception as e:
+            logging.error(f"Error validating assignment of {worker_id} on {shift_date}: {e}", exc_info=True)
+            return ValidationResult(
+                is_valid=False,
+                severity=ValidationSeverity.ERROR,
+                message=f"Validation error: {str(e)}",
+                constraint_type="system_error"
+            )
+    
+    def _check_worker_limits(self, worker_id: str) -> ValidationResult:
+        """Check a worker's current assignments against the weekend/holiday limits"""
+        checker = getattr(self.scheduler, 'constraint_checker', None)
+        assignments = self.scheduler.worker_assignments.get(worker_id, set())
+        weekend_dates = [d for d in assignments if checker and checker.is_weekend_day(d)]
+        
+        if weekend_dates and checker._would_exceed_weekend_limit(worker_id, max(weekend_dates), assignments=assignments):
+            return ValidationResult(
+                is_valid=False,
+                severity=ValidationSeverity.ERROR,
+                message=f"Weekend/holiday limit exceeded for worker {worker_id}",
+                constraint_type="weekend_limit",
+                affected_items=[worker_id]
+            )
+        
+        return ValidationResult(
+            is_valid=True,
+            severity=ValidationSeverity.INFO,
+            message="Weekend/holiday limits satisfied",
+            constraint_type="weekend_limit"
+        )
     
     def _check_schedule_completeness(self) -> ValidationResult:
         """Check if schedule is complete"""
@@ -648,26 +888,24 @@ class LiveValidator:
         
         return conflicts
     
-    def _detect_gap_violations(self, start_date: datetime, end_date: datetime) -> List[ConflictInfo]:
-        """Detect gap constraint violations"""
+    def _detect_worker_gap_violations(self, worker_id: str) -> List[ConflictInfo]:
+        """Detect gap constraint violations between one worker's assignments"""
         conflicts = []
+        assignments_list = sorted(self.scheduler.worker_assignments.get(worker_id, ()))
         
-        for worker_id, assignments in self.scheduler.worker_assignments.items():
-            assignments_list = sorted(list(assignments))
-            
-            for i in range(len(assignments_list) - 1):
-                gap = (assignments_list[i+1] - assignments_list[i]).days
-                if 0 < gap < self.scheduler.gap_between_shifts:
-                    conflicts.append(ConflictInfo(
-                        conflict_type="gap_violation",
-                        description=f"Worker {worker_id} has {gap} day gap (minimum: {self.scheduler.gap_between_shifts})",
-                        severity=ValidationSeverity.ERROR,
-                        workers_involved=[worker_id],
-                        dates_involved=[assignments_list[i], assignments_list[i+1]],
-                        resolution_suggestions=[
-                            f"Reassign worker {worker_id} from one of the conflicting dates"
-                        ]
-                    ))
+        for i in range(len(assignments_list) - 1):
+            gap = (assignments_list[i+1] - assignments_list[i]).days
+            if 0 < gap < self.scheduler.gap_between_shifts:
+                conflicts.append(ConflictInfo(
+                    conflict_type="gap_violation",
+                    description=f"Worker {worker_id} has {gap} day gap (minimum: {self.scheduler.gap_between_shifts})",
+                    severity=ValidationSeverity.ERROR,
+                    workers_involved=[worker_id],
+                    dates_involved=[assignments_list[i], assignments_list[i+1]],
+                    resolution_suggestions=[
+                        f"Reassign worker {worker_id} from one of the conflicting dates"
+                    ]
+                ))
         
         return conflicts
     
@@ -680,8 +918,8 @@ class LiveValidator:
         
         return conflicts
     
-    def _detect_workload_imbalances(self) -> List[ConflictInfo]:
-        """Detect significant workload imbalances"""
+    def _detect_workload_imbalances(self, workers: Optional[Set[str]] = None) -> List[ConflictInfo]:
+        """Detect significant workload imbalances (optionally only for some workers)"""
         conflicts = []
         
         workloads = {worker_id: len(assignments) 
@@ -693,6 +931,8 @@ class LiveValidator:
         avg_workload = sum(workloads.values()) / len(workloads)
         
         for worker_id, workload in workloads.items():
+            if workers is not None and worker_id not in workers:
+                continue
             deviation = abs(workload - avg_workload)
             if deviation > avg_workload * 0.5:  # 50% deviation threshold
                 conflicts.append(ConflictInfo(
@@ -708,112 +948,65 @@ class LiveValidator:
         
         return conflicts
     
-    def _calculate_assignment_priority(self, worker_id: str, shift_date: datetime) -> float:
-        """Calculate priority score for assignment suggestion"""
-        priority = 1.0
-        
-        # Factor in current workload (prefer less loaded workers)
-        current_workload = len(self.scheduler.worker_assignments.get(worker_id, set()))
-        avg_workload = sum(len(assignments) for assignments in self.scheduler.worker_assignments.values()) / len(self.scheduler.worker_assignments)
-        if current_workload < avg_workload:
-            priority += 0.5
-        
-        # Factor in work percentage
-        worker_data = next((w for w in self.scheduler.workers_data if w['id'] == worker_id), None)
-        if worker_data:
-            work_percentage = worker_data.get('work_percentage', 100)
-            priority *= work_percentage / 100
-        
-        # Factor in recent assignments (prefer workers with more gap)
-        worker_assignments = self.scheduler.worker_assignments.get(worker_id, set())
-        if worker_assignments:
-            last_assignment = max(worker_assignments)
-            days_since_last = (shift_date - last_assignment).days
-            if days_since_last > self.scheduler.gap_between_shifts:
-                priority += 0.3
-        else:
-            priority += 0.5  # Prefer workers with no assignments
-        
-        return priority
-    
-    def _get_suggestion_reason(self, worker_id: str, shift_date: datetime) -> str:
-        """Get human-readable reason for suggestion"""
-        current_workload = len(self.scheduler.worker_assignments.get(worker_id, set()))
-        
-        if current_workload == 0:
-            return "No current assignments"
-        
-        worker_assignments = self.scheduler.worker_assignments.get(worker_id, set())
-        if worker_assignments:
-            last_assignment = max(worker_assignments)
-            days_since_last = (shift_date - last_assignment).days
-            return f"Good gap: {days_since_last} days since last shift"
-        
-        return "Available and suitable"
+    def _on_schedule_changed(self, event):
+        """Clear validation caches and mark changed dates/workers after any schedule change"""
+        self._constraint_cache.clear()
+        self._conflict_cache.clear()
+        self._mark_dirty(event)
     
     def _on_shift_assigned(self, event):
         """Handle shift assignment events"""
-        # Clear relevant caches
-        self._constraint_cache.clear()
-        self._conflict_cache.clear()
-        
-        # Validate the assignment
-        worker_id = event.data.get('worker_id')
-        shift_date = datetime.fromisoformat(event.data.get('shift_date'))
-        post_index = event.data.get('post_index')
-        
-        if worker_id and shift_date is not None and post_index is not None:
-            result = self.validate_assignment(worker_id, shift_date, post_index)
-            if not result.is_valid:
-                self.event_bus.emit(
-                    EventType.CONSTRAINT_VIOLATION,
-                    worker_id=worker_id,
-                    shift_date=shift_date.isoformat(),
-                    post_index=post_index,
-                    violation_type=result.constraint_type,
-                    message=result.message
-                )
+        # Report violations of the new assignment from the live state
+        self._report_violations([(event.data.get('shift_date'), event.data.get('post_index'))])
     
-    def _on_shift_unassigned(self, event):
-        """Handle shift unassignment events"""
-        # Clear relevant caches
-        self._constraint_cache.clear()
-        self._conflict_cache.clear()
+    def _on_bulk_update(self, event):
+        """Validate the assignments carried by a batched envelope"""
+        cells = []
+        for inner_event in unpack_bulk_event(event):
+            data = inner_event.data
+            if inner_event.event_type == EventType.SHIFT_ASSIGNED:
+                cells.append((data.get('shift_date'), data.get('post_index')))
+            elif inner_event.event_type == EventType.SHIFT_SWAPPED:
+                cells.append((data.get('shift_date1'), data.get('post_index1')))
+                cells.append((data.get('shift_date2'), data.get('post_index2')))
+        self._report_violations(cells)
     
     def _on_shift_swapped(self, event):
         """Handle shift swap events"""
-        # Clear relevant caches
-        self._constraint_cache.clear()
-        self._conflict_cache.clear()
-        
-        # Validate both new assignments
-        worker1 = event.data.get('worker1')
-        worker2 = event.data.get('worker2')
+        # Report violations of both new assignments
+        self._report_violations([
+            (event.data.get('shift_date1'), event.data.get('post_index1')),
+            (event.data.get('shift_date2'), event.data.get('post_index2'))
+        ])
+    
+    def _report_violations(self, cells: List[Tuple[Optional[str], Optional[int]]]):
+        """
+        Emit a CONSTRAINT_VIOLATION for each changed cell that now violates a constraint
         
-        if worker1:
-            shift_date2 = datetime.fromisoformat(event.data.get('shift_date2'))
-            post_index2 = event.data.get('post_index2')
-            result = self.validate_assignment(worker1, shift_date2, post_index2)
-            if not result.is_valid:
-                self.event_bus.emit(
-                    EventType.CONSTRAINT_VIOLATION,
-                    worker_id=worker1,
-                    shift_date=shift_date2.isoformat(),
-                    post_index=post_index2,
-                    violation_type=result.constraint_type,
-                    message=result.message
-                )
+        Args:
+            cells: (ISO date, post index) of the cells that changed
+        """
+        reported = []
+        with self._reading(), self._state_lock:
+            self._refresh_violations()
+            for date_str, post_index in cells:
+                if date_str is None or post_index is None:
+                    continue
+                shift_date = datetime.fromisoformat(date_str)
+                row = self.scheduler.schedule.get(shift_date, [])
+                worker_id = row[post_index] if post_index < len(row) else None
+                if worker_id is None:
+                    continue
+                result = self._cell_violations.get((shift_date, post_index)) or self._worker_violations.get(worker_id)
+                if result:
+                    reported.append((worker_id, shift_date, post_index, result))
         
-        if worker2:
-            shift_date1 = datetime.fromisoformat(event.data.get('shift_date1'))
-            post_index1 = event.data.get('post_index1')
-            result = self.validate_assignment(worker2, shift_date1, post_index1)
-            if not result.is_valid:
-                self.event_bus.emit(
-                    EventType.CONSTRAINT_VIOLATION,
-                    worker_id=worker2,
-                    shift_date=shift_date1.isoformat(),
-                    post_index=post_index1,
-                    violation_type=result.constraint_type,
-                    message=result.message
-                )
\ No newline at end of file
+        for worker_id, shift_date, post_index, result in reported:
+            self.event_bus.emit(
+                EventType.CONSTRAINT_VIOLATION,
+                worker_id=worker_id,
+                shift_date=shift_date.isoformat(),
+                post_index=post_index,
+                violation_type=result.constraint_type,
+                message=result.message
+            )
@@ -0,0 +1,338 @@
+"""
+Hierarchical resource locking for collaborative schedule editing.
+Resources form a tree (schedule -> month -> date -> cell). Read/write locks
+on a node place intention locks on its ancestors, so a date range can be
+locked in one operation and conflicts are found without scanning every lock.
+Expired locks are released from a min-heap of expiry times.
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Dict, List, Optional, Tuple, Any, Iterator
+
+from exceptions import SchedulerError
+
+
+# Explicit lock modes and the intention mode they place on ancestors
+SHARED = 'S'
+EXCLUSIVE = 'X'
+INTENT_SHARED = 'IS'
+INTENT_EXCLUSIVE = 'IX'
+
+LOCK_TYPE_MODES = {'read': SHARED, 'write': EXCLUSIVE, 'exclusive': EXCLUSIVE}
+INTENT_FOR = {SHARED: INTENT_SHARED, EXCLUSIVE: INTENT_EXCLUSIVE}
+
+# Pairs of modes that two different users may hold on the same node
+_COMPATIBLE = {
+    (INTENT_SHARED, INTENT_SHARED), (INTENT_SHARED, INTENT_EXCLUSIVE), (INTENT_SHARED, SHARED),
+    (INTENT_EXCLUSIVE, INTENT_SHARED), (INTENT_EXCLUSIVE, INTENT_EXCLUSIVE),
+    (SHARED, INTENT_SHARED), (SHARED, SHARED),
+}
+
+ROOT_RESOURCE = 'schedule'
+
+# Resource path: () for the schedule, (month,), (month, date) or (month, date, post)
+ResourcePath = Tuple[str, ...]
+
+
+def resource_path(resource_id: str) -> ResourcePath:
+    """
+    Map a resource id to its path in the resource tree
+
+    Accepted ids: 'schedule', 'month_YYYY-MM', 'date_<ISO date>' and
+    'shift_<ISO date>_<post>'. Any other id is a standalone resource
+    directly under the schedule.
+
+    Args:
+        resource_id: Resource id
+
+    Returns:
+        Resource path
+    """
+    try:
+        if resource_id == ROOT_RESOURCE:
+            return ()
+        if resource_id.startswith('month_'):
+            month = datetime.strptime(resource_id[6:], '%Y-%m').strftime('%Y-%m')
+            return (month,)
+        if resource_id.startswith('date_'):
+            day = datetime.fromisoformat(resource_id[5:]).date()
+            return (day.strftime('%Y-%m'), day.isoformat())
+        if resource_id.startswith('shift_'):
+            date_part, post = resource_id[6:].rsplit('_', 1)
+            day = datetime.fromisoformat(date_part).date()
+            return (day.strftime('%Y-%m'), day.isoformat(), str(int(post)))
+    except ValueError:
+        pass
+    return ('~' + resource_id,)
+
+
+def path_resource_id(path: ResourcePath) -> str:
+    """Canonical resource id of a path (inverse of resource_path)"""
+    if not path:
+        return ROOT_RESOURCE
+    if path[0].startswith('~'):
+        return path[0][1:]
+    if len(path) == 1:
+        return f"month_{path[0]}"
+    if len(path) == 2:
+        return f"date_{path[1]}"
+    return f"shift_{path[1]}_{path[2]}"
+
+
+def range_paths(start_date: datetime, end_date: datetime) -> List[ResourcePath]:
+    """
+    Fewest nodes covering a date range: whole months as month nodes, the rest as dates
+
+    Args:
+        start_date: First date (inclusive)
+        end_date: Last date (inclusive)
+
+    Returns:
+        List of resource paths
+    """
+    if end_date < start_date:
+        raise SchedulerError(f"Invalid lock range {start_date} - {end_date}")
+
+    paths = []
+    day = start_date.date() if isinstance(start_date, datetime) else start_date
+    last = end_date.date() if isinstance(end_date, datetime) else end_date
+    while day <= last:
+        month_start = day.replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        month_end = next_month - timedelta(days=1)
+        if day == month_start and month_end <= last:
+            paths.append((day.strftime('%Y-%m'),))
+            day = next_month
+        else:
+            paths.append((day.strftime('%Y-%m'), day.isoformat()))
+            day += timedelta(days=1)
+    return paths
+
+
+class _Node:
+    """One resource in the lock tree"""
+
+    __slots__ = ('key', 'parent', 'children', 'locks', 'intents')
+
+    def __init__(self, key: Optional[str], parent: Optional['_Node']):
+        self.key = key
+        self.parent = parent
+        self.children: Dict[str, '_Node'] = {}
+        self.locks: Dict[str, Any] = {}                  # user_id -> explicit lock
+        self.intents: Dict[str, Dict[str, int]] = {}     # user_id -> intention mode -> count
+
+
+class LockManager:
+    """
+    Multi-granularity lock table with heap-based expiry
+
+    Not thread-safe on its own; CollaborationManager serializes calls.
+    """
+
+    def __init__(self, lock_timeout: timedelta = timedelta(minutes=5)):
+        """
+        Initialize the lock table
+
+        Args:
+            lock_timeout: Default lifetime of a lock
+        """
+        self.lock_timeout = lock_timeout
+        self._root = _Node(None, None)
+        self._expiry_heap: List[Tuple[datetime, int, str, ResourcePath]] = []
+        self._seq = count()
+        self._lock_count = 0
+
+    def _node(self, path: ResourcePath, create: bool = False) -> Optional[_Node]:
+        node = self._root
+        for key in path:
+            child = node.children.get(key)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[key] = _Node(key, node)
+            node = child
+        return node
+
+    def _prune(self, node: _Node):
+        """Drop empty nodes so the tree only holds locked branches"""
+        while node.parent is not None and not node.locks and not node.intents and not node.children:
+            del node.parent.children[node.key]
+            node = node.parent
+
+    def _blocking_locks(self, user_id: str, path: ResourcePath, mode: str) -> List[Any]:
+        """Locks of other users that prevent user_id from taking mode on path"""
+        blocking = []
+        intent = INTENT_FOR[mode]
+        node = self._root
+        nodes = [node]
+        for key in path:
+            node = node.children.get(key)
+            if node is None:
+                break
+            nodes.append(node)
+        target_exists = len(nodes) == len(path) + 1
+
+        # Ancestors: our intention mode against their explicit locks
+        for ancestor in nodes[:len(path)]:
+            for owner, lock in ancestor.locks.items():
+                if owner != user_id and (intent, LOCK_TYPE_MODES[lock.lock_type]) not in _COMPATIBLE:
+                    blocking.append(lock)
+
+        if target_exists:
+            target = nodes[-1]
+            for owner, lock in target.locks.items():
+                if owner != user_id and (mode, LOCK_TYPE_MODES[lock.lock_type]) not in _COMPATIBLE:
+                    blocking.append(lock)
+            # Intentions of others mean they hold locks below; report those locks
+            if any(owner != user_id and any((mode, held) not in _COMPATIBLE for held in modes)
+                   for owner, modes in target.intents.items()):
+                for lock in self._locks_below(target):
+                    if lock.user_id != user_id and (mode, LOCK_TYPE_MODES[lock.lock_type]) not in _COMPATIBLE:
+                        blocking.append(lock)
+        return blocking
+
+    def _locks_below(self, node: _Node) -> Iterator[Any]:
+        for child in node.children.values():
+            yield from child.locks.values()
+            yield from self._locks_below(child)
+
+    def expire(self, now: Optional[datetime] = None) -> List[Any]:
+        """
+        Release locks whose expiry time has passed
+
+        Args:
+            now: Current time (default: datetime.now())
+
+        Returns:
+            The expired locks
+        """
+        now = now or datetime.now()
+        expired = []
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, _, user_id, path = heapq.heappop(self._expiry_heap)
+            node = self._node(path)
+            lock = node.locks.get(user_id) if node else None
+            if lock is not None and lock.expires_at == expires_at:  # Not renewed or released since
+                self._release_node(node, user_id)
+                expired.append(lock)
+        return expired
+
+    def acquire(self, user_id: str, paths: List[ResourcePath], lock_type: str,
+                make_lock, now: Optional[datetime] = None) -> Tuple[List[Any], List[Any]]:
+        """
+        Lock several resources atomically (all or none)
+
+        Args:
+            user_id: Requesting user
+            paths: Resources to lock
+            lock_type: 'read', 'write' or 'exclusive'
+            make_lock: Callable(resource_id, expires_at) creating the lock record
+            now: Current time (default: datetime.now())
+
+        Returns:
+            (granted locks, blocking locks); granted is empty if anything blocks
+        """
+        if lock_type not in LOCK_TYPE_MODES:
+            raise SchedulerError(f"Unknown lock type: {lock_type}")
+        mode = LOCK_TYPE_MODES[lock_type]
+        now = now or datetime.now()
+
+        blocking = []
+        for path in paths:
+            blocking.extend(self._blocking_locks(user_id, path, mode))
+        if blocking:
+            return [], blocking
+
+        granted = []
+        expires_at = now + self.lock_timeout
+        for path in paths:
+            node = self._node(path, create=True)
+            existing = node.locks.get(user_id)
+            if existing is not None:
+                if LOCK_TYPE_MODES[existing.lock_type] == EXCLUSIVE:
+                    lock_type_kept = existing.lock_type
+                else:
+                    lock_type_kept = lock_type
+                self._release_node(node, user_id)
+                node = self._node(path, create=True)
+            else:
+                lock_type_kept = lock_type
+
+            lock = make_lock(path_resource_id(path), expires_at)
+            lock.lock_type = lock_type_kept
+            node.locks[user_id] = lock
+            self._lock_count += 1
+            intent = INTENT_FOR[LOCK_TYPE_MODES[lock_type_kept]]
+            ancestor = node.parent
+            while ancestor is not None:
+                modes = ancestor.intents.setdefault(user_id, {})
+                modes[intent] = modes.get(intent, 0) + 1
+                ancestor = ancestor.parent
+            heapq.heappush(self._expiry_heap, (expires_at, next(self._seq), user_id, path))
+            granted.append(lock)
+        return granted, []
+
+    def _release_node(self, node: _Node, user_id: str) -> Optional[Any]:
+        lock = node.locks.pop(user_id, None)
+        if lock is None:
+            return None
+        self._lock_count -= 1
+        intent = INTENT_FOR[LOCK_TYPE_MODES[lock.lock_type]]
+        ancestor = node.parent
+        while ancestor is not None:
+            modes = ancestor.intents.get(user_id, {})
+            modes[intent] = modes.get(intent, 0) - 1
+            if modes[intent] <= 0:
+                del modes[intent]
+            if not modes:
+                ancestor.intents.pop(user_id, None)
+            ancestor = ancestor.parent
+        self._prune(node)
+        return lock
+
+    def release(self, user_id: str, path: ResourcePath) -> Optional[Any]:
+        """
+        Release a user's lock on a resource
+
+        Returns:
+            The released lock, or None if the user held none
+        """
+        node = self._node(path)
+        return self._release_node(node, user_id) if node else None
+
+    def get_lock(self, path: ResourcePath, user_id: Optional[str] = None) -> Optional[Any]:
+        """Explicit lock on a resource (the given user's, or any holder's)"""
+        node = self._node(path)
+        if not node or not node.locks:
+            return None
+        if user_id is not None:
+            return node.locks.get(user_id)
+        return next(iter(node.locks.values()))
+
+    def conflicts(self, user_id: str, path: ResourcePath, lock_type: str = 'write') -> List[Any]:
+        """
+        Locks of other users that conflict with locking a resource
+
+        Covers locks on the resource, on its ancestors (e.g. a locked date
+        range) and below it (e.g. cells of a date).
+        """
+        return self._blocking_locks(user_id, path, LOCK_TYPE_MODES[lock_type])
+
+    def conflicts_in_range(self, user_id: str, start_date: datetime, end_date: datetime,
+                           lock_type: str = 'write') -> List[Any]:
+        """Locks of other users that conflict with locking a date range"""
+        found = {}
+        for path in range_paths(start_date, end_date):
+            for lock in self._blocking_locks(user_id, path, LOCK_TYPE_MODES[lock_type]):
+                found[id(lock)] = lock
+        return list(found.values())
+
+    def iter_locks(self) -> Iterator[Any]:
+        """All explicit locks"""
+        yield from self._root.locks.values()
+        yield from self._locks_below(self._root)
+
+    def __len__(self) -> int:
+        return self._lock_count
@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 from scheduler import  Scheduler, SchedulerError
 from exporters import StatsExporter
 from pdf_exporter import PDFExporter
+from stats_engine import compute_statistics, get_statistics_engine
 from utilities import numeric_sort_key
 
 import json
@@ -1814,62 +1815,9 @@ class CalendarViewScreen(Screen):
             print("DEBUG: prepare_statistics - Schedule is empty.")
             return {}
 
-        # Initialize the stats dictionary
-        global_stats = {
-            'total_shifts': 0,
-            'workers': {},
-            'weekend_shifts': 0,
-            'last_post_shifts': 0,
-            'posts': {i: 0 for i in range(num_shifts)},
-            'worker_shifts': {},
-            'period_start': start_date, # Store period boundaries
-            'period_end': end_date
-        }
-
         print(f"DEBUG: prepare_statistics - Processing ALL dates in schedule...")
-        # Iterate through ALL dates in the loaded schedule
-        for date, workers in schedule.items():
-            # No date filtering needed here for global summary
-            global_stats['total_shifts'] += len(workers)
-            is_weekend = date.weekday() >= 4
-            is_holiday = date in holidays
-
-            for i, worker_id in enumerate(workers):
-                if worker_id is None:
-                    continue
-
-                # Initialize worker stats dict if first time seen
-                if worker_id not in global_stats['workers']:
-                    global_stats['workers'][worker_id] = {
-                        'total': 0, 'weekends': 0, 'holidays': 0, 'last_post': 0,
-                        'weekday_counts': {day: 0 for day in range(7)},
-                        'post_counts': {post: 0 for post in range(num_shifts)}
-                    }
-                if worker_id not in global_stats['worker_shifts']:
-                     global_stats['worker_shifts'][worker_id] = []
-
-                # Add detailed shift info for the list
-                shift_detail = {
-                    'date': date, 'day': date.strftime('%A'), 'post': i + 1,
-                    'is_weekend': is_weekend, 'is_holiday': is_holiday
-                }
-                global_stats['worker_shifts'][worker_id].append(shift_detail)
-
-                # Increment counts
-                global_stats['workers'][worker_id]['total'] += 1
-                global_stats['workers'][worker_id]['weekday_counts'][date.weekday()] += 1
-                if i < num_shifts: # Ensure post index is valid
-                    global_stats['workers'][worker_id]['post_counts'][i] += 1
-
-                if is_weekend:
-                    global_stats['weekend_shifts'] += 1
-                    global_stats['workers'][worker_id]['weekends'] += 1
-                if is_holiday:
-                     global_stats['workers'][worker_id]['holidays'] += 1
-
-                if i == num_shifts - 1:
-                    global_stats['last_post_shifts'] += 1
-                    global_stats['workers'][worker_id]['last_post'] += 1
+        # One pass over every date in the loaded schedule (no date filtering for the global summary)
+        global_stats = compute_statistics(schedule, holidays).export_summary(num_shifts, start_date, end_date)
 
         print(f"DEBUG: prepare_statistics - Finished GLOBAL calculation.")
         return global_stats # Return the newly created dictionary
@@ -2257,9 +2205,12 @@ class CalendarViewScreen(Screen):
         import platform
         
         try:
+            # Export from one snapshot so the PDF is consistent even if edits continue
+            snapshot = scheduler.get_schedule_snapshot()
+            
             # Create PDF exporter with the generated schedule
             schedule_config_for_export = {
-                'schedule': scheduler.schedule,
+                'schedule': snapshot.schedule,
                 'workers_data': config.get('workers_data', []),
                 'num_shifts': config.get('num_shifts', 0),
                 'holidays': config.get('holidays', [])
@@ -2268,7 +2219,7 @@ class CalendarViewScreen(Screen):
             pdf_exporter = PDFExporter(schedule_config_for_export)
             
             # Generate statistics for the PDF
-            stats_data = self._generate_stats_for_export(scheduler, config)
+            stats_data = self._generate_stats_for_export(scheduler, config, snapshot)
             
             # Export the PDF
             filename = pdf_exporter.export_summary_pdf(stats_data)
@@ -2294,62 +2245,18 @@ class CalendarViewScreen(Screen):
             logging.error(f"Auto export failed: {e}")
             raise e
 
-    def _generate_stats_for_export(self, scheduler, config):
-        """Generate statistics data for PDF export"""
+    def _generate_stats_for_export(self, scheduler, config, snapshot=None):
+        """Generate statistics data for PDF export from a schedule snapshot"""
         from datetime import datetime
         
-        workers_stats = {}
-        worker_shifts_all = {}
-        
-        for worker in config.get('workers_data', []):
-            worker_id = worker['id']
-            assignments = scheduler.worker_assignments.get(worker_id, set())
-            
-            # Basic stats calculation
-            total_shifts = len(assignments)
-            weekend_shifts = sum(1 for date in assignments if date.weekday() >= 4)
-            holiday_shifts = sum(1 for date in assignments if date in config.get('holidays', []))
-            
-            # Post distribution
-            post_counts = {}
-            weekday_counts = {i: 0 for i in range(7)}
-            
-            shifts_list = []
-            for date in assignments:
-                if date in scheduler.schedule:
-                    try:
-                        post = scheduler.schedule[date].index(worker_id)
-                        post_counts[post] = post_counts.get(post, 0) + 1
-                        
-                        shifts_list.append({
-                            'date': date,
-                            'day': date.strftime('%A'),
-                            'post': post + 1,
-                            'is_weekend': date.weekday() >= 4,
-                            'is_holiday': date in config.get('holidays', [])
-                        })
-                    except ValueError:
-                        pass
-                
-                weekday_counts[date.weekday()] += 1
-            
-            workers_stats[worker_id] = {
-                'total': total_shifts,
-                'weekends': weekend_shifts,
-                'holidays': holiday_shifts,
-                'last_post': post_counts.get(config.get('num_shifts', 1) - 1, 0),
-                'weekday_counts': weekday_counts,
-                'post_counts': post_counts
-            }
-            
-            worker_shifts_all[worker_id] = shifts_list
-        
-        return {
-            'period_start': config.get('start_date', datetime.now()),
-            'period_end': config.get('end_date', datetime.now()),
-            'workers': workers_stats,
-            'worker_shifts': worker_shifts_all
-        }
+        snapshot = snapshot or scheduler.get_schedule_snapshot()
+        statistics = get_statistics_engine().compute(snapshot, config.get('holidays', []))
+        return statistics.export_summary(
+            config.get('num_shifts', 1),
+            config.get('start_date', datetime.now()),
+            config.get('end_date', datetime.now()),
+            worker_ids=[worker['id'] for worker in config.get('workers_data', [])]
+        )
 
     def _open_pdf_file(self, filename):
         """Automatically open the generated PDF file"""
@@ -0,0 +1,269 @@
+"""
+Incrementally maintained schedule metrics for real-time analytics.
+Slot counts and per-worker loads are updated from the cell changes carried
+by schedule events, so reading them does not scan the schedule.
+"""
+
+import logging
+from contextlib import nullcontext
+from datetime import datetime
+from threading import RLock
+from typing import Dict, Optional, Any, Iterable
+
+from event_bus import get_event_bus, EventType, DeliveryMode, CellChange, schedule_cell_changes
+
+
+class LoadDistribution:
+    """
+    Integer load per key with O(1) count, total, min and max
+
+    A histogram maps each load to the number of keys carrying it. Min and
+    max only move when their bucket empties, and then only to the next
+    non-empty bucket, so a +/-1 change is O(1) and a larger jump costs at
+    most the distance moved.
+    """
+
+    def __init__(self):
+        self._loads: Dict[str, int] = {}
+        self._histogram: Dict[int, int] = {}
+        self._total = 0
+        self._min = 0
+        self._max = 0
+
+    def clear(self):
+        """Remove every key"""
+        self._loads.clear()
+        self._histogram.clear()
+        self._total = 0
+        self._min = 0
+        self._max = 0
+
+    def load(self, key: str) -> int:
+        """Current load of a key (0 if unknown)"""
+        return self._loads.get(key, 0)
+
+    def add(self, key: str, delta: int = 1):
+        """
+        Change a key's load, adding the key at 0 first if unknown
+
+        Args:
+            key: Key whose load changes
+            delta: Amount to add (negative to subtract)
+        """
+        self.set(key, self._loads.get(key, 0) + delta)
+
+    def set(self, key: str, load: int):
+        """
+        Set a key's load
+
+        Args:
+            key: Key to set
+            load: New load
+        """
+        old = self._loads.get(key)
+        if old == load:
+            return
+        if old is not None:
+            self._drop_bucket(old)
+            self._total -= old
+        self._loads[key] = load
+        self._histogram[load] = self._histogram.get(load, 0) + 1
+        self._total += load
+
+        if len(self._loads) == 1:
+            self._min = self._max = load
+            return
+        self._min = min(self._min, load)
+        self._max = max(self._max, load)
+        if old is not None:
+            self._settle(old)
+
+    def remove(self, key: str):
+        """Forget a key"""
+        old = self._loads.pop(key, None)
+        if old is None:
+            return
+        self._drop_bucket(old)
+        self._total -= old
+        if not self._loads:
+            self._min = self._max = 0
+        else:
+            self._settle(old)
+
+    def _drop_bucket(self, load: int):
+        remaining = self._histogram[load] - 1
+        if remaining:
+            self._histogram[load] = remaining
+        else:
+            del self._histogram[load]
+
+    def _settle(self, emptied: int):
+        """Move min/max off a bucket that may have just emptied"""
+        if emptied in self._histogram:
+            return
+        if emptied == self._min:
+            while self._min not in self._histogram:
+                self._min += 1
+        if emptied == self._max:
+            while self._max not in self._histogram:
+                self._max -= 1
+
+    @property
+    def count(self) -> int:
+        return len(self._loads)
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    @property
+    def minimum(self) -> int:
+        return self._min
+
+    @property
+    def maximum(self) -> int:
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        return self._total / len(self._loads) if self._loads else 0.0
+
+
+class MetricsRegistry:
+    """
+    Counters and gauges describing the live schedule
+
+    Built from the schedule on first read, then kept current by schedule
+    events (and by ChangeTracker for undo/redo, which edit without events).
+    A regenerated schedule or an event that cannot be interpreted drops the
+    state; the next read rebuilds it.
+    """
+
+    def __init__(self, scheduler, locks=None, event_bus=None):
+        """
+        Initialize the registry
+
+        Args:
+            scheduler: Scheduler whose schedule and worker_assignments are measured
+            locks: ScheduleLocks held exclusively while rebuilding, so a rebuild
+                never observes a half-applied edit (optional)
+            event_bus: Event bus to follow (the global bus by default)
+        """
+        self.scheduler = scheduler
+        self.locks = locks
+        self.event_bus = event_bus or get_event_bus()
+
+        self._lock = RLock()
+        self._built = False
+        self._row_sizes: Dict[datetime, int] = {}
+        self._total_slots = 0
+        self._filled_slots = 0
+        self.loads = LoadDistribution()
+        self.counters: Dict[str, int] = {}
+
+        for event_type in (EventType.SHIFT_ASSIGNED, EventType.SHIFT_UNASSIGNED,
+                           EventType.SHIFT_SWAPPED, EventType.BULK_UPDATE):
+            self.event_bus.subscribe(event_type, self._on_schedule_changed, delivery=DeliveryMode.SYNC)
+        self.event_bus.subscribe(EventType.SCHEDULE_GENERATED, self._on_schedule_generated,
+                                 delivery=DeliveryMode.SYNC)
+
+    def increment(self, name: str, amount: int = 1):
+        """Add to a named counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def invalidate(self):
+        """Drop the maintained state (call after editing the schedule without events)"""
+        with self._lock:
+            self._built = False
+
+    def rebuild(self):
+        """Recompute every gauge from the schedule"""
+        with (self.locks.exclusive() if self.locks is not None else nullcontext()), self._lock:
+            self._row_sizes = {d: len(row) for d, row in self.scheduler.schedule.items()}
+            self._total_slots = sum(self._row_sizes.values())
+            self._filled_slots = sum(1 for row in self.scheduler.schedule.values()
+                                     for worker_id in row if worker_id is not None)
+            self.loads.clear()
+            for worker_id, assignments in self.scheduler.worker_assignments.items():
+                self.loads.set(worker_id, len(assignments))
+            self._built = True
+        self.increment('rebuilds')
+
+    def record_cells(self, cells: Iterable[CellChange]):
+        """
+        Apply cell changes already written to the schedule
+
+        Args:
+            cells: (date, post index, old worker, new worker) per changed cell
+        """
+        with self._lock:
+            if not self._built:
+                return
+            for shift_date, post_index, old, new in cells:
+                self._apply_cell(shift_date, old, new)
+
+    def _apply_cell(self, shift_date: datetime, old: Optional[str], new: Optional[str]):
+        if shift_date not in self._row_sizes:
+            size = len(self.scheduler.schedule.get(shift_date, ()))
+            self._row_sizes[shift_date] = size
+            self._total_slots += size
+        if old == new:
+            return
+        if old is not None:
+            self.loads.add(old, -1)
+        if new is not None:
+            self.loads.add(new, 1)
+        self._filled_slots += (new is not None) - (old is not None)
+
+    def _on_schedule_changed(self, event):
+        """Apply the cell changes of a schedule event"""
+        self.increment(event.event_type.value)
+        try:
+            cells = schedule_cell_changes(event)
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(f"Schedule event {event.event_type.value} not understood ({e}), rebuilding metrics")
+            self.invalidate()
+            return
+        self.record_cells(cells)
+
+    def _on_schedule_generated(self, event):
+        """A regenerated schedule is measured afresh on the next read"""
+        self.increment(event.event_type.value)
+        self.invalidate()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Current schedule metrics
+
+        O(1) once built; the first read after construction or invalidation
+        rebuilds from the schedule.
+
+        Returns:
+            Dictionary with 'schedule_metrics', 'workload_distribution' and 'counters'
+        """
+        if not self._built:
+            self.rebuild()
+        with self._lock:
+            total, filled = self._total_slots, self._filled_slots
+            return {
+                'schedule_metrics': {
+                    'total_slots': total,
+                    'filled_slots': filled,
+                    'coverage_percentage': round(filled / total * 100, 2) if total > 0 else 0
+                },
+                'workload_distribution': {
+                    'average_workload': round(self.loads.mean, 2),
+                    'min_workload': self.loads.minimum,
+                    'max_workload': self.loads.maximum,
+                    'worker_count': self.loads.count
+                },
+                'counters': dict(self.counters)
+            }
+
+    def worker_load(self, worker_id: str) -> int:
+        """Number of shifts currently assigned to a worker"""
+        if not self._built:
+            self.rebuild()
+        with self._lock:
+            return self.loads.load(worker_id)
@@ -1,6 +1,3 @@
-from kivy.app import App
-from kivy.uix.popup import Popup
-from kivy.uix.label import Label
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape, letter # Keep A4 if needed elsewhere
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
@@ -34,7 +31,7 @@ class PDFExporter:
         self.styles.add(ParagraphStyle(name='SmallNormal', parent=self.styles['Normal'], fontSize=9))
         self.styles.add(ParagraphStyle(name='SmallBold', parent=self.styles['SmallNormal'], fontName='Helvetica-Bold'))
 
-    def export_summary_pdf(self, stats_data): # Takes the whole stats dictionary now
+    def export_summary_pdf(self, stats_data, filename=None): # Takes the whole stats dictionary now
         """Export a detailed GLOBAL summary with shift listings and distributions."""
 
         # --- Determine Filename and Title from stats_data ---
@@ -43,11 +40,12 @@ class PDFExporter:
         if start and end:
             period_str_file = f"{start.strftime('%Y%m%d')}_{end.strftime('%Y%m%d')}"
             period_str_title = f"{start.strftime('%d-%m-%Y')} to {end.strftime('%d-%m-%Y')}"
-            filename = f"summary_global_{period_str_file}.pdf"
+            default_filename = f"summary_global_{period_str_file}.pdf"
             title_text = f"Schedule Summary ({period_str_title})"
         else:
-            filename = "summary_global_full_period.pdf"
+            default_filename = "summary_global_full_period.pdf"
             title_text = "Schedule Summary (Full Period)"
+        filename = filename or default_filename
         # --- End Filename/Title ---
 
         try:
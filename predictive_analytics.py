@@ -58,10 +58,13 @@ class PredictiveAnalyticsEngine:
         """Check if predictive analytics are enabled"""
         return self.config.get('enabled', True)
     
-    def collect_and_store_current_data(self) -> Dict[str, Any]:
+    def collect_and_store_current_data(self, snapshot=None) -> Dict[str, Any]:
         """
         Collect current schedule data and store it for historical analysis
         
+        Args:
+            snapshot: ScheduleSnapshot to collect from instead of the live schedule
+        
         Returns:
             Dictionary containing the collected data and storage status
         """
@@ -70,7 +73,7 @@ class PredictiveAnalyticsEngine:
         
         try:
             # Collect current schedule data
-            current_data = self.historical_data_manager.collect_current_schedule_data()
+            current_data = self.historical_data_manager.collect_current_schedule_data(snapshot)
             
             # Store the data
             self.historical_data_manager.store_historical_data(current_data)
@@ -624,10 +627,13 @@ class PredictiveAnalyticsEngine:
         
         return suggestions[:10]  # Limit to top 10 suggestions
     
-    def auto_collect_data_if_enabled(self) -> bool:
+    def auto_collect_data_if_enabled(self, snapshot=None) -> bool:
         """
         Automatically collect data if auto-collection is enabled
         
+        Args:
+            snapshot: ScheduleSnapshot to collect from instead of the live schedule
+        
         Returns:
             True if data was collected, False otherwise
         """
@@ -635,7 +641,7 @@ class PredictiveAnalyticsEngine:
             return False
         
         try:
-            result = self.collect_and_store_current_data()
+            result = self.collect_and_store_current_data(snapshot)
             return result.get('status') == 'success'
         except Exception as e:
             logging.error(f"Auto data collection failed: {e}")
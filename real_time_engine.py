@@ -14,6 +14,10 @@ from event_bus import get_event_bus, EventType, ScheduleEvent
 from incremental_updater import IncrementalUpdater, UpdateResult
 from live_validator import LiveValidator, ValidationResult, ConflictInfo
 from change_tracker import ChangeTracker
+from schedule_locks import ScheduleSnapshot
+from metrics_registry import MetricsRegistry
+from schedule_snapshots import SnapshotStore
+from latency_metrics import LatencyMetrics
 from exceptions import SchedulerError
 
 
@@ -26,6 +30,8 @@ class RealTimeOperationResult:
     validation_results: List[ValidationResult] = None
     conflicts: List[ConflictInfo] = None
     suggestions: List[str] = None
+    versions: Dict[str, Any] = None
+    stale: Dict[str, Any] = None
     
     def __post_init__(self):
         if self.validation_results is None:
@@ -34,6 +40,10 @@ class RealTimeOperationResult:
             self.conflicts = []
         if self.suggestions is None:
             self.suggestions = []
+        if self.versions is None:
+            self.versions = {}
+        if self.stale is None:
+            self.stale = {}
 
 
 class RealTimeEngine:
@@ -49,15 +59,23 @@ class RealTimeEngine:
         self.scheduler = scheduler
         self.event_bus = get_event_bus()
         
+        # Deliver listener work off the editing thread when configured
+        dispatch_workers = scheduler.config.get('event_dispatch_workers', 0)
+        if dispatch_workers:
+            self.event_bus.enable_async_dispatch(dispatch_workers)
+        
         # Initialize real-time components
         self.incremental_updater = IncrementalUpdater(scheduler)
-        self.live_validator = LiveValidator(scheduler)
-        self.change_tracker = ChangeTracker(scheduler)
+        self.live_validator = LiveValidator(scheduler, locks=self.incremental_updater.locks)
+        self.metrics = MetricsRegistry(scheduler, locks=self.incremental_updater.locks)
+        self.snapshots = SnapshotStore(scheduler, locks=self.incremental_updater.locks,
+                                       versions=self.incremental_updater.versions)
+        self.change_tracker = ChangeTracker(scheduler, versions=self.incremental_updater.versions)
         
         # Real-time state management
         self._active_operations: Dict[str, Any] = {}
         self._operation_lock = Lock()
-        self._performance_metrics: Dict[str, Any] = {}
+        self.latency = LatencyMetrics()
         
         # Setup event listeners
         self._setup_event_listeners()
@@ -75,7 +93,8 @@ class RealTimeEngine:
                                post_index: int,
                                user_id: Optional[str] = None,
                                validate: bool = True,
-                               force: bool = False) -> RealTimeOperationResult:
+                               force: bool = False,
+                               expected_versions: Optional[Dict[str, Any]] = None) -> RealTimeOperationResult:
         """
         Assign worker to shift with real-time validation and feedback
         
@@ -86,11 +105,14 @@ class RealTimeEngine:
             user_id: ID of user making the change
             validate: Whether to perform validation
             force: Skip constraint validation if True
+            expected_versions: Versions read by the client for an optimistic
+                (lock-free) edit; see IncrementalUpdater.read_versions
             
         Returns:
             RealTimeOperationResult with comprehensive feedback
         """
         operation_id = f"assign_{worker_id}_{shift_date.strftime('%Y%m%d')}_{post_index}_{datetime.now().timestamp()}"
+        timer = self.latency.start('assign')
         
         try:
             with self._operation_lock:
@@ -106,12 +128,14 @@ class RealTimeEngine:
             suggestions = []
             
             if validate and not force:
-                validation_result = self.live_validator.validate_assignment(worker_id, shift_date, post_index)
+                with timer.stage('validation'):
+                    validation_result = self.live_validator.validate_assignment(worker_id, shift_date, post_index)
                 validation_results.append(validation_result)
                 
                 if not validation_result.is_valid:
                     # Get suggestions for alternatives
-                    suggestions = self.live_validator.get_suggestions_for_date(shift_date, post_index)
+                    with timer.stage('suggestions'):
+                        suggestions = self.live_validator.get_suggestions_for_date(shift_date, post_index)
                     
                     return RealTimeOperationResult(
                         success=False,
@@ -122,18 +146,21 @@ class RealTimeEngine:
                     )
             
             # Perform the assignment
-            update_result = self.incremental_updater.assign_worker_to_shift(
-                worker_id, shift_date, post_index, user_id, force
-            )
+            with timer.stage('mutation'):
+                update_result = self.incremental_updater.assign_worker_to_shift(
+                    worker_id, shift_date, post_index, user_id, force, expected_versions
+                )
             
             if update_result.success:
                 # Post-assignment validation and conflict detection
                 if validate:
-                    post_conflicts = self.live_validator.detect_conflicts((shift_date, shift_date))
+                    with timer.stage('validation'):
+                        post_conflicts = self.live_validator.detect_conflicts((shift_date, shift_date))
                     conflicts.extend(post_conflicts)
                 
                 # Get optimization suggestions
-                suggestions = self._get_optimization_suggestions(shift_date)
+                with timer.stage('suggestions'):
+                    suggestions = self._get_optimization_suggestions(shift_date)
                 
                 return RealTimeOperationResult(
                     success=True,
@@ -141,7 +168,8 @@ class RealTimeEngine:
                     operation_id=operation_id,
                     validation_results=validation_results,
                     conflicts=conflicts,
-                    suggestions=suggestions
+                    suggestions=suggestions,
+                    versions=update_result.versions
                 )
             else:
                 return RealTimeOperationResult(
@@ -150,7 +178,8 @@ class RealTimeEngine:
                     operation_id=operation_id,
                     validation_results=validation_results,
                     conflicts=update_result.conflicts if hasattr(update_result, 'conflicts') else [],
-                    suggestions=update_result.suggestions if hasattr(update_result, 'suggestions') else []
+                    suggestions=update_result.suggestions if hasattr(update_result, 'suggestions') else [],
+                    stale=update_result.stale
                 )
                 
         except Exception as e:
@@ -161,17 +190,15 @@ class RealTimeEngine:
                 operation_id=operation_id
             )
         finally:
+            timer.stop()
             with self._operation_lock:
-                if operation_id in self._active_operations:
-                    end_time = datetime.now()
-                    duration = (end_time - self._active_operations[operation_id]['start_time']).total_seconds()
-                    self._update_performance_metrics('assignment', duration)
-                    del self._active_operations[operation_id]
+                self._active_operations.pop(operation_id, None)
     
     def unassign_worker_real_time(self, 
                                  shift_date: datetime, 
                                  post_index: int,
-                                 user_id: Optional[str] = None) -> RealTimeOperationResult:
+                                 user_id: Optional[str] = None,
+                                 expected_versions: Optional[Dict[str, Any]] = None) -> RealTimeOperationResult:
         """
         Unassign worker from shift with real-time feedback
         
@@ -179,11 +206,13 @@ class RealTimeEngine:
             shift_date: Date of the shift
             post_index: Post index (0-based)
             user_id: ID of user making the change
+            expected_versions: Versions read by the client for an optimistic edit
             
         Returns:
             RealTimeOperationResult with feedback
         """
         operation_id = f"unassign_{shift_date.strftime('%Y%m%d')}_{post_index}_{datetime.now().timestamp()}"
+        timer = self.latency.start('unassign')
         
         try:
             with self._operation_lock:
@@ -194,25 +223,29 @@ class RealTimeEngine:
                 }
             
             # Perform the unassignment
-            update_result = self.incremental_updater.unassign_worker_from_shift(
-                shift_date, post_index, user_id
-            )
+            with timer.stage('mutation'):
+                update_result = self.incremental_updater.unassign_worker_from_shift(
+                    shift_date, post_index, user_id, expected_versions
+                )
             
             if update_result.success:
                 # Get suggestions for replacement
-                suggestions = self.live_validator.get_suggestions_for_date(shift_date, post_index)
+                with timer.stage('suggestions'):
+                    suggestions = self.live_validator.get_suggestions_for_date(shift_date, post_index)
                 
                 return RealTimeOperationResult(
                     success=True,
                     message=update_result.message,
                     operation_id=operation_id,
-                    suggestions=suggestions
+                    suggestions=suggestions,
+                    versions=update_result.versions
                 )
             else:
                 return RealTimeOperationResult(
                     success=False,
                     message=update_result.message,
-                    operation_id=operation_id
+                    operation_id=operation_id,
+                    stale=update_result.stale
                 )
                 
         except Exception as e:
@@ -223,19 +256,17 @@ class RealTimeEngine:
                 operation_id=operation_id
             )
         finally:
+            timer.stop()
             with self._operation_lock:
-                if operation_id in self._active_operations:
-                    end_time = datetime.now()
-                    duration = (end_time - self._active_operations[operation_id]['start_time']).total_seconds()
-                    self._update_performance_metrics('unassignment', duration)
-                    del self._active_operations[operation_id]
+                self._active_operations.pop(operation_id, None)
     
     def swap_workers_real_time(self, 
                               shift_date1: datetime, post_index1: int,
                               shift_date2: datetime, post_index2: int,
                               user_id: Optional[str] = None,
                               validate: bool = True,
-                              force: bool = False) -> RealTimeOperationResult:
+                              force: bool = False,
+                              expected_versions: Optional[Dict[str, Any]] = None) -> RealTimeOperationResult:
         """
         Swap workers between shifts with real-time validation
         
@@ -247,11 +278,13 @@ class RealTimeEngine:
             user_id: ID of user making the change
             validate: Whether to perform validation
             force: Skip constraint validation if True
+            expected_versions: Versions read by the client for an optimistic edit
             
         Returns:
             RealTimeOperationResult with feedback
         """
         operation_id = f"swap_{shift_date1.strftime('%Y%m%d')}_{post_index1}_{shift_date2.strftime('%Y%m%d')}_{post_index2}_{datetime.now().timestamp()}"
+        timer = self.latency.start('swap')
         
         try:
             with self._operation_lock:
@@ -271,13 +304,14 @@ class RealTimeEngine:
                 worker2 = self.scheduler.schedule.get(shift_date2, [None] * self.scheduler.num_shifts)[post_index2]
                 
                 # Validate swap constraints
-                if worker1:
-                    val_result = self.live_validator.validate_assignment(worker1, shift_date2, post_index2)
-                    validation_results.append(val_result)
-                
-                if worker2:
-                    val_result = self.live_validator.validate_assignment(worker2, shift_date1, post_index1)
-                    validation_results.append(val_result)
+                with timer.stage('validation'):
+                    if worker1:
+                        val_result = self.live_validator.validate_assignment(worker1, shift_date2, post_index2)
+                        validation_results.append(val_result)
+                    
+                    if worker2:
+                        val_result = self.live_validator.validate_assignment(worker2, shift_date1, post_index1)
+                        validation_results.append(val_result)
                 
                 # Check if any validation failed
                 failed_validations = [v for v in validation_results if not v.is_valid]
@@ -290,15 +324,17 @@ class RealTimeEngine:
                     )
             
             # Perform the swap
-            update_result = self.incremental_updater.swap_workers(
-                shift_date1, post_index1, shift_date2, post_index2, user_id, force
-            )
+            with timer.stage('mutation'):
+                update_result = self.incremental_updater.swap_workers(
+                    shift_date1, post_index1, shift_date2, post_index2, user_id, force, expected_versions
+                )
             
             if update_result.success:
                 # Post-swap conflict detection
                 if validate:
-                    conflicts1 = self.live_validator.detect_conflicts((shift_date1, shift_date1))
-                    conflicts2 = self.live_validator.detect_conflicts((shift_date2, shift_date2))
+                    with timer.stage('validation'):
+                        conflicts1 = self.live_validator.detect_conflicts((shift_date1, shift_date1))
+                        conflicts2 = self.live_validator.detect_conflicts((shift_date2, shift_date2))
                     conflicts.extend(conflicts1)
                     conflicts.extend(conflicts2)
                 
@@ -307,14 +343,16 @@ class RealTimeEngine:
                     message=update_result.message,
                     operation_id=operation_id,
                     validation_results=validation_results,
-                    conflicts=conflicts
+                    conflicts=conflicts,
+                    versions=update_result.versions
                 )
             else:
                 return RealTimeOperationResult(
                     success=False,
                     message=update_result.message,
                     operation_id=operation_id,
-                    validation_results=validation_results
+                    validation_results=validation_results,
+                    stale=update_result.stale
                 )
                 
         except Exception as e:
@@ -325,12 +363,9 @@ class RealTimeEngine:
                 operation_id=operation_id
             )
         finally:
+            timer.stop()
             with self._operation_lock:
-                if operation_id in self._active_operations:
-                    end_time = datetime.now()
-                    duration = (end_time - self._active_operations[operation_id]['start_time']).total_seconds()
-                    self._update_performance_metrics('swap', duration)
-                    del self._active_operations[operation_id]
+                self._active_operations.pop(operation_id, None)
     
     def validate_schedule_real_time(self, 
                                    quick_check: bool = False) -> RealTimeOperationResult:
@@ -344,6 +379,7 @@ class RealTimeEngine:
             RealTimeOperationResult with validation details
         """
         operation_id = f"validate_{datetime.now().timestamp()}"
+        timer = self.latency.start('validate')
         
         try:
             with self._operation_lock:
@@ -352,11 +388,12 @@ class RealTimeEngine:
                     'start_time': datetime.now()
                 }
             
-            # Perform validation
-            validation_results = self.live_validator.validate_schedule_integrity(check_partial=quick_check)
-            
-            # Detect conflicts
-            conflicts = self.live_validator.detect_conflicts()
+            # The validator's maintained state catches up with the edits made since
+            # the last call, so edits are held off until it is consistent
+            with timer.stage('validation'), self.incremental_updater.locks.exclusive():
+                validation_results = self.live_validator.validate_schedule_integrity(check_partial=quick_check,
+                                                                                     quick_check=quick_check)
+                conflicts = self.live_validator.detect_conflicts()
             
             # Determine overall success
             errors = [v for v in validation_results if not v.is_valid]
@@ -380,12 +417,9 @@ class RealTimeEngine:
                 operation_id=operation_id
             )
         finally:
+            timer.stop()
             with self._operation_lock:
-                if operation_id in self._active_operations:
-                    end_time = datetime.now()
-                    duration = (end_time - self._active_operations[operation_id]['start_time']).total_seconds()
-                    self._update_performance_metrics('validation', duration)
-                    del self._active_operations[operation_id]
+                self._active_operations.pop(operation_id, None)
     
     def undo_last_change(self, user_id: Optional[str] = None) -> RealTimeOperationResult:
         """
@@ -398,6 +432,7 @@ class RealTimeEngine:
             RealTimeOperationResult with undo details
         """
         operation_id = f"undo_{datetime.now().timestamp()}"
+        timer = self.latency.start('undo')
         
         try:
             if not self.change_tracker.can_undo():
@@ -408,7 +443,8 @@ class RealTimeEngine:
                 )
             
             # Perform undo
-            undone_change = self.change_tracker.undo(user_id)
+            with timer.stage('mutation'), self.incremental_updater.locks.exclusive():
+                undone_change = self.change_tracker.undo(user_id)
             
             if undone_change:
                 return RealTimeOperationResult(
@@ -430,6 +466,8 @@ class RealTimeEngine:
                 message=f"Undo failed: {str(e)}",
                 operation_id=operation_id
             )
+        finally:
+            timer.stop()
     
     def redo_last_change(self, user_id: Optional[str] = None) -> RealTimeOperationResult:
         """
@@ -442,6 +480,7 @@ class RealTimeEngine:
             RealTimeOperationResult with redo details
         """
         operation_id = f"redo_{datetime.now().timestamp()}"
+        timer = self.latency.start('redo')
         
         try:
             if not self.change_tracker.can_redo():
@@ -452,7 +491,8 @@ class RealTimeEngine:
                 )
             
             # Perform redo
-            redone_change = self.change_tracker.redo(user_id)
+            with timer.stage('mutation'), self.incremental_updater.locks.exclusive():
+                redone_change = self.change_tracker.redo(user_id)
             
             if redone_change:
                 return RealTimeOperationResult(
@@ -474,6 +514,20 @@ class RealTimeEngine:
                 message=f"Redo failed: {str(e)}",
                 operation_id=operation_id
             )
+        finally:
+            timer.stop()
+    
+    def get_schedule_snapshot(self) -> ScheduleSnapshot:
+        """
+        Immutable view of the current schedule for whole-schedule readers
+        
+        Taking it is O(1) (the snapshot shares unchanged months with the live
+        shadow); reading it never blocks edits and never sees a half-applied edit.
+        
+        Returns:
+            ScheduleSnapshot tagged with the current schedule version
+        """
+        return self.snapshots.snapshot()
     
     def get_real_time_analytics(self) -> Dict[str, Any]:
         """
@@ -494,37 +548,22 @@ class RealTimeEngine:
             # Event bus stats
             event_stats = self.event_bus.get_stats()
             
-            # Schedule coverage
-            total_slots = sum(len(shifts) for shifts in self.scheduler.schedule.values())
-            filled_slots = sum(1 for shifts in self.scheduler.schedule.values() 
-                             for worker in shifts if worker is not None)
-            coverage = (filled_slots / total_slots * 100) if total_slots > 0 else 0
-            
-            # Worker workload distribution
-            workloads = {worker_id: len(assignments) 
-                        for worker_id, assignments in self.scheduler.worker_assignments.items()}
-            avg_workload = sum(workloads.values()) / len(workloads) if workloads else 0
+            # Coverage and workload gauges are maintained from schedule events
+            metrics = self.metrics.get_metrics()
             
             return {
                 'timestamp': datetime.now().isoformat(),
+                'schedule_version': self.incremental_updater.versions.clock,
                 'active_operations': {
                     'count': active_ops,
                     'types': active_op_types
                 },
-                'schedule_metrics': {
-                    'total_slots': total_slots,
-                    'filled_slots': filled_slots,
-                    'coverage_percentage': round(coverage, 2)
-                },
-                'workload_distribution': {
-                    'average_workload': round(avg_workload, 2),
-                    'min_workload': min(workloads.values()) if workloads else 0,
-                    'max_workload': max(workloads.values()) if workloads else 0,
-                    'worker_count': len(workloads)
-                },
+                'schedule_metrics': metrics['schedule_metrics'],
+                'workload_distribution': metrics['workload_distribution'],
+                'counters': metrics['counters'],
                 'change_tracking': change_state,
                 'event_system': event_stats,
-                'performance_metrics': self._performance_metrics.copy()
+                'performance_metrics': self.latency.summary()
             }
             
         except Exception as e:
@@ -549,9 +588,11 @@ class RealTimeEngine:
             for conflict in conflicts[:limit//2]:
                 suggestions.extend(conflict.resolution_suggestions[:1])
             
+            snapshot = self.get_schedule_snapshot()
+            
             # Workload balancing suggestions
             workloads = {worker_id: len(assignments) 
-                        for worker_id, assignments in self.scheduler.worker_assignments.items()}
+                        for worker_id, assignments in snapshot.worker_assignments.items()}
             
             if workloads:
                 avg_workload = sum(workloads.values()) / len(workloads)
@@ -563,7 +604,7 @@ class RealTimeEngine:
             
             # Coverage improvement suggestions
             empty_slots = []
-            for date, shifts in self.scheduler.schedule.items():
+            for date, shifts in snapshot.schedule.items():
                 for i, worker in enumerate(shifts):
                     if worker is None:
                         empty_slots.append((date, i))
@@ -601,23 +642,19 @@ class RealTimeEngine:
         
         return suggestions[:3]  # Limit suggestions
     
-    def _update_performance_metrics(self, operation_type: str, duration: float):
-        """Update performance metrics for operations"""
-        if operation_type not in self._performance_metrics:
-            self._performance_metrics[operation_type] = {
-                'count': 0,
-                'total_time': 0.0,
-                'avg_time': 0.0,
-                'min_time': float('inf'),
-                'max_time': 0.0
-            }
+    def export_latency_metrics(self, path: str, fmt: str = 'json') -> str:
+        """
+        Write the operation latency histograms to a file
         
-        metrics = self._performance_metrics[operation_type]
-        metrics['count'] += 1
-        metrics['total_time'] += duration
-        metrics['avg_time'] = metrics['total_time'] / metrics['count']
-        metrics['min_time'] = min(metrics['min_time'], duration)
-        metrics['max_time'] = max(metrics['max_time'], duration)
+        Args:
+            path: Output file
+            fmt: 'json' (per-operation percentiles and stage breakdowns) or
+                'prometheus' (text exposition format)
+            
+        Returns:
+            The path written
+        """
+        return self.latency.export(path, fmt)
     
     def _on_constraint_violation(self, event):
         """Handle constraint violation events"""
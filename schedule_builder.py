@@ -169,6 +169,10 @@ class ScheduleBuilder:
         # Delegate to the DateTimeUtils class
         return self.date_utils.parse_dates(date_str)
         
+    def _get_prior_assignments(self, worker_id):
+        """Get the worker's assignments in the tail of the previous period (warm start)"""
+        return getattr(self.scheduler, 'prior_assignments', {}).get(worker_id, set())
+
     def _get_post_counts(self, worker_id):
         """
         Get the count of assignments for each post for a specific worker
@@ -376,8 +380,8 @@ class ScheduleBuilder:
             if not self._check_incompatibility(worker_id, date):
                 return False
             
-            # Check minimum gap and 7-14 day pattern
-            assignments = sorted(list(self.worker_assignments.get(worker_id, [])))
+            # Check minimum gap and 7-14 day pattern (including the prior period tail)
+            assignments = sorted(self.worker_assignments.get(worker_id, set()) | self._get_prior_assignments(worker_id))
             if assignments:
                 for prev_date in assignments:
                     days_between = abs((date - prev_date).days)
@@ -546,7 +550,7 @@ class ScheduleBuilder:
                  logging.debug(f"Sim Check Fail: Double booking {worker_id} on {date}")
                  return False
 
-            sorted_sim_assignments = sorted(list(simulated_assignments.get(worker_id, [])))
+            sorted_sim_assignments = sorted(simulated_assignments.get(worker_id, set()) | self._get_prior_assignments(worker_id))
 
             # 7. Friday-Monday Check (Only if gap constraint allows 3 days, i.e., gap_between_shifts == 1)
             # Apply strictly during simulation checks
@@ -622,7 +626,7 @@ class ScheduleBuilder:
         if work_percentage < 70: # Example threshold for part-time adjustment
             min_days_between = max(min_days_between, self.scheduler.gap_between_shifts + 2)
 
-        assignments = sorted(list(simulated_assignments.get(worker_id, [])))
+        assignments = sorted(simulated_assignments.get(worker_id, set()) | self._get_prior_assignments(worker_id))
 
         for prev_date in assignments:
             if prev_date == date: continue # Don't compare date to itself
@@ -665,7 +669,7 @@ class ScheduleBuilder:
     
         # Get weekend assignments and add the current date
         weekend_dates = []
-        for d_val in simulated_assignments.get(worker_id, set()):
+        for d_val in simulated_assignments.get(worker_id, set()) | self._get_prior_assignments(worker_id):
             if (d_val.weekday() >= 4 or 
                 d_val in self.scheduler.holidays or
                 (d_val + timedelta(days=1)) in self.scheduler.holidays):
@@ -829,7 +833,7 @@ class ScheduleBuilder:
     def _check_gap_constraints(self, worker, date, relaxation_level):
         """Check gap constraints between assignments"""
         worker_id = worker['id']
-        assignments = sorted(list(self.worker_assignments[worker_id]))
+        assignments = sorted(self.worker_assignments[worker_id] | self._get_prior_assignments(worker_id))
         
         if not assignments:
             return True
@@ -1027,8 +1031,11 @@ class ScheduleBuilder:
         if base_score == float('-inf'):
             return float('-inf')
     
-        # Bonus for balancing post rotation
+        # Bonus for balancing post rotation (carrying over the previous period's counts)
         post_counts = self._get_post_counts(worker_id)
+        for prior_post, count in getattr(self.scheduler, 'prior_post_counts', {}).get(worker_id, {}).items():
+            if prior_post in post_counts:
+                post_counts[prior_post] += count
         total_assignments = sum(post_counts.values())
     
         # Skip post balance check for workers with few assignments
@@ -1040,6 +1047,15 @@ class ScheduleBuilder:
             if current_count < expected_per_post:
                 base_score += 10 * (expected_per_post - current_count)
     
+        # Bonus for balancing weekdays across the period boundary
+        prior_weekdays = getattr(self.scheduler, 'prior_weekday_counts', {}).get(worker_id)
+        if prior_weekdays and any(prior_weekdays.values()):
+            weekday_counts = {day: prior_weekdays.get(day, 0) + self.worker_weekdays[worker_id].get(day, 0)
+                              for day in range(7)}
+            expected_per_weekday = sum(weekday_counts.values()) / 7
+            if weekday_counts[date.weekday()] < expected_per_weekday:
+                base_score += 10 * (expected_per_weekday - weekday_counts[date.weekday()])
+    
         # Bonus for balancing workload
         work_percentage = worker.get('work_percentage', 100)
         current_assignments = len(self.worker_assignments[worker_id])
@@ -1159,6 +1175,51 @@ class ScheduleBuilder:
         # No _save_current_as_best here; scheduler's generate_schedule will handle it after this.
         # self._synchronize_tracking_data() # Ensure builder's view is also synced if it has separate copies (it shouldn't for core data)
         return assigned_count > 0
+
+    def _seed_from_prior_template(self, prior_schedule):
+        """
+        Use the previous period's structure as an initial assignment template.
+
+        Each empty slot is offered to the worker who held the same post on the same
+        weekday a whole number of weeks earlier, so weekday patterns are preserved
+        while the 7/14 day rule is respected. Every placement goes through the
+        regular constraint checks and respects target shifts.
+
+        Args:
+            prior_schedule: Dict mapping prior-period dates to worker lists
+
+        Returns:
+            int: Number of slots seeded from the template
+        """
+        if not prior_schedule:
+            return 0
+
+        prior_days = (max(prior_schedule) - min(prior_schedule)).days + 1
+        offset = timedelta(weeks=max(1, prior_days // 7))
+        targets = {w['id']: w.get('target_shifts', 0) for w in self.workers_data}
+        seeded_count = 0
+
+        for date in sorted(self.schedule):
+            template_workers = prior_schedule.get(date - offset)
+            if not template_workers:
+                continue
+            for post, worker_id in enumerate(template_workers):
+                if post >= len(self.schedule[date]) or self.schedule[date][post] is not None:
+                    continue
+                if worker_id not in self.worker_assignments:
+                    continue
+                if len(self.worker_assignments[worker_id]) >= targets.get(worker_id, 0):
+                    continue
+                if not self._can_assign_worker(worker_id, date, post):
+                    continue
+
+                self.schedule[date][post] = worker_id
+                self.worker_assignments[worker_id].add(date)
+                self.scheduler._update_tracking_data(worker_id, date, post, removing=False)
+                seeded_count += 1
+
+        logging.info(f"Seeded {seeded_count} slots from the prior schedule template (offset {offset.days} days)")
+        return seeded_count
     
     def _get_remaining_dates_to_process(self, forward):
         """Get remaining dates that need to be processed"""
@@ -3526,7 +3587,7 @@ class ScheduleBuilder:
     
         # 3. Check minimum gap constraints for worker1
         min_days_between = self.gap_between_shifts + 1
-        worker1_dates = sorted(list(assignments_copy[worker1_id]))
+        worker1_dates = sorted(assignments_copy[worker1_id] | self._get_prior_assignments(worker1_id))
     
         for assigned_date_val in worker1_dates: # Renamed assigned_date
             if assigned_date_val == date2:
@@ -3556,7 +3617,7 @@ class ScheduleBuilder:
                     return False
     
         # 4. Check minimum gap constraints for worker2
-        worker2_dates = sorted(list(assignments_copy[worker2_id]))
+        worker2_dates = sorted(assignments_copy[worker2_id] | self._get_prior_assignments(worker2_id))
     
         for assigned_date_val in worker2_dates: # Renamed assigned_date
             if assigned_date_val == date1:
@@ -3904,6 +3965,10 @@ class ScheduleBuilder:
         for i in range(max_main_loops):
             logging.info(f"--- Main Optimization Loop Iteration: {i + 1}/{max_main_loops} ---")
             made_change_in_main_iteration = False
+            
+            checkpoint_manager = getattr(self.scheduler, 'checkpoint_manager', None)
+            if checkpoint_manager:
+                checkpoint_manager.maybe_checkpoint('optimize', i, 0, max_main_loops)
         
             # Check if we should continue optimization
             current_score = self._evaluate_schedule()
@@ -0,0 +1,225 @@
+"""
+Concurrency control for real-time schedule editing.
+Cell edits share the schedule and serialize only on striped per-date and
+per-worker locks, so edits touching different dates and workers run in
+parallel. Whole-schedule operations (transactions, undo/redo, taking a
+snapshot) hold the schedule exclusively. Readers of the whole schedule
+work on immutable snapshots instead of the live structures.
+"""
+
+from contextlib import contextmanager, ExitStack
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Condition, RLock, get_ident, local
+from types import MappingProxyType
+from typing import List, Optional, Tuple, FrozenSet, Mapping, Iterable, Iterator, Hashable
+
+from exceptions import SchedulerError
+
+
+class ReadWriteLock:
+    """
+    Writer-preferring reader-writer lock
+
+    Reentrant for both sides: a thread holding the shared side may take it
+    again, and the exclusive owner may take either side. A shared holder
+    cannot upgrade to exclusive.
+    """
+
+    def __init__(self):
+        self._cond = Condition()
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = local()
+
+    def _read_depth(self) -> int:
+        return getattr(self._local, 'depth', 0)
+
+    def held(self) -> bool:
+        """Whether the calling thread holds either side of the lock"""
+        return self._writer == get_ident() or self._read_depth() > 0
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """Hold the lock shared with other shared holders"""
+        me = get_ident()
+        depth = self._read_depth()
+        if self._writer == me or depth:
+            # Nested inside our own exclusive or shared hold
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the lock exclusively"""
+        me = get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+            return
+        if self._read_depth():
+            raise SchedulerError("Cannot take the schedule exclusively while holding it shared")
+
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = None
+                self._write_depth = 0
+                self._cond.notify_all()
+
+
+@dataclass(frozen=True)
+class ScheduleSnapshot:
+    """Immutable, consistent view of the schedule at one version"""
+    schedule: Mapping[datetime, Tuple[Optional[str], ...]]
+    worker_assignments: Mapping[str, FrozenSet[datetime]]
+    version: int
+    taken_at: datetime
+
+
+def copy_snapshot(scheduler, version: int = 0) -> ScheduleSnapshot:
+    """
+    Copy a schedule into an immutable snapshot without taking any lock
+
+    Args:
+        scheduler: Scheduler whose schedule and worker_assignments to copy
+        version: Schedule version the snapshot corresponds to
+
+    Returns:
+        ScheduleSnapshot
+    """
+    schedule = {d: tuple(row) for d, row in scheduler.schedule.items()}
+    assignments = {w: frozenset(dates) for w, dates in scheduler.worker_assignments.items()}
+    return ScheduleSnapshot(
+        schedule=MappingProxyType(schedule),
+        worker_assignments=MappingProxyType(assignments),
+        version=version,
+        taken_at=datetime.now()
+    )
+
+
+class EditScope:
+    """Locks held by one cell edit; worker stripes are added once the workers are known"""
+
+    def __init__(self, locks: 'ScheduleLocks', stack: ExitStack):
+        self._locks = locks
+        self._stack = stack
+        self._workers_locked = False
+
+    def lock_workers(self, workers: Iterable[Optional[str]]):
+        """
+        Lock the stripes of the workers an edit touches
+
+        Called at most once per scope, after the date stripes are held, so
+        every edit takes stripes in the same global order.
+        """
+        if self._workers_locked:
+            raise SchedulerError("Worker locks already taken in this edit")
+        self._workers_locked = True
+        for lock in self._locks._stripes(self._locks._worker_stripes, (w for w in workers if w is not None)):
+            self._stack.enter_context(lock)
+
+
+class ScheduleLocks:
+    """Schedule-wide reader-writer lock plus striped date and worker locks"""
+
+    def __init__(self, stripes: int = 64):
+        """
+        Initialize the locks
+
+        Args:
+            stripes: Number of lock stripes for dates and for workers
+        """
+        self.schedule = ReadWriteLock()
+        self._date_stripes = [RLock() for _ in range(stripes)]
+        self._worker_stripes = [RLock() for _ in range(stripes)]
+
+    @staticmethod
+    def _stripes(stripes: List[RLock], keys: Iterable[Hashable]) -> List[RLock]:
+        """Distinct stripes for keys in index order (the global lock order)"""
+        return [stripes[i] for i in sorted({hash(key) % len(stripes) for key in keys})]
+
+    @contextmanager
+    def edit(self, dates: Iterable[datetime]) -> Iterator[EditScope]:
+        """
+        Hold the schedule shared and the stripes of the given dates
+
+        Yields:
+            EditScope for locking the workers involved
+        """
+        with self.schedule.shared(), ExitStack() as stack:
+            for lock in self._stripes(self._date_stripes, dates):
+                stack.enter_context(lock)
+            yield EditScope(self, stack)
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the whole schedule exclusively"""
+        with self.schedule.exclusive():
+            yield
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        """
+        Hold edits off while reading the live schedule structures
+
+        Takes the schedule exclusively, unless the calling thread already
+        holds it: a listener delivered inline from an edit cannot upgrade,
+        and reads under the edit's own locks.
+        """
+        if self.schedule.held():
+            yield
+            return
+        with self.schedule.exclusive():
+            yield
+
+    def snapshot(self, scheduler, version: int = 0) -> ScheduleSnapshot:
+        """
+        Copy the schedule into an immutable snapshot
+
+        Edits are held off only while copying; the snapshot can then be read
+        from any thread without locks. SnapshotStore (schedule_snapshots)
+        avoids the O(schedule) copy for repeated snapshots.
+
+        Args:
+            scheduler: Scheduler whose schedule and worker_assignments to copy
+            version: Schedule version the snapshot corresponds to
+
+        Returns:
+            ScheduleSnapshot
+        """
+        with self.schedule.exclusive():
+            return copy_snapshot(scheduler, version)
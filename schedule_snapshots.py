@@ -0,0 +1,233 @@
+"""
+Copy-on-write schedule snapshots.
+A shadow of the schedule is kept frozen (rows as tuples, assignments as
+frozensets) and split into one chunk per month. Taking a snapshot hands out
+the current chunks and marks them shared; the next edit to a shared chunk
+copies that chunk alone. Snapshots therefore cost O(1), and the first edit
+of a month after a snapshot costs one month of rows. Snapshots taken with
+no edit in between share the same views, so readers can cache results per
+view (see stats_engine).
+"""
+
+import logging
+from collections.abc import Mapping
+from contextlib import nullcontext
+from datetime import datetime
+from threading import RLock
+from types import MappingProxyType
+from typing import Dict, Optional, Set, Tuple, FrozenSet, Iterable, Iterator
+
+from event_bus import get_event_bus, EventType, DeliveryMode, CellChange, schedule_cell_changes
+from schedule_locks import ScheduleSnapshot
+
+
+Row = Tuple[Optional[str], ...]
+MonthKey = Tuple[int, int]
+
+
+class ScheduleView(Mapping):
+    """Read-only date -> row mapping over frozen month chunks"""
+
+    def __init__(self, chunks: Dict[MonthKey, Dict[datetime, Row]], size: int):
+        """
+        Initialize the view
+
+        Args:
+            chunks: Month chunks; neither the dict nor the chunks may change afterwards
+            size: Number of dates across the chunks
+        """
+        self._chunks = chunks
+        self._size = size
+
+    def __getitem__(self, date: datetime) -> Row:
+        try:
+            chunk = self._chunks[(date.year, date.month)]
+        except (AttributeError, KeyError):
+            raise KeyError(date) from None
+        return chunk[date]
+
+    def __iter__(self) -> Iterator[datetime]:
+        for chunk in self._chunks.values():
+            yield from chunk
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"ScheduleView({self._size} dates in {len(self._chunks)} months)"
+
+
+class SnapshotStore:
+    """
+    Frozen shadow of the schedule that snapshots share without copying
+
+    Built from the schedule on the first snapshot, then kept current by
+    schedule events (and by ChangeTracker for undo/redo, which edit without
+    events): each changed date and worker is re-read from the live schedule,
+    which the editing thread still holds locked when its events are
+    delivered. A regenerated schedule or an event that cannot be interpreted
+    drops the shadow; the next snapshot rebuilds it.
+    """
+
+    def __init__(self, scheduler, locks=None, versions=None, event_bus=None):
+        """
+        Initialize the store
+
+        Args:
+            scheduler: Scheduler whose schedule and worker_assignments to mirror
+            locks: ScheduleLocks held exclusively while a snapshot is taken, so
+                it never observes a half-applied edit (optional)
+            versions: VersionTable whose clock tags each snapshot (optional)
+            event_bus: Event bus to follow (the global bus by default)
+        """
+        self.scheduler = scheduler
+        self.locks = locks
+        self.versions = versions
+        self.event_bus = event_bus or get_event_bus()
+
+        self._lock = RLock()
+        self._built = False
+        self._chunks: Dict[MonthKey, Dict[datetime, Row]] = {}
+        self._size = 0
+        self._assignments: Dict[str, FrozenSet[datetime]] = {}
+
+        # What has been copied since the last snapshot and may be written in place
+        self._owned_chunks: Set[MonthKey] = set()
+        self._owns_chunk_index = False
+        self._owns_assignments = False
+        # Views handed out since the last write, reused until the next one
+        self._shared: Optional[Tuple[ScheduleView, Mapping]] = None
+
+        self.snapshots_taken = 0
+        self.chunk_copies = 0
+
+        for event_type in (EventType.SHIFT_ASSIGNED, EventType.SHIFT_UNASSIGNED,
+                           EventType.SHIFT_SWAPPED, EventType.BULK_UPDATE):
+            self.event_bus.subscribe(event_type, self._on_schedule_changed, delivery=DeliveryMode.SYNC)
+        self.event_bus.subscribe(EventType.SCHEDULE_GENERATED, self._on_schedule_generated,
+                                 delivery=DeliveryMode.SYNC)
+
+    def invalidate(self):
+        """Drop the shadow (call after editing the schedule without events)"""
+        with self._lock:
+            self._built = False
+
+    def snapshot(self) -> ScheduleSnapshot:
+        """
+        Take an immutable snapshot of the schedule
+
+        O(1) once the shadow is built; the first snapshot after construction
+        or invalidation copies the schedule once. Until the schedule changes,
+        every snapshot carries the same schedule and assignment views.
+
+        Returns:
+            ScheduleSnapshot whose schedule is a ScheduleView
+        """
+        with (self.locks.exclusive() if self.locks is not None else nullcontext()), self._lock:
+            if not self._built:
+                self._rebuild()
+            version = self.versions.clock if self.versions is not None else 0
+
+            if self._shared is None:
+                # Everything handed out from here on is copied before the next write
+                self._owned_chunks = set()
+                self._owns_chunk_index = False
+                self._owns_assignments = False
+                self._shared = (ScheduleView(self._chunks, self._size), MappingProxyType(self._assignments))
+            self.snapshots_taken += 1
+            schedule, assignments = self._shared
+            return ScheduleSnapshot(
+                schedule=schedule,
+                worker_assignments=assignments,
+                version=version,
+                taken_at=datetime.now()
+            )
+
+    def _rebuild(self):
+        chunks: Dict[MonthKey, Dict[datetime, Row]] = {}
+        for date, row in self.scheduler.schedule.items():
+            chunks.setdefault((date.year, date.month), {})[date] = tuple(row)
+        self._chunks = chunks
+        self._size = len(self.scheduler.schedule)
+        self._assignments = {w: frozenset(dates) for w, dates in self.scheduler.worker_assignments.items()}
+        self._owned_chunks = set(chunks)
+        self._owns_chunk_index = True
+        self._owns_assignments = True
+        self._shared = None
+        self._built = True
+
+    def record_cells(self, cells: Iterable[CellChange]):
+        """
+        Mirror cell changes already written to the schedule
+
+        Args:
+            cells: (date, post index, old worker, new worker) per changed cell
+        """
+        with self._lock:
+            if not self._built:
+                return
+            dates, workers = set(), set()
+            for shift_date, post_index, old, new in cells:
+                dates.add(shift_date)
+                workers.update(w for w in (old, new) if w is not None)
+            for shift_date in dates:
+                self._refresh_date(shift_date)
+            for worker_id in workers:
+                self._refresh_worker(worker_id)
+
+    def _writable_chunk(self, key: MonthKey) -> Dict[datetime, Row]:
+        """The chunk for a month, copied first if a snapshot shares it"""
+        self._shared = None
+        if not self._owns_chunk_index:
+            self._chunks = dict(self._chunks)
+            self._owns_chunk_index = True
+        if key not in self._owned_chunks:
+            self._chunks[key] = dict(self._chunks.get(key, ()))
+            self._owned_chunks.add(key)
+            self.chunk_copies += 1
+        return self._chunks[key]
+
+    def _refresh_date(self, shift_date: datetime):
+        row = self.scheduler.schedule.get(shift_date)
+        key = (shift_date.year, shift_date.month)
+        current = self._chunks.get(key, {}).get(shift_date)
+        if row is None:
+            if current is not None:
+                del self._writable_chunk(key)[shift_date]
+                self._size -= 1
+            return
+        frozen = tuple(row)
+        if frozen == current:
+            return
+        if current is None:
+            self._size += 1
+        self._writable_chunk(key)[shift_date] = frozen
+
+    def _refresh_worker(self, worker_id: str):
+        dates = self.scheduler.worker_assignments.get(worker_id)
+        frozen = frozenset(dates) if dates is not None else None
+        if frozen == self._assignments.get(worker_id):
+            return
+        self._shared = None
+        if not self._owns_assignments:
+            self._assignments = dict(self._assignments)
+            self._owns_assignments = True
+        if frozen is None:
+            self._assignments.pop(worker_id, None)
+        else:
+            self._assignments[worker_id] = frozen
+
+    def _on_schedule_changed(self, event):
+        """Mirror the cell changes of a schedule event"""
+        try:
+            cells = schedule_cell_changes(event)
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(f"Schedule event {event.event_type.value} not understood ({e}), "
+                            f"rebuilding snapshots")
+            self.invalidate()
+            return
+        self.record_cells(cells)
+
+    def _on_schedule_generated(self, event):
+        """A regenerated schedule is copied afresh on the next snapshot"""
+        self.invalidate()
@@ -0,0 +1,213 @@
+"""
+Versioned schedule synchronization for real-time clients.
+Turns schedule change events into numbered cell diffs so that clients can
+catch up after a reconnect instead of fetching the whole schedule.
+
+Protocol: every schedule_event broadcast carries from_version, to_version
+and changes. A client at version V applies a broadcast with
+from_version <= V < to_version, ignores broadcasts with to_version <= V and
+sends {'type': 'sync', 'version': V} when it sees from_version > V.
+
+Versions restart at 0 with every server process, so each message also
+carries the server epoch. A client reports the epoch its version belongs to
+(auth 'last_epoch', sync 'epoch') and gets a snapshot if it differs.
+"""
+
+from collections import deque
+from threading import Lock
+import uuid
+from typing import Dict, List, Optional, Any, Tuple
+import logging
+
+from event_bus import get_event_bus, EventType, DeliveryMode, ScheduleEvent, unpack_bulk_event, BATCHED_EVENT_TYPES
+
+
+# A cell diff: [shift date (ISO), post index, worker id or None]
+CellDiff = List[Any]
+
+
+class ScheduleSync:
+    """Keeps a schedule version and a ring of recent cell diffs"""
+
+    def __init__(self, scheduler, max_entries: int = 1000, max_delta_changes: int = 500):
+        """
+        Initialize schedule synchronization
+
+        Args:
+            scheduler: The main Scheduler instance
+            max_entries: Number of recent version steps kept for catch-up
+            max_delta_changes: Largest delta sent before falling back to a snapshot
+        """
+        self.scheduler = scheduler
+        self.event_bus = get_event_bus()
+        self.max_delta_changes = max_delta_changes
+
+        # Identifies this version sequence; versions from another epoch are meaningless
+        self.epoch = uuid.uuid4().hex
+        self.version = 0
+        # Each entry: (from_version, to_version, event seq, cell diffs or None for a full reset)
+        self._entries: deque = deque(maxlen=max_entries)
+        self._entries_by_seq: Dict[int, Tuple[int, int, Optional[int], Optional[List[CellDiff]]]] = {}
+        self._lock = Lock()
+
+        # Versions must be assigned in publish order, before any broadcast
+        for event_type in (EventType.SHIFT_ASSIGNED, EventType.SHIFT_UNASSIGNED, EventType.SHIFT_SWAPPED,
+                           EventType.BULK_UPDATE, EventType.SCHEDULE_GENERATED):
+            self.event_bus.subscribe(event_type, self._on_schedule_event, delivery=DeliveryMode.SYNC)
+
+        logging.info("ScheduleSync initialized")
+
+    @staticmethod
+    def event_to_diffs(event: ScheduleEvent) -> Optional[List[CellDiff]]:
+        """
+        Convert a schedule change event into cell diffs
+
+        Args:
+            event: A schedule change event
+
+        Returns:
+            List of cell diffs, or None if the event replaces the whole schedule
+            without listing its changes
+        """
+        data = event.data
+        if event.event_type == EventType.SHIFT_ASSIGNED:
+            return [[data['shift_date'], data['post_index'], data['worker_id']]]
+        if event.event_type == EventType.SHIFT_UNASSIGNED:
+            return [[data['shift_date'], data['post_index'], None]]
+        if event.event_type == EventType.SHIFT_SWAPPED:
+            return [
+                [data['shift_date1'], data['post_index1'], data.get('worker2')],
+                [data['shift_date2'], data['post_index2'], data.get('worker1')]
+            ]
+        if event.event_type == EventType.BULK_UPDATE:
+            diffs = []
+            for inner_event in unpack_bulk_event(event):
+                if inner_event.event_type not in BATCHED_EVENT_TYPES:
+                    continue  # Coalesced with the shift events, but changes no cells
+                inner_diffs = ScheduleSync.event_to_diffs(inner_event)
+                if inner_diffs is None:
+                    return None
+                diffs.extend(inner_diffs)
+            return diffs
+        if event.event_type == EventType.SCHEDULE_GENERATED and 'changes' in data:
+            return [[shift_date, post_index, new] for shift_date, post_index, _, new in data['changes']]
+        return None
+
+    def _on_schedule_event(self, event: ScheduleEvent):
+        """Advance the version for a schedule change"""
+        try:
+            diffs = self.event_to_diffs(event)
+        except KeyError as e:
+            logging.warning(f"Schedule event {event.event_type.value} missing {e}, forcing snapshot")
+            diffs = None
+
+        if diffs is not None and not diffs:
+            return  # e.g. a bulk summary without changes
+
+        with self._lock:
+            entry = (self.version, self.version + 1, event.seq, diffs)
+            self.version += 1
+            if len(self._entries) == self._entries.maxlen:
+                evicted = self._entries[0]
+                self._entries_by_seq.pop(evicted[2], None)
+            self._entries.append(entry)
+            if event.seq is not None:
+                self._entries_by_seq[event.seq] = entry
+
+    def get_version_range(self, seqs: List[int]) -> Optional[Dict[str, Any]]:
+        """
+        Get the version step and diffs produced by already published events
+
+        Args:
+            seqs: Event sequence numbers
+
+        Returns:
+            dict with from_version, to_version and changes, or None if the
+            events did not change the schedule or are no longer known
+        """
+        with self._lock:
+            entries = [self._entries_by_seq[s] for s in seqs if s in self._entries_by_seq]
+        if not entries:
+            return None
+
+        changes = []
+        for entry in entries:
+            if entry[3] is None:
+                changes = None
+                break
+            changes.extend(entry[3])
+        return {
+            'epoch': self.epoch,
+            'from_version': min(e[0] for e in entries),
+            'to_version': max(e[1] for e in entries),
+            'changes': changes
+        }
+
+    def get_delta(self, since_version: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the diffs needed to bring a client from since_version to the current version
+
+        Args:
+            since_version: Last version the client has applied
+
+        Returns:
+            A delta message, or None if a snapshot is required
+        """
+        with self._lock:
+            if since_version > self.version:
+                return None  # Client is ahead of us (e.g. server restart)
+            if since_version == self.version:
+                return {'type': 'delta', 'epoch': self.epoch, 'from_version': since_version,
+                        'to_version': self.version, 'changes': []}
+            if not self._entries or self._entries[0][0] > since_version:
+                return None  # Gap no longer in the ring
+
+            changes = []
+            for from_version, to_version, _, diffs in self._entries:
+                if to_version <= since_version:
+                    continue
+                if diffs is None:
+                    return None
+                changes.extend(diffs)
+                if len(changes) > self.max_delta_changes:
+                    return None
+            current = self.version
+
+        return {'type': 'delta', 'epoch': self.epoch, 'from_version': since_version,
+                'to_version': current, 'changes': changes}
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the whole schedule with its version
+
+        Cell diffs are absolute values, so applying a delta that overlaps the
+        snapshot is harmless.
+
+        Returns:
+            A snapshot message
+        """
+        with self._lock:
+            version = self.version
+            schedule = {
+                date.isoformat(): list(workers)
+                for date, workers in list(self.scheduler.schedule.items())
+            }
+        return {'type': 'snapshot', 'epoch': self.epoch, 'version': version, 'schedule': schedule}
+
+    def get_sync_message(self, client_version: Optional[int] = None,
+                         client_epoch: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the cheapest message that brings a client up to date
+
+        Args:
+            client_version: Last version the client has applied (None for a new client)
+            client_epoch: Epoch client_version belongs to
+
+        Returns:
+            A delta message if possible, otherwise a snapshot
+        """
+        if client_version is not None and client_epoch == self.epoch:
+            delta = self.get_delta(client_version)
+            if delta is not None:
+                return delta
+        return self.get_snapshot()
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 import logging
 import random
 import copy
+import threading
 from typing import Dict, List, Set, Optional, Tuple, Any
 
 from scheduler_config import setup_logging, SchedulerConfig
@@ -13,6 +14,7 @@ from utilities import DateTimeUtils
 from statistics import StatisticsCalculator
 from exceptions import SchedulerError
 from worker_eligibility import WorkerEligibilityTracker
+from schedule_locks import ScheduleSnapshot, copy_snapshot
 
 # Initialize logging using the configuration module
 setup_logging()
@@ -34,7 +36,7 @@ class Scheduler:
         
         try:
             # Initialize date_utils FIRST, before calling any method that might need it
-            self.date_utils = DateTimeUtils()
+            self.date_utils = DateTimeUtils(clock=config.get('clock'))
     
             # Then validate the configuration
             self._validate_config(config)
@@ -136,6 +138,25 @@ class Scheduler:
                 scheduler=self              # Pass reference to scheduler
             )
 
+            # Initialize crash-safe optimization checkpoints (optional, only if a path is configured)
+            self.checkpoint_manager = None
+            if config.get('checkpoint_path'):
+                from checkpoint_manager import CheckpointManager
+                self.checkpoint_manager = CheckpointManager(
+                    self,
+                    config['checkpoint_path'],
+                    config.get('checkpoint_interval', default_config['checkpoint_interval'])
+                )
+
+            # Warm start: boundary state carried over from the previous period (optional)
+            self.prior_schedule = {}
+            self.prior_assignments = {w['id']: set() for w in self.workers_data}
+            self.prior_post_counts = {w['id']: {} for w in self.workers_data}
+            self.prior_weekday_counts = {w['id']: {d: 0 for d in range(7)} for w in self.workers_data}
+            self.use_prior_schedule_template = config.get('prior_schedule_as_template', False)
+            if config.get('prior_schedule') is not None:
+                self.load_prior_schedule(config['prior_schedule'])
+
             # Initialize real-time engine (optional, only if real-time features are enabled)
             self.real_time_engine = None
             if config.get('enable_real_time', False):
@@ -146,27 +167,13 @@ class Scheduler:
                 except ImportError:
                     logging.warning("Real-time engine not available - real-time features disabled")
 
-            # Initialize predictive analytics engine (optional, only if enabled)
-            self.predictive_analytics = None
-            self.predictive_optimizer = None
-            if config.get('enable_predictive_analytics', True):
-                try:
-                    from predictive_analytics import PredictiveAnalyticsEngine
-                    from predictive_optimizer import PredictiveOptimizer
-                    
-                    predictive_config = config.get('predictive_analytics_config', {})
-                    self.predictive_analytics = PredictiveAnalyticsEngine(self, predictive_config)
-                    self.predictive_optimizer = PredictiveOptimizer(self, self.predictive_analytics)
-                    logging.info("Predictive analytics engine initialized")
-                    
-                    # Auto-collect data if enabled
-                    if predictive_config.get('auto_collect_data', True):
-                        self.predictive_analytics.auto_collect_data_if_enabled()
-                        
-                except ImportError as e:
-                    logging.warning(f"Predictive analytics not available - predictive features disabled: {e}")
-                except Exception as e:
-                    logging.error(f"Error initializing predictive analytics: {e}")
+            # Predictive analytics engine (optional, loaded lazily on first use)
+            self._predictive_enabled = config.get('enable_predictive_analytics', True)
+            self._predictive_config = config.get('predictive_analytics_config', {})
+            self._predictive_analytics = None
+            self._predictive_optimizer = None
+            self._predictive_loaded = False
+            self._predictive_lock = threading.Lock()
 
             # Sort the variable shifts by start date for efficient lookup
             self.variable_shifts.sort(key=lambda x: x['start_date'])
@@ -329,6 +336,102 @@ class Scheduler:
             # Move to next date
             current_date += timedelta(days=1)
         
+    def load_prior_schedule(self, prior_schedule) -> int:
+        """
+        Load the schedule of the previous period to warm-start generation.
+
+        Only the tail of the prior schedule (the days that can still interact with
+        the gap, 7/14 day and consecutive weekend rules) is used for boundary
+        constraints. Post and weekday counters are carried over from the whole
+        prior schedule so that rotation keeps balancing across periods.
+
+        Args:
+            prior_schedule: Path to a JSON file saved by the app ({'dd-mm-YYYY': [workers]}),
+                a previous Scheduler instance, or a dict mapping dates to worker lists
+
+        Returns:
+            int: Number of prior assignments loaded
+
+        Raises:
+            SchedulerError: If the prior schedule cannot be read
+        """
+        try:
+            if isinstance(prior_schedule, str):
+                import json
+                with open(prior_schedule, 'r') as f:
+                    prior_schedule = json.load(f)
+            elif hasattr(prior_schedule, 'schedule'):
+                prior_schedule = prior_schedule.schedule
+
+            parsed = {}
+            for date, workers in prior_schedule.items():
+                if isinstance(date, str):
+                    try:
+                        date = datetime.strptime(date, '%d-%m-%Y')
+                    except ValueError:
+                        date = datetime.fromisoformat(date)
+                if date < self.start_date:
+                    parsed[date] = list(workers)
+        except Exception as e:
+            logging.error(f"Error loading prior schedule: {str(e)}", exc_info=True)
+            raise SchedulerError(f"Failed to load prior schedule: {str(e)}")
+
+        self.prior_schedule = parsed
+        for worker_id in self.prior_assignments:
+            self.prior_assignments[worker_id].clear()
+            self.prior_post_counts[worker_id].clear()
+            self.prior_weekday_counts[worker_id] = {d: 0 for d in range(7)}
+
+        tail_start = self.start_date - timedelta(days=self._get_prior_lookback_days())
+        loaded = 0
+        for date, workers in parsed.items():
+            for post, worker_id in enumerate(workers):
+                if worker_id not in self.prior_assignments:
+                    continue  # Empty slot or worker no longer on the roster
+                counts = self.prior_post_counts[worker_id]
+                counts[post] = counts.get(post, 0) + 1
+                self.prior_weekday_counts[worker_id][date.weekday()] += 1
+                if date >= tail_start:
+                    self.prior_assignments[worker_id].add(date)
+                loaded += 1
+
+        self._apply_prior_schedule_seed()
+        logging.info(f"Loaded prior schedule: {len(parsed)} dates, {loaded} assignments "
+                     f"(boundary window from {tail_start.strftime('%d-%m-%Y')})")
+        return loaded
+
+    def _get_prior_lookback_days(self) -> int:
+        """Number of days before start_date that can still affect constraints"""
+        return max(
+            self.gap_between_shifts + 2,               # Gap (part-time workers get +1)
+            14,                                         # 7/14 day pattern
+            7 * (self.max_consecutive_weekends + 1)     # Consecutive weekend runs
+        )
+
+    def _apply_prior_schedule_seed(self) -> None:
+        """Seed last_assignment_date and consecutive_shifts from the prior schedule tail"""
+        previous_day = self.start_date - timedelta(days=1)
+        for worker_id, dates in self.prior_assignments.items():
+            if not dates:
+                continue
+            self.last_assignment_date[worker_id] = max(dates)
+            run_length = 0
+            while (previous_day - timedelta(days=run_length)) in dates:
+                run_length += 1
+            self.consecutive_shifts[worker_id] = run_length
+
+    def get_prior_assignments(self, worker_id) -> Set[datetime]:
+        """
+        Get the prior-period boundary assignments of a worker
+
+        Args:
+            worker_id: ID of the worker
+
+        Returns:
+            set: Dates in the prior schedule tail the worker was assigned to
+        """
+        return self.prior_assignments.get(worker_id, set())
+
     def _reset_schedule(self):
         """Reset all schedule data"""
         self.schedule = {}
@@ -1400,9 +1503,73 @@ class Scheduler:
         # Create scheduler core for orchestration
         scheduler_core = SchedulerCore(self)
         
+        # Keep the previous schedule so real-time listeners get the change as cell diffs
+        previous_schedule = self._copy_schedule_for_diff()
+        
         # Use orchestrated workflow
-        return scheduler_core.orchestrate_schedule_generation(max_improvement_loops)
-   
+        success = scheduler_core.orchestrate_schedule_generation(max_improvement_loops)
+        
+        if success:
+            self._emit_schedule_generated(previous_schedule)
+        
+        # Record the finished schedule for the predictive stack without blocking the caller
+        if success:
+            self._start_background_data_collection()
+        return success
+
+    def resume_generation(self, checkpoint, max_improvement_loops: Optional[int] = None) -> bool:
+        """
+        Resume an interrupted schedule generation from a checkpoint.
+
+        Args:
+            checkpoint: Path to a checkpoint file or an already loaded checkpoint dict
+            max_improvement_loops: Loop budget for the resumed run (defaults to the
+                budget recorded in the checkpoint)
+
+        Returns:
+            bool: True if schedule generation was successful
+
+        Raises:
+            SchedulerError: If the checkpoint is unreadable or belongs to another problem
+        """
+        from checkpoint_manager import CheckpointManager
+        from scheduler_core import SchedulerCore
+
+        checkpoint_data = CheckpointManager.load(checkpoint) if isinstance(checkpoint, str) else checkpoint
+
+        if checkpoint_data.get('fingerprint') != CheckpointManager.get_fingerprint(self):
+            raise SchedulerError("Checkpoint does not match this scheduler's period, shifts or workers")
+
+        if max_improvement_loops is None:
+            max_improvement_loops = checkpoint_data.get('max_loops') or 70
+
+        scheduler_core = SchedulerCore(self)
+        previous_schedule = self._copy_schedule_for_diff()
+        success = scheduler_core.orchestrate_schedule_generation(max_improvement_loops, resume_from=checkpoint_data)
+        
+        # The schedule was rebuilt in place, so event-maintained state must follow it
+        if success:
+            self._emit_schedule_generated(previous_schedule)
+        return success
+    
+    def _copy_schedule_for_diff(self) -> Optional[Dict[datetime, List[Optional[str]]]]:
+        """Copy the schedule before regenerating it, if real-time listeners need the diff"""
+        if not self.is_real_time_enabled():
+            return None
+        return {date: list(workers) for date, workers in self.schedule.items()}
+    
+    def _emit_schedule_generated(self, previous_schedule: Optional[Dict[datetime, List[Optional[str]]]]):
+        """Publish SCHEDULE_GENERATED with the cell diffs from previous_schedule"""
+        if previous_schedule is None:
+            return
+        from change_tracker import diff_schedules
+        from event_bus import EventType
+        self.real_time_engine.event_bus.emit(
+            EventType.SCHEDULE_GENERATED,
+            user_id=self.current_user,
+            changes=diff_schedules(previous_schedule, self.schedule)
+        )
+
     def _get_date_range(self, start_date, end_date):
         """
         Get list of dates between start_date and end_date (inclusive)
@@ -2065,27 +2232,29 @@ class Scheduler:
             int: Number of reports generated
         """
         count = 0
-        for worker in self.workers_data:
-            worker_id = worker['id']
-            try:
-                report = self.stats.generate_worker_report(worker_id)
-            
-                # Create filename
-                filename = f'worker_{worker_id}_report.txt'
-                if output_directory:
-                    import os
-                    os.makedirs(output_directory, exist_ok=True)
-                    filename = os.path.join(output_directory, filename)
+        # All reports describe the same snapshot of the schedule
+        with self.stats.report_run():
+            for worker in self.workers_data:
+                worker_id = worker['id']
+                try:
+                    report = self.stats.generate_worker_report(worker_id)
                 
-                # Save to file
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(report)
+                    # Create filename
+                    filename = f'worker_{worker_id}_report.txt'
+                    if output_directory:
+                        import os
+                        os.makedirs(output_directory, exist_ok=True)
+                        filename = os.path.join(output_directory, filename)
+                    
+                    # Save to file
+                    with open(filename, 'w', encoding='utf-8') as f:
+                        f.write(report)
+                    
+                    count += 1
+                    logging.info(f"Generated report for worker {worker_id}")
                 
-                count += 1
-                logging.info(f"Generated report for worker {worker_id}")
-            
-            except Exception as e:
-                logging.error(f"Failed to generate report for worker {worker_id}: {str(e)}")
+                except Exception as e:
+                    logging.error(f"Failed to generate report for worker {worker_id}: {str(e)}")
             
         logging.info(f"Generated {count} worker reports")
         return count
@@ -2218,7 +2387,8 @@ class Scheduler:
             return False
     
     def assign_worker_real_time(self, worker_id: str, shift_date: datetime, post_index: int,
-                               user_id: Optional[str] = None, validate: bool = True) -> Dict[str, Any]:
+                               user_id: Optional[str] = None, validate: bool = True,
+                               expected_versions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Assign worker to shift with real-time validation and feedback
         
@@ -2228,6 +2398,7 @@ class Scheduler:
             post_index: Post index (0-based)
             user_id: ID of user making the change
             validate: Whether to perform validation
+            expected_versions: Versions read by the client (see read_schedule_versions)
             
         Returns:
             Dictionary with operation result and feedback
@@ -2241,7 +2412,8 @@ class Scheduler:
         
         try:
             result = self.real_time_engine.assign_worker_real_time(
-                worker_id, shift_date, post_index, user_id, validate
+                worker_id, shift_date, post_index, user_id, validate,
+                expected_versions=expected_versions
             )
             
             return {
@@ -2249,8 +2421,10 @@ class Scheduler:
                 'message': result.message,
                 'operation_id': result.operation_id,
                 'validation_results': [v.__dict__ for v in result.validation_results],
-                'conflicts': [c.__dict__ for c in result.conflicts],
-                'suggestions': result.suggestions
+                'conflicts': [c.__dict__ if hasattr(c, '__dict__') else c for c in result.conflicts],
+                'suggestions': result.suggestions,
+                'versions': result.versions,
+                'stale': result.stale
             }
             
         except Exception as e:
@@ -2262,7 +2436,8 @@ class Scheduler:
             }
     
     def unassign_worker_real_time(self, shift_date: datetime, post_index: int, 
-                                 user_id: Optional[str] = None) -> Dict[str, Any]:
+                                 user_id: Optional[str] = None,
+                                 expected_versions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Unassign worker from shift with real-time feedback
         
@@ -2270,6 +2445,7 @@ class Scheduler:
             shift_date: Date of the shift
             post_index: Post index (0-based)
             user_id: ID of user making the change
+            expected_versions: Versions read by the client (see read_schedule_versions)
             
         Returns:
             Dictionary with operation result and feedback
@@ -2283,14 +2459,16 @@ class Scheduler:
         
         try:
             result = self.real_time_engine.unassign_worker_real_time(
-                shift_date, post_index, user_id
+                shift_date, post_index, user_id, expected_versions
             )
             
             return {
                 'success': result.success,
                 'message': result.message,
                 'operation_id': result.operation_id,
-                'suggestions': result.suggestions
+                'suggestions': result.suggestions,
+                'versions': result.versions,
+                'stale': result.stale
             }
             
         except Exception as e:
@@ -2303,7 +2481,8 @@ class Scheduler:
     
     def swap_workers_real_time(self, shift_date1: datetime, post_index1: int,
                               shift_date2: datetime, post_index2: int,
-                              user_id: Optional[str] = None, validate: bool = True) -> Dict[str, Any]:
+                              user_id: Optional[str] = None, validate: bool = True,
+                              expected_versions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Swap workers between shifts with real-time validation
         
@@ -2314,6 +2493,7 @@ class Scheduler:
             post_index2: Post index of second shift
             user_id: ID of user making the change
             validate: Whether to perform validation
+            expected_versions: Versions read by the client (see read_schedule_versions)
             
         Returns:
             Dictionary with operation result and feedback
@@ -2327,7 +2507,8 @@ class Scheduler:
         
         try:
             result = self.real_time_engine.swap_workers_real_time(
-                shift_date1, post_index1, shift_date2, post_index2, user_id, validate
+                shift_date1, post_index1, shift_date2, post_index2, user_id, validate,
+                expected_versions=expected_versions
             )
             
             return {
@@ -2335,7 +2516,9 @@ class Scheduler:
                 'message': result.message,
                 'operation_id': result.operation_id,
                 'validation_results': [v.__dict__ for v in result.validation_results],
-                'conflicts': [c.__dict__ for c in result.conflicts]
+                'conflicts': [c.__dict__ for c in result.conflicts],
+                'versions': result.versions,
+                'stale': result.stale
             }
             
         except Exception as e:
@@ -2346,6 +2529,25 @@ class Scheduler:
                 'error': 'OPERATION_FAILED'
             }
     
+    def read_schedule_versions(self, cells: List[Tuple[datetime, int]],
+                               workers: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Versions of schedule cells and workers for optimistic edits
+        
+        Submit the result with an edit as expected_versions; the edit is
+        rejected with the changed state if any of them changed meanwhile.
+        
+        Args:
+            cells: (date, post index) of the cells read
+            workers: Workers whose assignments were read (default: the workers on the cells)
+            
+        Returns:
+            Versions dict, empty if real-time features are disabled
+        """
+        if not self.is_real_time_enabled():
+            return {}
+        return self.real_time_engine.incremental_updater.read_versions(cells, workers)
+    
     def validate_schedule_real_time(self, quick_check: bool = False) -> Dict[str, Any]:
         """
         Perform real-time schedule validation
@@ -2470,6 +2672,41 @@ class Scheduler:
                 'error': f'Analytics failed: {str(e)}'
             }
     
+    def export_latency_metrics(self, path: str, fmt: str = 'json') -> Optional[str]:
+        """
+        Write real-time operation latency histograms to a file
+        
+        Args:
+            path: Output file
+            fmt: 'json' or 'prometheus'
+        
+        Returns:
+            The path written, or None if real-time features are disabled or the export failed
+        """
+        if not self.is_real_time_enabled():
+            return None
+        
+        try:
+            return self.real_time_engine.export_latency_metrics(path, fmt)
+        except (OSError, ValueError) as e:
+            logging.error(f"Error exporting latency metrics: {e}")
+            return None
+    
+    def get_schedule_snapshot(self) -> ScheduleSnapshot:
+        """
+        Immutable, consistent view of the schedule for exports and reports
+        
+        With real-time features enabled the snapshot is taken in O(1) and can
+        be read while edits continue; otherwise nothing edits concurrently and
+        the schedule is copied.
+        
+        Returns:
+            ScheduleSnapshot with frozen schedule rows and worker assignments
+        """
+        if self.is_real_time_enabled():
+            return self.real_time_engine.get_schedule_snapshot()
+        return copy_snapshot(self)
+    
     def get_change_history(self, limit: int = 20, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Get recent schedule changes
@@ -2506,9 +2743,84 @@ class Scheduler:
     
     # Predictive Analytics Integration Methods
     
+    def _load_predictive_stack(self) -> None:
+        """
+        Load the predictive analytics engine and optimizer on first use.
+        
+        Kept out of __init__ so that constructing a Scheduler does not pay for
+        the predictive modules, their storage I/O or the ML libraries.
+        """
+        with self._predictive_lock:
+            if self._predictive_loaded:
+                return
+            self._predictive_loaded = True
+            if not self._predictive_enabled:
+                return
+            try:
+                from predictive_analytics import PredictiveAnalyticsEngine
+                from predictive_optimizer import PredictiveOptimizer
+                
+                self._predictive_analytics = PredictiveAnalyticsEngine(self, self._predictive_config)
+                self._predictive_optimizer = PredictiveOptimizer(self, self._predictive_analytics)
+                logging.info("Predictive analytics engine initialized")
+                
+            except ImportError as e:
+                logging.warning(f"Predictive analytics not available - predictive features disabled: {e}")
+            except Exception as e:
+                logging.error(f"Error initializing predictive analytics: {e}")
+    
+    @property
+    def predictive_analytics(self):
+        """Predictive analytics engine, loaded on first access (None if disabled)"""
+        if not self._predictive_loaded:
+            self._load_predictive_stack()
+        return self._predictive_analytics
+    
+    @predictive_analytics.setter
+    def predictive_analytics(self, engine):
+        self._predictive_analytics = engine
+        self._predictive_loaded = True
+    
+    @property
+    def predictive_optimizer(self):
+        """Predictive optimizer, loaded on first access (None if disabled)"""
+        if not self._predictive_loaded:
+            self._load_predictive_stack()
+        return self._predictive_optimizer
+    
+    @predictive_optimizer.setter
+    def predictive_optimizer(self, optimizer):
+        self._predictive_optimizer = optimizer
+        self._predictive_loaded = True
+    
+    def _start_background_data_collection(self) -> Optional[threading.Thread]:
+        """
+        Collect historical data for the predictive stack on a background thread.
+        
+        Returns:
+            threading.Thread: The collection thread, or None if auto-collection is off
+        """
+        if not self._predictive_enabled or not self._predictive_config.get('auto_collect_data', True):
+            return None
+        
+        # The thread reads a snapshot, so edits made meanwhile cannot race with it
+        snapshot = self.get_schedule_snapshot()
+        
+        def collect():
+            try:
+                if self.predictive_analytics:
+                    self.predictive_analytics.auto_collect_data_if_enabled(snapshot)
+            except Exception as e:
+                logging.error(f"Background data collection failed: {e}")
+        
+        # A daemon thread, so a pending collection never keeps the process alive
+        thread = threading.Thread(target=collect, name='predictive-data-collection', daemon=True)
+        thread.start()
+        return thread
+    
     def is_predictive_analytics_enabled(self) -> bool:
         """Check if predictive analytics features are enabled"""
-        return self.predictive_analytics is not None
+        return self._predictive_enabled and self.predictive_analytics is not None
     
     def generate_demand_forecasts(self, forecast_days: int = 30) -> Dict[str, Any]:
         """
@@ -0,0 +1,335 @@
+"""
+Headless Scheduler CLI
+
+Batch entry point for generating schedules without the Kivy UI:
+
+    python -m scheduler_cli config.json --output-dir out --seed 42 --time-budget 300 --pdf
+
+The module only imports the scheduling core. Kivy is never imported, the PDF
+exporter is loaded only when PDF output is requested and the predictive
+analytics stack stays disabled unless --predictive is given.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+from scheduler_config import SchedulerConfig
+from scheduler import Scheduler
+from exceptions import SchedulerError
+from stats_engine import get_statistics_engine
+
+
+SOLVER_MODES = ('standard', 'adaptive', 'fast')
+FAST_MODE_LOOPS = 5  # Improvement loops used by the 'fast' solver mode
+DATE_FORMAT = '%d-%m-%Y'  # Same format used by schedule.json in the app
+
+
+def _parse_date(value) -> datetime:
+    """Parse a 'dd-mm-YYYY' or ISO formatted date string"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(value, DATE_FORMAT)
+    except ValueError:
+        return datetime.fromisoformat(value)
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """
+    Load a scheduler configuration from a JSON file.
+
+    Dates (start_date, end_date, holidays and variable shift ranges) may be
+    written as 'dd-mm-YYYY' or ISO strings. Worker fields are passed through
+    unchanged, as they already use the string formats the Scheduler parses.
+
+    Args:
+        config_path: Path of the JSON configuration file
+
+    Returns:
+        dict: Configuration ready to be passed to Scheduler
+
+    Raises:
+        SchedulerError: If the file cannot be read or a date cannot be parsed
+    """
+    try:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+
+        config['start_date'] = _parse_date(config['start_date'])
+        config['end_date'] = _parse_date(config['end_date'])
+        config['holidays'] = [_parse_date(h) for h in config.get('holidays', [])]
+        for shift_range in config.get('variable_shifts', []):
+            shift_range['start_date'] = _parse_date(shift_range['start_date'])
+            shift_range['end_date'] = _parse_date(shift_range['end_date'])
+        return config
+
+    except KeyError as e:
+        raise SchedulerError(f"Missing required configuration key in {config_path}: {str(e)}")
+    except (OSError, ValueError, TypeError) as e:
+        raise SchedulerError(f"Failed to load configuration {config_path}: {str(e)}")
+
+
+def _resolve_improvement_loops(scheduler, solver_mode: str, max_loops: Optional[int]) -> int:
+    """Translate a solver mode into the number of improvement loops to run"""
+    if solver_mode == 'fast':
+        return FAST_MODE_LOOPS
+    if solver_mode == 'adaptive':
+        from adaptive_iterations import AdaptiveIterationManager
+        return AdaptiveIterationManager(scheduler).calculate_adaptive_iterations()['max_optimization_loops']
+    if max_loops is not None:
+        return max_loops
+    return scheduler.config.get('max_improvement_loops', SchedulerConfig.DEFAULT_OPTIMIZATION_LOOPS)
+
+
+def run_generation(config: Dict[str, Any], seed: int, solver_mode: str = 'standard',
+                   max_loops: Optional[int] = None) -> Tuple[Any, float]:
+    """
+    Run a single schedule generation.
+
+    Args:
+        config: Scheduler configuration
+        seed: Seed for the global random generator used by the builder
+        solver_mode: One of SOLVER_MODES
+        max_loops: Improvement loop budget for the 'standard' mode
+
+    Returns:
+        Tuple[Scheduler, float]: The scheduler holding the result and its score
+    """
+    random.seed(seed)
+    scheduler = Scheduler(config)
+    loops = _resolve_improvement_loops(scheduler, solver_mode, max_loops)
+    logging.info(f"Start with seed {seed}: solver mode '{solver_mode}', {loops} improvement loops")
+
+    if not scheduler.generate_schedule(max_improvement_loops=loops):
+        raise SchedulerError(f"Schedule generation failed for seed {seed}")
+
+    best_data = getattr(scheduler.schedule_builder, 'best_schedule_data', None) or {}
+    return scheduler, best_data.get('score', float('-inf'))
+
+
+def _run_parallel_start(config: Dict[str, Any], seed: int, solver_mode: str,
+                        max_loops: Optional[int], log_level: int) -> Dict[str, Any]:
+    """Process pool entry point: run one start and return a picklable result"""
+    logging.getLogger().setLevel(log_level)
+    if config.get('checkpoint_path'):
+        # Concurrent starts must not overwrite each other's checkpoint
+        config = dict(config, checkpoint_path=f"{config['checkpoint_path']}.{seed}")
+    try:
+        scheduler, score = run_generation(config, seed, solver_mode, max_loops)
+        return {'seed': seed, 'score': score, 'schedule': scheduler.schedule, 'error': None}
+    except Exception as e:
+        return {'seed': seed, 'score': float('-inf'), 'schedule': None, 'error': str(e)}
+
+
+def _restore_scheduler(config: Dict[str, Any], schedule: Dict[datetime, List]):
+    """Rebuild a Scheduler around a schedule produced in another process"""
+    scheduler = Scheduler(config)
+    # Components created with the scheduler hold the schedule dict, so fill it in place
+    scheduler.schedule.clear()
+    scheduler.schedule.update(schedule)
+    scheduler._synchronize_tracking_data()
+    return scheduler
+
+
+def generate_best_schedule(config: Dict[str, Any], starts: int = 1, seed: Optional[int] = None,
+                           solver_mode: str = 'standard',
+                           max_loops: Optional[int] = None) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run one or more independent starts and keep the best schedule.
+
+    Args:
+        config: Scheduler configuration
+        starts: Number of independent starts; more than one runs in worker processes
+        seed: Base seed, start i uses seed + i (random when omitted)
+        solver_mode: One of SOLVER_MODES
+        max_loops: Improvement loop budget for the 'standard' mode
+
+    Returns:
+        Tuple[Scheduler, dict]: Scheduler holding the best schedule and run metadata
+
+    Raises:
+        SchedulerError: If every start failed
+    """
+    base_seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 31)
+    seeds = [base_seed + i for i in range(max(1, starts))]
+    start_time = time.monotonic()
+
+    if len(seeds) == 1:
+        scheduler, score = run_generation(config, seeds[0], solver_mode, max_loops)
+        best_seed, failed = seeds[0], []
+    else:
+        max_workers = min(len(seeds), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_run_parallel_start, config, s, solver_mode, max_loops,
+                                       logging.getLogger().level) for s in seeds]
+            results = [future.result() for future in futures]
+
+        failed = [r for r in results if r['error']]
+        for result in failed:
+            logging.warning(f"Start with seed {result['seed']} failed: {result['error']}")
+        successful = [r for r in results if not r['error']]
+        if not successful:
+            raise SchedulerError(f"All {len(seeds)} starts failed")
+
+        best = max(successful, key=lambda r: r['score'])
+        scheduler = _restore_scheduler(config, best['schedule'])
+        score, best_seed = best['score'], best['seed']
+
+    run_info = {
+        'seed': best_seed,
+        'score': score,
+        'solver_mode': solver_mode,
+        'starts': len(seeds),
+        'failed_starts': len(failed),
+        'duration_seconds': round(time.monotonic() - start_time, 3),
+    }
+    return scheduler, run_info
+
+
+def build_export_stats(scheduler, snapshot=None) -> Dict[str, Any]:
+    """
+    Build the statistics structure expected by PDFExporter.export_summary_pdf
+
+    Args:
+        scheduler: Scheduler holding a generated schedule
+        snapshot: ScheduleSnapshot to read (a fresh one by default)
+
+    Returns:
+        dict: Per-worker totals, distributions and shift listings
+    """
+    snapshot = snapshot or scheduler.get_schedule_snapshot()
+    statistics = get_statistics_engine().compute(snapshot, scheduler.holidays)
+    return statistics.export_summary(scheduler.num_shifts, scheduler.start_date, scheduler.end_date,
+                                     worker_ids=[w['id'] for w in scheduler.workers_data])
+
+
+def write_outputs(scheduler, run_info: Dict[str, Any], output_dir: str, write_pdf: bool = False) -> List[str]:
+    """
+    Write the schedule, statistics and (optionally) PDF reports.
+
+    Args:
+        scheduler: Scheduler holding the generated schedule
+        run_info: Metadata returned by generate_best_schedule
+        output_dir: Directory the files are written to
+        write_pdf: Whether to also export PDF reports
+
+    Returns:
+        list: Paths of the files written
+    """
+    from statistics import StatisticsCalculator
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    # Every file describes the same schedule, even if it is edited meanwhile
+    snapshot = scheduler.get_schedule_snapshot()
+
+    schedule_path = os.path.join(output_dir, 'schedule.json')
+    with open(schedule_path, 'w') as f:
+        json.dump({date.strftime(DATE_FORMAT): workers for date, workers in sorted(snapshot.schedule.items())},
+                  f, indent=2)
+    written.append(schedule_path)
+
+    stats_path = os.path.join(output_dir, 'stats.json')
+    stats = StatisticsCalculator(scheduler, snapshot=snapshot).gather_statistics()
+    stats['run'] = run_info
+    with open(stats_path, 'w') as f:
+        json.dump(stats, f, indent=2, default=str)
+    written.append(stats_path)
+
+    if write_pdf:
+        from pdf_exporter import PDFExporter
+
+        exporter = PDFExporter({
+            'schedule': snapshot.schedule,
+            'workers_data': scheduler.workers_data,
+            'num_shifts': scheduler.num_shifts,
+            'holidays': scheduler.holidays,
+        })
+        written.append(exporter.export_summary_pdf(build_export_stats(scheduler, snapshot),
+                                                   filename=os.path.join(output_dir, 'summary.pdf')))
+        for year, month in sorted({(d.year, d.month) for d in snapshot.schedule}):
+            written.append(exporter.export_monthly_calendar(
+                year, month, filename=os.path.join(output_dir, f'schedule_{year}_{month:02d}.pdf')))
+
+    return written
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser"""
+    parser = argparse.ArgumentParser(
+        prog='python -m scheduler_cli',
+        description='Generate a shift schedule from a JSON configuration without the UI.')
+    parser.add_argument('config', help='Path of the JSON scheduler configuration')
+    parser.add_argument('-o', '--output-dir', default='.', help='Directory for the output files')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed (start i uses seed + i)')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Wall-clock seconds allowed per start for the improvement phase')
+    parser.add_argument('--solver-mode', choices=SOLVER_MODES, default='standard',
+                        help='standard: fixed loop budget, adaptive: sized to problem complexity, '
+                             'fast: a few improvement loops')
+    parser.add_argument('--max-loops', type=int, default=None,
+                        help='Improvement loop budget for the standard mode')
+    parser.add_argument('--starts', type=int, default=1,
+                        help='Number of independent starts run in parallel processes')
+    parser.add_argument('--pdf', action='store_true', help='Also write PDF summary and monthly calendars')
+    parser.add_argument('--predictive', action='store_true', help='Enable the predictive analytics stack')
+    parser.add_argument('--checkpoint', default=None, help='Write optimization checkpoints to this file')
+    parser.add_argument('--prior-schedule', default=None, help="Previous period's schedule.json for warm start")
+    parser.add_argument('--log-level', default='WARNING',
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], help='Logging level')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        int: Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    logging.getLogger().setLevel(getattr(logging, args.log_level))
+
+    try:
+        config = load_config(args.config)
+        if args.predictive:
+            config['enable_predictive_analytics'] = True
+        else:
+            config.setdefault('enable_predictive_analytics', False)
+        if args.time_budget is not None:
+            config['max_generation_time'] = args.time_budget
+        if args.checkpoint:
+            config['checkpoint_path'] = args.checkpoint
+        if args.prior_schedule:
+            config['prior_schedule'] = args.prior_schedule
+
+        scheduler, run_info = generate_best_schedule(
+            config, starts=args.starts, seed=args.seed,
+            solver_mode=args.solver_mode, max_loops=args.max_loops)
+        written = write_outputs(scheduler, run_info, args.output_dir, write_pdf=args.pdf)
+
+    except SchedulerError as e:
+        logging.error(f"Schedule generation failed: {str(e)}")
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Generated schedule (seed {run_info['seed']}, score {run_info['score']:.2f}, "
+          f"{run_info['duration_seconds']:.1f}s)")
+    for path in written:
+        print(f"  {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -100,6 +100,9 @@ class SchedulerConfig:
     DEFAULT_NUM_SHIFTS = 3
     DEFAULT_OPTIMIZATION_LOOPS = 70
     DEFAULT_LAST_POST_ADJUSTMENT_ITERATIONS = 5
+    DEFAULT_CHECKPOINT_INTERVAL = 5.0  # Seconds between optimization checkpoints
+    DEFAULT_MAX_GENERATION_TIME = None  # Seconds allowed for generation (None = no limit)
+    DEFAULT_EVENT_DISPATCH_WORKERS = 0  # Event bus worker threads (0 = synchronous dispatch)
     
     # Performance optimization settings
     CACHE_ENABLED = True
@@ -125,6 +128,9 @@ class SchedulerConfig:
             'num_shifts': cls.DEFAULT_NUM_SHIFTS,
             'max_improvement_loops': cls.DEFAULT_OPTIMIZATION_LOOPS,
             'last_post_adjustment_max_iterations': cls.DEFAULT_LAST_POST_ADJUSTMENT_ITERATIONS,
+            'checkpoint_interval': cls.DEFAULT_CHECKPOINT_INTERVAL,
+            'max_generation_time': cls.DEFAULT_MAX_GENERATION_TIME,
+            'event_dispatch_workers': cls.DEFAULT_EVENT_DISPATCH_WORKERS,
             'cache_enabled': cls.CACHE_ENABLED,
             'lazy_evaluation': cls.LAZY_EVALUATION,
             'batch_size': cls.BATCH_SIZE
@@ -6,6 +6,7 @@ extracted from the original Scheduler class to improve maintainability and separ
 """
 
 import logging
+import random
 from datetime import datetime, timedelta
 from typing import Dict, List, Set, Optional, Tuple, Any
 
@@ -31,15 +32,18 @@ class SchedulerCore:
         self.start_date = scheduler.start_date
         self.end_date = scheduler.end_date
         self.workers_data = scheduler.workers_data
+        self._deadline: Optional[datetime] = None
         
         logging.info("SchedulerCore initialized")
     
-    def orchestrate_schedule_generation(self, max_improvement_loops: int = 70) -> bool:
+    def orchestrate_schedule_generation(self, max_improvement_loops: int = 70,
+                                        resume_from: Optional[Dict[str, Any]] = None) -> bool:
         """
         Main orchestration method for schedule generation workflow.
         
         Args:
             max_improvement_loops: Maximum number of improvement iterations
+            resume_from: Optional checkpoint payload to continue an interrupted run from
             
         Returns:
             bool: True if schedule generation was successful
@@ -47,23 +51,37 @@ class SchedulerCore:
         logging.info("Starting schedule generation orchestration...")
         start_time = datetime.now()
         
+        # Optional wall-clock budget for the improvement phase
+        time_budget = self.config.get('max_generation_time')
+        self._deadline = start_time + timedelta(seconds=time_budget) if time_budget else None
+        
         try:
             # Phase 1: Initialize schedule structure
             if not self._initialize_schedule_phase():
                 raise SchedulerError("Failed to initialize schedule structure")
             
-            # Phase 2: Assign mandatory shifts
-            if not self._assign_mandatory_phase():
-                raise SchedulerError("Failed to assign mandatory shifts")
+            start_loop, start_operation = 0, 0
+            if resume_from is not None:
+                # Phase 2 (resumed): Restore best-so-far state instead of re-assigning
+                start_loop, start_operation = self._restore_checkpoint_phase(resume_from)
+            else:
+                # Phase 2: Assign mandatory shifts
+                if not self._assign_mandatory_phase():
+                    raise SchedulerError("Failed to assign mandatory shifts")
             
             # Phase 3: Iterative improvement
-            if not self._iterative_improvement_phase(max_improvement_loops):
+            if not self._iterative_improvement_phase(max_improvement_loops, start_loop, start_operation):
                 logging.warning("Iterative improvement phase completed with issues")
             
             # Phase 4: Finalization
             if not self._finalization_phase():
                 raise SchedulerError("Failed to finalize schedule")
             
+            # A completed run no longer needs its checkpoint
+            checkpoint_manager = getattr(self.scheduler, 'checkpoint_manager', None)
+            if checkpoint_manager:
+                checkpoint_manager.clear()
+            
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             logging.info(f"Schedule generation orchestration completed successfully in {duration:.2f} seconds.")
@@ -95,6 +113,9 @@ class SchedulerCore:
             self.scheduler.last_assignment_date = {w['id']: None for w in self.workers_data}
             self.scheduler.consecutive_shifts = {w['id']: 0 for w in self.workers_data}
             
+            # Carry over boundary state from the previous period (warm start)
+            self.scheduler._apply_prior_schedule_seed()
+            
             # Initialize schedule with variable shifts
             self.scheduler._initialize_schedule_with_variable_shifts()
             
@@ -125,9 +146,18 @@ class SchedulerCore:
             # Synchronize tracking data
             self.scheduler.schedule_builder._synchronize_tracking_data()
             
+            # Seed the remaining slots from the previous period's structure (warm start)
+            if self.scheduler.use_prior_schedule_template and self.scheduler.prior_schedule:
+                self.scheduler.schedule_builder._seed_from_prior_template(self.scheduler.prior_schedule)
+            
             # Save initial state as best
             self.scheduler.schedule_builder._save_current_as_best(initial=True)
             
+            # Checkpoint the locked mandatory state so a resume never redoes it
+            checkpoint_manager = getattr(self.scheduler, 'checkpoint_manager', None)
+            if checkpoint_manager:
+                checkpoint_manager.write_checkpoint('mandatory', 0, 0)
+            
             # Log summary
             self.scheduler.log_schedule_summary("After Mandatory Assignment")
             
@@ -138,19 +168,73 @@ class SchedulerCore:
             logging.error(f"Failed in mandatory assignment phase: {str(e)}", exc_info=True)
             return False
     
-    def _iterative_improvement_phase(self, max_improvement_loops: int) -> bool:
+    def _restore_checkpoint_phase(self, checkpoint_data: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Phase 2 (resumed): Restore the best-so-far state stored in a checkpoint.
+        
+        Args:
+            checkpoint_data: Checkpoint payload written by CheckpointManager
+            
+        Returns:
+            Tuple[int, int]: Improvement loop and operation index to continue from
+                (the start of the improvement phase unless the checkpoint was
+                written by it)
+        """
+        logging.info(f"Phase 2: Restoring checkpoint from phase '{checkpoint_data.get('phase')}', "
+                     f"loop {checkpoint_data.get('loop_index', 0)}...")
+        
+        builder = self.scheduler.schedule_builder
+        best_data = checkpoint_data['best_schedule_data']
+        
+        # The builder holds direct references to the scheduler structures, so update in place
+        self.scheduler.schedule.clear()
+        for date, shifts in best_data['schedule'].items():
+            self.scheduler.schedule[date] = list(shifts)
+        builder._synchronize_tracking_data()
+        
+        for attr in ('last_assignment_date', 'consecutive_shifts'):
+            saved = best_data.get(attr)
+            if saved:
+                getattr(self.scheduler, attr).update(saved)
+        
+        builder._locked_mandatory = set(checkpoint_data.get('locked_mandatory', set()))
+        builder.best_schedule_data = best_data
+        random.setstate(checkpoint_data['rng_state'])
+        
+        self.scheduler.log_schedule_summary("After Checkpoint Restore")
+        
+        # Positions recorded by other loops (e.g. ScheduleBuilder._optimize_schedule's
+        # 'optimize' checkpoints) do not index the improvement phase
+        if checkpoint_data.get('phase') != 'iterative_improvement':
+            return 0, 0
+        return checkpoint_data.get('loop_index', 0), checkpoint_data.get('operation_index', 0)
+    
+    def _time_budget_exhausted(self) -> bool:
+        """Check whether the configured generation time budget has run out"""
+        return self._deadline is not None and datetime.now() >= self._deadline
+    
+    def _checkpoint(self, loop_index: int, operation_index: int, max_loops: int) -> None:
+        """Write a periodic checkpoint if checkpointing is enabled"""
+        checkpoint_manager = getattr(self.scheduler, 'checkpoint_manager', None)
+        if checkpoint_manager:
+            checkpoint_manager.maybe_checkpoint('iterative_improvement', loop_index, operation_index, max_loops)
+    
+    def _iterative_improvement_phase(self, max_improvement_loops: int,
+                                     start_loop: int = 0, start_operation: int = 0) -> bool:
         """
         Phase 3: Iterative improvement of the schedule.
         
         Args:
             max_improvement_loops: Maximum number of improvement iterations
+            start_loop: Loop to start from (non-zero when resuming from a checkpoint)
+            start_operation: Operation within start_loop to start from
             
         Returns:
             bool: True if improvement phase completed successfully
         """
         logging.info("Phase 3: Starting iterative improvement...")
         
-        improvement_loop_count = 0
+        improvement_loop_count = start_loop
         improvement_made_in_cycle = True
         
         try:
@@ -172,7 +256,13 @@ class SchedulerCore:
                     ("adjust_last_post_distribution", self.scheduler.schedule_builder._adjust_last_post_distribution),
                 ]
                 
-                for operation_name, operation_func in improvement_operations:
+                first_operation = start_operation if improvement_loop_count == start_loop else 0
+                for operation_index, (operation_name, operation_func) in enumerate(improvement_operations):
+                    if operation_index < first_operation:
+                        continue
+                    if self._time_budget_exhausted():
+                        break
+                    self._checkpoint(improvement_loop_count, operation_index, max_improvement_loops)
                     try:
                         if operation_name == "synchronize_tracking_data":
                             # This operation always runs and doesn't return improvement status
@@ -192,6 +282,11 @@ class SchedulerCore:
                     logging.info("No further improvements detected. Exiting improvement phase.")
                 
                 improvement_loop_count += 1
+                
+                if self._time_budget_exhausted():
+                    logging.info(f"Time budget exhausted after {improvement_loop_count} improvement loops. "
+                                 f"Stopping improvements.")
+                    break
             
             if improvement_loop_count >= max_improvement_loops:
                 logging.warning(f"Reached maximum improvement loops ({max_improvement_loops}). Stopping improvements.")
@@ -1,29 +1,42 @@
 # Imports
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 from exceptions import SchedulerError
+from stats_engine import get_statistics_engine
 if TYPE_CHECKING:
     from scheduler import Schedulerr
 
 class StatisticsCalculator:
     """Calculates statistics and metrics for schedules"""
     
-    def __init__(self, scheduler):
+    def __init__(self, scheduler, snapshot=None):
         """
         Initialize the statistics calculator
     
         Args:
             scheduler: The main Scheduler object
+            snapshot: ScheduleSnapshot to report on instead of the live schedule,
+                so long reports stay consistent while the schedule is edited
         """
         self.scheduler = scheduler
+        self.snapshot = snapshot
+        # Live snapshot pinned by report_run, per thread
+        self._run = threading.local()
     
         # Store references to frequently accessed attributes
-        self.schedule = scheduler.schedule
-        self.worker_assignments = scheduler.worker_assignments
-        self.worker_posts = scheduler.worker_posts
-        self.worker_weekdays = scheduler.worker_weekdays
-        self.worker_weekends = scheduler.worker_weekends
+        if snapshot is not None:
+            self.schedule = snapshot.schedule
+            self.worker_assignments = snapshot.worker_assignments
+            self._tracking_from_snapshot(scheduler, snapshot)
+        else:
+            self.schedule = scheduler.schedule
+            self.worker_assignments = scheduler.worker_assignments
+            self.worker_posts = scheduler.worker_posts
+            self.worker_weekdays = scheduler.worker_weekdays
+            self.worker_weekends = scheduler.worker_weekends
         self.workers_data = scheduler.workers_data
         self.num_shifts = scheduler.num_shifts
         self.holidays = scheduler.holidays  # Add this line to reference holidays
@@ -35,6 +48,63 @@ class StatisticsCalculator:
     
         logging.info("StatisticsCalculator initialized")
     
+    def _tracking_from_snapshot(self, scheduler, snapshot):
+        """
+        Derive the scheduler's per-worker tracking data from a snapshot
+        
+        Sets worker_posts, worker_weekdays and worker_weekends shaped like the
+        Scheduler attributes of the same names.
+        """
+        statistics = get_statistics_engine().compute(snapshot, scheduler.holidays)
+        worker_ids = [w['id'] for w in scheduler.workers_data]
+        worker_ids.extend(w for w in statistics.workers if w not in worker_ids)
+        self.worker_posts = {w: set(statistics.worker(w).post_counts) for w in worker_ids}
+        self.worker_weekdays = {w: dict(statistics.worker(w).weekdays) for w in worker_ids}
+        self.worker_weekends = {w: list(statistics.worker(w).special_days) for w in worker_ids}
+    
+    @contextmanager
+    def report_run(self):
+        """
+        Report on one snapshot of the live schedule for the duration of the block
+        
+        Helpers called inside the block share that snapshot and its statistics
+        instead of taking a new snapshot each. Nested runs reuse the outer one.
+        """
+        if self.snapshot is not None or getattr(self._run, 'snapshot', None) is not None:
+            yield
+            return
+        self._run.snapshot = self.scheduler.get_schedule_snapshot()
+        try:
+            yield
+        finally:
+            self._run.snapshot = None
+    
+    def _current_snapshot(self):
+        """The snapshot being reported on, or None to use the live schedule"""
+        if self.snapshot is not None:
+            return self.snapshot
+        return getattr(self._run, 'snapshot', None)
+    
+    def _statistics(self):
+        """
+        Single-pass statistics of the schedule being reported on
+        
+        Returns:
+            ScheduleStatistics of the snapshot (or the one pinned by report_run),
+            else of a fresh snapshot of the live schedule
+        """
+        snapshot = self._current_snapshot()
+        if snapshot is None:
+            snapshot = self.scheduler.get_schedule_snapshot()
+        return get_statistics_engine().compute(snapshot, self.scheduler.holidays)
+    
+    def _schedule_data(self):
+        """Schedule and worker assignments to report on: the snapshot's, else the live ones"""
+        snapshot = self._current_snapshot()
+        if snapshot is not None:
+            return snapshot.schedule, snapshot.worker_assignments
+        return self.scheduler.schedule, self.scheduler.worker_assignments
+    
     def get_post_counts(self, worker_id):
         """
         Get the counts of different posts for a worker
@@ -44,14 +114,7 @@ class StatisticsCalculator:
         Returns:
             dict: Dictionary mapping post numbers to counts
         """
-        if worker_id not in self.worker_posts:
-            return {}
-            
-        post_counts = {}
-        for post in self.worker_posts[worker_id]:
-            post_counts[post] = post_counts.get(post, 0) + 1
-        
-        return post_counts
+        return dict(self._statistics().worker(worker_id).post_counts)
     
     def _get_monthly_distribution(self, worker_id):
         """
@@ -62,11 +125,7 @@ class StatisticsCalculator:
         Returns:
             dict: Monthly shift counts {YYYY-MM: count}
         """
-        distribution = {}
-        for date in sorted(list(self.worker_assignments[worker_id])):
-            month_key = f"{date.year}-{date.month:02d}"
-            distribution[month_key] = distribution.get(month_key, 0) + 1
-        return distribution
+        return dict(self._statistics().worker(worker_id).monthly)
     
     def _analyze_gaps(self, worker_id):
         """
@@ -77,18 +136,7 @@ class StatisticsCalculator:
         Returns:
             dict: Statistics about gaps between assignments
         """
-        assignments = sorted(list(self.worker_assignments[worker_id]))
-        if len(assignments) <= 1:
-            return {'min_gap': None, 'max_gap': None, 'avg_gap': None}
-
-        gaps = [(assignments[i+1] - assignments[i]).days 
-                for i in range(len(assignments)-1)]
-        
-        return {
-            'min_gap': min(gaps),
-            'max_gap': max(gaps),
-            'avg_gap': sum(gaps) / len(gaps)
-        }
+        return self._statistics().worker(worker_id).gaps
 
     def _get_least_used_weekday(self, worker_id):
         """
@@ -112,13 +160,16 @@ class StatisticsCalculator:
         """
         Gather comprehensive schedule statistics
         
+        All distributions come from one pass over the schedule.
+        
         Returns:
             dict: Detailed statistics about the schedule and worker assignments
         """
+        statistics = self._statistics()
         stats = {
             'general': {
                 'total_days': (self.end_date - self.start_date).days + 1,
-                'total_shifts': sum(len(shifts) for shifts in self.schedule.values()),
+                'total_shifts': statistics.total_slots,
                 'constraint_skips': {
                     'gap': sum(len(skips['gap']) for skips in self.constraint_skips.values()),
                     'incompatibility': sum(len(skips['incompatibility']) for skips in self.constraint_skips.values()),
@@ -130,9 +181,9 @@ class StatisticsCalculator:
 
         for worker in self.workers_data:
             worker_id = worker['id']
-            assignments = self.worker_assignments[worker_id]
+            worker_stats = statistics.worker(worker_id)
             
-            monthly_dist = self._get_monthly_distribution(worker_id)
+            monthly_dist = dict(worker_stats.monthly)
             monthly_stats = {
                 'distribution': monthly_dist,
                 'min_monthly': min(monthly_dist.values()) if monthly_dist else 0,
@@ -141,42 +192,41 @@ class StatisticsCalculator:
             }
             
             stats['workers'][worker_id] = {
-                'total_shifts': len(assignments),
+                'total_shifts': worker_stats.days,
                 'target_shifts': worker.get('target_shifts', 0),
                 'work_percentage': worker.get('work_percentage', 100),
-                'weekend_shifts': len(self.worker_weekends[worker_id]),
-                'weekday_distribution': self.worker_weekdays[worker_id],
-                'post_distribution': self.get_post_counts(worker_id),  # Use the existing method
+                'weekend_shifts': len(worker_stats.special_days),
+                'weekday_distribution': dict(worker_stats.weekdays),
+                'post_distribution': dict(worker_stats.post_counts),
                 'constraint_skips': self.constraint_skips[worker_id],
                 'monthly_stats': monthly_stats,
-                'gaps_analysis': self._analyze_gaps(worker_id)
+                'gaps_analysis': worker_stats.gaps
             }
 
         # Add monthly balance analysis
-        stats['monthly_balance'] = self._analyze_monthly_balance()
+        stats['monthly_balance'] = self._analyze_monthly_balance(statistics)
         
         return stats
 
-    def _analyze_monthly_balance(self):
+    def _analyze_monthly_balance(self, statistics=None):
         """
         Analyze monthly balance across all workers
         
+        Args:
+            statistics: ScheduleStatistics to analyze (computed if not given)
         Returns:
             dict: Statistics about monthly distribution balance
         """
+        statistics = statistics or self._statistics()
         monthly_stats = {}
         
         # Get all months in schedule period
         all_months = set()
-        for worker_id in self.worker_assignments:
-            dist = self._get_monthly_distribution(worker_id)
-            all_months.update(dist.keys())
+        for worker_stats in statistics.workers.values():
+            all_months.update(worker_stats.monthly.keys())
         
         for month in sorted(all_months):
-            worker_counts = []
-            for worker_id in self.worker_assignments:
-                dist = self._get_monthly_distribution(worker_id)
-                worker_counts.append(dist.get(month, 0))
+            worker_counts = [worker_stats.monthly.get(month, 0) for worker_stats in statistics.workers.values()]
             
             if worker_counts:
                 monthly_stats[month] = {
@@ -207,10 +257,11 @@ class StatisticsCalculator:
         """Calculate how well the post rotation is working across all workers"""
         worker_scores = {}
         total_score = 0
+        statistics = self._statistics()
     
         for worker in self.workers_data:
             worker_id = worker['id']
-            post_counts = self._get_post_counts(worker_id)
+            post_counts = statistics.worker(worker_id).post_counts
             total_assignments = sum(post_counts.values())
         
             if total_assignments == 0:
@@ -259,10 +310,11 @@ class StatisticsCalculator:
     def _calculate_balance_score(self):
         """Calculate overall balance score based on various factors"""
         scores = []
+        statistics = self._statistics()
     
         # Post rotation balance
         for worker_id in self.worker_assignments:
-            post_counts = self._get_post_counts(worker_id)
+            post_counts = statistics.worker(worker_id).post_counts
             if post_counts.values():
                 post_imbalance = max(post_counts.values()) - min(post_counts.values())
                 scores.append(max(0, 100 - (post_imbalance * 20)))
@@ -301,8 +353,7 @@ class StatisticsCalculator:
         }
     
         # Get schedule data
-        schedule = self.scheduler.schedule
-        worker_assignments = self.scheduler.worker_assignments
+        schedule, worker_assignments = self._schedule_data()
     
         # Calculate coverage
         total_shifts = (self.scheduler.end_date - self.scheduler.start_date).days * self.scheduler.num_shifts
@@ -374,12 +425,13 @@ class StatisticsCalculator:
         Returns:
             dict: Dictionary containing various schedule performance metrics
         """
-        metrics = {
-            'coverage': self._calculate_coverage(),
-            'balance_score': self._calculate_balance_score(),
-            'constraint_violations': self._count_constraint_violations(),
-            'worker_satisfaction': self._calculate_worker_satisfaction()
-        }
+        with self.report_run():
+            metrics = {
+                'coverage': self._calculate_coverage(),
+                'balance_score': self._calculate_balance_score(),
+                'constraint_violations': self._count_constraint_violations(),
+                'worker_satisfaction': self._calculate_worker_satisfaction()
+            }
         
         logging.info("Generated schedule metrics")
         return metrics
@@ -399,6 +451,7 @@ class StatisticsCalculator:
     def _generate_schedule_body(self):
         """Generate the main body of the schedule output"""
         output = ""
+        statistics = self._statistics()
         for date in sorted(self.schedule.keys()):
             # Date header
             output += f"\n{date.strftime('%Y-%m-%d')} ({date.strftime('%A')})"
@@ -419,7 +472,7 @@ class StatisticsCalculator:
                     output += f" (Part-time: {work_percentage}%)"
                 
                 # Add post rotation info
-                post_counts = self._get_post_counts(worker_id)
+                post_counts = statistics.worker(worker_id).post_counts
                 output += f" [Post {i} count: {post_counts.get(i-1, 0)}]"
                 
                 output += "\n"
@@ -473,7 +526,8 @@ class StatisticsCalculator:
                 return f"Error: Worker {worker_id} not found"
         
             # Get worker assignments
-            assignments = sorted(list(self.worker_assignments.get(worker_id, set())))
+            schedule, worker_assignments = self._schedule_data()
+            assignments = sorted(list(worker_assignments.get(worker_id, set())))
             if not assignments:
                 return f"Worker {worker_id} has no assignments in the schedule"
             
@@ -490,6 +544,8 @@ class StatisticsCalculator:
             report.append(f"Target Shifts: {worker.get('target_shifts', 0)}")
             report.append(f"Actual Shifts: {len(assignments)} ({len(assignments) - worker.get('target_shifts', 0):+d})")
         
+            worker_stats = self._statistics().worker(worker_id)
+            
             # Add schedule summary statistics
             post_counts = {}
             weekday_counts = self.worker_weekdays.get(worker_id, {i: 0 for i in range(7)})
@@ -499,9 +555,9 @@ class StatisticsCalculator:
         
             # Calculate post distribution
             for date in assignments:
-                if date in self.scheduler.schedule:
+                if date in schedule:
                     try:
-                        post = self.scheduler.schedule[date].index(worker_id)
+                        post = schedule[date].index(worker_id)
                         post_counts[post] = post_counts.get(post, 0) + 1
                     except ValueError:
                         # This would indicate a data inconsistency
@@ -514,7 +570,7 @@ class StatisticsCalculator:
             report.append(f"Holiday Shifts: {holiday_count}")
         
             # Monthly distribution
-            monthly_dist = self._get_monthly_distribution(worker_id)
+            monthly_dist = worker_stats.monthly
             report.append("\nMONTHLY DISTRIBUTION")
             for month, count in sorted(monthly_dist.items()):
                 report.append(f"  {month}: {count} shifts")
@@ -538,7 +594,7 @@ class StatisticsCalculator:
             report.append(f"\nPost Balance Score: {post_balance_score:.1f}%")
         
             # Get gap analysis
-            gaps = self._analyze_gaps(worker_id)
+            gaps = worker_stats.gaps
             report.append("\nSCHEDULE GAPS")
             if gaps['min_gap'] is not None:
                 report.append(f"  Minimum gap: {gaps['min_gap']} days")
@@ -570,9 +626,9 @@ class StatisticsCalculator:
                 day_name = date.strftime('%A')
             
                 post = "Unknown"
-                if date in self.scheduler.schedule:
+                if date in schedule:
                     try:
-                        post_index = self.scheduler.schedule[date].index(worker_id)
+                        post_index = schedule[date].index(worker_id)
                         post = f"Post {post_index + 1}"
                     except ValueError:
                         post = "Not found in day schedule"
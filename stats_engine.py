@@ -0,0 +1,233 @@
+"""
+Single-pass schedule statistics.
+One walk over the schedule in date order yields every worker's post counts,
+monthly, weekday and weekend distributions and the gaps between shifts, so
+a report costs O(cells) instead of a rescan and a sort per worker. Results
+are cached per snapshot; SnapshotStore hands out the same views until the
+schedule changes, so reports of one schedule version share one pass.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Any, Iterable, Mapping, FrozenSet
+
+
+@dataclass
+class WorkerStatistics:
+    """Distributions of one worker's shifts"""
+    shifts: List[Tuple[datetime, int]] = field(default_factory=list)   # (date, post) in date order
+    post_counts: Dict[int, int] = field(default_factory=dict)
+    monthly: Dict[str, int] = field(default_factory=dict)             # {YYYY-MM: days}, in month order
+    weekdays: Dict[int, int] = field(default_factory=lambda: {i: 0 for i in range(7)})
+    days: int = 0                # Distinct dates worked
+    weekend_shifts: int = 0      # Friday to Sunday
+    holiday_shifts: int = 0
+    special_days: List[datetime] = field(default_factory=list)  # Weekend, holiday or holiday eve
+    min_gap: Optional[int] = None
+    max_gap: Optional[int] = None
+    gap_total: int = 0
+
+    @property
+    def gaps(self) -> Dict[str, Any]:
+        """Minimum, maximum and average days between consecutive shifts (None if fewer than two)"""
+        if self.days <= 1:
+            return {'min_gap': None, 'max_gap': None, 'avg_gap': None}
+        return {'min_gap': self.min_gap, 'max_gap': self.max_gap, 'avg_gap': self.gap_total / (self.days - 1)}
+
+
+@dataclass
+class ScheduleStatistics:
+    """Per-worker and schedule-wide statistics from one pass over a schedule"""
+    workers: Dict[str, WorkerStatistics] = field(default_factory=dict)
+    holidays: FrozenSet[datetime] = frozenset()
+    total_slots: int = 0
+    filled_slots: int = 0
+    post_totals: Dict[int, int] = field(default_factory=dict)
+
+    def worker(self, worker_id: str) -> WorkerStatistics:
+        """Statistics of a worker (empty if the worker has no shifts)"""
+        stats = self.workers.get(worker_id)
+        return stats if stats is not None else WorkerStatistics()
+
+    def export_summary(self, num_shifts: int, period_start: datetime, period_end: datetime,
+                       worker_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Statistics in the structure PDFExporter.export_summary_pdf expects
+
+        Args:
+            num_shifts: Posts per day
+            period_start: First day of the reported period
+            period_end: Last day of the reported period
+            worker_ids: Workers to report, in order (every worker seen by default)
+
+        Returns:
+            dict: Period, schedule totals, per-worker totals and distributions
+            ('workers') and shift listings ('worker_shifts')
+        """
+        last_post = num_shifts - 1
+        workers_stats, worker_shifts = {}, {}
+        for worker_id in (worker_ids if worker_ids is not None else self.workers):
+            stats = self.worker(worker_id)
+            post_counts = {post: 0 for post in range(num_shifts)}
+            post_counts.update(stats.post_counts)
+            workers_stats[worker_id] = {
+                'total': len(stats.shifts),
+                'weekends': stats.weekend_shifts,
+                'holidays': stats.holiday_shifts,
+                'last_post': stats.post_counts.get(last_post, 0),
+                'weekday_counts': dict(stats.weekdays),
+                'post_counts': post_counts
+            }
+            worker_shifts[worker_id] = [{
+                'date': date,
+                'day': date.strftime('%A'),
+                'post': post + 1,
+                'is_weekend': date.weekday() >= 4,
+                'is_holiday': date in self.holidays
+            } for date, post in stats.shifts]
+
+        return {
+            'period_start': period_start,
+            'period_end': period_end,
+            'total_shifts': self.total_slots,
+            'weekend_shifts': sum(s.weekend_shifts for s in self.workers.values()),
+            'last_post_shifts': self.post_totals.get(last_post, 0),
+            'posts': {post: self.post_totals.get(post, 0) for post in range(num_shifts)},
+            'workers': workers_stats,
+            'worker_shifts': worker_shifts
+        }
+
+
+def compute_statistics(schedule: Mapping[datetime, Iterable[Optional[str]]],
+                       holidays: Iterable[datetime] = (),
+                       worker_ids: Iterable[str] = ()) -> ScheduleStatistics:
+    """
+    Compute schedule statistics in one pass over the cells
+
+    Args:
+        schedule: Date -> workers per post (None for an empty post)
+        holidays: Holiday dates
+        worker_ids: Workers to include even if they have no shifts
+
+    Returns:
+        ScheduleStatistics
+    """
+    holidays = frozenset(holidays)
+    result = ScheduleStatistics(holidays=holidays)
+    workers = result.workers
+    post_totals = result.post_totals
+    for worker_id in worker_ids:
+        workers[worker_id] = WorkerStatistics()
+
+    for date in sorted(schedule):
+        row = schedule[date]
+        weekday = date.weekday()
+        is_weekend = weekday >= 4
+        is_holiday = date in holidays
+        is_special_day = is_weekend or is_holiday or (date + timedelta(days=1)) in holidays
+        month = f"{date.year}-{date.month:02d}"
+        result.total_slots += len(row)
+
+        for post, worker_id in enumerate(row):
+            if worker_id is None:
+                continue
+            result.filled_slots += 1
+            post_totals[post] = post_totals.get(post, 0) + 1
+
+            stats = workers.get(worker_id)
+            if stats is None:
+                stats = workers[worker_id] = WorkerStatistics()
+            previous = stats.shifts[-1][0] if stats.shifts else None
+            stats.shifts.append((date, post))
+            stats.post_counts[post] = stats.post_counts.get(post, 0) + 1
+            if previous == date:
+                continue  # A second post on the same day counts once below
+
+            # Dates arrive in order, so gaps need no per-worker sort
+            if previous is not None:
+                gap = (date - previous).days
+                stats.gap_total += gap
+                if stats.min_gap is None or gap < stats.min_gap:
+                    stats.min_gap = gap
+                if stats.max_gap is None or gap > stats.max_gap:
+                    stats.max_gap = gap
+            stats.days += 1
+            stats.monthly[month] = stats.monthly.get(month, 0) + 1
+            stats.weekdays[weekday] += 1
+            stats.weekend_shifts += is_weekend
+            stats.holiday_shifts += is_holiday
+            if is_special_day:
+                stats.special_days.append(date)
+
+    return result
+
+
+class StatisticsEngine:
+    """Computes ScheduleStatistics from snapshots, caching the most recent results"""
+
+    def __init__(self, max_entries: int = 4):
+        """
+        Initialize the engine
+
+        Args:
+            max_entries: Number of snapshot results kept
+        """
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[Tuple[int, FrozenSet[datetime]], Tuple[Any, ScheduleStatistics]]' = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compute(self, snapshot, holidays: Iterable[datetime] = ()) -> ScheduleStatistics:
+        """
+        Statistics of a schedule snapshot
+
+        Snapshots are immutable, so a result is reused for as long as the
+        snapshot's schedule view is; callers must not modify it.
+
+        Args:
+            snapshot: ScheduleSnapshot to measure
+            holidays: Holiday dates
+
+        Returns:
+            ScheduleStatistics covering every worker in the snapshot
+        """
+        schedule = snapshot.schedule
+        holidays = frozenset(holidays)
+        # The cached entry holds the view, so its id cannot be reused while cached
+        key = (id(schedule), holidays)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] is schedule:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        result = compute_statistics(schedule, holidays, snapshot.worker_assignments)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = (schedule, result)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        logging.debug(f"Schedule statistics computed for version {snapshot.version}")
+        return result
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._cache.clear()
+
+
+# Global statistics engine instance
+_global_statistics_engine: Optional[StatisticsEngine] = None
+
+
+def get_statistics_engine() -> StatisticsEngine:
+    """Get the global statistics engine instance"""
+    global _global_statistics_engine
+    if _global_statistics_engine is None:
+        _global_statistics_engine = StatisticsEngine()
+    return _global_statistics_engine
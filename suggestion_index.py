@@ -0,0 +1,215 @@
+"""
+Ranked worker suggestions for empty schedule cells.
+Keeps the eligible workers of each date up to date from schedule events so
+that suggesting workers for a cell does not revalidate every worker.
+"""
+
+import heapq
+import logging
+from datetime import datetime, timedelta
+from threading import RLock
+from typing import Dict, List, Tuple, Optional, Iterable
+
+
+class SuggestionIndex:
+    """
+    Per-date eligible-worker sets with top-k ranking
+
+    A date's entry records the workers found eligible and, for every worker
+    checked, the worker's generation at the time. A change on a date drops
+    the date's entry (incompatibilities and double assignments depend on
+    the whole day); a change to a worker bumps the worker's generation, so
+    only that worker is rechecked on the dates already indexed (gaps and
+    weekend limits depend on all of the worker's assignments). Days off and
+    work periods never change during editing and are cached per date.
+
+    As in LiveValidator.validate_assignment, a check that fails with a
+    warning rather than an error still leaves the worker eligible; such
+    workers are ranked at half priority.
+    """
+
+    def __init__(self, validator):
+        """
+        Initialize the suggestion index
+
+        Args:
+            validator: LiveValidator whose constraint checks decide eligibility
+        """
+        self.validator = validator
+        self.scheduler = validator.scheduler
+
+        self._lock = RLock()
+        self._available: Dict[datetime, List[str]] = {}
+        # Per date: eligible worker -> warning message (None if clean), checked worker -> generation
+        self._eligible: Dict[datetime, Tuple[Dict[str, Optional[str]], Dict[str, int]]] = {}
+        self._worker_gen: Dict[str, int] = {}
+
+        self.stats = {'queries': 0, 'checks': 0}
+
+    def clear(self):
+        """Drop all indexed dates (worker data or the whole schedule changed)"""
+        with self._lock:
+            self._available.clear()
+            self._eligible.clear()
+            self._worker_gen.clear()
+
+    def mark_changed(self, dates: Iterable[datetime], workers: Iterable[str]):
+        """
+        Invalidate what a schedule change can affect
+
+        Args:
+            dates: Dates whose assignments changed
+            workers: Workers whose assignments changed
+        """
+        with self._lock:
+            for shift_date in dates:
+                self._eligible.pop(shift_date, None)
+            for worker_id in workers:
+                self._worker_gen[worker_id] = self._worker_gen.get(worker_id, 0) + 1
+
+    def _available_workers(self, shift_date: datetime) -> List[str]:
+        """Workers not off and inside their work periods on a date (in workers_data order)"""
+        available = self._available.get(shift_date)
+        if available is None:
+            checker = getattr(self.scheduler, 'constraint_checker', None)
+            available = [w['id'] for w in self.scheduler.workers_data
+                         if not checker or not checker._is_worker_off(w['id'], shift_date)]
+            self._available[shift_date] = available
+        return available
+
+    def _check(self, worker_id: str, shift_date: datetime) -> Tuple[bool, Optional[str]]:
+        """
+        Whether a worker can take any post on a date
+
+        Returns:
+            (eligible, warning message of the first check that failed with a warning)
+        """
+        from live_validator import ValidationSeverity
+
+        self.stats['checks'] += 1
+        if shift_date in self.scheduler.worker_assignments.get(worker_id, ()):
+            return False, None
+        validator = self.validator
+        for check in (validator._check_incompatibility_constraints,
+                      validator._check_gap_constraints,
+                      validator._check_weekend_limits):
+            result = check(worker_id, shift_date)
+            if not result.is_valid:
+                if result.severity == ValidationSeverity.WARNING:
+                    return True, result.message
+                return False, None
+        return True, None
+
+    def _get_eligible(self, shift_date: datetime) -> Dict[str, Optional[str]]:
+        """Eligible workers of a date and their warnings, rechecking only stale workers"""
+        available = self._available_workers(shift_date)
+        eligible, checked = self._eligible.get(shift_date) or ({}, {})
+        for worker_id in available:
+            gen = self._worker_gen.get(worker_id, 0)
+            if checked.get(worker_id) == gen:
+                continue
+            checked[worker_id] = gen
+            ok, warning = self._check(worker_id, shift_date)
+            if ok:
+                eligible[worker_id] = warning
+            else:
+                eligible.pop(worker_id, None)
+        self._eligible[shift_date] = (eligible, checked)
+        return eligible
+
+    def get_eligible(self, shift_date: datetime) -> List[str]:
+        """
+        Get the workers eligible on a date
+
+        Args:
+            shift_date: Date to look up
+
+        Returns:
+            Eligible worker ids in workers_data order
+        """
+        with self._lock:
+            eligible = self._get_eligible(shift_date)
+            return [w for w in self._available_workers(shift_date) if w in eligible]
+
+    def _rank(self, shift_date: datetime, candidates: List[Tuple[str, Optional[str]]], limit: int) -> List[str]:
+        """
+        Score (worker, warning) candidates in one pass and return the top entries
+
+        Less loaded workers, higher work percentages and longer gaps since the
+        last shift rank higher; candidates with a warning get half priority.
+        The schedule-wide average load is computed once per call, not once
+        per worker.
+        """
+        assignments = self.scheduler.worker_assignments
+        gap = self.scheduler.gap_between_shifts
+        avg_workload = (sum(len(a) for a in assignments.values()) / len(assignments)) if assignments else 0
+        work_percentages = {w['id']: w.get('work_percentage', 100) for w in self.scheduler.workers_data}
+
+        scored = []
+        for worker_id, warning in candidates:
+            worker_dates = assignments.get(worker_id, set())
+            priority = 1.0
+            if len(worker_dates) < avg_workload:
+                priority += 0.5
+            priority *= work_percentages.get(worker_id, 100) / 100
+            if worker_dates:
+                days_since_last = (shift_date - max(worker_dates)).days
+                if days_since_last > gap:
+                    priority += 0.3
+                reason = f"Good gap: {days_since_last} days since last shift"
+            else:
+                priority += 0.5
+                reason = "No current assignments"
+            if warning is not None:
+                priority *= 0.5
+                reason = f"Available (with warnings): {warning}"
+            scored.append((priority, worker_id, reason))
+
+        top = heapq.nlargest(limit, scored, key=lambda entry: entry[0])
+        return [f"{worker_id}: {reason}" for _, worker_id, reason in top]
+
+    def top_k(self, shift_date: datetime, limit: int = 5) -> List[str]:
+        """
+        Get the best workers for an empty cell on a date
+
+        Args:
+            shift_date: Date of the shift
+            limit: Number of suggestions
+
+        Returns:
+            List of "worker_id: reason" strings, best first
+        """
+        with self._lock:
+            self.stats['queries'] += 1
+            eligible = self._get_eligible(shift_date)
+            candidates = [(w, eligible[w]) for w in self._available_workers(shift_date) if w in eligible]
+            return self._rank(shift_date, candidates, limit)
+
+    def prefetch(self, start_date: datetime, end_date: datetime,
+                 limit: int = 5) -> Dict[Tuple[datetime, int], List[str]]:
+        """
+        Suggestions for every empty cell in a date range (e.g. the visible month)
+
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            limit: Suggestions per cell
+
+        Returns:
+            Dict mapping (date, post index) of each empty cell to its suggestions
+        """
+        result: Dict[Tuple[datetime, int], List[str]] = {}
+        schedule = self.scheduler.schedule
+        with self._lock:
+            current = start_date
+            while current <= end_date:
+                empty_posts = [p for p, w in enumerate(schedule.get(current, [])) if w is None]
+                if empty_posts:
+                    # Eligibility does not depend on the post, so rank once per date
+                    suggestions = self.top_k(current, limit)
+                    for post_index in empty_posts:
+                        result[(current, post_index)] = list(suggestions)
+                current += timedelta(days=1)
+
+        logging.debug(f"Prefetched suggestions for {len(result)} empty cells")
+        return result
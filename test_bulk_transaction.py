@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test suite for transactional bulk updates.
+Tests atomic rollback with per-item errors, single-envelope commits and staged swaps.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime, timedelta
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from incremental_updater import IncrementalUpdater
+from change_tracker import ChangeTracker, ChangeType
+from schedule_sync import ScheduleSync
+from event_bus import get_event_bus, reset_event_bus, EventType
+from fake_scheduler import FakeScheduler, make_workers
+
+
+class TestBulkTransaction(unittest.TestCase):
+    """Test IncrementalUpdater.bulk_update as a single transaction"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.start = datetime(2024, 1, 1)  # Monday
+        workers = make_workers(40)
+        workers[0]['incompatible_with'] = ['W002']
+        workers[1]['incompatible_with'] = ['W001']
+        workers[2]['days_off'] = '03-01-2024'
+
+        self.scheduler = FakeScheduler(self.start, 28, workers)
+        self.day = self.scheduler.day
+        self.updater = IncrementalUpdater(self.scheduler)
+        self.tracker = ChangeTracker(self.scheduler)
+        self.sync = ScheduleSync(self.scheduler)
+
+        self.envelopes = []
+        get_event_bus().subscribe(EventType.BULK_UPDATE, self.envelopes.append)
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def test_commit_is_one_change(self):
+        """A valid bulk update applies every cell with one version step and one change"""
+        updates = [{'operation': 'assign', 'worker_id': f'W{i:03d}', 'shift_date': self.day(i // 2, iso=True),
+                    'post_index': i % 2} for i in range(4, 40)]
+        result = self.updater.bulk_update(updates, user_id='u1')
+
+        self.assertTrue(result.success, result.conflicts)
+        self.assertEqual(self.scheduler.schedule[self.start + timedelta(days=2)], ['W004', 'W005'])
+        self.assertEqual(len(self.envelopes), 1)
+        self.assertEqual(self.sync.version, 1)
+        changes = self.tracker.get_change_history()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].change_type, ChangeType.BULK_UPDATE)
+        self.assertEqual(len(changes[0].cells), 36)
+
+    def test_invalid_item_rolls_back_everything(self):
+        """One failing item leaves the schedule untouched and is reported by index"""
+        updates = [
+            {'operation': 'assign', 'worker_id': 'W010', 'shift_date': self.day(0, iso=True), 'post_index': 0},
+            {'operation': 'assign', 'worker_id': 'W001', 'shift_date': self.day(5, iso=True), 'post_index': 0},
+            {'operation': 'assign', 'worker_id': 'W002', 'shift_date': self.day(5, iso=True), 'post_index': 1},
+            {'operation': 'assign', 'worker_id': 'W003', 'shift_date': self.day(2, iso=True), 'post_index': 0},
+            {'operation': 'assign', 'worker_id': 'W010', 'shift_date': self.day(1, iso=True), 'post_index': 0,
+             'force': True},
+            {'operation': 'rotate'},
+        ]
+        result = self.updater.bulk_update(updates, user_id='u1')
+
+        self.assertFalse(result.success)
+        failed = sorted({e['index'] for e in result.item_errors})
+        self.assertEqual(failed, [0, 1, 2, 3, 5])
+        self.assertTrue(all(w == [None, None] for w in self.scheduler.schedule.values()))
+        self.assertEqual(self.envelopes, [])
+        self.assertEqual(self.sync.version, 0)
+
+    def test_staged_swap_sees_earlier_items(self):
+        """Later items read the overlay, so an assign followed by a swap commits as net cells"""
+        transaction = self.updater.begin_transaction(user_id='u1')
+        transaction.assign('W010', self.start, 0)
+        transaction.assign('W011', self.start + timedelta(days=3), 1)
+        transaction.swap(self.start, 0, self.start + timedelta(days=3), 1)
+        result = transaction.commit()
+
+        self.assertTrue(result.success, result.conflicts)
+        self.assertEqual(self.scheduler.schedule[self.start][0], 'W011')
+        self.assertEqual(self.scheduler.schedule[self.start + timedelta(days=3)][1], 'W010')
+        self.assertEqual(len(result.rollback_data['cells']), 2)
+        self.assertEqual(self.scheduler.worker_assignments['W010'], {self.start + timedelta(days=3)})
+
+        self.assertIsNotNone(self.tracker.undo('u1'))
+        self.assertEqual(self.scheduler.schedule[self.start], [None, None])
+
+    def test_partial_mode_keeps_successes(self):
+        """atomic=False applies the updates that pass on their own"""
+        updates = [
+            {'operation': 'assign', 'worker_id': 'W010', 'shift_date': self.day(0, iso=True), 'post_index': 0},
+            {'operation': 'assign', 'worker_id': 'W003', 'shift_date': self.day(2, iso=True), 'post_index': 0},
+        ]
+        result = self.updater.bulk_update(updates, user_id='u1', atomic=False)
+
+        self.assertTrue(result.success)
+        self.assertEqual(self.scheduler.schedule[self.start][0], 'W010')
+        self.assertIsNone(self.scheduler.schedule[self.start + timedelta(days=2)][0])
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test suite for the ChangeTracker journal.
+Tests journaling, replay on startup, compaction and the streamed audit trail.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+import logging
+from datetime import datetime
+from types import SimpleNamespace
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from change_tracker import ChangeTracker
+from event_bus import get_event_bus, reset_event_bus, EventType
+
+
+class TestChangeJournal(unittest.TestCase):
+    """Test ChangeTracker persistence through ChangeJournal"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.journal_path = os.path.join(self.tmp_dir.name, 'changes.journal')
+        self.day = datetime(2024, 1, 1)
+        self.scheduler = SimpleNamespace(
+            schedule={self.day: [None, None]},
+            num_shifts=2,
+            config={'change_journal_path': self.journal_path},
+            _update_tracking_data=lambda *args, **kwargs: None
+        )
+
+    def tearDown(self):
+        reset_event_bus()
+        self.tmp_dir.cleanup()
+
+    def _new_tracker(self, **kwargs):
+        reset_event_bus()
+        return ChangeTracker(self.scheduler, **kwargs)
+
+    def _assign(self, worker_id, post_index):
+        self.scheduler.schedule[self.day][post_index] = worker_id
+        get_event_bus().emit(EventType.SHIFT_ASSIGNED, user_id='u1', worker_id=worker_id,
+                             shift_date=self.day.isoformat(), post_index=post_index)
+
+    def test_replay_restores_stack(self):
+        """Undo/redo state survives a restart"""
+        tracker = self._new_tracker()
+        self._assign('W001', 0)
+        self._assign('W002', 1)
+        self.assertIsNotNone(tracker.undo('u1'))
+        tracker.close()
+
+        restored = self._new_tracker()
+        info = restored.get_current_state_info()
+        self.assertEqual(info['total_changes'], 2)
+        self.assertEqual(info['current_position'], 0)
+        self.assertTrue(restored.can_redo())
+        self.assertIsNotNone(restored.redo('u1'))
+        self.assertEqual(self.scheduler.schedule[self.day], ['W001', 'W002'])
+
+    def test_redo_branch_truncated_on_replay(self):
+        """A change recorded after an undo drops the redo branch on replay too"""
+        tracker = self._new_tracker()
+        self._assign('W001', 0)
+        self._assign('W002', 1)
+        tracker.undo('u1')
+        self._assign('W003', 1)
+        tracker.close()
+
+        restored = self._new_tracker()
+        descriptions = [c.description for c in restored.get_change_history()]
+        self.assertEqual(len(descriptions), 2)
+        self.assertIn('W003', descriptions[0])
+        self.assertEqual(len(list(restored.iter_audit_trail())), 3)
+
+    def test_compaction_keeps_audit_and_stack(self):
+        """Compaction drops undo/redo lines but not history"""
+        tracker = self._new_tracker()
+        tracker.journal.compact_every = 4
+        self._assign('W001', 0)
+        self._assign('W002', 1)
+        for _ in range(2):
+            tracker.undo('u1')
+            tracker.redo('u1')
+        tracker.close()
+
+        with open(self.journal_path) as f:
+            ops = [json.loads(line)['op'] for line in f]
+        self.assertEqual(ops, ['state', 'record', 'record'])
+
+        restored = self._new_tracker()
+        self.assertEqual(restored.get_current_state_info()['current_position'], 1)
+        self.assertTrue(restored.can_undo())
+
+    def test_export_streams_journal(self):
+        """The exported audit trail is valid JSON with every journaled change"""
+        tracker = self._new_tracker(max_history=2)
+        for post in range(2):
+            for worker in ('W001', 'W002'):
+                self._assign(worker, post)
+
+        export_path = os.path.join(self.tmp_dir.name, 'audit.json')
+        self.assertTrue(tracker.export_audit_trail(export_path))
+        with open(export_path) as f:
+            audit = json.load(f)
+        self.assertEqual(audit['total_changes'], 4)
+        self.assertEqual(len(tracker.get_change_history()), 2)
+        tracker.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test suite for diff-based undo/redo in ChangeTracker.
+Tests bulk and generated-schedule changes, swaps and conflict detection.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from change_tracker import ChangeTracker, ChangeType, diff_schedules
+from event_bus import get_event_bus, reset_event_bus, EventType
+
+
+class TestDiffUndo(unittest.TestCase):
+    """Test undo/redo through cell diffs"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.bus = get_event_bus()
+        self.day = datetime(2024, 1, 1)
+        self.tracking_calls = []
+        self.scheduler = SimpleNamespace(
+            schedule={self.day + timedelta(days=d): [None, None] for d in range(3)},
+            num_shifts=2,
+            config={},
+            _update_tracking_data=lambda worker, date, post, removing=False:
+                self.tracking_calls.append((worker, date, post, removing))
+        )
+        self.tracker = ChangeTracker(self.scheduler)
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def _assign(self, worker_id, day_offset, post_index):
+        shift_date = self.day + timedelta(days=day_offset)
+        previous = self.scheduler.schedule[shift_date][post_index]
+        self.scheduler.schedule[shift_date][post_index] = worker_id
+        self.bus.emit(EventType.SHIFT_ASSIGNED, worker_id=worker_id, shift_date=shift_date.isoformat(),
+                      post_index=post_index, previous_worker=previous)
+
+    def test_bulk_update_undo_redo(self):
+        """A batched bulk edit is one change undone and redone as a whole"""
+        with self.bus.batch(total_operations=4, successful_operations=4, failed_operations=0):
+            self._assign('W001', 0, 0)
+            self._assign('W002', 1, 0)
+            self._assign('W003', 2, 1)
+            self._assign('W004', 0, 0)
+        after = {d: list(w) for d, w in self.scheduler.schedule.items()}
+
+        changes = self.tracker.get_change_history()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].change_type, ChangeType.BULK_UPDATE)
+        self.assertEqual(len(changes[0].cells), 4)
+
+        self.assertIsNotNone(self.tracker.undo())
+        self.assertTrue(all(w == [None, None] for w in self.scheduler.schedule.values()))
+        self.assertIsNotNone(self.tracker.redo())
+        self.assertEqual(self.scheduler.schedule, after)
+
+    def test_undo_refused_when_cell_changed(self):
+        """Undo does nothing if the schedule no longer matches the change"""
+        self._assign('W001', 0, 0)
+        self.scheduler.schedule[self.day][0] = 'W009'
+        calls = len(self.tracking_calls)
+
+        self.assertIsNone(self.tracker.undo())
+        self.assertEqual(self.scheduler.schedule[self.day][0], 'W009')
+        self.assertEqual(len(self.tracking_calls), calls)
+
+    def test_swap_undo_updates_tracking_per_cell(self):
+        """Undoing a swap touches only the two swapped cells"""
+        day2 = self.day + timedelta(days=1)
+        self.scheduler.schedule[self.day][0] = 'W002'
+        self.scheduler.schedule[day2][1] = 'W001'
+        self.bus.emit(EventType.SHIFT_SWAPPED, worker1='W001', worker2='W002',
+                      shift_date1=self.day.isoformat(), post_index1=0,
+                      shift_date2=day2.isoformat(), post_index2=1)
+
+        self.assertIsNotNone(self.tracker.undo())
+        self.assertEqual(self.scheduler.schedule[self.day][0], 'W001')
+        self.assertEqual(self.scheduler.schedule[day2][1], 'W002')
+        self.assertEqual(len(self.tracking_calls), 4)
+
+    def test_generated_schedule_undo(self):
+        """A generated schedule is recorded as diffs against the previous one"""
+        before = {d: list(w) for d, w in self.scheduler.schedule.items()}
+        for workers in self.scheduler.schedule.values():
+            workers[:] = ['W001', 'W002']
+        self.bus.emit(EventType.SCHEDULE_GENERATED,
+                      changes=diff_schedules(before, self.scheduler.schedule))
+
+        self.assertEqual(len(self.tracker.get_change_history()[0].cells), 6)
+        self.assertIsNotNone(self.tracker.undo())
+        self.assertEqual(self.scheduler.schedule, before)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
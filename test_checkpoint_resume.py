@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test suite for optimization checkpoints.
+Tests atomic checkpoint writes and resuming an interrupted generation.
+"""
+
+import os
+import sys
+import random
+import tempfile
+import unittest
+from unittest import mock
+from datetime import datetime
+import logging
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scheduler import Scheduler
+from scheduler_core import SchedulerCore
+from checkpoint_manager import CheckpointManager
+from exceptions import SchedulerError
+from event_bus import get_event_bus, reset_event_bus, EventType
+
+
+class TestCheckpointResume(unittest.TestCase):
+    """Test checkpoint writing and resume_generation"""
+
+    def setUp(self):
+        """Set up a small scheduler writing checkpoints to a temporary directory"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmp_dir.name, 'run.ckpt')
+
+        self.config = {
+            'start_date': datetime(2024, 1, 1),
+            'end_date': datetime(2024, 1, 14),
+            'num_shifts': 2,
+            'variable_shifts': [],
+            'workers_data': [
+                {
+                    'id': f'W{i:03d}',
+                    'name': f'Worker {i}',
+                    'work_percentage': 100,
+                    'work_periods': '',
+                    'days_off': '',
+                    'mandatory_days': '',
+                    'incompatible_with': []
+                }
+                for i in range(1, 6)
+            ],
+            'holidays': [],
+            'gap_between_shifts': 1,
+            'max_consecutive_weekends': 3,
+            'checkpoint_path': self.checkpoint_path,
+            'checkpoint_interval': 0,
+        }
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _interrupted_run(self, phase, loop_index, operation_index, max_loops):
+        """Run part of a generation, write a checkpoint and load it"""
+        scheduler = Scheduler(self.config)
+        core = SchedulerCore(scheduler)
+        self.assertTrue(core._initialize_schedule_phase())
+        self.assertTrue(core._assign_mandatory_phase())
+        core._iterative_improvement_phase(1)
+        random.seed(1234)
+        self.assertTrue(scheduler.checkpoint_manager.write_checkpoint(phase, loop_index, operation_index, max_loops))
+        return CheckpointManager.load(self.checkpoint_path)
+
+    def _resume_recording_positions(self, **kwargs):
+        """Resume from the checkpoint file, recording each improvement position and the RNG state at it"""
+        positions = []
+        write_checkpoint = SchedulerCore._checkpoint
+
+        def record(core, loop_index, operation_index, max_loops):
+            positions.append((loop_index, operation_index, max_loops, random.getstate()))
+            write_checkpoint(core, loop_index, operation_index, max_loops)
+
+        resumed = Scheduler(self.config)
+        with mock.patch.object(SchedulerCore, '_checkpoint', record):
+            self.assertTrue(resumed.resume_generation(self.checkpoint_path, **kwargs))
+        return resumed, positions
+
+    def test_checkpoint_written_and_cleared(self):
+        """A checkpoint is written during generation and removed on success"""
+        scheduler = Scheduler(self.config)
+        self.assertIsNotNone(scheduler.checkpoint_manager)
+
+        self.assertTrue(scheduler.generate_schedule(max_improvement_loops=2))
+        self.assertGreater(scheduler.checkpoint_manager.checkpoints_written, 0)
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_restore_checkpoint_state(self):
+        """Restoring a checkpoint brings back its assignments, tracking and RNG state"""
+        checkpoint = self._interrupted_run('iterative_improvement', 1, 2, 2)
+        saved = checkpoint['best_schedule_data']['schedule']
+        self.assertTrue(any(w is not None for shifts in saved.values() for w in shifts))
+
+        resumed = Scheduler(self.config)
+        core = SchedulerCore(resumed)
+        self.assertTrue(core._initialize_schedule_phase())
+        random.seed(0)
+        self.assertEqual(core._restore_checkpoint_phase(checkpoint), (1, 2))
+
+        self.assertEqual(random.getstate(), checkpoint['rng_state'])
+        self.assertEqual(resumed.schedule, {d: list(shifts) for d, shifts in saved.items()})
+        for worker in self.config['workers_data']:
+            expected = {d for d, shifts in saved.items() if worker['id'] in shifts}
+            self.assertEqual(resumed.worker_assignments[worker['id']], expected)
+
+    def test_resume_from_checkpoint(self):
+        """A resumed run continues from the recorded loop and operation with the recorded RNG state"""
+        checkpoint = self._interrupted_run('iterative_improvement', 1, 2, 2)
+        self.assertEqual((checkpoint['loop_index'], checkpoint['operation_index']), (1, 2))
+
+        resumed, positions = self._resume_recording_positions()
+        self.assertEqual(positions[0][:3], (1, 2, 2))
+        self.assertEqual(positions[0][3], checkpoint['rng_state'])
+        self.assertTrue(all(loop_index == 1 for loop_index, _, _, _ in positions))
+        self.assertEqual(len(resumed.schedule), 14)
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_resume_from_builder_checkpoint(self):
+        """Positions from the builder's own optimization loop restart the improvement phase"""
+        checkpoint = self._interrupted_run('optimize', 5, 0, 1)
+
+        resumed = Scheduler(self.config)
+        core = SchedulerCore(resumed)
+        self.assertTrue(core._initialize_schedule_phase())
+        self.assertEqual(core._restore_checkpoint_phase(checkpoint), (0, 0))
+        self.assertEqual(resumed.schedule,
+                         {d: list(shifts) for d, shifts in checkpoint['best_schedule_data']['schedule'].items()})
+
+        _, positions = self._resume_recording_positions()
+        self.assertEqual(positions[0][:3], (0, 0, 1))
+
+    def test_resume_publishes_generated_schedule(self):
+        """With real-time features a resumed run publishes its cell diffs like a fresh generation"""
+        self._interrupted_run('iterative_improvement', 1, 2, 2)
+        reset_event_bus()
+        self.addCleanup(reset_event_bus)
+
+        resumed = Scheduler(dict(self.config, enable_real_time=True))
+        self.assertTrue(resumed.is_real_time_enabled())
+        before = resumed.real_time_engine.snapshots.snapshot()
+        self.assertTrue(all(w is None for shifts in before.schedule.values() for w in shifts))
+        generated = []
+        get_event_bus().subscribe(EventType.SCHEDULE_GENERATED, generated.append)
+
+        self.assertTrue(resumed.resume_generation(self.checkpoint_path))
+        self.assertEqual(len(generated), 1)
+        changes = generated[0].data['changes']
+        self.assertEqual(len(changes), sum(1 for shifts in resumed.schedule.values() for w in shifts if w))
+        self.assertEqual(dict(resumed.real_time_engine.snapshots.snapshot().schedule),
+                         {d: tuple(shifts) for d, shifts in resumed.schedule.items()})
+
+    def test_resume_rejects_other_problem(self):
+        """A checkpoint for a different worker set is rejected"""
+        scheduler = Scheduler(self.config)
+        core = SchedulerCore(scheduler)
+        core._initialize_schedule_phase()
+        core._assign_mandatory_phase()
+        self.assertTrue(os.path.exists(self.checkpoint_path))
+
+        other_config = dict(self.config, workers_data=self.config['workers_data'][:4])
+        other = Scheduler(other_config)
+        with self.assertRaisesRegex(Exception, 'does not match'):
+            other.resume_generation(self.checkpoint_path)
+
+    def test_load_missing_checkpoint(self):
+        """Loading a missing checkpoint raises SchedulerError"""
+        with self.assertRaises(SchedulerError):
+            CheckpointManager.load(os.path.join(self.tmp_dir.name, 'missing.ckpt'))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test suite for the pluggable clock providers in utilities.
+Tests local time, injection into the Scheduler and the asynchronous remote sync.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import logging
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scheduler import Scheduler
+from utilities import ClockProvider, FixedClock, RemoteSyncClock, DateTimeUtils
+
+
+class _TimeApiHandler(BaseHTTPRequestHandler):
+    """Serves a remote time one hour ahead of the local clock"""
+
+    def do_GET(self):
+        remote = ClockProvider().now() + timedelta(hours=1)
+        body = json.dumps({'datetime': remote.isoformat()}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestClockProvider(unittest.TestCase):
+    """Test clock providers and their use by DateTimeUtils/Scheduler"""
+
+    def test_local_clock_matches_zoneinfo(self):
+        """The default clock returns the local Europe/Madrid time without the network"""
+        from zoneinfo import ZoneInfo
+        expected = datetime.now(ZoneInfo('Europe/Madrid')).replace(tzinfo=None)
+        self.assertLess(abs(DateTimeUtils().get_spain_time() - expected), timedelta(seconds=5))
+
+    def test_fixed_clock_injected_into_scheduler(self):
+        """A clock passed in the config is used for the scheduler's current time"""
+        clock = FixedClock(datetime(2024, 3, 1, 12, 0))
+        scheduler = Scheduler({
+            'start_date': datetime(2024, 1, 1),
+            'end_date': datetime(2024, 1, 7),
+            'num_shifts': 1,
+            'gap_between_shifts': 1,
+            'max_consecutive_weekends': 3,
+            'workers_data': [{'id': 'W001', 'work_percentage': 100}],
+            'enable_predictive_analytics': False,
+            'clock': clock,
+        })
+        self.assertEqual(scheduler.current_datetime, datetime(2024, 3, 1, 12, 0))
+
+        clock.advance(timedelta(hours=2))
+        self.assertEqual(scheduler.date_utils.get_spain_time(), datetime(2024, 3, 1, 14, 0))
+
+    def test_utilities_import_does_not_load_requests(self):
+        """Importing utilities does not import the requests library"""
+        code = "import sys, utilities; print('requests' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'False')
+
+    def test_remote_sync_is_asynchronous_and_cached(self):
+        """now() does not wait on the remote request; the offset is applied once synced"""
+        server = HTTPServer(('127.0.0.1', 0), _TimeApiHandler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        try:
+            clock = RemoteSyncClock(url=f'http://127.0.0.1:{server.server_port}/')
+            clock.now()
+            clock._sync_thread.join(timeout=10)
+
+            offset = clock.now() - ClockProvider().now()
+            self.assertLess(abs(offset - timedelta(hours=1)), timedelta(seconds=5))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_remote_sync_failure_falls_back_to_local(self):
+        """An unreachable time API leaves the local time in place without blocking"""
+        clock = RemoteSyncClock(url='http://127.0.0.1:9/', timeout=0.5)
+        start = time.monotonic()
+        clock.now()
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        clock._sync_thread.join(timeout=10)
+        self.assertEqual(clock._offset, timedelta(0))
+        self.assertIsNotNone(clock._synced_at)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test suite for the date-indexed conflict store.
+Tests range queries, event-driven recomputation and the worker index.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from live_validator import LiveValidator
+from incremental_updater import IncrementalUpdater
+from change_tracker import ChangeTracker
+from schedule_sync import ScheduleSync
+from event_bus import reset_event_bus
+from fake_scheduler import FakeScheduler, make_workers
+
+
+class TestConflictStore(unittest.TestCase):
+    """Test ConflictStore through LiveValidator.detect_conflicts"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.start = datetime(2024, 1, 1)
+        workers = make_workers(10)
+        workers[0]['incompatible_with'] = ['W002']
+        workers[1]['incompatible_with'] = ['W001']
+
+        self.scheduler = FakeScheduler(self.start, 60, workers, gap_between_shifts=3)
+        self.day = self.scheduler.day
+        self.updater = IncrementalUpdater(self.scheduler)
+        self.validator = LiveValidator(self.scheduler, locks=self.updater.locks)
+        self.store = self.validator.conflict_store
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def _assign(self, worker_id, offset, post_index):
+        self.updater.assign_worker_to_shift(worker_id, self.day(offset), post_index, force=True)
+
+    def test_range_query(self):
+        """A range returns the conflicts touching it, each once"""
+        self._assign('W001', 5, 0)
+        self._assign('W002', 5, 1)
+        self._assign('W003', 30, 0)
+        self._assign('W003', 31, 0)
+        self._assign('W004', 40, 0)
+        self._assign('W004', 41, 0)
+
+        self.assertEqual(len(self.store), 3)
+        month = self.store.query(self.day(31), self.day(35))
+        self.assertEqual([c.workers_involved for c in month], [['W003']])
+        types = [c.conflict_type for c in self.store.query(self.day(0), self.day(31))]
+        self.assertEqual(types, ['incompatibility', 'gap_violation'])
+
+    def test_events_recompute_only_changes(self):
+        """Edits recompute only the touched dates and workers"""
+        self._assign('W001', 5, 0)
+        self.assertEqual(self.store.query(), [])
+
+        worker_calls = []
+        original = self.store._detect_worker
+        self.store._detect_worker = lambda w: worker_calls.append(w) or original(w)
+        self._assign('W002', 5, 1)
+        self.assertEqual(len(self.store.query(self.day(5), self.day(5))), 1)
+        self.assertEqual(worker_calls, ['W002'])
+
+        self.updater.unassign_worker_from_shift(self.day(5), 0)
+        self.assertEqual(self.store.query(), [])
+
+    def test_failed_refresh_is_retried(self):
+        """Changed dates and workers stay marked until their conflicts are recomputed"""
+        self._assign('W001', 5, 0)
+        self.assertEqual(self.store.query(), [])
+        self._assign('W002', 5, 1)
+
+        original = self.store._detect_date
+        self.store._detect_date = lambda shift_date: 1 / 0
+        with self.assertRaises(ZeroDivisionError):
+            self.store.query()
+        self.store._detect_date = original
+        self.assertEqual([c.conflict_type for c in self.store.query()], ['incompatibility'])
+
+    def test_worker_index(self):
+        """Conflicts can be looked up by worker"""
+        self._assign('W001', 5, 0)
+        self._assign('W002', 5, 1)
+        self._assign('W001', 7, 0)
+
+        conflicts = self.store.for_worker('W001')
+        self.assertEqual([c.conflict_type for c in conflicts], ['gap_violation', 'incompatibility'])
+        self.assertEqual(len(self.store.for_worker('W002')), 1)
+        self.assertEqual(self.store.for_worker('W005'), [])
+
+    def test_undo_redo_update_conflicts(self):
+        """Undo and redo publish their cells, so conflicts and versions follow them"""
+        tracker = ChangeTracker(self.scheduler)
+        sync = ScheduleSync(self.scheduler)
+        self._assign('W001', 5, 0)
+        self._assign('W002', 5, 1)
+        self.assertEqual(len(self.validator.validate_schedule_integrity(quick_check=True)), 2)
+        self.assertEqual(len(self.store), 1)
+
+        self.assertIsNotNone(tracker.undo())
+        self.assertEqual(self.validator.validate_schedule_integrity(quick_check=True), [])
+        self.assertEqual(self.store.query(), [])
+        self.assertEqual(sync.version, 3)
+        # The undo itself is not recorded as a new change
+        self.assertEqual(len(tracker.get_change_history()), 2)
+        self.assertTrue(tracker.can_redo())
+
+        self.assertIsNotNone(tracker.redo())
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(sync.version, 4)
+        self.assertEqual(len(tracker.get_change_history()), 2)
+
+    def test_detect_conflicts_range_scopes_workload(self):
+        """With a range, workload imbalances cover only workers assigned in it"""
+        for offset in range(0, 40, 4):
+            self._assign('W005', offset, 0)
+        self._assign('W006', 50, 0)
+
+        scoped = self.validator.detect_conflicts((self.day(0), self.day(0)))
+        self.assertEqual([c.workers_involved for c in scoped], [['W005']])
+        self.assertEqual(self.validator.detect_conflicts((self.day(50), self.day(50))), [])
+        everything = self.validator.detect_conflicts()
+        self.assertIn('W007', {c.workers_involved[0] for c in everything})
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test suite for asynchronous EventBus dispatch.
+Tests per-subscriber ordering, synchronous subscribers, overflow policies,
+dispatch metrics, batches and time-window coalescing.
+"""
+
+import os
+import sys
+import threading
+import unittest
+import logging
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from event_bus import EventBus, EventType, DeliveryMode, OverflowPolicy, unpack_bulk_event, schedule_cell_changes
+from schedule_sync import ScheduleSync
+
+
+class TestEventBusAsync(unittest.TestCase):
+    """Test the asynchronous dispatch mode of EventBus"""
+
+    def setUp(self):
+        self.bus = EventBus(async_dispatch=True, max_workers=4)
+
+    def tearDown(self):
+        self.bus.shutdown()
+
+    def test_async_delivery_preserves_order(self):
+        """Events reach an async subscriber in publish order, off the publishing thread"""
+        received = []
+        threads = set()
+
+        def handler(event):
+            received.append(event.data['n'])
+            threads.add(threading.current_thread().name)
+
+        self.bus.subscribe(EventType.SHIFT_ASSIGNED, handler)
+        for n in range(200):
+            self.bus.emit(EventType.SHIFT_ASSIGNED, n=n)
+
+        self.assertTrue(self.bus.flush(timeout=5))
+        self.assertEqual(received, list(range(200)))
+        self.assertNotIn(threading.current_thread().name, threads)
+
+    def test_sync_subscriber_runs_before_publish_returns(self):
+        """A SYNC subscriber is called on the publishing thread"""
+        received = []
+        self.bus.subscribe(EventType.SHIFT_ASSIGNED,
+                           lambda e: received.append(threading.current_thread()),
+                           delivery=DeliveryMode.SYNC)
+
+        self.bus.emit(EventType.SHIFT_ASSIGNED)
+        self.assertEqual(received, [threading.current_thread()])
+
+    def test_slow_subscriber_does_not_block_publisher(self):
+        """A blocked async subscriber neither delays publish nor other subscribers"""
+        release = threading.Event()
+        fast = []
+
+        self.bus.subscribe(EventType.SHIFT_ASSIGNED, lambda e: release.wait(5))
+        self.bus.subscribe(EventType.SHIFT_ASSIGNED, lambda e: fast.append(e))
+
+        for _ in range(3):
+            self.bus.emit(EventType.SHIFT_ASSIGNED)
+        for _ in range(50):
+            if len(fast) == 3:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(len(fast), 3)
+
+        release.set()
+        self.assertTrue(self.bus.flush(timeout=5))
+
+    def test_drop_newest_policy(self):
+        """Events beyond a full queue are dropped and counted"""
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow(event):
+            started.set()
+            release.wait(5)
+
+        self.bus.subscribe(EventType.SHIFT_ASSIGNED, slow, queue_size=2,
+                           overflow_policy=OverflowPolicy.DROP_NEWEST)
+        self.bus.emit(EventType.SHIFT_ASSIGNED)
+        self.assertTrue(started.wait(5))
+        for _ in range(5):
+            self.bus.emit(EventType.SHIFT_ASSIGNED)
+
+        stats = self.bus.get_stats()['dispatch']
+        self.assertEqual(stats['total_dropped'], 3)
+        self.assertEqual(stats['total_queue_depth'], 2)
+
+        release.set()
+        self.assertTrue(self.bus.flush(timeout=5))
+        subscriber = self.bus.get_stats()['dispatch']['subscribers'][0]
+        self.assertEqual(subscriber['delivered'], 3)
+        self.assertGreater(subscriber['max_latency_ms'], 0)
+
+    def test_sync_bus_delivers_inline(self):
+        """Without async dispatch every subscriber is called inline"""
+        bus = EventBus()
+        received = []
+        bus.subscribe(EventType.SHIFT_ASSIGNED, lambda e: received.append(e))
+        bus.emit(EventType.SHIFT_ASSIGNED)
+        self.assertEqual(len(received), 1)
+        self.assertFalse(bus.get_stats()['dispatch']['async_dispatch'])
+
+
+class TestEventBatching(unittest.TestCase):
+    """Test batch contexts and coalescing windows"""
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.assigned = []
+        self.bulk = []
+        self.bus.subscribe(EventType.SHIFT_ASSIGNED, self.assigned.append)
+        self.bus.subscribe(EventType.BULK_UPDATE, self.bulk.append)
+
+    def test_batch_publishes_one_envelope(self):
+        """Changes inside a batch reach subscribers as one BULK_UPDATE"""
+        with self.bus.batch(user_id='u1') as batch:
+            for n in range(10):
+                self.bus.emit(EventType.SHIFT_ASSIGNED, n=n)
+            with self.bus.batch():
+                self.bus.emit(EventType.SHIFT_UNASSIGNED, n=10)
+            batch.update(total_operations=11)
+            self.assertEqual(self.bulk, [])
+
+        self.assertEqual(self.assigned, [])
+        self.assertEqual(len(self.bulk), 1)
+        envelope = self.bulk[0]
+        self.assertEqual(envelope.user_id, 'u1')
+        self.assertEqual(envelope.data['total_operations'], 11)
+        self.assertEqual([e.data['n'] for e in unpack_bulk_event(envelope)], list(range(11)))
+
+    def test_batch_discarded_on_error(self):
+        """A failing batch can drop its events"""
+        with self.assertRaises(ValueError):
+            with self.bus.batch(discard_on_error=True):
+                self.bus.emit(EventType.SHIFT_ASSIGNED, n=0)
+                raise ValueError('boom')
+        self.assertEqual(self.bulk, [])
+        self.assertEqual(self.assigned, [])
+
+    def test_coalesce_window(self):
+        """A coalescing subscriber receives one envelope per window"""
+        received = []
+        self.bus.subscribe(EventType.SHIFT_ASSIGNED, received.append, coalesce_window=0.05)
+        self.bus.subscribe(EventType.SHIFT_UNASSIGNED, received.append, coalesce_window=0.05)
+        for n in range(20):
+            self.bus.emit(EventType.SHIFT_ASSIGNED if n % 2 else EventType.SHIFT_UNASSIGNED, n=n)
+
+        self.assertEqual(received, [])
+        self.assertTrue(self.bus.flush(timeout=5))
+        self.assertEqual(len(received), 1)
+        self.assertEqual([e.data['n'] for e in unpack_bulk_event(received[0])], list(range(20)))
+        self.assertEqual(len(self.assigned), 10)
+
+
+    def test_coalesced_envelope_with_validation_events(self):
+        """Cell changes of a coalesced envelope skip the events that change no cells"""
+        received = []
+        for event_type in (EventType.SHIFT_ASSIGNED, EventType.CONSTRAINT_VIOLATION):
+            self.bus.subscribe(event_type, received.append, coalesce_window=0.05)
+        self.bus.emit(EventType.SHIFT_ASSIGNED, worker_id='W001', shift_date='2024-01-01T00:00:00', post_index=0)
+        self.bus.emit(EventType.CONSTRAINT_VIOLATION, worker_id='W001', message='gap')
+        self.assertTrue(self.bus.flush(timeout=5))
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(schedule_cell_changes(received[0]), [(datetime(2024, 1, 1), 0, None, 'W001')])
+        self.assertEqual(ScheduleSync.event_to_diffs(received[0]), [['2024-01-01T00:00:00', 0, 'W001']])
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test suite for the EventBus ring-buffer history.
+Tests sequence numbers, eviction, per-type queries and maintained counters.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime, timedelta
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from event_bus import EventBus, EventType, ScheduleEvent
+
+
+class TestEventHistory(unittest.TestCase):
+    """Test event history queries on a small ring buffer"""
+
+    def setUp(self):
+        self.bus = EventBus(max_history=5)
+        for n in range(8):
+            event_type = EventType.SHIFT_ASSIGNED if n % 2 == 0 else EventType.SHIFT_UNASSIGNED
+            self.bus.emit(event_type, n=n)
+
+    def test_sequence_numbers_and_eviction(self):
+        """Only the newest events are kept and seq keeps increasing"""
+        history = self.bus.get_event_history()
+        self.assertEqual([e.seq for e in history], [8, 7, 6, 5, 4])
+        self.assertEqual(self.bus.last_seq, 8)
+        self.assertTrue(self.bus.is_seq_available(3))
+        self.assertFalse(self.bus.is_seq_available(2))
+
+    def test_events_since_seq(self):
+        """get_events_since returns newer events oldest first, optionally by type"""
+        self.assertEqual([e.data['n'] for e in self.bus.get_events_since(5)], [5, 6, 7])
+        assigned = self.bus.get_events_since(0, EventType.SHIFT_ASSIGNED)
+        self.assertEqual([e.data['n'] for e in assigned], [4, 6])
+        self.assertEqual(self.bus.get_events_since(8), [])
+
+    def test_type_filter_and_limit(self):
+        """Type filtering uses the per-type index and honours the limit"""
+        events = self.bus.get_event_history(event_type=EventType.SHIFT_UNASSIGNED, limit=2)
+        self.assertEqual([e.data['n'] for e in events], [7, 5])
+
+    def test_since_filter_with_out_of_order_timestamps(self):
+        """An event created before it was published does not hide older-seq events"""
+        since = datetime.now()
+        late = ScheduleEvent(EventType.SHIFT_SWAPPED, timestamp=since - timedelta(seconds=1), data={'n': 'late'})
+        self.bus.emit(EventType.SHIFT_ASSIGNED, n=8)
+        self.bus.publish(late)
+        self.bus.emit(EventType.SHIFT_ASSIGNED, n=9)
+
+        events = self.bus.get_event_history(since=since)
+        self.assertEqual([e.data['n'] for e in events], [9, 8])
+
+    def test_stats_counters(self):
+        """get_stats reports counts for the events still in history"""
+        stats = self.bus.get_stats()
+        self.assertEqual(stats['total_events'], 5)
+        self.assertEqual(stats['total_published'], 8)
+        self.assertEqual(stats['event_type_counts'], {'shift_assigned': 2, 'shift_unassigned': 3})
+
+        self.bus.clear_history()
+        self.bus.emit(EventType.SHIFT_SWAPPED)
+        stats = self.bus.get_stats()
+        self.assertEqual(stats['total_events'], 1)
+        self.assertEqual(stats['last_seq'], 9)
+        self.assertEqual(stats['event_type_counts'], {'shift_swapped': 1})
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
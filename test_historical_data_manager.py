@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test suite for historical data storage.
+Tests that record files and the consolidated history are replaced atomically.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import logging
+from types import SimpleNamespace
+from unittest import mock
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import historical_data_manager
+from historical_data_manager import HistoricalDataManager
+from exceptions import SchedulerError
+
+
+class TestHistoricalStorage(unittest.TestCase):
+    """Test HistoricalDataManager file writes"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.manager = HistoricalDataManager(SimpleNamespace(), storage_path=self.directory)
+        self.consolidated = os.path.join(self.directory, 'consolidated_history.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_records_are_consolidated(self):
+        """Each stored record is written to its own file and the consolidated history"""
+        self.manager.store_historical_data({'timestamp': '2024-01-01T00:00:00', 'coverage': 90})
+        self.manager.store_historical_data({'timestamp': '2024-01-02T00:00:00', 'coverage': 95})
+
+        with open(self.consolidated) as f:
+            history = json.load(f)
+        self.assertEqual([r['coverage'] for r in history['records']], [90, 95])
+        self.assertEqual(history['summary']['total_records'], 2)
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith('.tmp')])
+
+    def test_interrupted_write_keeps_previous_files(self):
+        """A write that dies half way leaves the previous consolidated history intact"""
+        self.manager.store_historical_data({'timestamp': '2024-01-01T00:00:00', 'coverage': 90})
+        with open(self.consolidated) as f:
+            before = f.read()
+        record_files = set(os.listdir(self.directory))
+
+        def partial_dump(data, f, **kwargs):
+            f.write('{"records": [')
+            raise OSError('disk full')
+
+        with mock.patch.object(historical_data_manager.json, 'dump', side_effect=partial_dump):
+            with self.assertRaises(SchedulerError):
+                self.manager.store_historical_data({'timestamp': '2024-01-02T00:00:00', 'coverage': 95})
+            self.manager._update_consolidated_history({'timestamp': '2024-01-02T00:00:00', 'coverage': 95})
+
+        with open(self.consolidated) as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(set(os.listdir(self.directory)), record_files)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
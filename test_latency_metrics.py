@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test suite for real-time operation latency histograms.
+Tests percentiles, stage breakdowns, exports and engine instrumentation.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import unittest
+import logging
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from latency_metrics import LatencyHistogram, LatencyMetrics
+from real_time_engine import RealTimeEngine
+from event_bus import get_event_bus, reset_event_bus, EventType, DeliveryMode
+from fake_scheduler import FakeScheduler, make_workers
+
+
+class TestLatencyMetrics(unittest.TestCase):
+    """Test LatencyMetrics and its use by RealTimeEngine"""
+
+    def setUp(self):
+        reset_event_bus()
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def _make_scheduler(self):
+        start = datetime(2024, 1, 1)
+        scheduler = FakeScheduler(start, 14, make_workers(4))
+        return scheduler, start
+
+    def test_histogram_percentiles(self):
+        """Percentiles come from bucket bounds within the bucket resolution"""
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 100)
+        self.assertAlmostEqual(summary['avg_time'], 0.0505)
+        self.assertEqual((summary['min_time'], summary['max_time']), (0.001, 0.1))
+        for percent, expected in ((50, 0.05), (95, 0.095), (99, 0.099)):
+            self.assertGreaterEqual(summary[f'p{percent}'], expected)
+            self.assertLessEqual(summary[f'p{percent}'], expected * 1.19)
+        self.assertEqual(LatencyHistogram().percentile(99), 0.0)
+
+    def test_dispatch_is_split_from_mutation(self):
+        """Event dispatch inside a stage is recorded as its own stage"""
+        metrics = LatencyMetrics()
+        bus = get_event_bus()
+        bus.subscribe(EventType.SHIFT_ASSIGNED, lambda event: time.sleep(0.03), delivery=DeliveryMode.SYNC)
+
+        with metrics.time('assign') as timer:
+            with timer.stage('mutation'):
+                bus.emit(EventType.SHIFT_ASSIGNED, worker_id='W001')
+        bus.emit(EventType.SHIFT_ASSIGNED, worker_id='W002')  # Outside any operation
+
+        stages = metrics.summary()['assign']['stages']
+        self.assertEqual(stages['dispatch']['count'], 1)
+        self.assertGreaterEqual(stages['dispatch']['max_time'], 0.03)
+        self.assertLess(stages['mutation']['max_time'], 0.03)
+        self.assertGreaterEqual(metrics.summary()['assign']['max_time'], 0.03)
+
+    def test_exports(self):
+        """JSON and Prometheus exports are written atomically and agree on counts"""
+        metrics = LatencyMetrics()
+        for seconds in (0.002, 0.004, 2.5):
+            metrics.record('swap', seconds)
+        metrics.record('swap', 0.001, stage='validation')
+
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = metrics.export(os.path.join(directory, 'latency.json'))
+            with open(json_path, encoding='utf-8') as f:
+                exported = json.load(f)
+            self.assertEqual(exported['swap']['count'], 3)
+            self.assertEqual(exported['swap']['stages']['validation']['count'], 1)
+
+            prom_path = metrics.export(os.path.join(directory, 'latency.prom'), fmt='prometheus')
+            with open(prom_path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            self.assertEqual(sorted(os.listdir(directory)), ['latency.json', 'latency.prom'])
+
+        self.assertIn('# TYPE scheduler_operation_latency_seconds histogram', lines)
+        self.assertIn('scheduler_operation_latency_seconds_bucket'
+                      '{operation="swap",stage="total",le="+Inf"} 3', lines)
+        self.assertIn('scheduler_operation_latency_seconds_count{operation="swap",stage="total"} 3', lines)
+        with self.assertRaises(ValueError):
+            metrics.export('unused.txt', fmt='xml')
+
+    def test_engine_records_operations(self):
+        """Engine operations report totals and stage breakdowns in analytics"""
+        scheduler, start = self._make_scheduler()
+        engine = RealTimeEngine(scheduler)
+
+        self.assertTrue(engine.assign_worker_real_time('W001', start, 0).success)
+        self.assertTrue(engine.undo_last_change().success)
+        self.assertTrue(engine.redo_last_change().success)
+        engine.validate_schedule_real_time()
+
+        performance = engine.get_real_time_analytics()['performance_metrics']
+        self.assertEqual(set(performance), {'assign', 'undo', 'redo', 'validate'})
+        self.assertEqual(performance['assign']['count'], 1)
+        self.assertTrue({'validation', 'mutation', 'dispatch'} <= set(performance['assign']['stages']))
+        self.assertEqual(set(performance['undo']['stages']), {'mutation', 'dispatch'})
+        assign = performance['assign']
+        self.assertLessEqual(sum(s['total_time'] for s in assign['stages'].values()), assign['total_time'])
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test suite for LiveValidator's live violation state.
+Tests dirty-set revalidation, quick checks and one-time synchronization checks.
+"""
+
+import os
+import sys
+import unittest
+import logging
+import threading
+from datetime import datetime, timedelta
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from live_validator import LiveValidator
+from incremental_updater import IncrementalUpdater
+from event_bus import get_event_bus, reset_event_bus, EventType
+from fake_scheduler import FakeScheduler, make_workers
+
+
+class TestLiveValidationState(unittest.TestCase):
+    """Test incremental revalidation in LiveValidator"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.start = datetime(2024, 1, 1)  # Monday
+        workers = make_workers(10)
+        workers[0]['incompatible_with'] = ['W002']
+        workers[1]['incompatible_with'] = ['W001']
+
+        self.sync_checks = 0
+        self.scheduler = FakeScheduler(self.start, 28, workers)
+        self.scheduler._ensure_data_synchronization = self._ensure_sync
+        self.updater = IncrementalUpdater(self.scheduler)
+        self.validator = LiveValidator(self.scheduler, locks=self.updater.locks)
+
+        self.violation_events = []
+        get_event_bus().subscribe(EventType.CONSTRAINT_VIOLATION, self.violation_events.append)
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def _ensure_sync(self):
+        self.sync_checks += 1
+        return True
+
+    def _assign(self, worker_id, day_offset, post_index):
+        result = self.updater.assign_worker_to_shift(worker_id, self.start + timedelta(days=day_offset),
+                                                     post_index, force=True)
+        self.assertTrue(result.success, result.message)
+
+    def test_only_dirty_cells_revalidated(self):
+        """After the first build, an edit revalidates only the touched date and worker"""
+        for offset in range(0, 27, 3):
+            self._assign(f'W{offset // 3 + 1:03d}', offset, 0)
+        self.assertEqual(self.validator.validate_schedule_integrity(quick_check=True), [])
+
+        calls = []
+        original = self.validator._validate_existing_assignment
+        self.validator._validate_existing_assignment = lambda *args: calls.append(args) or original(*args)
+        self._assign('W010', 1, 1)
+        self.validator.validate_schedule_integrity(quick_check=True)
+
+        self.assertEqual([c[0] for c in calls], ['W010'])
+        calls.clear()
+        self.validator.validate_schedule_integrity(quick_check=True)
+        self.assertEqual(calls, [])
+
+    def test_violation_appears_and_clears(self):
+        """An incompatible pair is reported on both cells and cleared by unassigning one"""
+        self.validator.get_violations()
+        self._assign('W001', 2, 0)
+        self._assign('W002', 2, 1)
+
+        violations = self.validator.validate_schedule_integrity(quick_check=True)
+        self.assertEqual(len(violations), 2)
+        self.assertTrue(all(v.constraint_type == 'incompatibility' for v in violations))
+        self.assertEqual(self.violation_events[-1].data['worker_id'], 'W002')
+
+        self.updater.unassign_worker_from_shift(self.start + timedelta(days=2), 1)
+        self.assertEqual(self.validator.validate_schedule_integrity(quick_check=True), [])
+
+    def test_gap_violation_tracks_other_dates(self):
+        """A gap violation on another date is found through the dirty worker"""
+        self._assign('W003', 5, 0)
+        self.validator.get_violations()
+        self._assign('W003', 6, 1)
+
+        violations = self.validator.validate_schedule_integrity(quick_check=True)
+        self.assertEqual({v.constraint_type for v in violations}, {'gap_constraint'})
+        self.assertEqual(len(violations), 2)
+
+    def test_failed_refresh_keeps_dirty_state(self):
+        """Dates and workers stay dirty when their revalidation fails"""
+        self.validator.get_violations()
+        original = self.validator._validate_existing_assignment
+
+        def fail_once(*args):
+            self.validator._validate_existing_assignment = original
+            raise RuntimeError('validation failed')
+
+        self.validator._validate_existing_assignment = fail_once
+        self.scheduler.schedule[self.start + timedelta(days=2)] = ['W001', 'W002']
+        self.scheduler._update_tracking_data('W001', self.start + timedelta(days=2), 0)
+        self.scheduler._update_tracking_data('W002', self.start + timedelta(days=2), 1)
+        # The revalidation run by the assignment listener fails and is logged
+        get_event_bus().emit(EventType.SHIFT_ASSIGNED, worker_id='W002',
+                             shift_date=(self.start + timedelta(days=2)).isoformat(), post_index=1)
+        self.assertIs(self.validator._validate_existing_assignment, original)
+
+        violations = self.validator.get_violations()
+        self.assertEqual(len(violations), 2)
+        self.assertTrue(all(v.constraint_type == 'incompatibility' for v in violations))
+
+    def test_refresh_waits_for_edits(self):
+        """Revalidation does not read the schedule while a cell edit holds it"""
+        self._assign('W001', 2, 0)
+        edit_started, release_edit, refreshed = threading.Event(), threading.Event(), threading.Event()
+
+        def edit():
+            with self.updater.locks.edit([self.start + timedelta(days=2)]):
+                edit_started.set()
+                release_edit.wait(5)
+
+        def refresh():
+            self.validator.get_violations()
+            refreshed.set()
+
+        editor = threading.Thread(target=edit)
+        editor.start()
+        self.assertTrue(edit_started.wait(5))
+        reader = threading.Thread(target=refresh)
+        reader.start()
+        self.assertFalse(refreshed.wait(0.2))
+        release_edit.set()
+        self.assertTrue(refreshed.wait(5))
+        editor.join(5)
+        reader.join(5)
+
+    def test_sync_checked_once(self):
+        """validate_assignment checks synchronization once, again only after invalidate()"""
+        for offset in range(3):
+            self.validator.validate_assignment('W004', self.start + timedelta(days=offset * 4), 0)
+        self.assertEqual(self.sync_checks, 1)
+
+        self.validator.invalidate()
+        self.validator.validate_assignment('W004', self.start, 0)
+        self.assertEqual(self.sync_checks, 2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
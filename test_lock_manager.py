@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test suite for hierarchical resource locks.
+Tests range locks, intention-lock conflicts, heap-based expiry and range conflict checks.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from collaboration_manager import CollaborationManager
+from lock_manager import range_paths
+from event_bus import reset_event_bus
+
+
+class TestLockManager(unittest.TestCase):
+    """Test hierarchical locking through CollaborationManager"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.manager = CollaborationManager(SimpleNamespace(schedule={}))
+        self.manager.start_user_session('alice')
+        self.manager.start_user_session('bob')
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def test_range_lock_blocks_cells_inside(self):
+        """A locked date range blocks cells inside it but not outside"""
+        self.assertTrue(self.manager.acquire_range_lock('alice', datetime(2024, 1, 1), datetime(2024, 2, 3)))
+        self.assertEqual(range_paths(datetime(2024, 1, 1), datetime(2024, 2, 3))[0], ('2024-01',))
+        self.assertEqual(len(self.manager.lock_manager), 4)
+
+        self.assertFalse(self.manager.acquire_resource_lock('bob', 'shift_2024-01-15_0'))
+        self.assertFalse(self.manager.acquire_resource_lock('bob', 'shift_2024-02-02_1', 'read'))
+        self.assertTrue(self.manager.acquire_resource_lock('bob', 'shift_2024-02-04_0'))
+        self.assertTrue(self.manager.acquire_resource_lock('alice', 'shift_2024-01-15_0'))
+
+        self.assertTrue(self.manager.release_range_lock('alice', datetime(2024, 1, 1), datetime(2024, 2, 3)))
+        self.assertTrue(self.manager.acquire_resource_lock('bob', 'shift_2024-01-15_1'))
+
+    def test_cell_lock_blocks_range(self):
+        """A cell lock is found through intention locks when locking its date or month"""
+        self.assertTrue(self.manager.acquire_resource_lock('bob', 'shift_2024-01-15_0'))
+        self.assertFalse(self.manager.acquire_range_lock('alice', datetime(2024, 1, 10), datetime(2024, 1, 20)))
+        self.assertFalse(self.manager.acquire_resource_lock('alice', 'schedule', 'read'))
+        self.assertEqual(len(self.manager.lock_manager), 1)  # Failed range locked nothing
+
+        self.assertTrue(self.manager.acquire_resource_lock('alice', 'shift_2024-01-15_1'))
+        self.assertTrue(self.manager.acquire_resource_lock('alice', 'shift_2024-01-16_0', 'read'))
+        self.assertTrue(self.manager.acquire_resource_lock('bob', 'date_2024-01-16', 'read'))
+        self.assertFalse(self.manager.acquire_resource_lock('bob', 'date_2024-01-16'))
+
+    def test_expiry_heap(self):
+        """Cleanup releases only expired locks and skips renewed ones"""
+        self.assertTrue(self.manager.acquire_resource_lock('alice', 'shift_2024-01-01_0'))
+        self.assertTrue(self.manager.acquire_resource_lock('alice', 'shift_2024-01-02_0', 'read'))
+        self.manager.lock_manager.lock_timeout = timedelta(hours=1)
+        self.assertTrue(self.manager.acquire_resource_lock('alice', 'shift_2024-01-02_0', 'write'))
+
+        self.manager.lock_manager.expire(datetime.now() + timedelta(minutes=10))
+        self.assertIsNone(self.manager.get_resource_lock_info('shift_2024-01-01_0'))
+        self.assertEqual(self.manager.get_resource_lock_info('shift_2024-01-02_0')['lock_type'], 'write')
+        self.assertEqual(len(self.manager.lock_manager._expiry_heap), 1)
+        self.assertTrue(self.manager.acquire_resource_lock('bob', 'date_2024-01-01'))
+
+    def test_detect_range_conflict(self):
+        """Operation conflict checks see locks on ancestors and inside a bulk range"""
+        self.manager.acquire_resource_lock('bob', 'date_2024-03-05')
+        self.manager.acquire_resource_lock('bob', 'shift_2024-03-20_2', 'read')
+
+        conflict = self.manager.detect_operation_conflict(
+            'alice', 'assign_worker', {'shift_date': '2024-03-05', 'post_index': 1})
+        self.assertEqual(conflict['conflicts'][0]['resource_id'], 'date_2024-03-05')
+
+        conflict = self.manager.detect_operation_conflict(
+            'alice', 'bulk_update', {'start_date': datetime(2024, 3, 1), 'end_date': datetime(2024, 3, 31)})
+        self.assertEqual(sorted(c['resource_id'] for c in conflict['conflicts']),
+                         ['date_2024-03-05', 'shift_2024-03-20_2'])
+        self.assertIsNone(self.manager.detect_operation_conflict(
+            'alice', 'bulk_update', {'start_date': datetime(2024, 3, 6), 'end_date': datetime(2024, 3, 19)}))
+        self.assertIsNone(self.manager.detect_operation_conflict(
+            'bob', 'assign_worker', {'shift_date': '2024-03-05', 'post_index': 1}))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test suite for incrementally maintained schedule metrics.
+Tests the load distribution, event-driven updates, undo/redo and rebuilds.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from metrics_registry import MetricsRegistry, LoadDistribution
+from incremental_updater import IncrementalUpdater
+from change_tracker import ChangeTracker
+from event_bus import get_event_bus, reset_event_bus, EventType
+from fake_scheduler import FakeScheduler, make_workers
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test MetricsRegistry against full recounts of the schedule"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.start = datetime(2024, 1, 1)
+        self.scheduler = FakeScheduler(self.start, 14, make_workers(6), num_shifts=3,
+                                       gap_between_shifts=0, max_consecutive_weekends=10)
+        self.day = self.scheduler.day
+        self.updater = IncrementalUpdater(self.scheduler)
+        self.metrics = MetricsRegistry(self.scheduler, locks=self.updater.locks)
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def _recount(self):
+        """Metrics computed by scanning the whole schedule"""
+        rows = self.scheduler.schedule.values()
+        loads = [len(dates) for dates in self.scheduler.worker_assignments.values()]
+        return {
+            'total_slots': sum(len(row) for row in rows),
+            'filled_slots': sum(1 for row in rows for w in row if w is not None),
+            'min_workload': min(loads),
+            'max_workload': max(loads),
+            'average_workload': round(sum(loads) / len(loads), 2)
+        }
+
+    def _maintained(self):
+        metrics = self.metrics.get_metrics()
+        merged = dict(metrics['schedule_metrics'], **metrics['workload_distribution'])
+        return {key: merged[key] for key in self._recount()}
+
+    def test_load_distribution(self):
+        """Min and max follow loads through moves, gaps and removals"""
+        loads = LoadDistribution()
+        for key, load in (('a', 2), ('b', 5), ('c', 5), ('d', 9)):
+            loads.set(key, load)
+        self.assertEqual((loads.minimum, loads.maximum, loads.total), (2, 9, 21))
+
+        loads.add('a', 1)
+        self.assertEqual(loads.minimum, 3)
+        loads.remove('d')
+        self.assertEqual(loads.maximum, 5)
+        loads.set('a', 7)
+        self.assertEqual((loads.minimum, loads.maximum), (5, 7))
+        loads.add('b', -5)
+        self.assertEqual((loads.minimum, loads.mean), (0, 4.0))
+
+    def test_events_keep_metrics_current(self):
+        """Assign, unassign, swap and bulk updates match a full recount without rescanning"""
+        self.metrics.get_metrics()
+        self.updater.assign_worker_to_shift('W001', self.day(0), 0)
+        self.updater.assign_worker_to_shift('W002', self.day(0), 1)
+        self.updater.assign_worker_to_shift('W003', self.day(0), 1, force=True)
+        self.updater.assign_worker_to_shift('W001', self.day(3), 2)
+        self.updater.swap_workers(self.day(3), 2, self.day(5), 0)
+        self.updater.unassign_worker_from_shift(self.day(0), 0)
+        self.updater.bulk_update([
+            {'operation': 'assign', 'worker_id': 'W004', 'shift_date': self.day(7).isoformat(), 'post_index': 0},
+            {'operation': 'assign', 'worker_id': 'W004', 'shift_date': self.day(8).isoformat(), 'post_index': 1},
+        ])
+
+        self.assertEqual(self._maintained(), self._recount())
+        self.assertEqual(self.metrics.worker_load('W004'), 2)
+        self.assertEqual(self.metrics.counters['rebuilds'], 1)
+        self.assertEqual(self.metrics.counters[EventType.SHIFT_ASSIGNED.value], 4)
+
+    def test_undo_redo_and_new_rows(self):
+        """Undo/redo through ChangeTracker and cells on new dates are counted"""
+        tracker = ChangeTracker(self.scheduler)
+        self.metrics.get_metrics()
+        self.updater.assign_worker_to_shift('W005', self.day(2), 0)
+        self.updater.assign_worker_to_shift('W006', self.day(20), 1)
+        self.assertEqual(self.metrics.get_metrics()['schedule_metrics']['total_slots'], 45)
+
+        self.assertIsNotNone(tracker.undo())
+        self.assertEqual(self._maintained(), self._recount())
+        self.assertIsNotNone(tracker.redo())
+        self.assertEqual(self._maintained(), self._recount())
+        self.assertEqual(self.metrics.counters['rebuilds'], 1)
+
+    def test_regeneration_rebuilds(self):
+        """A regenerated schedule is measured afresh on the next read"""
+        self.metrics.get_metrics()
+        for offset in range(14):
+            self.scheduler.schedule[self.day(offset)] = ['W001', 'W002', None]
+            self.scheduler._update_tracking_data('W001', self.day(offset), 0)
+            self.scheduler._update_tracking_data('W002', self.day(offset), 1)
+        get_event_bus().emit(EventType.SCHEDULE_GENERATED)
+
+        self.assertEqual(self._maintained(), self._recount())
+        self.assertEqual(self.metrics.get_metrics()['workload_distribution']['max_workload'], 14)
+        self.assertEqual(self.metrics.counters['rebuilds'], 2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test suite for optimistic concurrency on schedule edits.
+Tests version checks, rebase diffs, transactions and undo/redo versioning.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from incremental_updater import IncrementalUpdater
+from change_tracker import ChangeTracker
+from event_bus import get_event_bus, reset_event_bus, EventType
+from fake_scheduler import FakeScheduler, make_workers
+
+
+class TestOptimisticConcurrency(unittest.TestCase):
+    """Test versioned compare-and-swap edits in IncrementalUpdater"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.start = datetime(2024, 1, 1)
+        self.scheduler = FakeScheduler(self.start, 14, make_workers(5))
+        self.day = self.scheduler.day
+        self.updater = IncrementalUpdater(self.scheduler)
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def test_unrelated_edits_do_not_conflict(self):
+        """Edits to cells and workers that were not read commit without conflict"""
+        alice = self.updater.read_versions([(self.day(2), 0)], ['W001'])
+        bob = self.updater.read_versions([(self.day(5), 1)], ['W002'])
+
+        result = self.updater.assign_worker_to_shift('W001', self.day(2), 0, expected_versions=alice)
+        self.assertTrue(result.success)
+        result = self.updater.assign_worker_to_shift('W002', self.day(5), 1, expected_versions=bob)
+        self.assertTrue(result.success)
+        self.assertEqual(result.versions['cells'][0][:2], [self.day(5).isoformat(), 1])
+        self.assertGreater(result.versions['workers']['W002'], bob['workers']['W002'])
+
+    def test_conflict_returns_rebase_diff(self):
+        """A stale read is rejected with only the changed cells and workers"""
+        alice = self.updater.read_versions([(self.day(3), 0), (self.day(4), 0)], ['W003'])
+        self.assertTrue(self.updater.assign_worker_to_shift('W004', self.day(3), 0).success)
+
+        result = self.updater.assign_worker_to_shift('W003', self.day(3), 0, expected_versions=alice)
+        self.assertFalse(result.success)
+        self.assertEqual(self.scheduler.schedule[self.day(3)][0], 'W004')
+        self.assertEqual([cell[:3] for cell in result.stale['cells']], [[self.day(3).isoformat(), 0, 'W004']])
+        self.assertEqual(result.stale['workers'], {})
+
+        # Rebasing on the diff succeeds
+        rebased = self.updater.read_versions([(self.day(3), 0)], ['W003'])
+        result = self.updater.swap_workers(self.day(3), 0, self.day(8), 0, expected_versions=rebased)
+        self.assertTrue(result.success)
+        self.assertEqual(self.scheduler.schedule[self.day(8)][0], 'W004')
+
+    def test_worker_version_guards_constraints(self):
+        """Assignments elsewhere bump the worker version read for gap checks"""
+        alice = self.updater.read_versions([(self.day(6), 0)], ['W005'])
+        self.updater.assign_worker_to_shift('W005', self.day(9), 1)
+
+        result = self.updater.assign_worker_to_shift('W005', self.day(6), 0, expected_versions=alice)
+        self.assertFalse(result.success)
+        self.assertEqual(result.stale['workers']['W005']['assignments'], [self.day(9).isoformat()])
+
+        tx = self.updater.begin_transaction('alice')
+        tx.expect(alice)
+        tx.assign('W005', self.day(6), 0)
+        self.assertFalse(tx.commit().success)
+        self.assertIsNone(self.scheduler.schedule[self.day(6)][0])
+
+    def test_undo_and_regeneration_bump_versions(self):
+        """Undo/redo and a regenerated schedule make earlier reads stale"""
+        tracker = ChangeTracker(self.scheduler, versions=self.updater.versions)
+        self.updater.assign_worker_to_shift('W001', self.day(1), 0)
+        before_undo = self.updater.read_versions([(self.day(1), 0)])
+
+        self.assertIsNotNone(tracker.undo())
+        result = self.updater.unassign_worker_from_shift(self.day(1), 0, expected_versions=before_undo)
+        self.assertFalse(result.success)
+        self.assertEqual(result.stale['cells'][0][2], None)
+
+        untouched = self.updater.read_versions([(self.day(12), 1)])
+        get_event_bus().emit(EventType.SCHEDULE_GENERATED)
+        result = self.updater.assign_worker_to_shift('W002', self.day(12), 1, expected_versions=untouched)
+        self.assertFalse(result.success)
+        self.assertEqual(len(result.stale['cells']), 1)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test suite for lazy loading of the predictive analytics stack.
+Tests that constructing a Scheduler does not import the ML libraries.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+import logging
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scheduler import Scheduler
+
+
+class TestPredictiveLazyLoading(unittest.TestCase):
+    """Test that the predictive subsystem is only loaded on first use"""
+
+    def setUp(self):
+        """Set up a small configuration with predictive analytics enabled"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config = {
+            'start_date': datetime(2024, 1, 1),
+            'end_date': datetime(2024, 1, 14),
+            'num_shifts': 2,
+            'gap_between_shifts': 1,
+            'max_consecutive_weekends': 3,
+            'workers_data': [{'id': f'W{i:03d}', 'work_percentage': 100} for i in range(1, 7)],
+            'enable_predictive_analytics': True,
+            'predictive_analytics_config': {'storage_path': self.tmp_dir.name},
+        }
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_construction_does_not_import_ml_stack(self):
+        """A fresh interpreter constructing a Scheduler imports no predictive or ML modules"""
+        code = (
+            "import sys\n"
+            "from datetime import datetime\n"
+            "from scheduler import Scheduler\n"
+            "Scheduler({'start_date': datetime(2024, 1, 1), 'end_date': datetime(2024, 1, 14),\n"
+            "           'num_shifts': 2, 'gap_between_shifts': 1, 'max_consecutive_weekends': 3,\n"
+            "           'workers_data': [{'id': str(i), 'work_percentage': 100} for i in range(6)]})\n"
+            "heavy = ('predictive_analytics', 'demand_forecaster', 'pandas', 'sklearn', 'statsmodels')\n"
+            "print(sorted(m for m in heavy if m in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '[]')
+
+    def test_engine_loaded_on_first_access(self):
+        """The engine is created on first access and reused afterwards"""
+        scheduler = Scheduler(self.config)
+        self.assertFalse(scheduler._predictive_loaded)
+
+        engine = scheduler.predictive_analytics
+        self.assertIsNotNone(engine)
+        self.assertIs(scheduler.predictive_analytics, engine)
+        self.assertIsNotNone(scheduler.predictive_optimizer)
+        self.assertTrue(scheduler.is_predictive_analytics_enabled())
+
+    def test_disabled_stack_is_never_loaded(self):
+        """With predictive analytics disabled nothing is loaded"""
+        scheduler = Scheduler(dict(self.config, enable_predictive_analytics=False))
+        self.assertFalse(scheduler.is_predictive_analytics_enabled())
+        self.assertIsNone(scheduler.predictive_optimizer)
+        self.assertIsNone(scheduler._start_background_data_collection())
+
+    def test_background_data_collection(self):
+        """Data collection runs on a separate daemon thread and stores the collected data"""
+        scheduler = Scheduler(self.config)
+        scheduler.schedule[datetime(2024, 1, 1)] = ['W001', 'W002']
+        scheduler._synchronize_tracking_data()
+        thread = scheduler._start_background_data_collection()
+        self.assertIsNotNone(thread)
+        self.assertTrue(thread.daemon)
+        thread.join(timeout=30)
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(any(name.startswith('schedule_data_') for name in os.listdir(self.tmp_dir.name)))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
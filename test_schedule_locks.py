@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test suite for schedule concurrency control.
+Tests the reader-writer lock, striped cell edits and immutable snapshots.
+"""
+
+import os
+import sys
+import unittest
+import logging
+import threading
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from schedule_locks import ReadWriteLock, ScheduleLocks
+from incremental_updater import IncrementalUpdater
+from scheduler import Scheduler
+from event_bus import reset_event_bus
+from fake_scheduler import FakeScheduler, make_workers
+from exceptions import SchedulerError
+
+
+class TestScheduleLocks(unittest.TestCase):
+    """Test ScheduleLocks through IncrementalUpdater"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.start = datetime(2024, 1, 1)
+        self.scheduler = FakeScheduler(self.start, 60, make_workers(40),
+                                       max_consecutive_weekends=10, max_shifts_per_worker=30)
+        self.day = self.scheduler.day
+        self.updater = IncrementalUpdater(self.scheduler)
+        self.locks = self.updater.locks
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def _other_stripe(self, stripes, key, candidates):
+        """First candidate whose stripe differs from key's"""
+        used = hash(key) % len(stripes)
+        return next(c for c in candidates if hash(c) % len(stripes) != used)
+
+    def test_read_write_lock(self):
+        """Exclusive waits for shared holders; both sides are reentrant; no upgrades"""
+        lock = ReadWriteLock()
+        acquired = threading.Event()
+
+        def writer():
+            with lock.exclusive():
+                acquired.set()
+
+        with lock.shared():
+            with lock.shared():
+                thread = threading.Thread(target=writer)
+                thread.start()
+                self.assertFalse(acquired.wait(0.1))
+            with self.assertRaises(SchedulerError):
+                with lock.exclusive():
+                    pass
+        thread.join(2)
+        self.assertTrue(acquired.is_set())
+
+        with lock.exclusive():
+            with lock.shared():
+                with lock.exclusive():
+                    pass
+
+    def test_edits_on_other_dates_run_in_parallel(self):
+        """A held date blocks edits on that date only"""
+        busy_date = self.day(10)
+        free_date = self._other_stripe(self.locks._date_stripes, busy_date, [self.day(d) for d in range(20, 60)])
+        free_worker = self._other_stripe(self.locks._worker_stripes, 'W001', [f'W{i:03d}' for i in range(2, 41)])
+        holding, release = threading.Event(), threading.Event()
+
+        def hold_date():
+            with self.locks.edit([busy_date]) as scope:
+                scope.lock_workers(['W001'])
+                holding.set()
+                release.wait(2)
+
+        holder = threading.Thread(target=hold_date)
+        holder.start()
+        holding.wait(2)
+
+        self.assertTrue(self.updater.assign_worker_to_shift(free_worker, free_date, 0).success)
+
+        blocked = threading.Thread(target=self.updater.assign_worker_to_shift, args=(free_worker, busy_date, 1))
+        blocked.start()
+        blocked.join(0.1)
+        self.assertTrue(blocked.is_alive())
+        release.set()
+        blocked.join(2)
+        holder.join(2)
+        self.assertEqual(self.scheduler.schedule[busy_date][1], free_worker)
+
+    def test_concurrent_edits_stay_consistent(self):
+        """Many threads editing at once leave schedule and tracking in sync"""
+        def edit(thread_index):
+            for i in range(15):
+                day = self.day((thread_index * 15 + i) % 60)
+                worker_id = f'W{(thread_index * 7 + i) % 40 + 1:03d}'
+                self.updater.assign_worker_to_shift(worker_id, day, i % 2, force=True)
+                if i % 3 == 0:
+                    self.updater.unassign_worker_from_shift(day, i % 2)
+
+        threads = [threading.Thread(target=edit, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        from_schedule = {}
+        for day, row in self.scheduler.schedule.items():
+            for worker_id in row:
+                if worker_id is not None:
+                    from_schedule.setdefault(worker_id, set()).add(day)
+        tracked = {w: dates for w, dates in self.scheduler.worker_assignments.items() if dates}
+        self.assertEqual(tracked, from_schedule)
+
+    def test_concurrent_checked_edits_skip_global_sync(self):
+        """Constraint-checked edits on a real scheduler never run the schedule-wide sync check"""
+        scheduler = Scheduler({
+            'start_date': self.start, 'end_date': self.day(59), 'num_shifts': 2,
+            'gap_between_shifts': 1, 'max_consecutive_weekends': 10,
+            'workers_data': [{'id': f'W{i:03d}', 'work_percentage': 100} for i in range(1, 41)],
+        })
+        updater = IncrementalUpdater(scheduler)
+        sync_calls = []
+        scheduler._ensure_data_synchronization = lambda: sync_calls.append(threading.get_ident()) or True
+        errors = []
+
+        def edit(thread_index):
+            try:
+                for i in range(10):
+                    day = self.day((thread_index * 10 + i) % 60)
+                    updater.assign_worker_to_shift(f'W{thread_index * 5 + i % 5 + 1:03d}', day, i % 2)
+                    if i % 3 == 0:
+                        updater.unassign_worker_from_shift(day, i % 2)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=edit, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sync_calls, [])
+        from_schedule = {}
+        for day, row in scheduler.schedule.items():
+            for worker_id in row:
+                if worker_id is not None:
+                    from_schedule.setdefault(worker_id, set()).add(day)
+        self.assertTrue(from_schedule)
+        self.assertEqual({w: d for w, d in scheduler.worker_assignments.items() if d}, from_schedule)
+
+    def test_snapshot_is_immutable_and_stable(self):
+        """Snapshots do not change with later edits and cannot be modified"""
+        self.updater.assign_worker_to_shift('W001', self.day(1), 0)
+        snapshot = self.locks.snapshot(self.scheduler, self.updater.versions.clock)
+        self.updater.assign_worker_to_shift('W002', self.day(1), 1)
+
+        self.assertEqual(snapshot.schedule[self.day(1)], ('W001', None))
+        self.assertEqual(snapshot.worker_assignments['W002'], frozenset())
+        self.assertLess(snapshot.version, self.updater.versions.clock)
+        with self.assertRaises(TypeError):
+            snapshot.schedule[self.day(2)] = ('W003', None)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
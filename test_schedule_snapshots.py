@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test suite for copy-on-write schedule snapshots.
+Tests immutability, structural sharing, undo/redo mirroring and
+statistics read from a snapshot while the schedule is edited.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from schedule_snapshots import SnapshotStore
+from schedule_locks import copy_snapshot
+from incremental_updater import IncrementalUpdater
+from change_tracker import ChangeTracker
+from statistics import StatisticsCalculator
+from event_bus import get_event_bus, reset_event_bus, EventType
+from fake_scheduler import FakeScheduler, make_workers
+
+
+class TestScheduleSnapshots(unittest.TestCase):
+    """Test SnapshotStore against full copies of the schedule"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.start = datetime(2024, 1, 1)
+        # Three months, so edits can be checked against untouched months
+        self.scheduler = FakeScheduler(self.start, 91, make_workers(6), num_shifts=3,
+                                       gap_between_shifts=0, max_consecutive_weekends=10,
+                                       max_shifts_per_worker=40)
+        self.day = self.scheduler.day
+        self.updater = IncrementalUpdater(self.scheduler)
+        self.store = SnapshotStore(self.scheduler, locks=self.updater.locks, versions=self.updater.versions)
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def _assert_matches_live(self, snapshot):
+        expected = copy_snapshot(self.scheduler)
+        self.assertEqual(dict(snapshot.schedule), dict(expected.schedule))
+        self.assertEqual(list(snapshot.schedule), list(self.scheduler.schedule))
+        self.assertEqual(dict(snapshot.worker_assignments), dict(expected.worker_assignments))
+
+    def test_snapshot_is_frozen(self):
+        """A snapshot keeps its contents while the schedule is edited"""
+        self.updater.assign_worker_to_shift('W001', self.day(0), 0)
+        before = self.store.snapshot()
+        self.updater.assign_worker_to_shift('W002', self.day(0), 1)
+        self.updater.assign_worker_to_shift('W003', self.day(40), 2)
+        self.updater.swap_workers(self.day(0), 0, self.day(40), 2)
+
+        self.assertEqual(before.schedule[self.day(0)], ('W001', None, None))
+        self.assertEqual(before.schedule[self.day(40)], (None, None, None))
+        self.assertEqual(before.worker_assignments['W001'], frozenset({self.day(0)}))
+        self.assertEqual(len(before.schedule), 91)
+        with self.assertRaises(TypeError):
+            before.schedule[self.day(0)][0] = 'W006'
+        with self.assertRaises(TypeError):
+            before.worker_assignments['W001'] = frozenset()
+
+        after = self.store.snapshot()
+        self.assertGreater(after.version, before.version)
+        self._assert_matches_live(after)
+
+    def test_snapshots_share_unchanged_months(self):
+        """Taking a snapshot copies nothing; an edit copies only its month"""
+        first = self.store.snapshot()
+        second = self.store.snapshot()
+        self.assertIs(first.schedule._chunks, second.schedule._chunks)
+
+        copies = self.store.chunk_copies
+        self.updater.assign_worker_to_shift('W004', self.day(35), 1)
+        self.updater.assign_worker_to_shift('W005', self.day(36), 1)
+        third = self.store.snapshot()
+
+        self.assertEqual(self.store.chunk_copies, copies + 1)
+        self.assertIs(third.schedule._chunks[(2024, 1)], first.schedule._chunks[(2024, 1)])
+        self.assertIs(third.schedule._chunks[(2024, 3)], first.schedule._chunks[(2024, 3)])
+        self.assertIsNot(third.schedule._chunks[(2024, 2)], first.schedule._chunks[(2024, 2)])
+        self.assertEqual(first.schedule[self.day(35)], (None, None, None))
+        self._assert_matches_live(third)
+
+    def test_undo_redo_bulk_and_regeneration(self):
+        """Undo/redo, transactions and new dates are mirrored; regeneration rebuilds"""
+        tracker = ChangeTracker(self.scheduler)
+        self.store.snapshot()
+        self.updater.assign_worker_to_shift('W001', self.day(2), 0)
+        self.updater.assign_worker_to_shift('W002', self.day(120), 1)
+        self.updater.bulk_update([
+            {'operation': 'assign', 'worker_id': 'W003', 'shift_date': self.day(7).isoformat(), 'post_index': 0},
+            {'operation': 'assign', 'worker_id': 'W003', 'shift_date': self.day(70).isoformat(), 'post_index': 1},
+        ])
+        self._assert_matches_live(self.store.snapshot())
+
+        self.assertIsNotNone(tracker.undo())
+        self._assert_matches_live(self.store.snapshot())
+        self.assertIsNotNone(tracker.redo())
+        self._assert_matches_live(self.store.snapshot())
+
+        self.scheduler.schedule[self.day(10)] = ['W006', None, None]
+        self.scheduler._update_tracking_data('W006', self.day(10), 0)
+        get_event_bus().emit(EventType.SCHEDULE_GENERATED)
+        self._assert_matches_live(self.store.snapshot())
+
+    def test_statistics_from_snapshot(self):
+        """Statistics read from a snapshot ignore edits made after it was taken"""
+        for offset, worker_id in ((0, 'W001'), (4, 'W001'), (5, 'W002')):
+            self.updater.assign_worker_to_shift(worker_id, self.day(offset), 0)
+        snapshot = self.store.snapshot()
+        self.updater.assign_worker_to_shift('W001', self.day(50), 1)
+        self.updater.unassign_worker_from_shift(self.day(5), 0)
+
+        stats = StatisticsCalculator(self.scheduler, snapshot=snapshot)
+        worker_stats = stats.gather_statistics()['workers']
+        self.assertEqual(worker_stats['W001']['total_shifts'], 2)
+        self.assertEqual(worker_stats['W001']['post_distribution'], {0: 2})
+        self.assertEqual(worker_stats['W001']['weekend_shifts'], 1)  # Friday 5 January
+        self.assertEqual(worker_stats['W002']['total_shifts'], 1)
+        self.assertEqual(stats.calculate_statistics()['workers']['W001']['total_shifts'], 2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test suite for versioned schedule synchronization.
+Tests version steps, catch-up deltas and snapshot fallback.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime
+from types import SimpleNamespace
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from event_bus import get_event_bus, reset_event_bus, EventType
+from schedule_sync import ScheduleSync
+
+
+class TestScheduleSync(unittest.TestCase):
+    """Test ScheduleSync against the global event bus"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.bus = get_event_bus()
+        self.day = datetime(2024, 1, 1)
+        self.scheduler = SimpleNamespace(schedule={self.day: ['W001', None]})
+        self.sync = ScheduleSync(self.scheduler, max_entries=3)
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def _assign(self, worker_id, post_index):
+        self.bus.emit(EventType.SHIFT_ASSIGNED, worker_id=worker_id,
+                      shift_date=self.day.isoformat(), post_index=post_index)
+
+    def test_delta_after_reconnect(self):
+        """A client receives exactly the diffs it missed"""
+        self._assign('W001', 0)
+        self.bus.emit(EventType.SHIFT_SWAPPED, worker1='W001', worker2='W002',
+                      shift_date1=self.day.isoformat(), post_index1=0,
+                      shift_date2=self.day.isoformat(), post_index2=1)
+
+        message = self.sync.get_sync_message(1, self.sync.epoch)
+        self.assertEqual(message['type'], 'delta')
+        self.assertEqual((message['from_version'], message['to_version']), (1, 2))
+        self.assertEqual(message['changes'], [[self.day.isoformat(), 0, 'W002'],
+                                              [self.day.isoformat(), 1, 'W001']])
+        self.assertEqual(self.sync.get_delta(2)['changes'], [])
+
+    def test_batch_is_one_version_step(self):
+        """A batched bulk update advances the version once"""
+        with self.bus.batch():
+            self._assign('W001', 0)
+            self._assign('W002', 1)
+        self.assertEqual(self.sync.version, 1)
+
+        step = self.sync.get_version_range([self.bus.last_seq])
+        self.assertEqual((step['from_version'], step['to_version']), (0, 1))
+        self.assertEqual(len(step['changes']), 2)
+
+    def test_snapshot_when_gap_too_large(self):
+        """Clients too far behind, or new clients, receive a snapshot"""
+        for n in range(5):
+            self._assign(f'W00{n}', 0)
+
+        message = self.sync.get_sync_message(0, self.sync.epoch)
+        self.assertEqual(message['type'], 'snapshot')
+        self.assertEqual(message['version'], 5)
+        self.assertEqual(message['schedule'], {self.day.isoformat(): ['W001', None]})
+        self.assertEqual(self.sync.get_sync_message(None)['type'], 'snapshot')
+        self.assertEqual(self.sync.get_sync_message(3, self.sync.epoch)['type'], 'delta')
+
+
+    def test_snapshot_when_epoch_differs(self):
+        """A version from another server process is never answered with a delta"""
+        self._assign('W001', 0)
+        self._assign('W002', 1)
+        step = self.sync.get_version_range([self.bus.last_seq])
+        self.assertEqual(step['epoch'], self.sync.epoch)
+
+        restarted = ScheduleSync(self.scheduler, max_entries=3)
+        self.assertNotEqual(restarted.epoch, self.sync.epoch)
+        message = restarted.get_sync_message(1, self.sync.epoch)
+        self.assertEqual(message['type'], 'snapshot')
+        self.assertEqual(message['epoch'], restarted.epoch)
+        self.assertEqual(self.sync.get_sync_message(1)['type'], 'snapshot')
+        self.assertEqual(self.sync.get_sync_message(1, self.sync.epoch)['type'], 'delta')
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test suite for the headless scheduler CLI.
+Tests config loading, output files and that the UI stack is never imported.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import logging
+from unittest import mock
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import scheduler_cli
+from exceptions import SchedulerError
+
+
+class TestSchedulerCLI(unittest.TestCase):
+    """Test the python -m scheduler_cli entry point"""
+
+    def setUp(self):
+        """Write a small JSON configuration to a temporary directory"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmp_dir.name, 'config.json')
+        self.output_dir = os.path.join(self.tmp_dir.name, 'out')
+        config = {
+            'start_date': '01-01-2024',
+            'end_date': '14-01-2024',
+            'num_shifts': 2,
+            'holidays': ['06-01-2024'],
+            'gap_between_shifts': 1,
+            'max_consecutive_weekends': 3,
+            'workers_data': [
+                {'id': f'W{i:03d}', 'work_percentage': 100, 'work_periods': '',
+                 'days_off': '', 'mandatory_days': '', 'incompatible_with': []}
+                for i in range(1, 7)
+            ],
+        }
+        with open(self.config_path, 'w') as f:
+            json.dump(config, f)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load_config_parses_dates(self):
+        """Dates in the JSON configuration are converted to datetimes"""
+        config = scheduler_cli.load_config(self.config_path)
+        self.assertEqual(config['start_date'].day, 1)
+        self.assertEqual(config['holidays'][0].day, 6)
+
+    def test_generates_schedule_and_stats(self):
+        """A fast run writes schedule.json and stats.json"""
+        exit_code = scheduler_cli.main([self.config_path, '-o', self.output_dir,
+                                        '--seed', '7', '--solver-mode', 'fast'])
+        self.assertEqual(exit_code, 0)
+
+        with open(os.path.join(self.output_dir, 'schedule.json')) as f:
+            schedule = json.load(f)
+        self.assertEqual(len(schedule), 14)
+        self.assertIn('01-01-2024', schedule)
+
+        with open(os.path.join(self.output_dir, 'stats.json')) as f:
+            stats = json.load(f)
+        self.assertEqual(stats['run']['seed'], 7)
+        self.assertEqual(len(stats['workers']), 6)
+
+    def test_pdf_output(self):
+        """PDF reports are written only when requested"""
+        exit_code = scheduler_cli.main([self.config_path, '-o', self.output_dir,
+                                        '--seed', '1', '--solver-mode', 'fast', '--pdf'])
+        self.assertEqual(exit_code, 0)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'summary.pdf')))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'schedule_2024_01.pdf')))
+
+    def test_restored_schedule_is_shared(self):
+        """A schedule from a worker process is loaded into the dict the scheduler's components hold"""
+        config = scheduler_cli.load_config(self.config_path)
+        schedule = {config['start_date']: ['W001', 'W002']}
+        scheduler = scheduler_cli._restore_scheduler(config, schedule)
+        self.assertIs(scheduler.schedule, scheduler.stats.schedule)
+        self.assertEqual(scheduler.schedule, schedule)
+        self.assertIn(config['start_date'], scheduler.worker_assignments['W001'])
+
+    def test_missing_config_returns_error(self):
+        """A missing configuration file is reported with a non-zero exit code"""
+        exit_code = scheduler_cli.main([os.path.join(self.tmp_dir.name, 'missing.json')])
+        self.assertEqual(exit_code, 1)
+
+    def test_predictive_flag(self):
+        """--predictive overrides the config file; without it predictive analytics default to off"""
+        with open(self.config_path) as f:
+            config = json.load(f)
+        config['enable_predictive_analytics'] = False
+        with open(self.config_path, 'w') as f:
+            json.dump(config, f)
+
+        seen = []
+
+        def capture(config, **kwargs):
+            seen.append(config['enable_predictive_analytics'])
+            raise SchedulerError('stop after reading the configuration')
+
+        with mock.patch.object(scheduler_cli, 'generate_best_schedule', side_effect=capture):
+            self.assertEqual(scheduler_cli.main([self.config_path, '--predictive']), 1)
+            self.assertEqual(scheduler_cli.main([self.config_path]), 1)
+            del config['enable_predictive_analytics']
+            with open(self.config_path, 'w') as f:
+                json.dump(config, f)
+            self.assertEqual(scheduler_cli.main([self.config_path]), 1)
+        self.assertEqual(seen, [True, False, False])
+
+    def test_does_not_import_ui_or_predictive_stack(self):
+        """Importing the CLI pulls in neither Kivy nor the predictive analytics stack"""
+        code = ("import sys, scheduler_cli; "
+                "print(sorted(m for m in ('kivy', 'pdf_exporter', 'predictive_analytics') if m in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        self.assertEqual(output.strip().splitlines()[-1], '[]')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
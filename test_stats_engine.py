@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test suite for the single-pass statistics engine.
+Tests distributions against per-worker recounts, caching per schedule
+version and the summary structure shared by the exporters.
+"""
+
+import os
+import sys
+import random
+import tempfile
+import unittest
+import logging
+from datetime import datetime, timedelta
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stats_engine import StatisticsEngine, compute_statistics, get_statistics_engine
+from scheduler import Scheduler
+from schedule_snapshots import SnapshotStore
+from schedule_locks import copy_snapshot
+from incremental_updater import IncrementalUpdater
+from event_bus import reset_event_bus
+from fake_scheduler import FakeScheduler, make_workers
+
+
+class TestStatsEngine(unittest.TestCase):
+    """Test compute_statistics and StatisticsEngine"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.start = datetime(2024, 1, 1)
+        self.holidays = [datetime(2024, 1, 10), datetime(2024, 2, 14)]
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def _random_schedule(self, days=70, posts=3, workers=8, seed=7):
+        rng = random.Random(seed)
+        ids = [f'W{i:03d}' for i in range(1, workers + 1)]
+        schedule = {}
+        for d in range(days):
+            row = rng.sample(ids, posts)
+            row[rng.randrange(posts)] = None
+            schedule[self.start + timedelta(days=d)] = row
+        return schedule
+
+    def test_matches_per_worker_recount(self):
+        """One pass gives the same distributions as rescanning per worker"""
+        schedule = self._random_schedule()
+        statistics = compute_statistics(schedule, self.holidays, worker_ids=['IDLE'])
+
+        for worker_id, stats in statistics.workers.items():
+            dates = sorted(d for d, row in schedule.items() if worker_id in row)
+            self.assertEqual(stats.days, len(dates))
+            self.assertEqual(stats.post_counts,
+                             {p: n for p in range(3)
+                              if (n := sum(1 for row in schedule.values() if row[p] == worker_id))})
+            monthly = {}
+            for d in dates:
+                monthly[f"{d.year}-{d.month:02d}"] = monthly.get(f"{d.year}-{d.month:02d}", 0) + 1
+            self.assertEqual(stats.monthly, monthly)
+            self.assertEqual(sum(stats.weekdays.values()), len(dates))
+            self.assertEqual(stats.special_days,
+                             [d for d in dates if d.weekday() >= 4 or d in self.holidays
+                              or d + timedelta(days=1) in self.holidays])
+            gaps = [(b - a).days for a, b in zip(dates, dates[1:])]
+            expected = ({'min_gap': min(gaps), 'max_gap': max(gaps), 'avg_gap': sum(gaps) / len(gaps)}
+                        if gaps else {'min_gap': None, 'max_gap': None, 'avg_gap': None})
+            self.assertEqual(stats.gaps, expected)
+
+        self.assertEqual(statistics.worker('IDLE').days, 0)
+        self.assertEqual(statistics.total_slots, 210)
+        self.assertEqual(statistics.filled_slots, 140)
+
+    def test_cached_per_schedule_version(self):
+        """Snapshots of an unchanged schedule share one computation"""
+        scheduler = FakeScheduler(self.start, 10, make_workers(3), gap_between_shifts=0,
+                                  max_consecutive_weekends=10)
+        updater = IncrementalUpdater(scheduler)
+        store = SnapshotStore(scheduler, locks=updater.locks, versions=updater.versions)
+        engine = StatisticsEngine()
+
+        updater.assign_worker_to_shift('W001', self.start, 0)
+        first = engine.compute(store.snapshot())
+        self.assertIs(engine.compute(store.snapshot()), first)
+        self.assertEqual((engine.hits, engine.misses), (1, 1))
+
+        updater.assign_worker_to_shift('W002', self.start, 1)
+        second = engine.compute(store.snapshot())
+        self.assertIsNot(second, first)
+        self.assertEqual(second.worker('W002').days, 1)
+        self.assertEqual(first.worker('W002').days, 0)
+
+        # Copied snapshots are cached per snapshot object only
+        copied = copy_snapshot(scheduler)
+        self.assertIs(engine.compute(copied), engine.compute(copied))
+        self.assertIsNot(engine.compute(copy_snapshot(scheduler)), engine.compute(copied))
+
+    def test_report_run_shares_one_snapshot(self):
+        """Worker reports for the whole staff are computed from a single snapshot"""
+        scheduler = Scheduler({
+            'start_date': self.start, 'end_date': self.start + timedelta(days=13), 'num_shifts': 2,
+            'gap_between_shifts': 1, 'max_consecutive_weekends': 3,
+            'workers_data': [{'id': f'W{i:03d}', 'work_percentage': 100} for i in range(1, 11)],
+        })
+        for day in range(14):
+            date = self.start + timedelta(days=day)
+            scheduler.schedule[date] = [f'W{day % 10 + 1:03d}', f'W{(day + 5) % 10 + 1:03d}']
+            for post, worker_id in enumerate(scheduler.schedule[date]):
+                scheduler._update_tracking_data(worker_id, date, post)
+
+        snapshots = []
+        take_snapshot = scheduler.get_schedule_snapshot
+        scheduler.get_schedule_snapshot = lambda: snapshots.append(1) or take_snapshot()
+        engine = get_statistics_engine()
+        misses = engine.misses
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(scheduler.generate_all_worker_reports(directory), 10)
+            with open(os.path.join(directory, 'worker_W003_report.txt'), encoding='utf-8') as f:
+                self.assertIn('Total Shifts: 3', f.read())
+
+        self.assertEqual(len(snapshots), 1)
+        self.assertEqual(engine.misses - misses, 1)
+
+        # Outside a run every report takes its own snapshot of the live schedule
+        scheduler.stats.generate_worker_report('W001')
+        self.assertEqual(len(snapshots), 2)
+
+    def test_export_summary(self):
+        """The exporter summary lists shifts, padded post counts and totals"""
+        friday = datetime(2024, 1, 5)
+        schedule = {
+            friday: ['W001', 'W002'],
+            friday + timedelta(days=3): [None, 'W001'],
+            datetime(2024, 1, 10): ['W002', None],
+        }
+        summary = compute_statistics(schedule, self.holidays).export_summary(
+            2, self.start, datetime(2024, 1, 31), worker_ids=['W001', 'W002', 'W003'])
+
+        self.assertEqual(list(summary['workers']), ['W001', 'W002', 'W003'])
+        self.assertEqual(summary['workers']['W001'], {
+            'total': 2, 'weekends': 1, 'holidays': 0, 'last_post': 1,
+            'weekday_counts': {0: 1, 1: 0, 2: 0, 3: 0, 4: 1, 5: 0, 6: 0},
+            'post_counts': {0: 1, 1: 1}
+        })
+        self.assertEqual(summary['workers']['W002']['holidays'], 1)
+        self.assertEqual(summary['workers']['W003']['post_counts'], {0: 0, 1: 0})
+        self.assertEqual([s['post'] for s in summary['worker_shifts']['W001']], [1, 2])
+        self.assertTrue(summary['worker_shifts']['W002'][1]['is_holiday'])
+        self.assertEqual((summary['total_shifts'], summary['weekend_shifts'], summary['last_post_shifts']),
+                         (6, 2, 2))
+        self.assertEqual(summary['posts'], {0: 2, 1: 2})
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
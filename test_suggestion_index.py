@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test suite for ranked worker suggestions.
+Tests eligibility caching, event-driven invalidation, ranking and month prefetch.
+"""
+
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime, timedelta
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from live_validator import LiveValidator, ValidationResult, ValidationSeverity
+from incremental_updater import IncrementalUpdater
+from event_bus import reset_event_bus
+from fake_scheduler import FakeScheduler, make_workers
+
+
+class TestSuggestionIndex(unittest.TestCase):
+    """Test SuggestionIndex through LiveValidator"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.start = datetime(2024, 1, 1)  # Monday
+        workers = make_workers(20)
+        workers[0]['incompatible_with'] = ['W002']
+        workers[1]['incompatible_with'] = ['W001']
+        workers[2]['days_off'] = '01-01-2024 - 07-01-2024'
+        workers[3]['work_percentage'] = 50
+
+        self.scheduler = FakeScheduler(self.start, 31, workers)
+        self.validator = LiveValidator(self.scheduler)
+        self.index = self.validator.suggestion_index
+        self.updater = IncrementalUpdater(self.scheduler)
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def test_eligibility_follows_events(self):
+        """Assignments update eligibility on the date and on the worker's nearby dates"""
+        day = self.start + timedelta(days=2)
+        self.assertNotIn('W003', self.index.get_eligible(day))
+        self.assertIn('W002', self.index.get_eligible(day))
+        self.assertIn('W001', self.index.get_eligible(day + timedelta(days=1)))
+
+        self.updater.assign_worker_to_shift('W001', day, 0, force=True)
+        self.assertNotIn('W002', self.index.get_eligible(day))
+        self.assertNotIn('W001', self.index.get_eligible(day))
+        self.assertNotIn('W001', self.index.get_eligible(day + timedelta(days=1)))
+
+        self.updater.unassign_worker_from_shift(day, 0)
+        self.assertIn('W002', self.index.get_eligible(day))
+        self.assertIn('W001', self.index.get_eligible(day + timedelta(days=1)))
+
+    def test_repeated_queries_use_cache(self):
+        """Only workers touched by a change are rechecked on an indexed date"""
+        day = self.start + timedelta(days=10)
+        self.validator.get_suggestions_for_date(day, 0)
+        checks = self.index.stats['checks']
+        self.validator.get_suggestions_for_date(day, 1)
+        self.assertEqual(self.index.stats['checks'], checks)
+
+        self.updater.assign_worker_to_shift('W010', self.start + timedelta(days=20), 0, force=True)
+        self.validator.get_suggestions_for_date(day, 0)
+        self.assertEqual(self.index.stats['checks'], checks + 1)
+
+    def test_ranking(self):
+        """Suggestions are ranked best first and limited"""
+        for offset, worker_id in enumerate(['W005', 'W006', 'W007', 'W008']):
+            self.updater.assign_worker_to_shift(worker_id, self.start + timedelta(days=offset * 3), 0, force=True)
+
+        suggestions = self.validator.get_suggestions_for_date(self.start + timedelta(days=20), 0, limit=3)
+        self.assertEqual(len(suggestions), 3)
+        self.assertTrue(suggestions[0].startswith('W001: No current assignments'))
+        self.assertFalse(any(s.startswith(('W004', 'W005')) for s in suggestions))
+
+    def test_warning_only_candidates_ranked_lower(self):
+        """A check failing with a warning keeps the worker, at half priority; an error drops it"""
+        original = self.validator._check_gap_constraints
+
+        def gap_check(worker_id, shift_date):
+            if worker_id == 'W001':
+                return ValidationResult(False, ValidationSeverity.WARNING, "Short gap", "gap")
+            if worker_id == 'W002':
+                return ValidationResult(False, ValidationSeverity.ERROR, "Gap too short", "gap")
+            return original(worker_id, shift_date)
+
+        self.validator._check_gap_constraints = gap_check
+        day = self.start + timedelta(days=10)
+        self.assertIn('W001', self.index.get_eligible(day))
+        self.assertNotIn('W002', self.index.get_eligible(day))
+
+        suggestions = self.validator.get_suggestions_for_date(day, 0, limit=20)
+        self.assertEqual(suggestions[-1], 'W001: Available (with warnings): Short gap')
+        self.assertTrue(suggestions[0].endswith('No current assignments'))
+
+    def test_prefetch_month(self):
+        """Prefetch covers every empty cell of the range with one ranking per date"""
+        self.updater.assign_worker_to_shift('W010', self.start + timedelta(days=4), 1, force=True)
+        end = self.start + timedelta(days=30)
+        prefetched = self.validator.prefetch_suggestions(self.start, end)
+
+        self.assertEqual(len(prefetched), 31 * 2 - 1)
+        self.assertNotIn((self.start + timedelta(days=4), 1), prefetched)
+        self.assertEqual(self.index.stats['queries'], 31)
+        self.assertEqual(prefetched[(self.start, 0)],
+                         self.validator.get_suggestions_for_date(self.start, 0))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test suite for warm-starting generation from a previous period's schedule.
+Tests boundary constraints and seeded tracking data across the period boundary.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+import logging
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scheduler import Scheduler
+
+
+class TestWarmStart(unittest.TestCase):
+    """Test prior schedule loading and boundary constraints"""
+
+    def setUp(self):
+        """Set up a two-week period preceded by a one-week prior schedule"""
+        self.start_date = datetime(2024, 1, 1)  # Monday
+        self.config = {
+            'start_date': self.start_date,
+            'end_date': datetime(2024, 1, 14),
+            'num_shifts': 2,
+            'variable_shifts': [],
+            'workers_data': [
+                {
+                    'id': f'W{i:03d}',
+                    'name': f'Worker {i}',
+                    'work_percentage': 100,
+                    'work_periods': '',
+                    'days_off': '',
+                    'mandatory_days': '',
+                    'incompatible_with': []
+                }
+                for i in range(1, 7)
+            ],
+            'holidays': [],
+            'gap_between_shifts': 1,
+            'max_consecutive_weekends': 3,
+        }
+        # Prior week: 25-12-2023 (Monday) to 31-12-2023 (Sunday)
+        self.prior_schedule = {}
+        rotation = ['W001', 'W002', 'W003', 'W004', 'W005', 'W006']
+        for offset in range(7):
+            date = self.start_date - timedelta(days=7 - offset)
+            self.prior_schedule[date] = [rotation[(2 * offset) % 6], rotation[(2 * offset + 1) % 6]]
+
+    def test_prior_tail_seeds_tracking(self):
+        """last_assignment_date and counters are seeded from the prior schedule"""
+        scheduler = Scheduler(dict(self.config, prior_schedule=self.prior_schedule))
+
+        last_day_workers = self.prior_schedule[self.start_date - timedelta(days=1)]
+        for worker_id in last_day_workers:
+            self.assertEqual(scheduler.last_assignment_date[worker_id], self.start_date - timedelta(days=1))
+            self.assertEqual(scheduler.consecutive_shifts[worker_id], 1)
+        self.assertEqual(sum(sum(c.values()) for c in scheduler.prior_post_counts.values()), 14)
+
+    def test_gap_constraint_across_boundary(self):
+        """A worker who worked the last prior day cannot work the first new day"""
+        scheduler = Scheduler(dict(self.config, prior_schedule=self.prior_schedule))
+        worker_id = self.prior_schedule[self.start_date - timedelta(days=1)][0]
+
+        self.assertFalse(scheduler.constraint_checker._check_gap_constraint(worker_id, self.start_date))
+
+        self.assertTrue(scheduler.generate_schedule(max_improvement_loops=2))
+        self.assertNotIn(worker_id, scheduler.schedule[self.start_date])
+
+    def test_load_from_saved_json(self):
+        """A schedule.json saved by the app can be used as prior schedule"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'schedule.json')
+            with open(path, 'w') as f:
+                json.dump({d.strftime('%d-%m-%Y'): w for d, w in self.prior_schedule.items()}, f)
+
+            scheduler = Scheduler(self.config)
+            self.assertEqual(scheduler.load_prior_schedule(path), 14)
+            self.assertEqual(len(scheduler.prior_schedule), 7)
+
+    def test_prior_schedule_as_template(self):
+        """With the template option the prior structure seeds the initial assignment"""
+        config = dict(self.config, prior_schedule=self.prior_schedule, prior_schedule_as_template=True)
+        scheduler = Scheduler(config)
+
+        self.assertTrue(scheduler.generate_schedule(max_improvement_loops=2))
+        matches = sum(
+            1 for date, workers in scheduler.schedule.items()
+            for post, worker_id in enumerate(workers)
+            if worker_id is not None and self.prior_schedule.get(date - timedelta(weeks=1), [None] * 2)[post] == worker_id
+        )
+        self.assertGreater(matches, 0)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test suite for WebSocket broadcasting.
+Tests thread-safe hand-off, serialize-once fan-out and slow client handling.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import unittest
+import logging
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import websocket_handler
+from websocket_handler import WebSocketHandler
+from event_bus import ScheduleEvent, EventType, reset_event_bus
+
+
+class FakeWebSocket:
+    """Collects sent payloads; optionally blocks until released"""
+
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self._release = asyncio.Event()
+        if not blocked:
+            self._release.set()
+
+    async def send(self, payload):
+        await self._release.wait()
+        self.sent.append(payload)
+
+    async def close(self, code=1000, reason=''):
+        self.closed_with = code
+
+
+class TestWebSocketBroadcast(unittest.TestCase):
+    """Test WebSocketHandler broadcasting without a network server"""
+
+    def setUp(self):
+        reset_event_bus()
+        self.handler = WebSocketHandler(scheduler=None)
+
+    def tearDown(self):
+        reset_event_bus()
+
+    def test_broadcast_from_other_thread(self):
+        """Events published off the loop thread reach every client with one payload"""
+        async def scenario():
+            self.handler.loop = asyncio.get_running_loop()
+            sockets = [FakeWebSocket() for _ in range(50)]
+            for i, ws in enumerate(sockets):
+                await self.handler._register_user(f'user{i}', ws)
+
+            event = ScheduleEvent(EventType.SHIFT_ASSIGNED, data={'worker_id': 'W001'})
+            thread = threading.Thread(target=self.handler._broadcast_event, args=(event,))
+            thread.start()
+            thread.join()
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if all(len(ws.sent) == 1 for ws in sockets):
+                    break
+            return sockets
+
+        sockets = asyncio.run(scenario())
+        payloads = {ws.sent[0] for ws in sockets}
+        self.assertEqual(len(payloads), 1)
+        self.assertEqual(json.loads(payloads.pop())['event']['data']['worker_id'], 'W001')
+        self.assertEqual(self.handler.broadcast_stats['broadcasts'], 1)
+
+    def test_slow_client_resynced_then_disconnected(self):
+        """A client whose queue overflows is resynced, then disconnected"""
+        async def scenario():
+            self.handler.loop = asyncio.get_running_loop()
+            fast, slow = FakeWebSocket(), FakeWebSocket(blocked=True)
+            await self.handler._register_user('fast', fast)
+            await self.handler._register_user('slow', slow)
+
+            for n in range((websocket_handler.CLIENT_SEND_QUEUE_SIZE + 1) * 2):
+                self.handler._fan_out({'n': n}, {'json': json.dumps({'n': n})})
+                await asyncio.sleep(0)
+            self.assertEqual(self.handler.broadcast_stats['resyncs'], 2)
+            self.assertIsNone(slow.closed_with)
+
+            for n in range((websocket_handler.CLIENT_SEND_QUEUE_SIZE + 1) * 2):
+                self.handler._fan_out({'n': n}, {'json': json.dumps({'n': n})})
+            await asyncio.sleep(0.01)
+            return fast, slow
+
+        fast, slow = asyncio.run(scenario())
+        self.assertEqual(slow.closed_with, 1013)
+        self.assertEqual(self.handler.broadcast_stats['disconnects'], 1)
+        self.assertGreater(len(fast.sent), websocket_handler.CLIENT_SEND_QUEUE_SIZE)
+
+    def test_replies_queued_behind_broadcasts(self):
+        """Direct replies go through the client's queue, after the broadcasts already in it"""
+        async def scenario():
+            self.handler.loop = asyncio.get_running_loop()
+            ws = FakeWebSocket(blocked=True)
+            await self.handler._register_user('user', ws)
+
+            self.handler._fan_out({'n': 1}, {'json': json.dumps({'n': 1})})
+            await self.handler._send_message(ws, {'type': 'pong'})
+            self.assertEqual(ws.sent, [])
+            ws._release.set()
+            await asyncio.sleep(0.01)
+            return ws
+
+        ws = asyncio.run(scenario())
+        self.assertEqual([json.loads(p) for p in ws.sent], [{'n': 1}, {'type': 'pong'}])
+
+    def test_no_loop_counts_drop(self):
+        """Broadcasting before the server loop exists is counted, not raised"""
+        self.handler.connected_users['u'] = object()
+        self.handler._broadcast_event(ScheduleEvent(EventType.SHIFT_ASSIGNED))
+        self.assertEqual(self.handler.broadcast_stats['dropped_no_loop'], 1)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
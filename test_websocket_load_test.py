@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test suite for the WebSocket load test harness.
+Tests operation mix parsing, response routing and a short run against a local server.
+"""
+
+import os
+import sys
+import json
+import random
+import socket
+import asyncio
+import unittest
+import logging
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from websocket_load_test import LoadTestConfig, SimulatedClient, parse_mix, run_load_test, format_report
+from latency_metrics import LatencyMetrics
+from exceptions import SchedulerError
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+class _ScriptedWebSocket:
+    """Client connection whose incoming messages are queued by the test"""
+
+    def __init__(self):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+
+    async def send(self, raw):
+        self.sent.append(json.loads(raw))
+
+    def reply(self, request_id, **fields):
+        self.incoming.put_nowait(json.dumps(dict(fields, request_id=request_id)))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raw = await self.incoming.get()
+        if raw is None:
+            raise StopAsyncIteration
+        return raw
+
+
+class TestWebSocketLoadTest(unittest.TestCase):
+    """Test the load test harness"""
+
+    def test_parse_mix(self):
+        """Mixes parse into weights and reject unknown operations"""
+        self.assertEqual(parse_mix('assign=6, swap=3,validate'), {'assign': 6.0, 'swap': 3.0, 'validate': 1.0})
+        for bad in ('teleport=1', 'assign=x', 'assign=0', ''):
+            with self.assertRaises(SchedulerError):
+                parse_mix(bad)
+
+    def test_late_response_is_dropped(self):
+        """A reply arriving after its request timed out does not complete the next request"""
+        async def scenario():
+            config = LoadTestConfig(request_timeout=0.05)
+            schedule = {'workers': ['W001'], 'dates': ['2024-01-01'], 'num_shifts': 1}
+            client = SimulatedClient(0, config, schedule, LatencyMetrics(), random.Random(0))
+            websocket = client.websocket = _ScriptedWebSocket()
+            reader = asyncio.get_running_loop().create_task(client._read())
+
+            await client.request('validate')  # Never answered in time
+            self.assertEqual(client.timeouts, 1)
+
+            second = asyncio.get_running_loop().create_task(client.request('validate'))
+            await asyncio.sleep(0)
+            websocket.reply(1, type='validation_response', result={'success': True})
+            websocket.reply(2, type='error', message='Validation error')
+            await second
+
+            self.assertEqual([m['request_id'] for m in websocket.sent], [1, 2])
+            self.assertEqual((client.timeouts, client.errors, client.completed), (1, 1, {}))
+            self.assertEqual(client._pending, {})
+            websocket.incoming.put_nowait(None)
+            await reader
+
+        asyncio.run(scenario())
+
+    def test_short_run(self):
+        """A short run reports every operation and delivers every broadcast"""
+        config = LoadTestConfig(clients=3, duration=1.0, mix={'assign': 3, 'unassign': 1, 'validate': 1},
+                                think_time=0.01, port=_free_port(), workers=6, days=10, seed=7,
+                                drain_time=0.5)
+        report = run_load_test(config)
+
+        operations, broadcasts = report['operations'], report['broadcasts']
+        self.assertGreater(operations['succeeded'], 0)
+        self.assertEqual(operations['errors'] + operations['timeouts'], 0)
+        self.assertEqual(set(operations['by_type']), {'assign', 'unassign', 'validate'})
+        self.assertGreater(broadcasts['change_events'], 0)
+        self.assertEqual(broadcasts['received'], broadcasts['expected_deliveries'])
+        self.assertEqual(broadcasts['dropped'], 0)
+        self.assertEqual(broadcasts['latency_ms']['count'], broadcasts['received'])
+        self.assertGreater(report['server']['rss_end_bytes'], 0)
+        self.assertIn('3 clients', format_report(report))
+
+    def test_port_in_use(self):
+        """A server that cannot bind its port fails the run with SchedulerError"""
+        with socket.socket() as sock:
+            sock.bind(('localhost', 0))
+            sock.listen()
+            config = LoadTestConfig(clients=1, duration=0.1, port=sock.getsockname()[1], startup_timeout=30)
+            with self.assertRaises(SchedulerError):
+                run_load_test(config)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test suite for the compact wire encoding.
+Tests day ordinals, worker dictionary indices, compression and mixed-encoding broadcasts.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+import logging
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wire_codec import CompactCodec, EMPTY_CELL, ENCODING_COMPACT
+from websocket_handler import WebSocketHandler
+from event_bus import reset_event_bus, ScheduleEvent, EventType
+
+
+class FakeWebSocket:
+    """Collects sent payloads"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, payload):
+        self.sent.append(payload)
+
+
+class TestCompactCodec(unittest.TestCase):
+    """Test CompactCodec encoding"""
+
+    def setUp(self):
+        self.start = datetime(2024, 1, 1)
+        self.codec = CompactCodec(self.start, ['W001', 'W002'])
+
+    def test_snapshot_encoding(self):
+        """Snapshots use day ordinals and worker indices"""
+        schedule = {
+            (self.start + timedelta(days=d)).isoformat(): ['W001', 'W002', None]
+            for d in range(60)
+        }
+        message = {'type': 'snapshot', 'version': 7, 'schedule': schedule}
+        payload = self.codec.encode(message)
+
+        self.assertIsInstance(payload, bytes)
+        self.assertLess(len(payload), len(json.dumps(message)) / 5)
+        decoded = CompactCodec.decode(payload)
+        self.assertEqual(decoded['v'], 7)
+        self.assertEqual(decoded['g'][3], [3, [0, 1, EMPTY_CELL]])
+
+    def test_new_worker_announced(self):
+        """Workers missing from the dictionary are added and announced"""
+        message = {'type': 'delta', 'from_version': 1, 'to_version': 2,
+                   'changes': [['2024-01-05T00:00:00', 1, 'W009'], ['2024-01-05', 0, None]]}
+        decoded = CompactCodec.decode(self.codec.encode(message))
+
+        self.assertEqual(decoded['c'], [[4, 1, 2], [4, 0, EMPTY_CELL]])
+        self.assertEqual(decoded['w'], [[2, 'W009']])
+        self.assertEqual(self.codec.get_dictionary()['workers'], ['W001', 'W002', 'W009'])
+        self.assertNotIn('w', CompactCodec.decode(self.codec.encode(message)))
+
+    def test_dictionary_resent_to_late_clients(self):
+        """Snapshots and resync requests carry the whole dictionary, including workers announced earlier"""
+        # A broadcast announces W009 before the late client joins
+        self.codec.encode({'type': 'delta', 'from_version': 1, 'to_version': 2,
+                           'changes': [['2024-01-02', 0, 'W009']]})
+
+        snapshot = CompactCodec.decode(self.codec.encode(
+            {'type': 'snapshot', 'version': 2, 'schedule': {'2024-01-02': ['W009', 'W010']}}))
+        self.assertEqual(snapshot['d']['workers'], ['W001', 'W002', 'W009', 'W010'])
+        self.assertEqual(snapshot['g'], [[1, [2, 3]]])
+        self.assertNotIn('w', snapshot)
+
+        resync = CompactCodec.decode(self.codec.encode({'type': 'resync_required', 'version': 2}))
+        self.assertEqual(resync['dictionary'], self.codec.get_dictionary())
+
+    def test_mixed_encoding_broadcast(self):
+        """JSON and compact clients each receive their own encoding of a broadcast"""
+        reset_event_bus()
+        scheduler = SimpleNamespace(start_date=self.start, workers_data=[{'id': 'W001'}], schedule={})
+        handler = WebSocketHandler(scheduler)
+
+        async def scenario():
+            handler.loop = asyncio.get_running_loop()
+            plain, compact = FakeWebSocket(), FakeWebSocket()
+            await handler._register_user('plain', plain)
+            await handler._register_user('compact', compact)
+            handler.connected_users['compact'].encoding = ENCODING_COMPACT
+
+            handler._broadcast_event(ScheduleEvent(EventType.CONSTRAINT_VIOLATION, data={'worker_id': 'W001'}))
+            await asyncio.sleep(0.05)
+            return plain, compact
+
+        plain, compact = asyncio.run(scenario())
+        reset_event_bus()
+        self.assertEqual(json.loads(plain.sent[0])['event']['data']['worker_id'], 'W001')
+        decoded = CompactCodec.decode(compact.sent[0])
+        self.assertEqual((decoded['t'], decoded['e']), ('e', 'constraint_violation'))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    unittest.main(verbosity=2)
@@ -1,10 +1,15 @@
 # Imports
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import calendar
 import logging
-import requests
+import threading
+import time
+from typing import Optional
 from zoneinfo import ZoneInfo
 
+DEFAULT_TIMEZONE = 'Europe/Madrid'
+WORLD_TIME_API_URL = 'http://worldtimeapi.org/api/timezone/Europe/Madrid'
+
 def numeric_sort_key(item):
     """
     Attempts to convert the first element of a tuple (the key) to an integer
@@ -16,36 +21,149 @@ def numeric_sort_key(item):
     except (ValueError, TypeError):
         return (1, item[0]) # (1, original_string) - sorts non-numbers after numbers
 
-class DateTimeUtils:
-    """Date and time utility functions"""
+class ClockProvider:
+    """Clock returning the local time of a timezone from the system clock (no network)"""
     
-    # Methods
-    def __init__(self):
-        """Initialize the date/time utilities"""
-        logging.info("DateTimeUtils initialized")
+    def __init__(self, timezone_name: str = DEFAULT_TIMEZONE):
+        """
+        Initialize the clock
         
-    def get_spain_time(self):
-        """Get current time in Spain timezone with fallback options"""
+        Args:
+            timezone_name: IANA timezone the returned (naive) times are expressed in
+        """
+        self.timezone_name = timezone_name
+        try:
+            self._tz = ZoneInfo(timezone_name)
+        except Exception as e:
+            logging.error(f"Unknown timezone '{timezone_name}', falling back to UTC: {str(e)}")
+            self._tz = timezone.utc
+    
+    def now(self) -> datetime:
+        """Get the current time in the clock's timezone as a naive datetime"""
+        return datetime.now(self._tz).replace(tzinfo=None)
+
+class FixedClock(ClockProvider):
+    """Clock frozen at a given time, for tests and reproducible runs"""
+    
+    def __init__(self, fixed_time: datetime):
+        """
+        Initialize the clock
+        
+        Args:
+            fixed_time: Time returned by now()
+        """
+        self.timezone_name = None
+        self.fixed_time = fixed_time
+    
+    def now(self) -> datetime:
+        return self.fixed_time
+    
+    def advance(self, delta: timedelta) -> None:
+        """Move the clock forward by delta"""
+        self.fixed_time += delta
+
+class RemoteSyncClock(ClockProvider):
+    """
+    Local clock corrected by an offset obtained from a remote time API.
+    
+    The remote request runs on a background thread and its result is cached,
+    so now() never waits on the network. Until a sync succeeds the clock
+    behaves exactly like ClockProvider.
+    """
+    
+    def __init__(self, timezone_name: str = DEFAULT_TIMEZONE, url: str = WORLD_TIME_API_URL,
+                 timeout: float = 5.0, refresh_interval: float = 3600.0):
+        """
+        Initialize the clock
+        
+        Args:
+            timezone_name: IANA timezone the returned (naive) times are expressed in
+            url: Time API endpoint returning JSON with an ISO 'datetime' field
+            timeout: Timeout of the remote request in seconds
+            refresh_interval: Seconds after which a cached offset is refreshed
+        """
+        super().__init__(timezone_name)
+        self.url = url
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self._offset = timedelta(0)
+        self._synced_at: Optional[float] = None
+        self._sync_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def now(self) -> datetime:
+        if self._synced_at is None or time.monotonic() - self._synced_at > self.refresh_interval:
+            self.start_sync()
+        return super().now() + self._offset
+    
+    def start_sync(self) -> Optional[threading.Thread]:
+        """
+        Start a background sync unless one is already running
+        
+        Returns:
+            threading.Thread: The sync thread, or None if a sync is in progress
+        """
+        with self._lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return None
+            self._sync_thread = threading.Thread(target=self._sync, name='clock-sync', daemon=True)
+            self._sync_thread.start()
+            return self._sync_thread
+    
+    def _sync(self) -> None:
+        """Fetch the remote time and cache its offset from the local clock"""
         try:
-            response = requests.get(
-                'http://worldtimeapi.org/api/timezone/Europe/Madrid',
-                timeout=5,
-                verify=True
-            )
+            import requests  # Only needed when a remote sync actually runs
             
+            response = requests.get(self.url, timeout=self.timeout, verify=True)
             if response.status_code == 200:
-                time_data = response.json()
-                return datetime.fromisoformat(time_data['datetime']).replace(tzinfo=None)
-                
-        except (requests.RequestException, ValueError) as e:
+                remote = datetime.fromisoformat(response.json()['datetime']).replace(tzinfo=None)
+                self._offset = remote - super().now()
+                logging.info(f"Remote time sync succeeded (offset {self._offset.total_seconds():.3f}s)")
+        except Exception as e:
             logging.warning(f"Error getting time from API: {str(e)}")
+        finally:
+            # Also cache failures so an offline host does not retry on every call
+            self._synced_at = time.monotonic()
+
+_default_clock: ClockProvider = ClockProvider()
 
+def get_default_clock() -> ClockProvider:
+    """Get the clock used by DateTimeUtils instances created without an explicit clock"""
+    return _default_clock
+
+def set_default_clock(clock: ClockProvider) -> None:
+    """
+    Replace the process-wide default clock
+    
+    Args:
+        clock: ClockProvider to use from now on
+    """
+    global _default_clock
+    _default_clock = clock
+
+class DateTimeUtils:
+    """Date and time utility functions"""
+    
+    # Methods
+    def __init__(self, clock: Optional[ClockProvider] = None):
+        """
+        Initialize the date/time utilities
+        
+        Args:
+            clock: Clock provider to read the current time from (defaults to the
+                process-wide default clock, which uses the local zoneinfo time)
+        """
+        self.clock = clock
+        logging.info("DateTimeUtils initialized")
+        
+    def get_spain_time(self):
+        """Get current time in Spain timezone from the configured clock provider"""
         try:
-            spain_tz = ZoneInfo('Europe/Madrid')
-            return datetime.now(spain_tz).replace(tzinfo=None)
+            return (self.clock or get_default_clock()).now()
         except Exception as e:
-            logging.error(f"Fallback time error: {str(e)}")
-            return datetime.utcnow()
+            logging.error(f"Clock provider error: {str(e)}")
+            return datetime.now(timezone.utc).replace(tzinfo=None)
         
     def parse_dates(self, date_str):
         """Parse semicolon-separated dates"""
@@ -0,0 +1,101 @@
+"""
+Version stamps for optimistic concurrency in collaborative editing.
+Every schedule cell and every worker's assignment set carries a version.
+Clients submit the versions they read with an edit and the edit commits
+only if none of them changed in the meantime.
+"""
+
+from datetime import datetime
+from threading import RLock
+from typing import Dict, List, Optional, Tuple, Any, Iterable
+
+
+# Versions travel as {'cells': [[ISO date, post, version], ...], 'workers': {worker_id: version}}
+Versions = Dict[str, Any]
+
+
+class VersionTable:
+    """
+    Per-cell and per-worker versions drawn from one logical clock
+
+    Cells and workers never written since the last reset share a base
+    version, so the table only stores what was edited and resetting it
+    (e.g. after the schedule is regenerated) is O(1) while still making
+    every previously read version stale.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._clock = 0
+        self._base = 0
+        self._cells: Dict[Tuple[datetime, int], int] = {}
+        self._workers: Dict[str, int] = {}
+
+    @property
+    def clock(self) -> int:
+        """Version of the latest change anywhere in the schedule"""
+        return self._clock
+
+    def reset(self):
+        """Make every version read so far stale (the whole schedule changed)"""
+        with self._lock:
+            self._clock += 1
+            self._base = self._clock
+            self._cells.clear()
+            self._workers.clear()
+
+    def bump(self, cells: Iterable[Tuple[datetime, int]] = (), workers: Iterable[Optional[str]] = ()):
+        """
+        Record a change to cells and workers' assignment sets
+
+        Args:
+            cells: (date, post index) of each changed cell
+            workers: Workers whose assignments changed (None entries are ignored)
+        """
+        with self._lock:
+            self._clock += 1
+            for key in cells:
+                self._cells[key] = self._clock
+            for worker_id in workers:
+                if worker_id is not None:
+                    self._workers[worker_id] = self._clock
+
+    def read(self, cells: Iterable[Tuple[datetime, int]] = (), workers: Iterable[str] = ()) -> Versions:
+        """
+        Current versions of cells and workers, in the form submitted back with an edit
+
+        Args:
+            cells: (date, post index) of the cells read
+            workers: Workers whose assignments were read
+
+        Returns:
+            Versions dict
+        """
+        with self._lock:
+            return {
+                'cells': [[d.isoformat(), p, self._cells.get((d, p), self._base)] for d, p in cells],
+                'workers': {w: self._workers.get(w, self._base) for w in workers}
+            }
+
+    def stale(self, expected: Optional[Versions]) -> Tuple[List[Tuple[datetime, int]], List[str]]:
+        """
+        Cells and workers whose version differs from the one read
+
+        Args:
+            expected: Versions submitted with an edit (None checks nothing)
+
+        Returns:
+            (stale cells, stale workers)
+        """
+        if not expected:
+            return [], []
+        with self._lock:
+            cells = []
+            for shift_date, post_index, version in expected.get('cells', ()):
+                key = (datetime.fromisoformat(shift_date) if isinstance(shift_date, str) else shift_date,
+                       int(post_index))
+                if self._cells.get(key, self._base) != version:
+                    cells.append(key)
+            workers = [w for w, version in expected.get('workers', {}).items()
+                       if self._workers.get(w, self._base) != version]
+            return cells, workers
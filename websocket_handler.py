@@ -6,14 +6,28 @@ Enables live data streaming and multi-user collaboration.
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime
-from typing import Dict, Set, Optional, Any, List
+from typing import Dict, Set, Optional, Any, List, Tuple
 from dataclasses import dataclass, asdict
 import websockets
 from websockets.server import WebSocketServerProtocol
-from threading import Thread
+from threading import Thread, Event
 
 from event_bus import get_event_bus, EventType, ScheduleEvent
+from schedule_sync import ScheduleSync
+from wire_codec import CompactCodec, ENCODING_JSON, ENCODING_COMPACT, SUPPORTED_ENCODINGS
+from latency_metrics import LatencyMetrics
+
+
+# Seconds of schedule events collected into one broadcast message
+BROADCAST_COALESCE_WINDOW = 0.02
+
+# Messages buffered per client before it is considered too far behind
+CLIENT_SEND_QUEUE_SIZE = 256
+
+# Queue overflows tolerated (each one forces a resync) before a client is disconnected
+MAX_CLIENT_OVERFLOWS = 3
 
 
 @dataclass
@@ -24,10 +38,16 @@ class ConnectedUser:
     connected_at: datetime
     last_activity: datetime
     permissions: List[str] = None
+    send_queue: Optional[asyncio.Queue] = None
+    sender_task: Optional[asyncio.Task] = None
+    overflow_count: int = 0
+    encoding: str = ENCODING_JSON
     
     def __post_init__(self):
         if self.permissions is None:
             self.permissions = ["read", "write"]  # Default permissions
+        if self.send_queue is None:
+            self.send_queue = asyncio.Queue(maxsize=CLIENT_SEND_QUEUE_SIZE)
 
 
 class WebSocketHandler:
@@ -52,26 +72,43 @@ class WebSocketHandler:
         
         # Event bus integration
         self.event_bus = get_event_bus()
+        self.schedule_sync = ScheduleSync(scheduler)
+        self._codec: Optional[CompactCodec] = None
         self._setup_event_listeners()
         
         # Server instance
         self.server = None
         self.server_thread = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server_ready = Event()
+        
+        # Broadcast counters
+        self.broadcast_stats = {
+            'broadcasts': 0,
+            'messages_queued': 0,
+            'resyncs': 0,
+            'disconnects': 0,
+            'dropped_no_loop': 0
+        }
+        
+        # Broadcast latency lands next to the engine's operation latencies
+        engine = getattr(scheduler, 'real_time_engine', None)
+        self.latency: LatencyMetrics = engine.latency if engine is not None else LatencyMetrics()
         
         logging.info(f"WebSocketHandler initialized for {host}:{port}")
     
     def _setup_event_listeners(self):
         """Set up event listeners to broadcast events to connected clients"""
-        self.event_bus.subscribe(EventType.SHIFT_ASSIGNED, self._broadcast_event)
-        self.event_bus.subscribe(EventType.SHIFT_UNASSIGNED, self._broadcast_event)
-        self.event_bus.subscribe(EventType.SHIFT_SWAPPED, self._broadcast_event)
-        self.event_bus.subscribe(EventType.CONSTRAINT_VIOLATION, self._broadcast_event)
-        self.event_bus.subscribe(EventType.VALIDATION_RESULT, self._broadcast_event)
-        self.event_bus.subscribe(EventType.BULK_UPDATE, self._broadcast_event)
+        # Bursts of changes reach clients as one coalesced BULK_UPDATE message
+        for event_type in (EventType.SHIFT_ASSIGNED, EventType.SHIFT_UNASSIGNED, EventType.SHIFT_SWAPPED,
+                           EventType.CONSTRAINT_VIOLATION, EventType.VALIDATION_RESULT, EventType.BULK_UPDATE):
+            self.event_bus.subscribe(event_type, self._broadcast_event, coalesce_window=BROADCAST_COALESCE_WINDOW)
     
-    async def handle_client(self, websocket: WebSocketServerProtocol, path: str):
+    async def handle_client(self, websocket: WebSocketServerProtocol, path: Optional[str] = None):
         """Handle a new WebSocket client connection"""
         user_id = None
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
         try:
             # Wait for authentication message
             auth_message = await asyncio.wait_for(websocket.recv(), timeout=30.0)
@@ -89,13 +126,29 @@ class WebSocketHandler:
             # Register the user
             await self._register_user(user_id, websocket)
             
-            # Send welcome message
-            await self._send_message(websocket, {
+            # Negotiate the wire encoding; the welcome message is always JSON
+            encoding = auth_data.get('encoding', ENCODING_JSON)
+            if encoding not in SUPPORTED_ENCODINGS:
+                encoding = ENCODING_JSON
+            welcome = {
                 'type': 'authenticated',
                 'user_id': user_id,
                 'server_time': datetime.now().isoformat(),
-                'connected_users': list(self.connected_users.keys())
-            })
+                'connected_users': list(self.connected_users.keys()),
+                'schedule_version': self.schedule_sync.version,
+                'schedule_epoch': self.schedule_sync.epoch,
+                'encoding': encoding
+            }
+            if encoding == ENCODING_COMPACT:
+                welcome['dictionary'] = self.codec.get_dictionary()
+            
+            # Send welcome message
+            await self._send_message(websocket, welcome)
+            self.connected_users[user_id].encoding = encoding
+            
+            # Bring the client up to date: missing diffs for a reconnect, a snapshot otherwise
+            await self._send_message(websocket, self.schedule_sync.get_sync_message(
+                auth_data.get('last_version'), auth_data.get('last_epoch')))
             
             # Broadcast user connection
             await self._broadcast_to_others(user_id, {
@@ -123,9 +176,11 @@ class WebSocketHandler:
         """Register a new connected user"""
         # Remove existing connection if user reconnects
         if user_id in self.connected_users:
-            old_websocket = self.connected_users[user_id].websocket
-            if old_websocket in self.websocket_to_user:
-                del self.websocket_to_user[old_websocket]
+            old_user = self.connected_users[user_id]
+            if old_user.websocket in self.websocket_to_user:
+                del self.websocket_to_user[old_user.websocket]
+            if old_user.sender_task:
+                old_user.sender_task.cancel()
         
         # Register new connection
         user = ConnectedUser(
@@ -135,6 +190,8 @@ class WebSocketHandler:
             last_activity=datetime.now()
         )
         
+        user.sender_task = asyncio.get_running_loop().create_task(self._client_sender(user))
+        
         self.connected_users[user_id] = user
         self.websocket_to_user[websocket] = user_id
         
@@ -152,6 +209,8 @@ class WebSocketHandler:
             if user.websocket in self.websocket_to_user:
                 del self.websocket_to_user[user.websocket]
             del self.connected_users[user_id]
+            if user.sender_task:
+                user.sender_task.cancel()
             
             # Broadcast disconnection
             await self._broadcast_to_others(user_id, {
@@ -167,6 +226,7 @@ class WebSocketHandler:
     
     async def _handle_message(self, user_id: str, websocket: WebSocketServerProtocol, message: str):
         """Handle a message from a connected client"""
+        data = None
         try:
             data = json.loads(message)
             message_type = data.get('type')
@@ -178,6 +238,10 @@ class WebSocketHandler:
             if message_type == 'ping':
                 await self._send_message(websocket, {'type': 'pong'})
             
+            elif message_type == 'sync':
+                await self._send_message(websocket,
+                                         self.schedule_sync.get_sync_message(data.get('version'), data.get('epoch')))
+            
             elif message_type == 'assign_worker':
                 await self._handle_assign_worker(user_id, websocket, data)
             
@@ -190,6 +254,9 @@ class WebSocketHandler:
             elif message_type == 'validate_schedule':
                 await self._handle_validate_schedule(user_id, websocket, data)
             
+            elif message_type == 'read_versions':
+                await self._handle_read_versions(user_id, websocket, data)
+            
             elif message_type == 'get_analytics':
                 await self._handle_get_analytics(user_id, websocket, data)
             
@@ -200,13 +267,14 @@ class WebSocketHandler:
                 await self._handle_redo(user_id, websocket, data)
             
             else:
-                await self._send_error(websocket, f"Unknown message type: {message_type}")
+                await self._send_error(websocket, f"Unknown message type: {message_type}", data.get('request_id'))
                 
         except json.JSONDecodeError:
             await self._send_error(websocket, "Invalid JSON message")
         except Exception as e:
             logging.error(f"Error handling message from {user_id}: {e}")
-            await self._send_error(websocket, f"Message handling error: {str(e)}")
+            request_id = data.get('request_id') if isinstance(data, dict) else None
+            await self._send_error(websocket, f"Message handling error: {str(e)}", request_id)
     
     async def _handle_assign_worker(self, user_id: str, websocket: WebSocketServerProtocol, data: Dict[str, Any]):
         """Handle worker assignment request"""
@@ -216,12 +284,13 @@ class WebSocketHandler:
             post_index = data.get('post_index')
             
             if not all([worker_id, shift_date is not None, post_index is not None]):
-                await self._send_error(websocket, "Missing required fields for assignment")
+                await self._send_error(websocket, "Missing required fields for assignment", data.get('request_id'))
                 return
             
             # Perform assignment using scheduler's real-time method
             result = self.scheduler.assign_worker_real_time(
-                worker_id, shift_date, post_index, user_id
+                worker_id, shift_date, post_index, user_id,
+                expected_versions=data.get('versions')
             )
             
             # Send response to requesting client
@@ -232,7 +301,7 @@ class WebSocketHandler:
             })
             
         except Exception as e:
-            await self._send_error(websocket, f"Assignment error: {str(e)}")
+            await self._send_error(websocket, f"Assignment error: {str(e)}", data.get('request_id'))
     
     async def _handle_unassign_worker(self, user_id: str, websocket: WebSocketServerProtocol, data: Dict[str, Any]):
         """Handle worker unassignment request"""
@@ -241,12 +310,13 @@ class WebSocketHandler:
             post_index = data.get('post_index')
             
             if not all([shift_date is not None, post_index is not None]):
-                await self._send_error(websocket, "Missing required fields for unassignment")
+                await self._send_error(websocket, "Missing required fields for unassignment", data.get('request_id'))
                 return
             
             # Perform unassignment using scheduler's real-time method
             result = self.scheduler.unassign_worker_real_time(
-                shift_date, post_index, user_id
+                shift_date, post_index, user_id,
+                expected_versions=data.get('versions')
             )
             
             # Send response to requesting client
@@ -257,7 +327,7 @@ class WebSocketHandler:
             })
             
         except Exception as e:
-            await self._send_error(websocket, f"Unassignment error: {str(e)}")
+            await self._send_error(websocket, f"Unassignment error: {str(e)}", data.get('request_id'))
     
     async def _handle_swap_workers(self, user_id: str, websocket: WebSocketServerProtocol, data: Dict[str, Any]):
         """Handle worker swap request"""
@@ -269,12 +339,13 @@ class WebSocketHandler:
             
             if not all([shift_date1 is not None, post_index1 is not None,
                        shift_date2 is not None, post_index2 is not None]):
-                await self._send_error(websocket, "Missing required fields for swap")
+                await self._send_error(websocket, "Missing required fields for swap", data.get('request_id'))
                 return
             
             # Perform swap using scheduler's real-time method
             result = self.scheduler.swap_workers_real_time(
-                shift_date1, post_index1, shift_date2, post_index2, user_id
+                shift_date1, post_index1, shift_date2, post_index2, user_id,
+                expected_versions=data.get('versions')
             )
             
             # Send response to requesting client
@@ -285,7 +356,23 @@ class WebSocketHandler:
             })
             
         except Exception as e:
-            await self._send_error(websocket, f"Swap error: {str(e)}")
+            await self._send_error(websocket, f"Swap error: {str(e)}", data.get('request_id'))
+    
+    async def _handle_read_versions(self, user_id: str, websocket: WebSocketServerProtocol, data: Dict[str, Any]):
+        """Handle a request for cell and worker versions (for optimistic edits)"""
+        try:
+            cells = [(datetime.fromisoformat(shift_date), int(post_index))
+                     for shift_date, post_index in data.get('cells', [])]
+            versions = self.scheduler.read_schedule_versions(cells, data.get('workers'))
+            
+            await self._send_message(websocket, {
+                'type': 'read_versions_response',
+                'request_id': data.get('request_id'),
+                'versions': versions
+            })
+            
+        except Exception as e:
+            await self._send_error(websocket, f"Version read error: {str(e)}", data.get('request_id'))
     
     async def _handle_validate_schedule(self, user_id: str, websocket: WebSocketServerProtocol, data: Dict[str, Any]):
         """Handle schedule validation request"""
@@ -303,7 +390,7 @@ class WebSocketHandler:
             })
             
         except Exception as e:
-            await self._send_error(websocket, f"Validation error: {str(e)}")
+            await self._send_error(websocket, f"Validation error: {str(e)}", data.get('request_id'))
     
     async def _handle_get_analytics(self, user_id: str, websocket: WebSocketServerProtocol, data: Dict[str, Any]):
         """Handle analytics request"""
@@ -319,7 +406,7 @@ class WebSocketHandler:
             })
             
         except Exception as e:
-            await self._send_error(websocket, f"Analytics error: {str(e)}")
+            await self._send_error(websocket, f"Analytics error: {str(e)}", data.get('request_id'))
     
     async def _handle_undo(self, user_id: str, websocket: WebSocketServerProtocol, data: Dict[str, Any]):
         """Handle undo request"""
@@ -335,7 +422,7 @@ class WebSocketHandler:
             })
             
         except Exception as e:
-            await self._send_error(websocket, f"Undo error: {str(e)}")
+            await self._send_error(websocket, f"Undo error: {str(e)}", data.get('request_id'))
     
     async def _handle_redo(self, user_id: str, websocket: WebSocketServerProtocol, data: Dict[str, Any]):
         """Handle redo request"""
@@ -351,67 +438,197 @@ class WebSocketHandler:
             })
             
         except Exception as e:
-            await self._send_error(websocket, f"Redo error: {str(e)}")
+            await self._send_error(websocket, f"Redo error: {str(e)}", data.get('request_id'))
+    
+    @property
+    def codec(self) -> CompactCodec:
+        """Compact encoder shared by all compact sessions, created on first use"""
+        if self._codec is None:
+            start_date = getattr(self.scheduler, 'start_date', None) or datetime.now()
+            worker_ids = [str(w['id']) for w in getattr(self.scheduler, 'workers_data', None) or []]
+            self._codec = CompactCodec(start_date, worker_ids)
+        return self._codec
+    
+    def _encode(self, message: Dict[str, Any], encoding: str):
+        """Serialize a message for one wire encoding"""
+        if encoding == ENCODING_COMPACT:
+            return self.codec.encode(message)
+        return json.dumps(message, default=str)
+    
+    def _serialize_once(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Serialize a message once for every encoding used by connected clients"""
+        encodings = {user.encoding for user in list(self.connected_users.values())} or {ENCODING_JSON}
+        return {encoding: self._encode(message, encoding) for encoding in encodings}
     
     async def _send_message(self, websocket: WebSocketServerProtocol, message: Dict[str, Any]):
-        """Send a message to a specific WebSocket client"""
+        """
+        Send a message to a specific WebSocket client
+        
+        Messages to a registered client go through its send queue, so its
+        sender task is the only writer and replies stay in order with the
+        broadcasts queued before them.
+        """
+        user = self.connected_users.get(self.websocket_to_user.get(websocket))
         try:
-            await websocket.send(json.dumps(message, default=str))
+            payload = self._encode(message, user.encoding if user else ENCODING_JSON)
+            if user is not None and user.sender_task is not None:
+                self._enqueue_payload(user, payload)
+            else:
+                await websocket.send(payload)
         except websockets.exceptions.ConnectionClosed:
             pass  # Client disconnected
         except Exception as e:
             logging.error(f"Error sending message: {e}")
     
-    async def _send_error(self, websocket: WebSocketServerProtocol, error_message: str):
-        """Send an error message to a client"""
+    async def _send_error(self, websocket: WebSocketServerProtocol, error_message: str,
+                          request_id: Optional[Any] = None):
+        """Send an error message to a client, echoing the request_id of the failed request"""
         await self._send_message(websocket, {
             'type': 'error',
+            'request_id': request_id,
             'message': error_message,
             'timestamp': datetime.now().isoformat()
         })
     
-    async def _broadcast_to_all(self, message: Dict[str, Any]):
-        """Broadcast a message to all connected clients"""
-        if not self.connected_users:
+    async def _client_sender(self, user: ConnectedUser):
+        """Send the queued payloads of one client in order"""
+        try:
+            while True:
+                payload = await user.send_queue.get()
+                await user.websocket.send(payload)
+        except asyncio.CancelledError:
+            pass
+        except websockets.exceptions.ConnectionClosed:
+            pass  # Client disconnected; handle_client unregisters it
+        except Exception as e:
+            logging.error(f"Error sending to {user.user_id}: {e}")
+    
+    def _enqueue_payload(self, user: ConnectedUser, payload):
+        """
+        Queue a serialized payload or reply for one client (event loop thread only)
+        
+        A client whose queue overflows has its backlog replaced by a single
+        resync_required message; after MAX_CLIENT_OVERFLOWS overflows it is
+        disconnected.
+        """
+        try:
+            user.send_queue.put_nowait(payload)
+            self.broadcast_stats['messages_queued'] += 1
             return
+        except asyncio.QueueFull:
+            pass
+        
+        user.overflow_count += 1
+        while not user.send_queue.empty():
+            user.send_queue.get_nowait()
         
-        # Send to all connected users
-        tasks = []
-        for user in self.connected_users.values():
-            tasks.append(self._send_message(user.websocket, message))
+        if user.overflow_count > MAX_CLIENT_OVERFLOWS:
+            logging.warning(f"Disconnecting {user.user_id}: client too far behind")
+            self.broadcast_stats['disconnects'] += 1
+            asyncio.get_running_loop().create_task(
+                user.websocket.close(code=1013, reason="Client too slow")
+            )
+            return
         
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        logging.info(f"Client {user.user_id} fell behind, requesting resync")
+        self.broadcast_stats['resyncs'] += 1
+        user.send_queue.put_nowait(self._encode({
+            'type': 'resync_required',
+            'reason': 'send queue overflow',
+            'version': self.schedule_sync.version,
+            'epoch': self.schedule_sync.epoch,
+            'timestamp': datetime.now().isoformat()
+        }, user.encoding))
     
-    async def _broadcast_to_others(self, excluding_user_id: str, message: Dict[str, Any]):
-        """Broadcast a message to all clients except one"""
-        tasks = []
-        for user_id, user in self.connected_users.items():
+    def _fan_out(self, message: Dict[str, Any], payloads: Dict[str, Any], excluding_user_id: Optional[str] = None,
+                 handed_off_at: Optional[Tuple[float, float]] = None):
+        """
+        Queue the serialized payloads for every connected client (event loop thread only)
+        
+        Args:
+            message: Message the payloads were serialized from
+            payloads: Serialized payload per wire encoding
+            excluding_user_id: Client not to send to
+            handed_off_at: (broadcast start, hand-off to the loop) perf_counter
+                times of an event broadcast, to record its latency
+        """
+        fan_out_started = time.perf_counter()
+        self.broadcast_stats['broadcasts'] += 1
+        for user_id, user in list(self.connected_users.items()):
             if user_id != excluding_user_id:
-                tasks.append(self._send_message(user.websocket, message))
+                if user.encoding not in payloads:
+                    # Client switched encoding after the message was serialized
+                    payloads[user.encoding] = self._encode(message, user.encoding)
+                self._enqueue_payload(user, payloads[user.encoding])
         
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        if handed_off_at is not None:
+            started, handed_off = handed_off_at
+            finished = time.perf_counter()
+            self.latency.record('broadcast', fan_out_started - handed_off, stage='loop_wait')
+            self.latency.record('broadcast', finished - fan_out_started, stage='fan_out')
+            self.latency.record('broadcast', finished - started)
+    
+    async def _broadcast_to_all(self, message: Dict[str, Any]):
+        """Broadcast a message to all connected clients"""
+        if self.connected_users:
+            self._fan_out(message, self._serialize_once(message))
+    
+    async def _broadcast_to_others(self, excluding_user_id: str, message: Dict[str, Any]):
+        """Broadcast a message to all clients except one"""
+        if self.connected_users:
+            self._fan_out(message, self._serialize_once(message), excluding_user_id)
     
     def _broadcast_event(self, event: ScheduleEvent):
-        """Broadcast a schedule event to all connected clients"""
+        """
+        Broadcast a schedule event to all connected clients
+        
+        Called from event bus threads: the event is serialized once per wire
+        encoding in use here and handed to the server loop with
+        call_soon_threadsafe.
+        """
         if not self.connected_users:
             return
         
-        # Convert event to WebSocket message
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            self.broadcast_stats['dropped_no_loop'] += 1
+            return
+        
+        started = time.perf_counter()
         message = {
             'type': 'schedule_event',
             'event': event.to_dict()
         }
         
-        # Schedule the broadcast (since this might be called from a sync context)
-        if hasattr(asyncio, '_get_running_loop'):
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self._broadcast_to_all(message))
-            except RuntimeError:
-                # No running loop, skip broadcast
-                pass
+        # Attach the version step so clients can detect gaps and apply cell diffs
+        if event.seq is not None:
+            seqs = [event.seq]
+        else:
+            seqs = list(dict.fromkeys(e['seq'] for e in event.data.get('events', []) if e.get('seq') is not None))
+        version_step = self.schedule_sync.get_version_range(seqs)
+        if version_step:
+            message.update(version_step)
+        
+        payloads = self._serialize_once(message)
+        handed_off = time.perf_counter()
+        self.latency.record('broadcast', handed_off - started, stage='serialize')
+        
+        try:
+            loop.call_soon_threadsafe(self._fan_out, message, payloads, None, (started, handed_off))
+        except RuntimeError:
+            # Loop closed between the check and the call
+            self.broadcast_stats['dropped_no_loop'] += 1
+    
+    def get_broadcast_stats(self) -> Dict[str, Any]:
+        """Get broadcast counters and the current per-client queue depths"""
+        return {
+            **self.broadcast_stats,
+            'connected_clients': len(self.connected_users),
+            'queue_depths': {
+                user_id: user.send_queue.qsize()
+                for user_id, user in list(self.connected_users.items())
+            }
+        }
     
     def start_server(self):
         """Start the WebSocket server in a separate thread"""
@@ -420,36 +637,52 @@ class WebSocketHandler:
             return
         
         def run_server():
-            asyncio.set_event_loop(asyncio.new_event_loop())
-            loop = asyncio.get_event_loop()
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self.loop = loop
             
-            start_server = websockets.serve(
-                self.handle_client,
-                self.host,
-                self.port
-            )
+            async def serve():
+                # Current websockets versions need a running loop to create the server
+                return await websockets.serve(self.handle_client, self.host, self.port)
             
-            self.server = loop.run_until_complete(start_server)
+            try:
+                self.server = loop.run_until_complete(serve())
+            except OSError as e:
+                logging.error(f"WebSocket server failed to start on {self.host}:{self.port}: {e}")
+                loop.close()
+                return
             logging.info(f"WebSocket server started on {self.host}:{self.port}")
+            self.server_ready.set()
             
             try:
                 loop.run_forever()
             except KeyboardInterrupt:
                 pass
             finally:
-                loop.run_until_complete(self.server.close())
+                self.server.close()
+                loop.run_until_complete(self.server.wait_closed())
                 loop.close()
+                self.server_ready.clear()
         
         self.server_thread = Thread(target=run_server, daemon=True)
         self.server_thread.start()
         
         logging.info("WebSocket server thread started")
     
-    def stop_server(self):
-        """Stop the WebSocket server"""
-        if self.server:
-            # This is a simplified stop - in practice you'd need more coordination
-            logging.info("WebSocket server stop requested")
+    def stop_server(self, timeout: float = 5.0):
+        """
+        Stop the WebSocket server and wait for its thread to finish
+        
+        Args:
+            timeout: Seconds to wait for the server thread
+        """
+        loop = self.loop
+        if self.server is None or loop is None or loop.is_closed():
+            return
+        logging.info("WebSocket server stop requested")
+        loop.call_soon_threadsafe(loop.stop)
+        if self.server_thread:
+            self.server_thread.join(timeout)
     
     def get_connected_users(self) -> List[Dict[str, Any]]:
         """Get information about connected users"""
@@ -0,0 +1,549 @@
+"""
+Load test for the WebSocket collaboration server
+
+Starts the server on localhost in a child process and drives it with N
+simulated asyncio clients, each issuing a weighted mix of operations:
+
+    python websocket_load_test.py --clients 50 --duration 30 --mix assign=6,swap=3,validate=1
+
+Reports operation throughput and round-trip latency, end-to-end broadcast
+latency (event created on the server to event received by a client), schedule
+events that never reached a client, resyncs forced by slow clients and the
+growth of the server's resident memory. The server runs in its own process
+so its memory is measured without the clients.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+import websockets
+
+from latency_metrics import LatencyMetrics
+from exceptions import SchedulerError
+
+
+OPERATIONS = ('assign', 'unassign', 'swap', 'validate', 'undo', 'redo', 'analytics')
+DEFAULT_MIX = {'assign': 6.0, 'swap': 3.0, 'validate': 1.0}
+
+# Schedule events a client is expected to receive once per successful edit
+CHANGE_EVENT_TYPES = ('shift_assigned', 'shift_unassigned', 'shift_swapped')
+
+
+@dataclass
+class LoadTestConfig:
+    """Parameters of one load test run"""
+    clients: int = 10
+    duration: float = 10.0
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    think_time: float = 0.05
+    host: str = 'localhost'
+    port: int = 8790
+    workers: int = 20
+    days: int = 31
+    num_shifts: int = 3
+    scheduler_config: Optional[str] = None
+    seed: Optional[int] = None
+    request_timeout: float = 10.0
+    drain_time: float = 1.0
+    startup_timeout: float = 60.0
+    log_level: str = 'WARNING'
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parse an operation mix such as 'assign=6,swap=3,validate=1'
+
+    Args:
+        text: Comma separated operation=weight pairs
+
+    Returns:
+        dict: Weight per operation
+
+    Raises:
+        SchedulerError: If an operation is unknown or a weight is not a positive number
+    """
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SchedulerError(f"Unknown operation '{name}' in mix (choose from {', '.join(OPERATIONS)})")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise SchedulerError(f"Invalid weight for '{name}' in mix: {weight}")
+        if mix[name] <= 0:
+            raise SchedulerError(f"Weight for '{name}' must be positive")
+    if not mix:
+        raise SchedulerError("Operation mix is empty")
+    return mix
+
+
+def _rss_bytes() -> int:
+    """Resident memory of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        # Peak rather than current RSS where /proc is not available (KiB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _build_scheduler(config: LoadTestConfig):
+    """Scheduler with real-time features, from a config file or a synthetic empty schedule"""
+    from scheduler import Scheduler
+
+    if config.scheduler_config:
+        from scheduler_cli import load_config
+        scheduler_config = load_config(config.scheduler_config)
+    else:
+        start_date = datetime(2024, 1, 1)
+        scheduler_config = {
+            'start_date': start_date,
+            'end_date': start_date + timedelta(days=config.days - 1),
+            'num_workers': config.workers,
+            'num_shifts': config.num_shifts,
+            'gap_between_shifts': 1,
+            'max_consecutive_weekends': 3,
+            'holidays': [],
+            'workers_data': [{'id': f'W{i:03d}', 'work_percentage': 100} for i in range(1, config.workers + 1)],
+            'variable_shifts': []
+        }
+    scheduler_config['enable_real_time'] = True
+    scheduler_config.setdefault('enable_predictive_analytics', False)
+    return Scheduler(scheduler_config)
+
+
+def _server_main(conn, config: LoadTestConfig):
+    """
+    Child process: run the server and answer 'stats' requests until told to 'stop'
+
+    Every reply is ('ok', stats) or ('error', message).
+    """
+    try:
+        import scheduler as scheduler_module  # noqa: F401 (installs log handlers; the level is set after)
+        from websocket_handler import WebSocketHandler
+        from event_bus import EventType, DeliveryMode
+
+        logging.getLogger().setLevel(getattr(logging, config.log_level))
+        scheduler = _build_scheduler(config)
+        change_events = [0]
+
+        def count_change(event):
+            change_events[0] += 1
+
+        for event_type in (EventType.SHIFT_ASSIGNED, EventType.SHIFT_UNASSIGNED, EventType.SHIFT_SWAPPED):
+            scheduler.real_time_engine.event_bus.subscribe(event_type, count_change, delivery=DeliveryMode.SYNC)
+
+        handler = WebSocketHandler(scheduler, host=config.host, port=config.port)
+        handler.start_server()
+        deadline = time.monotonic() + config.startup_timeout
+        while not handler.server_ready.wait(0.05):
+            if not handler.server_thread.is_alive() or time.monotonic() > deadline:
+                conn.send(('error', f"server did not start on {config.host}:{config.port}"))
+                return
+    except Exception as e:
+        conn.send(('error', f"server setup failed: {e}"))
+        return
+
+    def stats():
+        broadcast = handler.get_broadcast_stats()
+        broadcast.pop('queue_depths', None)
+        return {
+            'rss_bytes': _rss_bytes(),
+            'change_events': change_events[0],
+            'broadcast': broadcast,
+            'latency': handler.latency.summary()
+        }
+
+    # The clients pick their cells and workers from the initial reply
+    dates = sorted(scheduler.schedule) or [scheduler.start_date + timedelta(days=i)
+                                           for i in range((scheduler.end_date - scheduler.start_date).days + 1)]
+    conn.send(('ok', dict(stats(), schedule={
+        'workers': [str(w['id']) for w in scheduler.workers_data],
+        'dates': [d.isoformat() for d in dates],
+        'num_shifts': scheduler.num_shifts
+    })))
+    while True:
+        command = conn.recv()
+        if command == 'stats':
+            conn.send(('ok', stats()))
+        elif command == 'stop':
+            handler.stop_server()
+            conn.send(('ok', None))
+            return
+
+
+class ServerProcess:
+    """WebSocket server running in a child process"""
+
+    def __init__(self, config: LoadTestConfig):
+        self.config = config
+        context = multiprocessing.get_context('spawn')
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_server_main, args=(child_conn, config), daemon=True)
+
+    def _call(self, command: Optional[str], timeout: float) -> Any:
+        if command is not None:
+            self._conn.send(command)
+        if not self._conn.poll(timeout):
+            raise SchedulerError(f"Load test server did not answer {command or 'startup'} within {timeout}s")
+        status, payload = self._conn.recv()
+        if status != 'ok':
+            raise SchedulerError(f"Load test server: {payload}")
+        return payload
+
+    def start(self) -> Dict[str, Any]:
+        """Start the server and return its initial stats"""
+        self._process.start()
+        return self._call(None, self.config.startup_timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current server stats"""
+        return self._call('stats', self.config.request_timeout)
+
+    def stop(self):
+        """Stop the server and its process"""
+        if self._process.is_alive():
+            try:
+                self._call('stop', self.config.request_timeout)
+            except (SchedulerError, OSError, EOFError) as e:
+                logging.warning(f"Load test server did not stop cleanly: {e}")
+            self._process.join(self.config.request_timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+
+
+class SimulatedClient:
+    """One collaborating user issuing operations one at a time"""
+
+    def __init__(self, index: int, config: LoadTestConfig, schedule: Dict[str, Any],
+                 metrics: LatencyMetrics, rng: random.Random):
+        self.user_id = f'load_{index:04d}'
+        self.config = config
+        self.metrics = metrics
+        self.rng = rng
+        self.workers = schedule['workers']
+        self.dates = schedule['dates']
+        self.num_shifts = schedule['num_shifts']
+        self.operations = list(config.mix)
+        self.weights = [config.mix[op] for op in self.operations]
+
+        self.websocket = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_request = 0
+
+        self.completed: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.errors = 0
+        self.timeouts = 0
+        self.change_events_received = 0
+        self.resyncs = 0
+        self.disconnected = False
+
+    async def connect(self, uri: str):
+        """Connect, authenticate and consume the initial sync message"""
+        self.websocket = await websockets.connect(uri, max_size=None)
+        await self.websocket.send(json.dumps({'type': 'authenticate', 'user_id': self.user_id, 'encoding': 'json'}))
+        welcome = json.loads(await self.websocket.recv())
+        if welcome.get('type') != 'authenticated':
+            raise SchedulerError(f"{self.user_id} was not authenticated: {welcome}")
+        await self.websocket.recv()  # Snapshot or diffs bringing the client up to date
+        self._reader_task = asyncio.get_running_loop().create_task(self._read())
+
+    async def _read(self):
+        """Route responses to the request they answer and time broadcasts"""
+        try:
+            async for raw in self.websocket:
+                received = datetime.now()
+                message = json.loads(raw)
+                message_type = message.get('type')
+                if message_type == 'schedule_event':
+                    self._on_schedule_event(message['event'], received)
+                elif message_type == 'resync_required':
+                    self.resyncs += 1
+                elif message_type.endswith('_response') or message_type == 'error':
+                    # Replies to requests that already timed out are dropped
+                    pending = self._pending.get(message.get('request_id'))
+                    if pending is not None and not pending.done():
+                        pending.set_result(message)
+        except websockets.exceptions.ConnectionClosed:
+            self.disconnected = True
+
+    def _on_schedule_event(self, event: Dict[str, Any], received: datetime):
+        if event['event_type'] == 'bulk_update':
+            events = event['data'].get('events', [])
+        else:
+            events = [event]
+        for inner in events:
+            if inner['event_type'] in CHANGE_EVENT_TYPES:
+                self.change_events_received += 1
+                sent = datetime.fromisoformat(inner['timestamp'])
+                self.metrics.record('broadcast', max(0.0, (received - sent).total_seconds()))
+
+    def _random_cell(self) -> Tuple[str, int]:
+        return self.rng.choice(self.dates), self.rng.randrange(self.num_shifts)
+
+    def _build_request(self, operation: str) -> Dict[str, Any]:
+        if operation == 'assign':
+            shift_date, post_index = self._random_cell()
+            return {'type': 'assign_worker', 'worker_id': self.rng.choice(self.workers),
+                    'shift_date': shift_date, 'post_index': post_index}
+        if operation == 'unassign':
+            shift_date, post_index = self._random_cell()
+            return {'type': 'unassign_worker', 'shift_date': shift_date, 'post_index': post_index}
+        if operation == 'swap':
+            (date1, post1), (date2, post2) = self._random_cell(), self._random_cell()
+            return {'type': 'swap_workers', 'shift_date1': date1, 'post_index1': post1,
+                    'shift_date2': date2, 'post_index2': post2}
+        if operation == 'validate':
+            return {'type': 'validate_schedule', 'quick_check': True}
+        if operation == 'analytics':
+            return {'type': 'get_analytics'}
+        return {'type': operation}  # undo / redo
+
+    async def request(self, operation: str):
+        """Send one operation and wait for its response"""
+        message = self._build_request(operation)
+        self._next_request += 1
+        request_id = message['request_id'] = self._next_request
+        pending = self._pending[request_id] = asyncio.get_running_loop().create_future()
+
+        started = time.perf_counter()
+        await self.websocket.send(json.dumps(message))
+        try:
+            response = await asyncio.wait_for(pending, self.config.request_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return
+        finally:
+            del self._pending[request_id]
+        self.metrics.record(operation, time.perf_counter() - started)
+
+        if response.get('type') == 'error':
+            self.errors += 1
+            return
+        result = response.get('result')
+        succeeded = result.get('success', False) if isinstance(result, dict) else True
+        counts = self.completed if succeeded else self.failed
+        counts[operation] = counts.get(operation, 0) + 1
+
+    async def run(self, deadline: float):
+        """Issue operations until the deadline (perf_counter time)"""
+        try:
+            while time.perf_counter() < deadline and not self.disconnected:
+                operation = self.rng.choices(self.operations, self.weights)[0]
+                await self.request(operation)
+                if self.config.think_time:
+                    await asyncio.sleep(self.rng.uniform(0, 2 * self.config.think_time))
+        except websockets.exceptions.ConnectionClosed:
+            self.disconnected = True
+
+    async def close(self):
+        """Disconnect"""
+        if self.websocket is not None:
+            await self.websocket.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+def _summarize(histogram_summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Count and millisecond percentiles of a latency summary"""
+    return {
+        'count': histogram_summary.get('count', 0),
+        **{key: round(histogram_summary.get(key, 0.0) * 1000, 3)
+           for key in ('avg_time', 'p50', 'p95', 'p99', 'max_time')}
+    }
+
+
+async def _drive(config: LoadTestConfig, server: ServerProcess, schedule: Dict[str, Any]) -> Dict[str, Any]:
+    """Connect the clients, run the operation mix and collect the client-side results"""
+    uri = f'ws://{config.host}:{config.port}'
+    metrics = LatencyMetrics()
+    seed_source = random.Random(config.seed)
+    clients = [SimulatedClient(i, config, schedule, metrics, random.Random(seed_source.random()))
+               for i in range(config.clients)]
+    await asyncio.gather(*(client.connect(uri) for client in clients))
+
+    baseline = server.stats()
+    started = time.perf_counter()
+    await asyncio.gather(*(client.run(started + config.duration) for client in clients))
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(config.drain_time)  # Let in-flight broadcasts arrive
+    final = server.stats()
+
+    for client in clients:
+        await client.close()
+    return {'clients': clients, 'metrics': metrics, 'elapsed': elapsed, 'baseline': baseline, 'final': final}
+
+
+def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    """
+    Run a load test against a freshly started local server
+
+    Args:
+        config: Load test parameters
+
+    Returns:
+        dict: Report with 'operations', 'broadcasts' and 'server' sections
+
+    Raises:
+        SchedulerError: If the server cannot be started or stops answering
+    """
+    server = ServerProcess(config)
+    try:
+        initial = server.start()
+        results = asyncio.run(_drive(config, server, initial['schedule']))
+    finally:
+        server.stop()
+
+    clients: List[SimulatedClient] = results['clients']
+    metrics: LatencyMetrics = results['metrics']
+    baseline, final, elapsed = results['baseline'], results['final'], results['elapsed']
+    latency = metrics.summary()
+
+    completed = sum(sum(c.completed.values()) for c in clients)
+    failed = sum(sum(c.failed.values()) for c in clients)
+    errors = sum(c.errors for c in clients)
+    timeouts = sum(c.timeouts for c in clients)
+    by_type = {}
+    for operation in config.mix:
+        by_type[operation] = {
+            'succeeded': sum(c.completed.get(operation, 0) for c in clients),
+            'failed': sum(c.failed.get(operation, 0) for c in clients),
+            'latency_ms': _summarize(latency.get(operation, {}))
+        }
+
+    change_events = final['change_events'] - baseline['change_events']
+    expected = change_events * len(clients)
+    received = sum(c.change_events_received for c in clients)
+
+    return {
+        'config': asdict(config),
+        'duration_seconds': round(elapsed, 3),
+        'operations': {
+            'total': completed + failed + errors + timeouts,
+            'succeeded': completed,
+            'failed': failed,
+            'errors': errors,
+            'timeouts': timeouts,
+            'throughput_per_second': round((completed + failed) / elapsed, 2) if elapsed > 0 else 0.0,
+            'by_type': by_type
+        },
+        'broadcasts': {
+            'change_events': change_events,
+            'expected_deliveries': expected,
+            'received': received,
+            'dropped': max(0, expected - received),
+            'resyncs': sum(c.resyncs for c in clients),
+            'disconnected_clients': sum(1 for c in clients if c.disconnected),
+            'latency_ms': _summarize(latency.get('broadcast', {}))
+        },
+        'server': {
+            'rss_start_bytes': initial['rss_bytes'],
+            'rss_before_run_bytes': baseline['rss_bytes'],
+            'rss_end_bytes': final['rss_bytes'],
+            'rss_growth_bytes': final['rss_bytes'] - baseline['rss_bytes'],
+            'broadcast_stats': final['broadcast'],
+            'broadcast_latency_ms': {stage: _summarize(summary) for stage, summary in
+                                     final['latency'].get('broadcast', {}).get('stages', {}).items()}
+        }
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human readable summary of a load test report"""
+    ops, broadcasts, server = report['operations'], report['broadcasts'], report['server']
+    config = report['config']
+    lines = [
+        f"{config['clients']} clients for {report['duration_seconds']:.1f}s",
+        f"Operations: {ops['total']} ({ops['succeeded']} succeeded, {ops['failed']} rejected, "
+        f"{ops['errors']} errors, {ops['timeouts']} timeouts), {ops['throughput_per_second']:.1f} ops/s",
+    ]
+    for operation, entry in ops['by_type'].items():
+        lat = entry['latency_ms']
+        lines.append(f"  {operation:<10} n={lat['count']:<6} p50={lat['p50']:.1f}ms "
+                     f"p95={lat['p95']:.1f}ms p99={lat['p99']:.1f}ms max={lat['max_time']:.1f}ms")
+    lat = broadcasts['latency_ms']
+    lines += [
+        f"Broadcasts: {broadcasts['received']}/{broadcasts['expected_deliveries']} delivered, "
+        f"{broadcasts['dropped']} dropped, {broadcasts['resyncs']} resyncs, "
+        f"{broadcasts['disconnected_clients']} clients disconnected",
+        f"  latency    p50={lat['p50']:.1f}ms p95={lat['p95']:.1f}ms p99={lat['p99']:.1f}ms max={lat['max_time']:.1f}ms",
+        f"Server memory: {server['rss_before_run_bytes'] / 2**20:.1f} MiB -> "
+        f"{server['rss_end_bytes'] / 2**20:.1f} MiB ({server['rss_growth_bytes'] / 2**20:+.1f} MiB)"
+    ]
+    return '\n'.join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser"""
+    parser = argparse.ArgumentParser(
+        prog='python websocket_load_test.py',
+        description='Load test the WebSocket collaboration server with simulated clients.')
+    parser.add_argument('-n', '--clients', type=int, default=10, help='Number of simulated clients')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='Seconds of load')
+    parser.add_argument('--mix', default='assign=6,swap=3,validate=1',
+                        help=f"Operation weights, e.g. assign=6,swap=3,validate=1 ({', '.join(OPERATIONS)})")
+    parser.add_argument('--think-time', type=float, default=0.05,
+                        help='Mean pause in seconds between a client\'s operations')
+    parser.add_argument('--port', type=int, default=8790, help='Port for the local server')
+    parser.add_argument('--workers', type=int, default=20, help='Workers in the synthetic schedule')
+    parser.add_argument('--days', type=int, default=31, help='Days in the synthetic schedule')
+    parser.add_argument('--shifts', type=int, default=3, help='Posts per day in the synthetic schedule')
+    parser.add_argument('--scheduler-config', default=None,
+                        help='JSON scheduler configuration to use instead of the synthetic schedule')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for the operation stream')
+    parser.add_argument('--json', default=None, help='Also write the full report to this JSON file')
+    parser.add_argument('--log-level', default='WARNING',
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], help='Logging level')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        int: Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    try:
+        config = LoadTestConfig(
+            clients=args.clients, duration=args.duration, mix=parse_mix(args.mix),
+            think_time=args.think_time, port=args.port, workers=args.workers, days=args.days,
+            num_shifts=args.shifts, scheduler_config=args.scheduler_config, seed=args.seed,
+            log_level=args.log_level)
+        report = run_load_test(config)
+    except SchedulerError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Report written to {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
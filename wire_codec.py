@@ -0,0 +1,165 @@
+"""
+Compact wire encoding for real-time schedule messages.
+Replaces ISO dates with day ordinals and worker ids with indices into a
+dictionary sent at authentication and with every snapshot or resync, then
+zlib-compresses the result.
+"""
+
+import json
+import zlib
+from datetime import date, datetime
+from threading import Lock
+from typing import Dict, List, Optional, Any, Iterable
+
+
+ENCODING_JSON = 'json'
+ENCODING_COMPACT = 'compact'
+SUPPORTED_ENCODINGS = (ENCODING_JSON, ENCODING_COMPACT)
+
+# Worker index used for an empty cell
+EMPTY_CELL = -1
+
+
+class CompactCodec:
+    """
+    Encodes schedule messages for clients that negotiated the compact encoding
+
+    The worker dictionary is shared by all sessions so that a broadcast is
+    encoded once for every compact client. Workers first seen after a client
+    authenticated are announced in the message that uses them ('w' key).
+    A client that missed such a message (it joined later or its queue was
+    dropped) gets the full dictionary again with the snapshot ('d' key) or
+    resync_required message ('dictionary' key) that brings it up to date.
+    Version-bearing messages keep the schedule sync epoch in the 'i' key.
+    """
+
+    def __init__(self, epoch: date, worker_ids: Iterable[str] = (), compression_level: int = 6):
+        """
+        Initialize the codec
+
+        Args:
+            epoch: Day 0 of the day ordinals (usually the schedule start date)
+            worker_ids: Initial worker dictionary
+            compression_level: zlib compression level
+        """
+        self.epoch = epoch.date() if isinstance(epoch, datetime) else epoch
+        self._epoch_ordinal = self.epoch.toordinal()
+        self.compression_level = compression_level
+        self._workers: List[str] = []
+        self._worker_index: Dict[str, int] = {}
+        self._lock = Lock()
+        for worker_id in worker_ids:
+            self._index_worker(worker_id)
+
+    def _index_worker(self, worker_id: str) -> int:
+        """Add a worker to the dictionary (caller holds the lock or is __init__)"""
+        index = self._worker_index.get(worker_id)
+        if index is None:
+            index = self._worker_index[worker_id] = len(self._workers)
+            self._workers.append(worker_id)
+        return index
+
+    def get_dictionary(self) -> Dict[str, Any]:
+        """
+        Get the dictionary sent to a client at authentication
+
+        Returns:
+            dict with the epoch date and the worker list (index = position)
+        """
+        with self._lock:
+            return {'epoch': self.epoch.isoformat(), 'workers': list(self._workers)}
+
+    def day(self, iso_date: str) -> int:
+        """Convert an ISO date or datetime string to a day ordinal relative to the epoch"""
+        return date.fromisoformat(iso_date[:10]).toordinal() - self._epoch_ordinal
+
+    def encode_cells(self, changes: List[List[Any]], new_workers: List[List[Any]]) -> List[List[int]]:
+        """
+        Encode cell diffs as [day, post, worker index] triples
+
+        Args:
+            changes: Cell diffs [ISO date, post index, worker id or None]
+            new_workers: Receives [index, worker id] for workers added to the dictionary
+
+        Returns:
+            Encoded cell diffs
+        """
+        encoded = []
+        with self._lock:
+            for shift_date, post_index, worker_id in changes:
+                if worker_id is None:
+                    index = EMPTY_CELL
+                else:
+                    known = worker_id in self._worker_index
+                    index = self._index_worker(worker_id)
+                    if not known:
+                        new_workers.append([index, worker_id])
+                encoded.append([self.day(shift_date), post_index, index])
+        return encoded
+
+    def to_compact(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a protocol message to its compact form
+
+        Args:
+            message: Message as sent to JSON clients
+
+        Returns:
+            Compact message (messages without a compact form are returned unchanged)
+        """
+        new_workers: List[List[Any]] = []
+        message_type = message.get('type')
+
+        if message_type == 'schedule_event':
+            event = message['event']
+            compact = {'t': 'e', 'e': event['event_type'], 's': event.get('seq'), 'u': event.get('user_id')}
+            if message.get('changes') is not None:
+                compact.update(i=message.get('epoch'), f=message['from_version'], v=message['to_version'],
+                               c=self.encode_cells(message['changes'], new_workers))
+            else:
+                compact['x'] = event.get('data', {})
+        elif message_type == 'delta':
+            compact = {'t': 'd', 'i': message.get('epoch'), 'f': message['from_version'],
+                       'v': message['to_version'],
+                       'c': self.encode_cells(message['changes'], new_workers)}
+        elif message_type == 'snapshot':
+            rows = []
+            for shift_date, workers in message['schedule'].items():
+                cells = self.encode_cells([[shift_date, post, w] for post, w in enumerate(workers)], new_workers)
+                rows.append([self.day(shift_date), [cell[2] for cell in cells]])
+            # The full dictionary replaces the client's, whatever it missed
+            return {'t': 's', 'i': message.get('epoch'), 'v': message['version'], 'g': rows, 'd': self.get_dictionary()}
+        elif message_type == 'resync_required':
+            return dict(message, dictionary=self.get_dictionary())
+        else:
+            return message
+
+        if new_workers:
+            compact['w'] = new_workers
+        return compact
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        """
+        Encode a message as a compressed binary frame
+
+        Args:
+            message: Message as sent to JSON clients
+
+        Returns:
+            bytes: zlib-compressed compact JSON
+        """
+        text = json.dumps(self.to_compact(message), separators=(',', ':'), default=str)
+        return zlib.compress(text.encode('utf-8'), self.compression_level)
+
+    @staticmethod
+    def decode(payload: bytes) -> Dict[str, Any]:
+        """
+        Decode a binary frame produced by encode (for Python clients and tests)
+
+        Args:
+            payload: Compressed frame
+
+        Returns:
+            The compact message
+        """
+        return json.loads(zlib.decompress(payload).decode('utf-8'))